@@ -0,0 +1,2 @@
+# This file is part of Peach-Py package and is licensed under the Simplified BSD license.
+#    See license.rst for the full text of the license.
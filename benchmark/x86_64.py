@@ -0,0 +1,370 @@
+# This file is part of Peach-Py package and is licensed under the Simplified BSD license.
+#    See license.rst for the full text of the license.
+
+"""Compile-time benchmarks of the x86-64 toolchain.
+
+The benchmarks synthesize large functions and measure the time of each stage of the pipeline:
+
+    - construction: creation of instruction objects in the body of a function.
+    - analysis: the end of the function definition (liveness analysis, spilling, and register preallocation).
+    - lowering: finalization of the function for an ABI (register allocation and lowering of pseudo-instructions).
+    - encoding: encoding of the ABI-specific function into machine code, with a cold encoding cache.
+    - elf, mach-o, ms-coff: writing the encoded function into an object file.
+
+The benchmarks also measure the memory held by the function after its definition and by the ABI-specific function
+(requires tracemalloc, Python 3.4+), and the time to import the x86-64 package in a new interpreter and construct the
+first instructions of several instruction set extensions.
+
+Run as ``python -m benchmark.x86_64 -o report.json`` and compare with a report from another commit with
+``python -m benchmark.x86_64 --compare baseline.json``.
+"""
+
+from __future__ import print_function
+import argparse
+import collections
+import json
+import os
+import sys
+import tempfile
+import time
+
+from peachpy import *
+from peachpy.x86_64 import *
+
+# Monotonic high-resolution clock where available (Python 3.3+)
+_clock = getattr(time, "perf_counter", time.time)
+
+
+def gemm_kernel(scale):
+    """Fully unrolled single-precision GEMM micro-kernel with a 6x16 tile of FMA3 accumulators"""
+    a_pointer = Argument(ptr(const_float_), name="a")
+    b_pointer = Argument(ptr(const_float_), name="b")
+    c_pointer = Argument(ptr(float_), name="c")
+
+    def body():
+        reg_a, reg_b, reg_c = GeneralPurposeRegister64(), GeneralPurposeRegister64(), GeneralPurposeRegister64()
+        LOAD.ARGUMENT(reg_a, a_pointer)
+        LOAD.ARGUMENT(reg_b, b_pointer)
+        LOAD.ARGUMENT(reg_c, c_pointer)
+
+        ymm_acc = [[YMMRegister() for _ in range(2)] for _ in range(6)]
+        for ymm_row in ymm_acc:
+            for ymm in ymm_row:
+                VXORPS(ymm, ymm, ymm)
+        for k in range(64 * scale):
+            ymm_b = [YMMRegister() for _ in range(2)]
+            for j, ymm in enumerate(ymm_b):
+                VMOVAPS(ymm, [reg_b + (k * 16 + j * 8) * 4])
+            for i, ymm_row in enumerate(ymm_acc):
+                ymm_a = YMMRegister()
+                VBROADCASTSS(ymm_a, [reg_a + (k * 6 + i) * 4])
+                for ymm, ymm_bj in zip(ymm_row, ymm_b):
+                    VFMADD231PS(ymm, ymm_a, ymm_bj)
+        for i, ymm_row in enumerate(ymm_acc):
+            for j, ymm in enumerate(ymm_row):
+                VMOVUPS([reg_c + (i * 16 + j * 8) * 4], ymm)
+        RETURN()
+
+    return (a_pointer, b_pointer, c_pointer), None, body
+
+
+def branchy_code(scale):
+    """Long sequence of loops with data-dependent branches"""
+    n = Argument(size_t, name="n")
+
+    def body():
+        reg_n, reg_sum = GeneralPurposeRegister64(), GeneralPurposeRegister64()
+        LOAD.ARGUMENT(reg_n, n)
+        XOR(reg_sum, reg_sum)
+        for i in range(64 * scale):
+            reg_i = GeneralPurposeRegister64()
+            MOV(reg_i, reg_n)
+            with Loop(name="loop%d" % i) as loop:
+                skip = Label("skip%d" % i)
+                TEST(reg_i, 1 << (i % 8))
+                JZ(skip)
+                ADD(reg_sum, reg_i)
+                LABEL(skip)
+                SUB(reg_i, 1)
+                JNZ(loop.begin)
+        RETURN(reg_sum)
+
+    return (n,), uint64_t, body
+
+
+def many_registers(scale):
+    """Thousands of short-lived virtual registers"""
+    x = Argument(uint64_t, name="x")
+
+    def body():
+        reg_x, reg_sum = GeneralPurposeRegister64(), GeneralPurposeRegister64()
+        LOAD.ARGUMENT(reg_x, x)
+        XOR(reg_sum, reg_sum)
+        for i in range(1024 * scale):
+            reg_t = GeneralPurposeRegister64()
+            LEA(reg_t, [reg_x + i])
+            XOR(reg_sum, reg_t)
+        RETURN(reg_sum)
+
+    return (x,), uint64_t, body
+
+
+workloads = collections.OrderedDict([
+    ("gemm", gemm_kernel),
+    ("branchy", branchy_code),
+    ("registers", many_registers),
+])
+
+
+# Instructions constructed after the import of the x86-64 package, which load the modules of their extensions
+import_scenarios = collections.OrderedDict([
+    ("package", ""),
+    ("generic", "MOV(eax, 1)"),
+    ("avx", "VADDPS(ymm0, ymm1, ymm2)"),
+    ("all", "MOV(eax, 1); PXOR(xmm0, xmm1); VADDPS(ymm0, ymm1, ymm2); VFMADD231PS(ymm0, ymm1, ymm2); "
+            "AESENC(xmm0, xmm1); PFADD(mm0, mm1)"),
+])
+
+
+def measure_import(name):
+    """Returns the time to import the x86-64 package and run the import scenario in a new Python interpreter"""
+    import subprocess
+    script = "\n".join([
+        "import time",
+        "clock = getattr(time, 'perf_counter', time.time)",
+        "start_time = clock()",
+        "from peachpy.x86_64 import *",
+        import_scenarios[name],
+        "print(repr(clock() - start_time))"
+    ])
+    environment = dict(os.environ)
+    environment["PYTHONPATH"] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.check_output([sys.executable, "-c", script], env=environment)
+    return float(output.decode("ascii"))
+
+
+def run_workload(name, scale):
+    """Runs the pipeline once and returns the ordered map from stage name to (time, instructions count)"""
+    from peachpy.x86_64.encoding import encoding_cache
+    from peachpy.writer import ELFWriter, MachOWriter, MSCOFFWriter
+
+    arguments, result_type, body = workloads[name](scale)
+    stages = collections.OrderedDict()
+
+    function = Function(name, arguments, result_type, target=uarch.default + isa.avx2 + isa.fma3)
+    start_time = _clock()
+    function.__enter__()
+    body()
+    stages["construction"] = _clock() - start_time, len(function._instructions)
+
+    start_time = _clock()
+    function.__exit__(None, None, None)
+    stages["analysis"] = _clock() - start_time, len(function._instructions)
+
+    start_time = _clock()
+    abi_function = function.finalize(abi.system_v_x86_64_abi)
+    stages["lowering"] = _clock() - start_time, len(abi_function._instructions)
+
+    encoding_cache.clear()
+    start_time = _clock()
+    encoded_function = abi_function.encode()
+    stages["encoding"] = _clock() - start_time, len(encoded_function._instructions)
+
+    encoded_ms_function = function.finalize(abi.microsoft_x64_abi).encode()
+    output_fd, output_path = tempfile.mkstemp(suffix=".o")
+    os.close(output_fd)
+    try:
+        for stage, writer, image_function in [
+                ("elf", ELFWriter(output_path, abi.system_v_x86_64_abi), encoded_function),
+                ("mach-o", MachOWriter(output_path, abi.system_v_x86_64_abi), encoded_function),
+                ("ms-coff", MSCOFFWriter(output_path, abi.microsoft_x64_abi), encoded_ms_function)]:
+            start_time = _clock()
+            with writer:
+                writer._add_prepared_function(image_function)
+            stages[stage] = _clock() - start_time, len(image_function._instructions)
+    finally:
+        if os.path.exists(output_path):
+            os.unlink(output_path)
+
+    return stages
+
+
+def measure_memory(name, scale):
+    """Returns the ordered map from object name to (allocated bytes, instructions count), or None if unsupported"""
+    try:
+        import tracemalloc
+    except ImportError:
+        return None
+    import gc
+
+    arguments, result_type, body = workloads[name](scale)
+    objects = collections.OrderedDict()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start_size, _ = tracemalloc.get_traced_memory()
+        function = Function(name, arguments, result_type, target=uarch.default + isa.avx2 + isa.fma3)
+        with function:
+            body()
+        gc.collect()
+        function_size, _ = tracemalloc.get_traced_memory()
+        objects["function"] = function_size - start_size, len(function._instructions)
+
+        abi_function = function.finalize(abi.system_v_x86_64_abi)
+        gc.collect()
+        abi_function_size, _ = tracemalloc.get_traced_memory()
+        objects["abi_function"] = abi_function_size - function_size, len(abi_function._instructions)
+    finally:
+        tracemalloc.stop()
+    return objects
+
+
+def run_benchmarks(workload_names, scale, repeat):
+    """Returns the report with the best time of each stage over several runs"""
+    results = collections.OrderedDict()
+    memory_results = collections.OrderedDict()
+    for name in workload_names:
+        objects = measure_memory(name, scale)
+        if objects is not None:
+            memory_results[name] = collections.OrderedDict(
+                (object_name, collections.OrderedDict([
+                    ("bytes", size),
+                    ("instructions", instructions),
+                    ("bytes_per_instruction", float(size) / instructions)
+                ])) for (object_name, (size, instructions)) in objects.items())
+
+        best_stages = None
+        for _ in range(repeat):
+            stages = run_workload(name, scale)
+            if best_stages is None:
+                best_stages = stages
+            else:
+                best_stages = collections.OrderedDict(
+                    (stage, (min(best_stages[stage][0], stage_time), instructions))
+                    for (stage, (stage_time, instructions)) in stages.items())
+        results[name] = collections.OrderedDict(
+            (stage, collections.OrderedDict([
+                ("time", stage_time),
+                ("instructions", instructions),
+                ("throughput", instructions / stage_time if stage_time > 0 else None)
+            ])) for (stage, (stage_time, instructions)) in best_stages.items())
+
+    import_results = collections.OrderedDict(
+        (name, collections.OrderedDict([("time", min(measure_import(name) for _ in range(repeat)))]))
+        for name in import_scenarios)
+
+    import platform
+    import peachpy
+    return collections.OrderedDict([
+        ("peachpy", peachpy.__version__),
+        ("commit", get_commit()),
+        ("python", platform.python_implementation() + " " + platform.python_version()),
+        ("scale", scale),
+        ("repeat", repeat),
+        ("benchmarks", results),
+        ("memory", memory_results),
+        ("imports", import_results)
+    ])
+
+
+def get_commit():
+    """Returns the git commit of the working tree, or None if it is unknown"""
+    import subprocess
+    try:
+        with open(os.devnull, "w") as devnull:
+            commit = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=devnull,
+                                             cwd=os.path.dirname(os.path.abspath(__file__)))
+        return commit.decode("ascii").strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def format_report(report, baseline=None):
+    """Formats the report as a table, optionally with the speedup relative to a baseline report"""
+    lines = ["PeachPy %s (commit %s), %s, scale %d" %
+             (report["peachpy"], report["commit"] or "unknown", report["python"], report["scale"])]
+    header = "%-10s %-13s %8s %12s %14s" % ("Workload", "Stage", "Insts", "Time, ms", "Insts/s")
+    if baseline is not None:
+        lines.append("Baseline: PeachPy %s (commit %s), %s, scale %d" %
+                     (baseline["peachpy"], baseline["commit"] or "unknown", baseline["python"], baseline["scale"]))
+        header += " %12s %8s" % ("Base, ms", "Speedup")
+    lines.append(header)
+    for name, stages in report["benchmarks"].items():
+        for stage, result in stages.items():
+            line = "%-10s %-13s %8d %12.3f %14s" % \
+                (name, stage, result["instructions"], result["time"] * 1.0e+3,
+                 "%.0f" % result["throughput"] if result["throughput"] is not None else "-")
+            if baseline is not None:
+                baseline_result = baseline["benchmarks"].get(name, {}).get(stage)
+                if baseline_result is not None and result["time"] > 0:
+                    line += " %12.3f %7.2fx" % (baseline_result["time"] * 1.0e+3,
+                                                baseline_result["time"] / result["time"])
+            lines.append(line)
+
+    if report["memory"]:
+        header = "%-10s %-13s %8s %12s %14s" % ("Workload", "Object", "Insts", "Size, KB", "Bytes/inst")
+        if baseline is not None:
+            header += " %12s %8s" % ("Base, KB", "Ratio")
+        lines.append(header)
+        for name, objects in report["memory"].items():
+            for object_name, result in objects.items():
+                line = "%-10s %-13s %8d %12.1f %14.1f" % \
+                    (name, object_name, result["instructions"], result["bytes"] / 1024.0,
+                     result["bytes_per_instruction"])
+                if baseline is not None:
+                    baseline_result = baseline.get("memory", {}).get(name, {}).get(object_name)
+                    if baseline_result is not None and result["bytes"] > 0:
+                        line += " %12.1f %7.2fx" % (baseline_result["bytes"] / 1024.0,
+                                                    float(baseline_result["bytes"]) / result["bytes"])
+                lines.append(line)
+
+    if report.get("imports"):
+        header = "%-10s %-13s %8s %12s %14s" % ("Import", "Scenario", "", "Time, ms", "")
+        if baseline is not None:
+            header += " %12s %8s" % ("Base, ms", "Speedup")
+        lines.append(header)
+        for name, result in report["imports"].items():
+            line = "%-10s %-13s %8s %12.3f %14s" % ("x86_64", name, "", result["time"] * 1.0e+3, "")
+            if baseline is not None:
+                baseline_result = baseline.get("imports", {}).get(name)
+                if baseline_result is not None and result["time"] > 0:
+                    line += " %12.3f %7.2fx" % (baseline_result["time"] * 1.0e+3,
+                                                baseline_result["time"] / result["time"])
+            lines.append(line)
+    return "\n".join(lines)
+
+
+parser = argparse.ArgumentParser(description="Compile-time benchmarks of the PeachPy x86-64 toolchain")
+parser.add_argument("-o", dest="output",
+                    help="Write the report in JSON format to specified file")
+parser.add_argument("--compare", dest="baseline",
+                    help="Compare with the JSON report in specified file")
+parser.add_argument("--scale", dest="scale", type=int, default=4,
+                    help="Scale the size of synthesized functions")
+parser.add_argument("--repeat", dest="repeat", type=int, default=3,
+                    help="Report the best time of specified number of runs")
+parser.add_argument("workloads", nargs="*",
+                    help="Run only specified workloads (%s)" % ", ".join(workloads.keys()))
+
+
+def main():
+    options = parser.parse_args()
+    for name in options.workloads:
+        if name not in workloads:
+            parser.error("unknown workload %s" % name)
+    report = run_benchmarks(options.workloads or list(workloads.keys()), options.scale, options.repeat)
+
+    baseline = None
+    if options.baseline is not None:
+        with open(options.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+    print(format_report(report, baseline))
+
+    if options.output is not None:
+        with open(options.output, "w") as output_file:
+            json.dump(report, output_file, indent=2, separators=(",", ": "))
+            output_file.write("\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,7 +6,11 @@ import opcodes
 import six
 from opcodes.x86_64 import *
 from codegen.code import CodeWriter, CodeBlock
+from peachpy.x86_64.encoding import TableComponent
 import operator
+import functools
+import itertools
+import collections
 import json
 
 instruction_set = read_instruction_set()
@@ -450,6 +454,165 @@ def generate_encoding_lambda(encoding, operands, use_off_argument=False):
         return flags, "lambda %s: %s" % (", ".join(lambda_args), " + ".join(parts))
 
 
+def generate_encoding_table(encoding, operands):
+    """Generates a static encoding table for peachpy.x86_64.encoding.TableEncoder
+
+    Returns a tuple of encoding flags and the table encoder construction code, or None if some of the encoding
+    components can not be represented in the table.
+    """
+    steps = []
+    constant_bytes = []
+    flags = 0
+
+    def operand_index(operand):
+        return operands.index(operand) if isinstance(operand, Operand) else -1
+
+    def flush_bytes():
+        if constant_bytes:
+            steps.append("(%d, b\"%s\")" % (TableComponent.Bytes, "".join("\\x%02X" % b for b in constant_bytes)))
+            del constant_bytes[:]
+
+    def add_step(kind, *args):
+        flush_bytes()
+        steps.append("(%s)" % ", ".join(map(str, (kind,) + args)))
+
+    for component in encoding.components:
+        if isinstance(component, Prefix):
+            constant_bytes.append(component.byte)
+        elif isinstance(component, REX):
+            component.set_ignored()
+            if component.is_mandatory:
+                if isinstance(component.X, Operand):
+                    assert component.X == component.B and component.X.is_memory, \
+                        "REX.X must refers to the same memory operand as REX.B. " \
+                        "Register operands must have constant REX.X"
+                    r = 0 if isinstance(component.R, Operand) else component.R
+                    add_step(TableComponent.REXMemory, component.W, r, operand_index(component.R),
+                             operand_index(component.X))
+                else:
+                    assert not isinstance(component.B, Operand) or component.B.is_register, \
+                        "Memory operands must have non-constant REX.B"
+                    assert component.X in {0, 1}
+                    rex_byte = 0x40 | (component.W << 3) | (component.X << 1)
+                    if not isinstance(component.R, Operand):
+                        rex_byte |= component.R << 2
+                    if not isinstance(component.B, Operand):
+                        rex_byte |= component.B
+                    if isinstance(component.R, Operand) or isinstance(component.B, Operand):
+                        add_step(TableComponent.REXRegister, "0x%02X" % rex_byte,
+                                 operand_index(component.R), operand_index(component.B))
+                    else:
+                        constant_bytes.append(rex_byte)
+            else:
+                assert component.W == 0, "Instructions with REX.W == 1 must mandate REX prefix"
+                r = 0 if isinstance(component.R, Operand) else component.R
+                if isinstance(component.X, Operand):
+                    assert component.X == component.B and component.X.is_memory, \
+                        "REX.X must refers to the same memory operand as REX.B. " \
+                        "Register operands must have constant REX.X"
+                    b_operand, xb_operand = -1, operand_index(component.X)
+                else:
+                    assert isinstance(component.B, Operand) and component.B.is_register, \
+                        "Memory operands must have non-constant REX.B"
+                    b_operand, xb_operand = operand_index(component.B), -1
+                r8_operands = tuple(i for (i, op) in enumerate(operands) if op.type == "r8")
+                add_step(TableComponent.OptionalREX, r, operand_index(component.R), b_operand, xb_operand,
+                         str(r8_operands))
+                flags |= Flags.OptionalREX
+        elif isinstance(component, VEX):
+            component.set_ignored()
+            if component.type == "VEX" and component.mmmmm == 0b00001 and component.W == 0:
+                if component.R == 1 and component.X == 1 and component.B == 1:
+                    # VZEROUPPER and VZEROALL instructions are VEX-encoded and have no arguments
+                    constant_bytes.append(0xC5)
+                    constant_bytes.append(0xF8 | component.L << 2 | component.pp)
+                else:
+                    assert isinstance(component.R, Operand) or component.R == 1
+                    if isinstance(component.X, Operand):
+                        assert component.X == component.B and component.X.is_memory, \
+                            "VEX.X must refers to the same memory operand as VEX.B. " \
+                            "Register operands must have constant VEX.X"
+                        b_operand, xb_operand = -1, operand_index(component.X)
+                    else:
+                        assert not isinstance(component.B, Operand) or component.B.is_register, \
+                            "Memory operands must have non-constant VEX.B"
+                        assert isinstance(component.B, Operand) or component.B == 1
+                        b_operand, xb_operand = operand_index(component.B), -1
+                    assert isinstance(component.vvvv, Operand) or component.vvvv == 0b1111
+                    add_step(TableComponent.VEX2, component.L << 2 | component.pp, operand_index(component.R),
+                             b_operand, xb_operand, operand_index(component.vvvv))
+                    flags |= Flags.VEX2
+            else:
+                escape = "0x%02X" % {"VEX": 0xC4, "XOP": 0x8F}[component.type]
+                assert isinstance(component.R, Operand) or component.R == 1
+                assert isinstance(component.vvvv, Operand) or component.vvvv == 0b1111
+                if isinstance(component.X, Operand):
+                    assert component.X == component.B and component.X.is_memory, \
+                        "VEX.X must refers to the same memory operand as VEX.B. " \
+                        "Register operands must have constant VEX.X"
+                    add_step(TableComponent.VEX3Memory, escape, bin(component.mmmmm),
+                             "0x%02X" % (component.W << 7 | component.L << 2 | component.pp),
+                             operand_index(component.R), operand_index(component.X), operand_index(component.vvvv))
+                else:
+                    assert isinstance(component.B, Operand) and component.B.is_register or component.B == 1, \
+                        "Memory operands must have non-constant VEX.B"
+                    byte1 = 0xE0 | component.mmmmm
+                    byte2 = 0x78 | (component.W << 7) | (component.L << 2) | component.pp
+                    if any(isinstance(field, Operand) for field in (component.R, component.B, component.vvvv)):
+                        add_step(TableComponent.VEX3Register, escape, "0x%02X" % byte1, operand_index(component.R),
+                                 operand_index(component.B), "0x%02X" % byte2, operand_index(component.vvvv))
+                    else:
+                        constant_bytes.extend([{"VEX": 0xC4, "XOP": 0x8F}[component.type], byte1, byte2])
+        elif isinstance(component, Opcode):
+            if component.addend:
+                add_step(TableComponent.OpcodeAddend, "0x%02X" % component.byte, operand_index(component.addend))
+            else:
+                constant_bytes.append(component.byte)
+        elif isinstance(component, ModRM):
+            if isinstance(component.mode, Operand):
+                assert component.mode == component.rm and component.rm.is_memory, \
+                    "Mod R/M:mode must refers to the same memory operand as Mod R/M:rm. " \
+                    "Register operands must have Mod R/M:mode == 0b11"
+                reg = 0 if isinstance(component.reg, Operand) else component.reg
+                add_step(TableComponent.ModRMMemory, reg, operand_index(component.reg), operand_index(component.rm))
+                flags |= Flags.ModRMSIBDisp
+            else:
+                assert component.mode == 0b11 and component.rm.is_register, \
+                    "Register operands must have Mod R/M:mode == 0b11. " \
+                    "For memory operands Mod R/M:mode must refer to an operand object"
+                modrm_byte = component.mode << 6
+                if not isinstance(component.reg, Operand) and component.reg:
+                    modrm_byte |= component.reg << 3
+                add_step(TableComponent.ModRMRegister, "0x%02X" % modrm_byte,
+                         operand_index(component.reg), operand_index(component.rm))
+        elif isinstance(component, Immediate):
+            assert component.size in {1, 2, 4, 8}
+            if isinstance(component.value, Operand):
+                add_step(TableComponent.Immediate, component.size, operand_index(component.value))
+            else:
+                assert component.size == 1
+                constant_bytes.append(component.value)
+        elif isinstance(component, RegisterByte):
+            assert component.payload is None or isinstance(component.payload, Operand)
+            add_step(TableComponent.RegisterByte, operand_index(component.register),
+                     operand_index(component.payload))
+        elif isinstance(component, CodeOffset):
+            assert component.size in {1, 4}
+            add_step(TableComponent.CodeOffset, component.size, operand_index(component.value))
+        else:
+            return None
+    flush_bytes()
+    return flags, "TableEncoder((%s))" % "".join(step + ", " for step in steps).rstrip(" ")
+
+
+def generate_encoder(encoding, operands):
+    """Generates a table encoder for the encoding, or an encoding lambda if table encoding is not supported"""
+    table_encoder = generate_encoding_table(encoding, operands)
+    if table_encoder is not None:
+        return table_encoder
+    return generate_encoding_lambda(encoding, operands)
+
+
 def get_in_regs(instruction_form):
     """Returns a list indicating which operands might contain input registers for this instruction form"""
     return tuple([bool(o.is_input and o.is_variable or o.is_output and o.is_memory) for o in instruction_form.operands])
@@ -470,6 +633,37 @@ def get_isa_extensions(instruction_form):
     return frozenset(map(operator.attrgetter("name"), instruction_form.isa_extensions))
 
 
+class ConstantPool:
+    """Module-level constants for metadata of instruction forms.
+
+    Instruction objects reference the constants instead of creating their own copies of encoders, sets of ISA
+    extensions, and maps of implicit registers.
+    """
+
+    def __init__(self):
+        # Map from constant expression to constant name
+        self.names = collections.OrderedDict()
+        # Map from name prefix to the number of constants with this prefix
+        self.counts = collections.defaultdict(int)
+
+    def get(self, prefix, expression):
+        """Returns the name of the constant with the expression and creates the constant if needed"""
+        name = self.names.get(expression)
+        if name is None:
+            name = "_%s_%d" % (prefix, self.counts[prefix])
+            self.counts[prefix] += 1
+            self.names[expression] = name
+        return name
+
+    def write(self, code):
+        for (expression, name) in six.iteritems(self.names):
+            code.line("%s = %s" % (name, expression))
+
+
+# Constants of the module being generated
+constant_pool = None
+
+
 def go_name_init(code, instruction_form):
     """Generates initialization code for go_name property"""
     if instruction_form.go_name:
@@ -510,10 +704,15 @@ def implicit_regs_init(code, instruction_form):
         (out_reg_id, out_reg_mask) = name_reg_map[out_reg_name]
         implicit_out_regs[out_reg_id] = \
             implicit_out_regs.get(out_reg_id, 0) | out_reg_mask
+    def format_registers(implicit_regs):
+        return "{" + ", ".join("%d: 0x%X" % item for item in sorted(implicit_regs.items())) + "}"
+
     if implicit_in_regs:
-        code.line("self._implicit_in_regs = " + str(implicit_in_regs))
+        code.line("self._implicit_in_regs = " +
+                  constant_pool.get("implicit_registers", format_registers(implicit_in_regs)))
     if implicit_out_regs:
-        code.line("self._implicit_out_regs = " + str(implicit_out_regs))
+        code.line("self._implicit_out_regs = " +
+                  constant_pool.get("implicit_registers", format_registers(implicit_out_regs)))
 
 
 def in_regs_init(code, instruction_form):
@@ -565,10 +764,10 @@ def isa_extensions_init(code, instruction_form):
             "SSE4.1": "sse4_1",
             "SSE4.2": "sse4_2"
         }
-        isa_extensions = ["peachpy.x86_64.isa." + isa_extensions_map.get(extension.name, extension.name.lower())
+        isa_extensions = ["isa." + isa_extensions_map.get(extension.name, extension.name.lower())
                           for extension in instruction_form.isa_extensions]
-        code.line("self.isa_extensions = frozenset([%s])" %
-                  ", ".join(isa_extensions))
+        code.line("self.isa_extensions = " +
+                  constant_pool.get("isa_extensions", "frozenset([%s])" % ", ".join(isa_extensions)))
 
 
 def instruction_branch_label_form_init(code, instruction_form, instruction_subforms,
@@ -587,7 +786,8 @@ def instruction_branch_label_form_init(code, instruction_form, instruction_subfo
         assert form.operands[0].type in {"rel8", "rel32"}, \
             "Branch label operand type expected to be rel8 or rel32"
         flags |= {"rel8": Flags.Rel8Label, "rel32": Flags.Rel32Label}[form.operands[0].type]
-        code.line("self.encodings.append((0x%02X, %s))" % (flags, encoding_lambda))
+        code.line("self.encodings.append(%s)" %
+                  constant_pool.get("encoding", "(0x%02X, %s)" % (flags, encoding_lambda)))
 
     implicit_regs_init(code, instruction_form)
 
@@ -619,7 +819,7 @@ def instruction_form_init(code, instruction_form, instruction_subforms,
         code.line("if %s:" % operand_check)
         with CodeBlock():
             # Record lambda functions that encode the instruction subform
-            encoding_lambdas = map(lambda e: generate_encoding_lambda(e, instruction_subform.operands),
+            encoding_lambdas = map(lambda e: generate_encoder(e, instruction_subform.operands),
                                    instruction_subform.encodings)
             flags = 0
             if instruction_subform.operands[operand_number].is_variable:
@@ -629,12 +829,14 @@ def instruction_form_init(code, instruction_form, instruction_subforms,
                     "Expect that the accumulator is either the first or the second operand"
                 flags |= {0: Flags.AccumulatorOp0, 1: Flags.AccumulatorOp1}[operand_number]
             for encoding_flags, encoding_lambda in encoding_lambdas:
-                code.line("self.encodings.append((0x%02X, %s))" % (flags | encoding_flags, encoding_lambda))
+                code.line("self.encodings.append(%s)" %
+                          constant_pool.get("encoding", "(0x%02X, %s)" % (flags | encoding_flags, encoding_lambda)))
 
     # Record lambda functions that encode the most generic instruction form
-    encodings = map(lambda e: generate_encoding_lambda(e, instruction_form.operands), instruction_form.encodings)
+    encodings = map(lambda e: generate_encoder(e, instruction_form.operands), instruction_form.encodings)
     for (flags, encoding_lambda) in encodings:
-        code.line("self.encodings.append((0x%02X, %s))" % (flags, encoding_lambda))
+        code.line("self.encodings.append(%s)" %
+                  constant_pool.get("encoding", "(0x%02X, %s)" % (flags, encoding_lambda)))
 
     implicit_regs_init(code, instruction_form)
 
@@ -788,25 +990,167 @@ def is_label_branch(instruction_form):
     return len(instruction_form.operands) == 1 and instruction_form.operands[0].type in {"rel8", "rel32"}
 
 
+# Operand kinds (see peachpy.x86_64.operand.get_operand_kind) of operands which match each operand type
+memory_kinds = ["m", "m8", "m16", "m32", "m64", "m80", "m128", "m256"]
+operand_type_kinds = {
+    "r8": ["r8"], "al": ["r8"], "cl": ["r8"],
+    "r16": ["r16"], "ax": ["r16"],
+    "r32": ["r32"], "eax": ["r32"],
+    "r64": ["r64"], "rax": ["r64"],
+    "mm": ["mm"],
+    "xmm": ["xmm"], "xmm0": ["xmm"],
+    "ymm": ["ymm"],
+    "zmm": ["zmm"],
+    "k": ["k"],
+    "m": memory_kinds,
+    "m8": ["m", "m8"],
+    "m16": ["m", "m16"],
+    "m32": ["m", "m32"],
+    "m64": ["m", "m64"],
+    "m128": ["m", "m128"],
+    "m256": ["m", "m256"],
+    "vm32x": ["vmx", "vm32x"],
+    "vm64x": ["vmx", "vm64x"],
+    "vm32y": ["vmy", "vm32y"],
+    "vm64y": ["vmy", "vm64y"],
+    "imm": ["imm"], "imm4": ["imm"], "imm8": ["imm"], "imm16": ["imm"], "imm32": ["imm"], "imm64": ["imm"],
+    "1": ["imm"], "3": ["imm"],
+    "rel8": ["rel8"],
+    "rel32": ["rel8", "rel32"],
+    "label": ["label"]
+}
+
+# Operand types which match only some operands of the kind, and need a check of the operand value
+value_operand_types = {"al", "cl", "ax", "eax", "rax", "xmm0", "1", "3"}
+
+
+class FormDispatch:
+    """Dispatch table from operand kinds to the functions which initialize instruction forms.
+
+    Forms are added in the order of priority: if operands match several forms, the first of them is initialized.
+    Operands of a kind match a form either unconditionally, or only if the operand values pass a check (e.g. the
+    register is al or the immediate is 1). In the latter case the table maps the operand kinds to a selector function
+    which checks the values and falls back to the next matching forms.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.table_name = "_%s_forms" % name.replace(".", "_")
+        # List of (function name, form description, function which writes the body of the form initialization)
+        self.forms = list()
+        # Map from operand kinds to the list of (function name, value check) for matching forms in priority order
+        self.candidates = collections.OrderedDict()
+
+    def add_form(self, operand_types, write_body):
+        """Adds an instruction form
+
+        :param list operand_types: the list of operand types of the form.
+        :param write_body: the function which writes the initialization code for the form.
+        """
+        function_name = "_%s_form_%d" % (self.name.replace(".", "_"), len(self.forms))
+        self.forms.append((function_name, "%s(%s)" % (self.name, ", ".join(operand_types)), write_body))
+
+        value_checks = [generate_operand_check(operand_index, Operand(operand_type))
+                        for (operand_index, operand_type) in enumerate(operand_types)
+                        if operand_type in value_operand_types]
+        value_check = " and ".join(value_checks) if value_checks else None
+        for operand_kinds in itertools.product(*[operand_type_kinds[operand_type] for operand_type in operand_types]):
+            key_candidates = self.candidates.setdefault(operand_kinds, [])
+            if key_candidates and key_candidates[-1][1] is None:
+                # An earlier form matches all operands with these kinds
+                continue
+            key_candidates.append((function_name, value_check))
+
+    def write_dispatch(self, code, operand_counts=None):
+        """Writes the code which selects and initializes the instruction form in the constructor
+
+        :param operand_counts: the list of supported numbers of operands if the instruction has forms with different
+            numbers of operands, or None if the number of operands is already checked.
+        """
+        code.line("init_form = %s.get(tuple(map(get_operand_kind, self.operands)))" % self.table_name)
+        code.line("if init_form is None:")
+        with CodeBlock():
+            if operand_counts is not None:
+                code.line("if len(self.operands) not in %s:" % str(tuple(operand_counts)))
+                code.indent_line("raise SyntaxError(\"Invalid number of operands for instruction \\\"%s\\\"\")" %
+                                 self.name)
+            self.write_syntax_error(code)
+        code.line("init_form(self)")
+
+    def write_syntax_error(self, code):
+        code.line("raise SyntaxError(\"Invalid operand types: " + self.name +
+                  " \" + \", \".join(map(format_operand_type, self.operands)))")
+
+    def write_functions(self, code):
+        """Writes functions which initialize the forms, selector functions, and the dispatch table"""
+        if not self.forms:
+            return
+
+        for (function_name, description, write_body) in self.forms:
+            code.line()
+            code.line()
+            code.line("def %s(self):" % function_name)
+            with CodeBlock():
+                code.line("# " + description)
+                write_body(code)
+
+        selector_names = collections.OrderedDict()
+        table_entries = list()
+        for (operand_kinds, key_candidates) in six.iteritems(self.candidates):
+            if key_candidates[0][1] is None:
+                table_entries.append((operand_kinds, key_candidates[0][0]))
+                continue
+            key_candidates = tuple(key_candidates)
+            selector_name = selector_names.get(key_candidates)
+            if selector_name is None:
+                selector_name = "_%s_select_%d" % (self.name.replace(".", "_"), len(selector_names))
+                selector_names[key_candidates] = selector_name
+                code.line()
+                code.line()
+                code.line("def %s(self):" % selector_name)
+                with CodeBlock():
+                    for (candidate_index, (function_name, value_check)) in enumerate(key_candidates):
+                        if value_check is not None:
+                            code.line("%s %s:" % ("if" if candidate_index == 0 else "elif", value_check))
+                        else:
+                            code.line("else:")
+                        code.indent_line("%s(self)" % function_name)
+                    if key_candidates[-1][1] is not None:
+                        code.line("else:")
+                        with CodeBlock():
+                            self.write_syntax_error(code)
+            table_entries.append((operand_kinds, selector_name))
+
+        code.line()
+        code.line()
+        code.line("%s = {" % self.table_name)
+        with CodeBlock():
+            for (entry_index, (operand_kinds, function_name)) in enumerate(table_entries):
+                separator = "," if entry_index + 1 != len(table_entries) else ""
+                code.line("%s: %s%s" % (str(operand_kinds), function_name, separator))
+        code.line("}")
+
+
 def main(package_root="."):
+    global constant_pool
     for group, instruction_names in six.iteritems(instruction_groups):
+        constant_pool = ConstantPool()
         with open(os.path.join(package_root, "peachpy", "x86_64", group + ".py"), "w") as out:
             with CodeWriter() as code:
                 code.line("# This file is auto-generated by /codegen/x86_64.py")
                 code.line("# Instruction data is based on package opcodes %s" % opcodes.__version__)
                 code.line()
-                code.line("import inspect")
-                code.line()
                 code.line("import peachpy.stream")
                 code.line("import peachpy.x86_64.options")
-                code.line("import peachpy.x86_64.isa")
+                code.line("from peachpy.x86_64 import isa")
                 code.line("from peachpy.util import is_sint8, is_sint32")
-                code.line("from peachpy.x86_64.encoding import rex, optional_rex, vex2, vex3, modrm_sib_disp")
-                code.line("from peachpy.x86_64.instructions import Instruction, BranchInstruction")
+                code.line("from peachpy.x86_64.encoding import rex, optional_rex, vex2, vex3, modrm_sib_disp, \\")
+                code.indent_line("TableEncoder")
+                code.line("from peachpy.x86_64.instructions import Instruction, BranchInstruction, SourceOrigin")
                 code.line("from peachpy.x86_64.operand import is_al, is_ax, is_eax, is_rax, is_cl, is_xmm0, is_r8, is_r8rex, is_r16, is_r32, is_r64, \\")
                 code.indent_line("is_mm, is_xmm, is_ymm, is_m, is_m8, is_m16, is_m32, is_m64, is_m80, is_m128, is_m256, \\")
                 code.indent_line("is_vm32x, is_vm64x, is_vm32y, is_vm64y, is_imm, is_imm4, is_imm8, is_imm16, is_imm32, is_imm64, \\")
-                code.indent_line("is_rel8, is_rel32, is_label, check_operand, format_operand_type")
+                code.indent_line("is_rel8, is_rel32, is_label, check_operand, get_operand_kind, format_operand_type")
                 code.line()
                 code.line()
                 for name in instruction_names:
@@ -853,6 +1197,8 @@ def main(package_root="."):
                         # Generate documentation comment for the class
                         code.line("\"\"\"%s\"\"\"" % name_instruction.summary)
                         code.line()
+                        code.line("__slots__ = ()")
+                        code.line()
 
                         # Generate constructor
                         code.line("def __init__(self, *args, **kwargs):")
@@ -866,7 +1212,7 @@ def main(package_root="."):
                             code.line("origin = kwargs.get(\"origin\")")
                             code.line("prototype = kwargs.get(\"prototype\")")
                             code.line("if origin is None and prototype is None and peachpy.x86_64.options.get_debug_level() > 0:")
-                            code.indent_line("origin = inspect.stack()")
+                            code.indent_line("origin = SourceOrigin.capture()")
                             code.line("super(%s, self).__init__(\"%s\", origin=origin, prototype=prototype)" % (name, name))
                             code.line("self.operands = tuple(map(check_operand, args))")
                             operand_count_options = sorted(set([len(instruction_form.operands)
@@ -875,103 +1221,110 @@ def main(package_root="."):
                                 code.line("if len(self.operands) != %d:" % operand_count_options[0])
                                 code.indent_line("raise SyntaxError(\"Instruction \\\"%s\\\" requires %d operands\")" % (name, operand_count_options[0]))
                             consider_operand_count = len(operand_count_options) > 1
-                            for index, count in enumerate(operand_count_options):
-                                if consider_operand_count:
-                                    code.line("%s len(self.operands) == %d:" % ("if" if index == 0 else "elif", count))
-                                with CodeBlock(consider_operand_count):
-                                    # Consider only instruction forms that have exactly `count` operands
-                                    count_operand_form_trees = list(filter(lambda form_subforms:
-                                                                           len(form_subforms[0].operands) == count,
-                                                                           six.iteritems(instruction_forms)))
-                                    # The most generic instruction forms
-                                    count_operand_forms = list(map(operator.itemgetter(0), count_operand_form_trees))
-                                    combine_attrs = len(count_operand_forms) > 1 or is_label_branch(count_operand_forms[0])
-                                    # Check how many in_regs combinations exist
-                                    in_regs_options = set(map(get_in_regs, count_operand_forms))
-                                    common_in_regs = combine_attrs and len(in_regs_options) == 1
-                                    # Check how many out_regs combinations exist
-                                    out_regs_options = set(map(get_out_regs, count_operand_forms))
-                                    common_out_regs = combine_attrs and len(out_regs_options) == 1
-                                    # Check how many out_operands combinations exist
-                                    out_operands_options = set(map(get_out_operands, count_operand_forms))
-                                    common_out_operands = combine_attrs and len(out_operands_options) == 1
-                                    # Check how many gas names exist
-                                    gas_names = set(map(lambda form: form.gas_name, count_operand_forms))
-                                    common_gas_name = combine_attrs and len(gas_names) == 1
-                                    # Check how many go names exist
-                                    go_names = set(map(lambda form: str(form.go_name), count_operand_forms))
-                                    common_go_name = combine_attrs and len(go_names) == 1
-                                    # Check how many mmx modes exist
-                                    mmx_modes = set(map(operator.attrgetter("mmx_mode"), count_operand_forms))
-                                    common_mmx_mode = combine_attrs and len(mmx_modes) == 1
-                                    # Check how many xmm modes exist
-                                    xmm_modes = set(map(operator.attrgetter("xmm_mode"), count_operand_forms))
-                                    common_xmm_mode = combine_attrs and len(xmm_modes) == 1
-                                    # Check how many ISA extension options exist
-                                    isa_extensions_options = set(map(get_isa_extensions, count_operand_forms))
-                                    common_isa_extensions = combine_attrs and len(isa_extensions_options) == 1
-                                    if common_go_name:
-                                        # Initialize go_name only once for all forms with `count` operands
-                                        go_name_init(code, count_operand_forms[0])
-                                    if common_gas_name:
-                                        # Initialize gas_name only once for all forms with `count` operands
-                                        gas_name_init(code, count_operand_forms[0])
-                                    if common_in_regs:
-                                        # Initialize in_regs only once for all registers with count operands
-                                        in_regs_init(code, count_operand_forms[0])
-                                    if common_out_regs:
-                                        # Initialize out_regs only once for all registers with count operands
-                                        out_regs_init(code, count_operand_forms[0])
-                                    if common_out_operands:
-                                        # Initialize out_operands only once for all registers with count operands
-                                        out_operands_init(code, count_operand_forms[0])
-                                    if common_mmx_mode:
-                                        # Initialize mmx_mode only once for all registers with count operands
-                                        mmx_mode_init(code, count_operand_forms[0])
-                                    if common_xmm_mode:
-                                        # Initialize avx_mode only once for all registers with count operands
-                                        xmm_mode_init(code, count_operand_forms[0])
-                                    if common_isa_extensions:
-                                        # Initialize isa_extensions only once for all forms with `count` operands
-                                        isa_extensions_init(code, count_operand_forms[0])
-                                    if count > 0:
-                                        # Instruction form with one or more operands
-                                        for (form_index, (instruction_form, instruction_subforms)) \
-                                                in enumerate(count_operand_form_trees):
-                                            operand_checks = map(lambda o: generate_operand_check(o[0], o[1]), enumerate(instruction_form.operands))
-                                            code.line("%s %s:" % ("if" if form_index == 0 else "elif", " and ".join(operand_checks)))
-                                            with CodeBlock():
-                                                instruction_form_init(code, instruction_form, instruction_subforms,
-                                                                      not common_go_name, not common_gas_name,
-                                                                      not common_in_regs, not common_out_regs,
-                                                                      not common_out_operands,
-                                                                      not common_mmx_mode, not common_xmm_mode,
-                                                                      not common_isa_extensions)
-                                            # For branch instructions with rel32 operand additionally generate label form
-                                            if is_label_branch(instruction_form):
-                                                code.line("elif is_label(self.operands[0]):")
-                                                with CodeBlock():
-                                                    instruction_branch_label_form_init(code,
-                                                        instruction_form, instruction_subforms,
-                                                        not common_gas_name, not common_in_regs)
-                                        code.line("else:")
-                                        with CodeBlock():
-                                            code.line("raise SyntaxError(\"Invalid operand types: " + name + " \" + \", \".join(map(format_operand_type, self.operands)))")
-                                    else:
-                                        # Instruction form with no operands
-                                        instruction_form_init(code, count_operand_forms[0], count_operand_form_trees[0][1],
-                                                              not common_go_name, not common_gas_name,
-                                                              not common_in_regs, not common_out_regs,
-                                                              not common_out_operands,
-                                                              not common_mmx_mode, not common_xmm_mode,
-                                                              not common_isa_extensions)
-                            if consider_operand_count:
-                                code.line("else:")
-                                code.indent_line("raise SyntaxError(\"Invalid number of operands for instruction \\\"" + name + "\\\"\")")
-                            code.line("if peachpy.stream.active_stream is not None:")
-                            code.line("peachpy.stream.active_stream.add_instruction(self)", indent=1)
-                            code.line()
-                            code.line()
+                            # Instruction forms with operands are initialized by functions selected by operand kinds
+                            form_dispatch = FormDispatch(name)
+                            for count in operand_count_options:
+                                # Consider only instruction forms that have exactly `count` operands
+                                count_operand_form_trees = list(filter(lambda form_subforms:
+                                                                       len(form_subforms[0].operands) == count,
+                                                                       six.iteritems(instruction_forms)))
+                                # The most generic instruction forms
+                                count_operand_forms = list(map(operator.itemgetter(0), count_operand_form_trees))
+                                # Attributes common to all forms are initialized in the constructor only if the
+                                # instruction has a single operand count
+                                combine_attrs = not consider_operand_count and \
+                                    (len(count_operand_forms) > 1 or is_label_branch(count_operand_forms[0]))
+                                # Check how many in_regs combinations exist
+                                in_regs_options = set(map(get_in_regs, count_operand_forms))
+                                common_in_regs = combine_attrs and len(in_regs_options) == 1
+                                # Check how many out_regs combinations exist
+                                out_regs_options = set(map(get_out_regs, count_operand_forms))
+                                common_out_regs = combine_attrs and len(out_regs_options) == 1
+                                # Check how many out_operands combinations exist
+                                out_operands_options = set(map(get_out_operands, count_operand_forms))
+                                common_out_operands = combine_attrs and len(out_operands_options) == 1
+                                # Check how many gas names exist
+                                gas_names = set(map(lambda form: form.gas_name, count_operand_forms))
+                                common_gas_name = combine_attrs and len(gas_names) == 1
+                                # Check how many go names exist
+                                go_names = set(map(lambda form: str(form.go_name), count_operand_forms))
+                                common_go_name = combine_attrs and len(go_names) == 1
+                                # Check how many mmx modes exist
+                                mmx_modes = set(map(operator.attrgetter("mmx_mode"), count_operand_forms))
+                                common_mmx_mode = combine_attrs and len(mmx_modes) == 1
+                                # Check how many xmm modes exist
+                                xmm_modes = set(map(operator.attrgetter("xmm_mode"), count_operand_forms))
+                                common_xmm_mode = combine_attrs and len(xmm_modes) == 1
+                                # Check how many ISA extension options exist
+                                isa_extensions_options = set(map(get_isa_extensions, count_operand_forms))
+                                common_isa_extensions = combine_attrs and len(isa_extensions_options) == 1
+                                if common_go_name:
+                                    # Initialize go_name only once for all forms with `count` operands
+                                    go_name_init(code, count_operand_forms[0])
+                                if common_gas_name:
+                                    # Initialize gas_name only once for all forms with `count` operands
+                                    gas_name_init(code, count_operand_forms[0])
+                                if common_in_regs:
+                                    # Initialize in_regs only once for all registers with count operands
+                                    in_regs_init(code, count_operand_forms[0])
+                                if common_out_regs:
+                                    # Initialize out_regs only once for all registers with count operands
+                                    out_regs_init(code, count_operand_forms[0])
+                                if common_out_operands:
+                                    # Initialize out_operands only once for all registers with count operands
+                                    out_operands_init(code, count_operand_forms[0])
+                                if common_mmx_mode:
+                                    # Initialize mmx_mode only once for all registers with count operands
+                                    mmx_mode_init(code, count_operand_forms[0])
+                                if common_xmm_mode:
+                                    # Initialize avx_mode only once for all registers with count operands
+                                    xmm_mode_init(code, count_operand_forms[0])
+                                if common_isa_extensions:
+                                    # Initialize isa_extensions only once for all forms with `count` operands
+                                    isa_extensions_init(code, count_operand_forms[0])
+                                write_flags = dict(write_go_name=not common_go_name,
+                                                   write_gas_name=not common_gas_name,
+                                                   write_in_regs=not common_in_regs,
+                                                   write_out_regs=not common_out_regs,
+                                                   write_out_operands=not common_out_operands,
+                                                   write_mmx_mode=not common_mmx_mode,
+                                                   write_xmm_mode=not common_xmm_mode,
+                                                   write_isa_extensions=not common_isa_extensions)
+                                if count > 0 or consider_operand_count:
+                                    for (instruction_form, instruction_subforms) in count_operand_form_trees:
+                                        operand_types = [operand.type for operand in instruction_form.operands]
+                                        form_dispatch.add_form(operand_types,
+                                            functools.partial(instruction_form_init,
+                                                              instruction_form=instruction_form,
+                                                              instruction_subforms=instruction_subforms,
+                                                              **write_flags))
+                                        # For branch instructions with rel32 operand additionally generate label form
+                                        if is_label_branch(instruction_form):
+                                            form_dispatch.add_form(["label"],
+                                                functools.partial(instruction_branch_label_form_init,
+                                                                  instruction_form=instruction_form,
+                                                                  instruction_subforms=instruction_subforms,
+                                                                  write_gas_name=not common_gas_name,
+                                                                  write_in_regs=not common_in_regs))
+                                else:
+                                    # Instruction form with no operands
+                                    instruction_form_init(code, count_operand_forms[0], count_operand_form_trees[0][1],
+                                                          **write_flags)
+                            if form_dispatch.forms:
+                                form_dispatch.write_dispatch(code,
+                                                             operand_count_options if consider_operand_count else None)
+                            code.line("active_stream = peachpy.stream.get_active_stream()")
+                            code.line("if active_stream is not None:")
+                            code.line("active_stream.add_instruction(self)", indent=1)
+
+                    # Functions which initialize instruction forms, and the table which selects them
+                    form_dispatch.write_functions(code)
+                    code.line()
+                    code.line()
+
+                # Constants are referenced only when instructions are created, after the module is loaded
+                code.line("# Metadata of instruction forms shared by all instruction objects")
+                constant_pool.write(code)
 
             print(str(code), file=out)
 
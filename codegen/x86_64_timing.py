@@ -0,0 +1,174 @@
+# This file is part of Peach-Py package and is licensed under the Simplified BSD license.
+#    See license.rst for the full text of the license.
+
+from __future__ import print_function
+import collections
+import itertools
+import json
+import os
+import struct
+import zlib
+
+from codegen.x86_64 import instruction_set, instruction_groups, filter_instruction_forms, operand_type_kinds
+import peachpy.x86_64.uarch
+
+
+# Sizes of register and memory operand types in bytes. Memory operand types without size, and vector memory operands
+# of gather instructions, have the size of register operands.
+register_type_sizes = {
+    "r8": 1, "al": 1, "cl": 1,
+    "r16": 2, "ax": 2,
+    "r32": 4, "eax": 4,
+    "r64": 8, "rax": 8,
+    "mm": 8, "k": 8,
+    "xmm": 16, "xmm0": 16,
+    "ymm": 32,
+    "zmm": 64
+}
+memory_type_sizes = {
+    "m": None, "m8": 1, "m16": 2, "m32": 4, "m64": 8, "m80": 10, "m128": 16, "m256": 32, "m512": 64,
+    "vm32x": None, "vm64x": None, "vm32y": None, "vm64y": None
+}
+
+# Microarchitectures described by the timing database
+microarchitectures = [
+    peachpy.x86_64.uarch.default,
+    peachpy.x86_64.uarch.prescott, peachpy.x86_64.uarch.conroe, peachpy.x86_64.uarch.penryn,
+    peachpy.x86_64.uarch.nehalem, peachpy.x86_64.uarch.sandy_bridge, peachpy.x86_64.uarch.ivy_bridge,
+    peachpy.x86_64.uarch.haswell, peachpy.x86_64.uarch.broadwell,
+    peachpy.x86_64.uarch.k8, peachpy.x86_64.uarch.k10,
+    peachpy.x86_64.uarch.bulldozer, peachpy.x86_64.uarch.piledriver, peachpy.x86_64.uarch.steamroller,
+    peachpy.x86_64.uarch.bonnell, peachpy.x86_64.uarch.saltwell, peachpy.x86_64.uarch.silvermont,
+    peachpy.x86_64.uarch.bobcat, peachpy.x86_64.uarch.jaguar
+]
+
+# Timings of operations on registers which the scheduling model does not estimate well. The file maps
+# microarchitecture id to a map from the instruction name, optionally followed by "/" and the width of the operation
+# in bits, to the latency, the reciprocal throughput, and the number of micro-operations on each set of ports.
+timing_overrides = json.load(open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "x86_64_timing.json")),
+                             object_pairs_hook=collections.OrderedDict)
+
+
+def get_operand_description(operand):
+    """Returns a tuple (operand type, size, is output) for an operand of an instruction form, as in
+    :func:`peachpy.x86_64.uarch.get_operand_descriptions`"""
+    if operand.type in register_type_sizes:
+        return "register", register_type_sizes[operand.type], bool(operand.is_output)
+    elif operand.type in memory_type_sizes:
+        return "memory", memory_type_sizes[operand.type], bool(operand.is_output)
+    else:
+        return None, None, bool(operand.is_output)
+
+
+def get_execution_timing(microarchitecture, name, operands):
+    """Returns the override of the timing of operation on registers as a tuple (latency, reciprocal throughput, ports),
+    or None if the timing of the instruction form is not overridden"""
+    overrides = timing_overrides.get(microarchitecture.id)
+    if not overrides:
+        return None
+    bits = max([size * 8 for (operand_type, size, _) in operands if operand_type is not None and size] + [0])
+    names = [name, name[1:]] if name.startswith("V") else [name]
+    for override_name in names:
+        for key in ("%s/%d" % (override_name, bits), override_name):
+            override = overrides.get(key)
+            if override is not None:
+                ports = [port_set for (port_set, count) in override["ports"].items() for _ in range(count)]
+                return override["latency"], override["throughput"], ports
+    return None
+
+
+def get_instruction_forms():
+    """Returns a list of (instruction name, is generic, operand kinds, operand descriptions) for the instruction forms
+    supported by PeachPy. Operand kinds are as in :func:`peachpy.x86_64.operand.get_operand_kind`, and if operands of
+    the same kinds match several forms, only the first form is listed."""
+    forms = []
+    for (group, instruction_names) in sorted(instruction_groups.items()):
+        for name in instruction_names:
+            name_instructions = [instruction for instruction in instruction_set if instruction.name == name]
+            if not name_instructions:
+                continue
+            form_keys = set()
+            for instruction_form in filter_instruction_forms(name_instructions[0].forms):
+                operand_types = [operand.type for operand in instruction_form.operands]
+                if any(operand_type not in operand_type_kinds for operand_type in operand_types):
+                    continue
+                operands = list(map(get_operand_description, instruction_form.operands))
+                for operand_kinds in itertools.product(*[operand_type_kinds[t] for t in operand_types]):
+                    if (name, operand_kinds) not in form_keys:
+                        form_keys.add((name, operand_kinds))
+                        forms.append((name, group == "generic", operand_kinds, operands))
+    return forms
+
+
+def pack_timing_database(forms, timing_columns):
+    """Encodes the timing database in the format of :func:`peachpy.x86_64.uarch.unpack_timing_database`
+
+    :param list forms: the list of (instruction name, operand kinds) keys of instruction forms.
+    :param list timing_columns: the list of tuples (microarchitecture, timings of instruction forms).
+    """
+    strings, string_indices = [], dict()
+
+    def string_index(string):
+        if string not in string_indices:
+            string_indices[string] = len(strings)
+            strings.append(string)
+        return string_indices[string]
+
+    timings, timing_indices = [], dict()
+    columns, column_indices = [], dict()
+    microarchitecture_columns = []
+    for (microarchitecture, column_timings) in timing_columns:
+        column = []
+        for timing in column_timings:
+            if timing not in timing_indices:
+                timing_indices[timing] = len(timings)
+                timings.append(timing)
+            column.append(timing_indices[timing])
+        column = tuple(column)
+        if column not in column_indices:
+            column_indices[column] = len(columns)
+            columns.append(column)
+        microarchitecture_columns.append((microarchitecture.id, column_indices[column]))
+
+    payload = bytearray()
+    packed_forms = bytearray(struct.pack("<I", len(forms)))
+    for (name, operand_kinds) in forms:
+        packed_forms += struct.pack("<HB", string_index(name), len(operand_kinds))
+        packed_forms += struct.pack("<" + "H" * len(operand_kinds), *map(string_index, operand_kinds))
+    packed_timings = bytearray(struct.pack("<H", len(timings)))
+    for timing in timings:
+        packed_timings += struct.pack("<HHBB", timing.latency, int(round(timing.reciprocal_throughput * 100)),
+                                      timing.uops, len(timing.ports))
+        packed_timings += struct.pack("<" + "H" * len(timing.ports), *map(string_index, timing.ports))
+    packed_microarchitectures = bytearray(struct.pack("<B", len(microarchitecture_columns)))
+    for (microarchitecture_id, column) in microarchitecture_columns:
+        packed_microarchitectures += struct.pack("<HB", string_index(microarchitecture_id), column)
+
+    payload += struct.pack("<H", len(strings))
+    for string in strings:
+        payload += struct.pack("<B", len(string)) + string.encode("ascii")
+    payload += packed_forms
+    payload += packed_timings
+    payload += struct.pack("<B", len(columns))
+    for column in columns:
+        payload += struct.pack("<" + "H" * len(column), *column)
+    payload += packed_microarchitectures
+    return b"PTDB" + struct.pack("<B", 1) + zlib.compress(bytes(payload), 9)
+
+
+def main(package_root="."):
+    forms = get_instruction_forms()
+    timing_columns = []
+    for microarchitecture in microarchitectures:
+        timings = []
+        for (name, is_generic, _, operands) in forms:
+            execution_timing = get_execution_timing(microarchitecture, name, operands)
+            timings.append(microarchitecture.estimate_timing(name, is_generic, operands, execution_timing))
+        timing_columns.append((microarchitecture, timings))
+    form_keys = [(name, operand_kinds) for (name, _, operand_kinds, _) in forms]
+    with open(os.path.join(package_root, "peachpy", "x86_64", "timing.bin"), "wb") as database_file:
+        database_file.write(pack_timing_database(form_keys, timing_columns))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ __version_info__ = (0, 2, 0)
 __version__ = '.'.join(map(str, __version_info__))
 
 from peachpy.stream import InstructionStream
+from peachpy.context import BuildContext
 from peachpy.c.types import Type, \
     uint8_t, uint16_t, uint32_t, uint64_t, uintptr_t, \
     int8_t, int16_t, int32_t, int64_t, intptr_t, \
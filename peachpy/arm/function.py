@@ -7,8 +7,12 @@ import time
 import peachpy.arm.instructions
 import peachpy.arm.registers
 from peachpy.arm.microarchitecture import Microarchitecture
+from peachpy.context import get_active_context
 
-active_function = None
+
+def get_active_function():
+    """Returns the function active in the build context of the current thread, or None"""
+    return get_active_context().active_function
 
 
 class Function(object):
@@ -83,14 +87,14 @@ class Function(object):
 
     def __enter__(self):
         import peachpy.stream
-        global active_function
 
-        if active_function is not None:
-            raise ValueError('Function {0} was not detached'.format(active_function.name))
-        if peachpy.stream.active_stream is not None:
+        context = get_active_context()
+        if context.active_function is not None:
+            raise ValueError('Function {0} was not detached'.format(context.active_function.name))
+        if peachpy.stream.get_active_stream() is not None:
             raise ValueError('Alternative instruction stream is active')
-        active_function = self
-        peachpy.stream.active_stream = self
+        context.active_function = self
+        context.active_stream = self
         if self.report_generation:
             print("Generating function {Function} for microarchitecture {Microarchitecture} and ABI {ABI}"
                   .format(Function=self.name, Microarchitecture=self.target, ABI=self.abi))
@@ -102,7 +106,7 @@ class Function(object):
         import peachpy.stream
         from peachpy.arm.instructions import Instruction
 
-        peachpy.stream.active_stream = None
+        get_active_context().active_stream = None
         if exc_type is None:
             try:
                 self.generate_labels()
@@ -170,12 +174,11 @@ class Function(object):
             self.detach()
 
     def detach(self):
-        import peachpy.stream
-        global active_function
-        if active_function is None:
+        context = get_active_context()
+        if context.active_function is None:
             raise ValueError('Trying to detach a function while no function is active')
-        active_function = None
-        peachpy.stream.active_stream = None
+        context.active_function = None
+        context.active_stream = None
         return self
 
     @property
@@ -1006,7 +1009,7 @@ class LocalVariable(object):
             self.size = 16
         else:
             raise ValueError('Unsupported register type {0}'.format(register_type))
-        self.id = active_function.allocate_local_variable()
+        self.id = get_active_function().allocate_local_variable()
         self.address = None
         self.offset = 0
         self.parent = None
@@ -91,11 +91,11 @@ class LoadConstantPseudoInstruction(Instruction):
 
 class LoadArgumentPseudoInstruction(Instruction):
     def __init__(self, destination, source, origin=None):
-        from peachpy.arm.function import active_function
+        from peachpy.arm.function import get_active_function
         from peachpy import Argument, Yep32f, Yep64f
         super(LoadArgumentPseudoInstruction, self).__init__('<LOAD-PARAMETER>', [destination, source], origin=origin)
         if isinstance(source, Argument):
-            argument = active_function.find_argument(source)
+            argument = get_active_function().find_argument(source)
             if argument is not None:
                 self.argument = argument
             else:
@@ -197,8 +197,9 @@ class AssumeInitializedPseudoInstruction(Instruction):
 
 def LABEL(name):
     instruction = LabelQuasiInstruction(Operand(name))
-    if peachpy.stream.active_stream is not None:
-        peachpy.stream.active_stream.add_instruction(instruction)
+    active_stream = peachpy.stream.get_active_stream()
+    if active_stream is not None:
+        active_stream.add_instruction(instruction)
     return instruction
 
 class Loop:
@@ -232,44 +233,48 @@ class Loop:
 
 def ALIGN(alignment):
     instruction = AlignQuasiInstruction(alignment)
-    if peachpy.stream.active_stream is not None:
-        peachpy.stream.active_stream.add_instruction(instruction)
+    active_stream = peachpy.stream.get_active_stream()
+    if active_stream is not None:
+        active_stream.add_instruction(instruction)
     return instruction
 
 
 def RETURN(return_value=None):
     instruction = ReturnInstruction(Operand(return_value))
-    if peachpy.stream.active_stream is not None:
-        peachpy.stream.active_stream.add_instruction(instruction)
+    active_stream = peachpy.stream.get_active_stream()
+    if active_stream is not None:
+        active_stream.add_instruction(instruction)
     return instruction
 
 
 class LOAD:
     @staticmethod
     def CONSTANT(destination, source):
-        from peachpy.arm.function import active_function
-        origin = inspect.stack() if active_function.collect_origin else None
+        from peachpy.arm.function import get_active_function
+        origin = inspect.stack() if get_active_function().collect_origin else None
         instruction = LoadConstantPseudoInstruction(Operand(destination), Operand(source), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def ARGUMENT(destination, source):
-        from peachpy.arm.function import active_function
-        origin = inspect.stack() if active_function.collect_origin else None
+        from peachpy.arm.function import get_active_function
+        origin = inspect.stack() if get_active_function().collect_origin else None
         instruction = LoadArgumentPseudoInstruction(Operand(destination), source, origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def ARGUMENTS():
-        from peachpy.arm.function import active_function
+        from peachpy.arm.function import get_active_function
         from peachpy.arm.registers import GeneralPurposeRegister, SRegister, DRegister
         from peachpy import Yep32f, Yep64f
         registers = list()
-        for argument in active_function.arguments:
+        for argument in get_active_function().arguments:
             if argument.is_pointer or argument.is_integer or argument.is_codeunit:
                 if argument.size <= 4:
                     register = GeneralPurposeRegister()
@@ -313,7 +318,7 @@ class LOAD:
 
     @staticmethod
     def ELEMENT(destination, source, ctype, increment_pointer=False):
-        from peachpy.arm.function import active_function
+        from peachpy.arm.function import get_active_function
         from peachpy.arm.instructions import Operand
         from peachpy.arm.registers import Register, GeneralPurposeRegister, SRegister, DRegister
         from peachpy.arm.generic import LDR, LDRH, LDRSH, LDRB, LDRSB, ADD
@@ -325,7 +330,7 @@ class LOAD:
             raise TypeError("Destination must be a register")
         if not Operand(source).is_memory_address():
             raise TypeError("Source must be a memory operand")
-        memory_size = ctype.get_size(active_function.abi)
+        memory_size = ctype.get_size(get_active_function().abi)
         if isinstance(destination, GeneralPurposeRegister):
             if ctype.is_unsigned_integer:
                 if memory_size == 4:
@@ -394,7 +399,7 @@ class LOAD:
 class STORE:
     @staticmethod
     def ELEMENT(destination, source, ctype, increment_pointer=False):
-        from peachpy.arm.function import active_function
+        from peachpy.arm.function import get_active_function
         from peachpy.arm.instructions import Operand
         from peachpy.arm.registers import GeneralPurposeRegister, SRegister, DRegister
         from peachpy.arm.generic import STR, STRH, STRB, ADD
@@ -402,7 +407,7 @@ class STORE:
         if isinstance(ctype, peachpy.c.Type):
             if Operand(destination).is_memory_address():
                 if Operand(source).is_register():
-                    memory_size = ctype.get_size(active_function.abi)
+                    memory_size = ctype.get_size(get_active_function().abi)
                     if isinstance(source, GeneralPurposeRegister):
                         if ctype.is_integer():
                             if memory_size == 4:
@@ -459,11 +464,12 @@ class STORE:
 class ASSUME:
     @staticmethod
     def INITIALIZED(destination):
-        from peachpy.arm.function import active_function
-        origin = inspect.stack() if active_function.collect_origin else None
+        from peachpy.arm.function import get_active_function
+        origin = inspect.stack() if get_active_function().collect_origin else None
         instruction = AssumeInitializedPseudoInstruction(Operand(destination), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
@@ -471,11 +477,12 @@ class INIT:
     @staticmethod
     def ONCE(register_class, constant, register=None):
         if register is None:
-            origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+            origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
             register = register_class()
             instruction = LoadConstantPseudoInstruction(Operand(register), Operand(constant), origin=origin)
-            if peachpy.stream.active_stream is not None:
-                peachpy.stream.active_stream.add_instruction(instruction)
+            active_stream = peachpy.stream.get_active_stream()
+            if active_stream is not None:
+                active_stream.add_instruction(instruction)
             return register
         else:
             return register
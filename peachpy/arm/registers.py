@@ -288,8 +288,8 @@ class GeneralPurposeRegister(Register):
     def __init__(self, id=None):
         super(GeneralPurposeRegister, self).__init__()
         if id is None:
-            from peachpy.arm.function import active_function
-            self.number = active_function.allocate_general_purpose_register()
+            from peachpy.arm.function import get_active_function
+            self.number = get_active_function().allocate_general_purpose_register()
             self.type = Register.GPType
             self.size = 4
         elif isinstance(id, int):
@@ -476,8 +476,8 @@ class WMMXRegister(Register):
     def __init__(self, id=None):
         super(WMMXRegister, self).__init__()
         if id is None:
-            from peachpy.arm.function import active_function
-            self.number = active_function.allocate_wmmx_register()
+            from peachpy.arm.function import get_active_function
+            self.number = get_active_function().allocate_wmmx_register()
             self.regtype = Register.WMMXType
             self.size = 8
         elif isinstance(id, int):
@@ -601,8 +601,8 @@ class SRegister(Register):
     def __init__(self, id=None):
         super(SRegister, self).__init__()
         if id is None:
-            from peachpy.arm.function import active_function
-            self.number = active_function.allocate_s_register()
+            from peachpy.arm.function import get_active_function
+            self.number = get_active_function().allocate_s_register()
             self.type = Register.VFPType
             self.size = 4
         elif isinstance(id, int):
@@ -826,8 +826,8 @@ class DRegister(Register):
     def __init__(self, id=None):
         super(DRegister, self).__init__()
         if id is None:
-            from peachpy.arm.function import active_function
-            self.number = active_function.allocate_d_register()
+            from peachpy.arm.function import get_active_function
+            self.number = get_active_function().allocate_d_register()
             self.type = Register.VFPType
             self.size = 8
         elif isinstance(id, int):
@@ -1062,8 +1062,8 @@ class QRegister(Register):
     def __init__(self, id=None):
         super(QRegister, self).__init__()
         if id is None:
-            from peachpy.arm.function import active_function
-            self.number = active_function.allocate_q_register()
+            from peachpy.arm.function import get_active_function
+            self.number = get_active_function().allocate_q_register()
             self.type = Register.VFPType
             self.size = 16
         elif isinstance(id, int):
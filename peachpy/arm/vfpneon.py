@@ -438,1810 +438,1979 @@ class VfpNeonMovInstruction(Instruction):
 class VADD:
     @staticmethod
     def I8(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VADD.I8', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def I16(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VADD.I16', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def I32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VADD.I32', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def I64(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VADD.I64', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def F32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = VFPNeonBinaryArithmeticInstruction('VADD.F32', Operand(destination), Operand(source_x),
                                                          Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def F64(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = VFPDoublePrecisionBinaryArithmeticInstruction('VADD.F64', Operand(destination), Operand(source_x),
                                                                     Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VADDL:
     @staticmethod
     def S8(destination, source_x, source_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = NeonWideArithmeticInstruction('VADDL.S8', Operand(destination), Operand(source_x),
                                                     Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def S16(destination, source_x, source_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = NeonWideArithmeticInstruction('VADDL.S16', Operand(destination), Operand(source_x),
                                                     Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def S32(destination, source_x, source_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = NeonWideArithmeticInstruction('VADDL.S32', Operand(destination), Operand(source_x),
                                                     Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U8(destination, source_x, source_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = NeonWideArithmeticInstruction('VADDL.U8', Operand(destination), Operand(source_x),
                                                     Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U16(destination, source_x, source_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = NeonWideArithmeticInstruction('VADDL.U16', Operand(destination), Operand(source_x),
                                                     Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U32(destination, source_x, source_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = NeonWideArithmeticInstruction('VADDL.U32', Operand(destination), Operand(source_x),
                                                     Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VSUB:
     @staticmethod
     def I8(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VSUB.I8', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def I16(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VSUB.I16', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def I32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VSUB.I32', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def I64(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VSUB.I64', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def F32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = VFPNeonBinaryArithmeticInstruction('VSUB.F32', Operand(destination), Operand(source_x),
                                                          Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def F64(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = VFPDoublePrecisionBinaryArithmeticInstruction('VSUB.F64', Operand(destination), Operand(source_x),
                                                                     Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VSUBL:
     @staticmethod
     def S8(destination, source_x, source_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = NeonWideArithmeticInstruction('VSUBL.S8', Operand(destination), Operand(source_x),
                                                     Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def S16(destination, source_x, source_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = NeonWideArithmeticInstruction('VSUBL.S16', Operand(destination), Operand(source_x),
                                                     Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def S32(destination, source_x, source_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = NeonWideArithmeticInstruction('VSUBL.S32', Operand(destination), Operand(source_x),
                                                     Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U8(destination, source_x, source_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = NeonWideArithmeticInstruction('VSUBL.U8', Operand(destination), Operand(source_x),
                                                     Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U16(destination, source_x, source_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = NeonWideArithmeticInstruction('VSUBL.U16', Operand(destination), Operand(source_x),
                                                     Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U32(destination, source_x, source_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = NeonWideArithmeticInstruction('VSUBL.U32', Operand(destination), Operand(source_x),
                                                     Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VMUL:
     @staticmethod
     def I8(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VMUL.I8', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def I16(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VMUL.I16', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def I32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VMUL.I32', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def F32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = VFPNeonBinaryArithmeticInstruction('VMUL.F32', Operand(destination), Operand(source_x),
                                                          Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def F64(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = VFPDoublePrecisionBinaryArithmeticInstruction('VMUL.F64', Operand(destination), Operand(source_x),
                                                                     Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VMULL:
     @staticmethod
     def S8(destination, source_x, source_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = NeonWideArithmeticInstruction('VMULL.S8', Operand(destination), Operand(source_x),
                                                     Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def S16(destination, source_x, source_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = NeonWideArithmeticInstruction('VMULL.S16', Operand(destination), Operand(source_x),
                                                     Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def S32(destination, source_x, source_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = NeonWideArithmeticInstruction('VMULL.S32', Operand(destination), Operand(source_x),
                                                     Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U8(destination, source_x, source_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = NeonWideArithmeticInstruction('VMULL.U8', Operand(destination), Operand(source_x),
                                                     Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U16(destination, source_x, source_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = NeonWideArithmeticInstruction('VMULL.U16', Operand(destination), Operand(source_x),
                                                     Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U32(destination, source_x, source_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = NeonWideArithmeticInstruction('VMULL.U32', Operand(destination), Operand(source_x),
                                                     Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def P8(destination, source_x, source_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = NeonWideArithmeticInstruction('VMULL.P8', Operand(destination), Operand(source_x),
                                                     Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VMIN:
     @staticmethod
     def S8(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VMIN.S8', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def S16(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VMIN.S16', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def S32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VMIN.S32', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U8(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VMIN.U8', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U16(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VMIN.U16', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VMIN.U32', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def F32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VMIN.F32', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VMAX:
     @staticmethod
     def S8(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VMAX.S8', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def S16(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VMAX.S16', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def S32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VMAX.S32', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U8(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VMAX.U8', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U16(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VMAX.U16', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VMAX.U32', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def F32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VMAX.F32', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VABD:
     @staticmethod
     def S8(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VABD.S8', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def S16(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VABD.S16', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def S32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VABD.S32', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U8(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VABD.U8', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U16(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VABD.U16', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VABD.U32', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def F32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VABD.F32', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VACGE:
     @staticmethod
     def F32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VACGE.F32', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VACGT:
     @staticmethod
     def F32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VACGT.F32', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VACLE:
     @staticmethod
     def F32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VACLE.F32', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VACLT:
     @staticmethod
     def F32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VACLT.F32', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VAND(object):
     @staticmethod
     def __new__(cls, destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VAND', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VBIC(object):
     @staticmethod
     def __new__(cls, destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VBIC', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VORR(object):
     @staticmethod
     def __new__(cls, destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VORR', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VORN(object):
     @staticmethod
     def __new__(cls, destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VORN', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 def VEOR(destination, source_x, source_y=None):
-    origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+    origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
     if source_y is None:
         (destination, source_x, source_y) = (destination, destination, source_x)
     instruction = NeonArithmeticInstruction('VEOR', Operand(destination), Operand(source_x), Operand(source_y),
                                             origin=origin)
-    if peachpy.stream.active_stream is not None:
-        peachpy.stream.active_stream.add_instruction(instruction)
+    active_stream = peachpy.stream.get_active_stream()
+    if active_stream is not None:
+        active_stream.add_instruction(instruction)
     return instruction
 
 
 class VPADD:
     @staticmethod
     def I8(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VPADD.I8', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def I16(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VPADD.I16', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def I32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VPADD.I32', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def F32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VPADD.F32', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VPMIN:
     @staticmethod
     def S8(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VPMIN.S8', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def S16(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VPMIN.S16', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def S32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VPMIN.S32', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U8(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VPMIN.U8', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U16(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VPMIN.U16', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VPMIN.U32', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def F32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VPMIN.F32', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VPMAX:
     @staticmethod
     def S8(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VPMAX.S8', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def S16(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VPMAX.S16', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def S32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VPMAX.S32', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U8(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VPMAX.U8', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U16(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VPMAX.U16', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VPMAX.U32', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def F32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VPMAX.F32', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VQADD:
     @staticmethod
     def S8(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VQADD.S8', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def S16(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VQADD.S16', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def S32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VQADD.S32', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def S64(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VQADD.S64', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U8(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VQADD.U8', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U16(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VQADD.U16', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VQADD.U32', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U64(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VQADD.U64', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VQSUB:
     @staticmethod
     def S8(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VQSUB.S8', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def S16(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VQSUB.S16', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def S32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VQSUB.S32', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def S64(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VQSUB.S64', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U8(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VQSUB.U8', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U16(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VQSUB.U16', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VQSUB.U32', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U64(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VQSUB.U64', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VHADD:
     @staticmethod
     def S8(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VHADD.S8', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def S16(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VHADD.S16', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def S32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VHADD.S32', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U8(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VHADD.U8', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U16(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VHADD.U16', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VHADD.U32', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VHSUB:
     @staticmethod
     def S8(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VHSUB.S8', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def S16(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VHSUB.S16', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def S32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VHSUB.S32', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U8(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VHSUB.U8', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U16(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VHSUB.U16', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VHSUB.U32', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VRHADD:
     @staticmethod
     def S8(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VRHADD.S8', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def S16(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VRHADD.S16', Operand(destination), Operand(source_x),
                                                 Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def S32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VRHADD.S32', Operand(destination), Operand(source_x),
                                                 Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U8(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VRHADD.U8', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U16(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VRHADD.U16', Operand(destination), Operand(source_x),
                                                 Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def U32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VRHADD.U32', Operand(destination), Operand(source_x),
                                                 Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VRECPS:
     @staticmethod
     def F32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VRECPS.F32', Operand(destination), Operand(source_x),
                                                 Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VRSQRTS:
     @staticmethod
     def F32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = NeonArithmeticInstruction('VRSQRTS.F32', Operand(destination), Operand(source_x),
                                                 Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VTST:
     @staticmethod
     def I8(destination, source_x, source_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = NeonArithmeticInstruction('VTST.8', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def I16(destination, source_x, source_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = NeonArithmeticInstruction('VTST.16', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def I32(destination, source_x, source_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = NeonArithmeticInstruction('VTST.32', Operand(destination), Operand(source_x), Operand(source_y),
                                                 origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VNMUL:
     @staticmethod
     def F32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = VFPSinglePrecisionMultiplyAddInstruction('VNMUL.F32', Operand(destination), Operand(source_x),
                                                                Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def F64(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = VFPDoublePrecisionBinaryArithmeticInstruction('VNMUL.F64', Operand(destination),
                                                                     Operand(source_x), Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VDIV:
     @staticmethod
     def F32(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = VFPSinglePrecisionMultiplyAddInstruction('VDIV.F32', Operand(destination), Operand(source_x),
                                                                Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def F64(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = VFPDoublePrecisionBinaryArithmeticInstruction('VDIV.F64', Operand(destination), Operand(source_x),
                                                                     Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VSQRT:
     @staticmethod
     def F64(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = VFPDoublePrecisionUnaryArithmeticInstruction('VSQRT.F64', Operand(destination), Operand(source_x),
                                                                    Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VABS:
     @staticmethod
     def F64(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = VFPDoublePrecisionUnaryArithmeticInstruction('VABS.F64', Operand(destination), Operand(source_x),
                                                                    Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VNEG:
     @staticmethod
     def F64(destination, source_x, source_y=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         if source_y is None:
             (destination, source_x, source_y) = (destination, destination, source_x)
         instruction = VFPDoublePrecisionUnaryArithmeticInstruction('VNEG.F64', Operand(destination), Operand(source_x),
                                                                    Operand(source_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VMLA:
     @staticmethod
     def F32(accumulator, factor_x, factor_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = VFPNeonMultiplyAddInstruction('VMLA.F32', Operand(accumulator), Operand(factor_x),
                                                     Operand(factor_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def F64(accumulator, factor_x, factor_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = VFPDoublePrecisionMultiplyAddInstruction('VMLA.F64', Operand(accumulator), Operand(factor_x),
                                                                Operand(factor_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VMLS:
     @staticmethod
     def F32(accumulator, factor_x, factor_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = VFPNeonMultiplyAddInstruction('VMLS.F32', Operand(accumulator), Operand(factor_x),
                                                     Operand(factor_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def F64(accumulator, factor_x, factor_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = VFPDoublePrecisionMultiplyAddInstruction('VMLS.F64', Operand(accumulator), Operand(factor_x),
                                                                Operand(factor_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VNMLA:
     @staticmethod
     def F32(accumulator, factor_x, factor_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = VFPSinglePrecisionMultiplyAddInstruction('VNMLA.F32', Operand(accumulator), Operand(factor_x),
                                                                Operand(factor_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def F64(accumulator, factor_x, factor_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = VFPDoublePrecisionMultiplyAddInstruction('VNMLA.F64', Operand(accumulator), Operand(factor_x),
                                                                Operand(factor_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VNMLS:
     @staticmethod
     def F32(accumulator, factor_x, factor_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = VFPSinglePrecisionMultiplyAddInstruction('VNMLS.F32', Operand(accumulator), Operand(factor_x),
                                                                Operand(factor_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def F64(accumulator, factor_x, factor_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = VFPDoublePrecisionMultiplyAddInstruction('VNMLS.F64', Operand(accumulator), Operand(factor_x),
                                                                Operand(factor_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VFMA:
     @staticmethod
     def F32(accumulator, factor_x, factor_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = VFPNeonMultiplyAddInstruction('VFMA.F32', Operand(accumulator), Operand(factor_x),
                                                     Operand(factor_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def F64(accumulator, factor_x, factor_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = VFPDoublePrecisionMultiplyAddInstruction('VFMA.F64', Operand(accumulator), Operand(factor_x),
                                                                Operand(factor_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VFMS:
     @staticmethod
     def F32(accumulator, factor_x, factor_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = VFPNeonMultiplyAddInstruction('VFMS.F32', Operand(accumulator), Operand(factor_x),
                                                     Operand(factor_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def F64(accumulator, factor_x, factor_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = VFPDoublePrecisionMultiplyAddInstruction('VFMS.F64', Operand(accumulator), Operand(factor_x),
                                                                Operand(factor_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VFNMA:
     @staticmethod
     def F32(accumulator, factor_x, factor_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = VFPSinglePrecisionMultiplyAddInstruction('VFNMA.F32', Operand(accumulator), Operand(factor_x),
                                                                Operand(factor_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def F64(accumulator, factor_x, factor_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = VFPDoublePrecisionMultiplyAddInstruction('VFNMA.F64', Operand(accumulator), Operand(factor_x),
                                                                Operand(factor_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VFNMS:
     @staticmethod
     def F32(accumulator, factor_x, factor_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = VFPSinglePrecisionMultiplyAddInstruction('VFNMS.F32', Operand(accumulator), Operand(factor_x),
                                                                Operand(factor_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def F64(accumulator, factor_x, factor_y):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = VFPDoublePrecisionMultiplyAddInstruction('VFNMS.F64', Operand(accumulator), Operand(factor_x),
                                                                Operand(factor_y), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 def VLDR(register, address):
-    origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+    origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
     instruction = VFPLoadStoreInstruction("VLDR", Operand(register), Operand(address), origin=origin)
-    if peachpy.stream.active_stream is not None:
-        peachpy.stream.active_stream.add_instruction(instruction)
+    active_stream = peachpy.stream.get_active_stream()
+    if active_stream is not None:
+        active_stream.add_instruction(instruction)
     return instruction
 
 
 def VSTR(register, address):
-    origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+    origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
     instruction = VFPLoadStoreInstruction("VSTR", Operand(register), Operand(address), origin=origin)
-    if peachpy.stream.active_stream is not None:
-        peachpy.stream.active_stream.add_instruction(instruction)
+    active_stream = peachpy.stream.get_active_stream()
+    if active_stream is not None:
+        active_stream.add_instruction(instruction)
     return instruction
 
 
 def VLDM(source, destination):
-    origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+    origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
     instruction = VFPLoadStoreMultipleInstruction("VLDM", Operand(source), Operand(destination), origin=origin)
-    if peachpy.stream.active_stream is not None:
-        peachpy.stream.active_stream.add_instruction(instruction)
+    active_stream = peachpy.stream.get_active_stream()
+    if active_stream is not None:
+        active_stream.add_instruction(instruction)
     return instruction
 
 
 def VLDMIA(source, destination):
-    origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+    origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
     instruction = VFPLoadStoreMultipleInstruction("VLDMIA", Operand(source), Operand(destination), origin=origin)
-    if peachpy.stream.active_stream is not None:
-        peachpy.stream.active_stream.add_instruction(instruction)
+    active_stream = peachpy.stream.get_active_stream()
+    if active_stream is not None:
+        active_stream.add_instruction(instruction)
     return instruction
 
 
 def VLDMDB(source, destination):
-    origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+    origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
     instruction = VFPLoadStoreMultipleInstruction("VLDMDB", Operand(source), Operand(destination), origin=origin)
-    if peachpy.stream.active_stream is not None:
-        peachpy.stream.active_stream.add_instruction(instruction)
+    active_stream = peachpy.stream.get_active_stream()
+    if active_stream is not None:
+        active_stream.add_instruction(instruction)
     return instruction
 
 
 def VSTM(source, destination):
-    origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+    origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
     instruction = VFPLoadStoreMultipleInstruction("VSTM", Operand(source), Operand(destination), origin=origin)
-    if peachpy.stream.active_stream is not None:
-        peachpy.stream.active_stream.add_instruction(instruction)
+    active_stream = peachpy.stream.get_active_stream()
+    if active_stream is not None:
+        active_stream.add_instruction(instruction)
     return instruction
 
 
 def VSTMIA(source, destination):
-    origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+    origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
     instruction = VFPLoadStoreMultipleInstruction("VSTMIA", Operand(source), Operand(destination), origin=origin)
-    if peachpy.stream.active_stream is not None:
-        peachpy.stream.active_stream.add_instruction(instruction)
+    active_stream = peachpy.stream.get_active_stream()
+    if active_stream is not None:
+        active_stream.add_instruction(instruction)
     return instruction
 
 
 def VSTMDB(source, destination):
-    origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+    origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
     instruction = VFPLoadStoreMultipleInstruction("VSTMDB", Operand(source), Operand(destination), origin=origin)
-    if peachpy.stream.active_stream is not None:
-        peachpy.stream.active_stream.add_instruction(instruction)
+    active_stream = peachpy.stream.get_active_stream()
+    if active_stream is not None:
+        active_stream.add_instruction(instruction)
     return instruction
 
 
 def VPUSH(register_list):
-    origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+    origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
     instruction = VFPPushPopInstruction("VPUSH", Operand(register_list), origin=origin)
-    if peachpy.stream.active_stream is not None:
-        peachpy.stream.active_stream.add_instruction(instruction)
+    active_stream = peachpy.stream.get_active_stream()
+    if active_stream is not None:
+        active_stream.add_instruction(instruction)
     return instruction
 
 
 def VPOP(register_list):
-    origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+    origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
     instruction = VFPPushPopInstruction("VPOP", Operand(register_list), origin=origin)
-    if peachpy.stream.active_stream is not None:
-        peachpy.stream.active_stream.add_instruction(instruction)
+    active_stream = peachpy.stream.get_active_stream()
+    if active_stream is not None:
+        active_stream.add_instruction(instruction)
     return instruction
 
 
 class VLD1:
     @staticmethod
     def I8(address, register_list, increment=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = NeonLoadStoreInstruction("VLD1.8", Operand(address), Operand(register_list), Operand(increment),
                                                origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def I16(address, register_list, increment=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = NeonLoadStoreInstruction("VLD1.16", Operand(address), Operand(register_list), Operand(increment),
                                                origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def I32(address, register_list, increment=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = NeonLoadStoreInstruction("VLD1.32", Operand(address), Operand(register_list), Operand(increment),
                                                origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def I64(address, register_list, increment=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = NeonLoadStoreInstruction("VLD1.64", Operand(address), Operand(register_list), Operand(increment),
                                                origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def F32(address, register_list, increment=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = NeonLoadStoreInstruction("VLD1.32", Operand(address), Operand(register_list), Operand(increment),
                                                origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VST1:
     @staticmethod
     def I8(address, register_list, increment=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = NeonLoadStoreInstruction("VST1.8", Operand(address), Operand(register_list), Operand(increment),
                                                origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def I16(address, register_list, increment=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = NeonLoadStoreInstruction("VST1.16", Operand(address), Operand(register_list), Operand(increment),
                                                origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def I32(address, register_list, increment=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = NeonLoadStoreInstruction("VST1.32", Operand(address), Operand(register_list), Operand(increment),
                                                origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def I64(address, register_list, increment=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = NeonLoadStoreInstruction("VST1.64", Operand(address), Operand(register_list), Operand(increment),
                                                origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def F32(address, register_list, increment=None):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = NeonLoadStoreInstruction("VST1.32", Operand(address), Operand(register_list), Operand(increment),
                                                origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
 
 class VMOV(object):
     @staticmethod
     def __new__(cls, destination, source):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = VfpNeonMovInstruction('VMOV', Operand(destination), Operand(source), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def F32(destination, source):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = VfpNeonMovInstruction('VMOV.F32', Operand(destination), Operand(source), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
 
     @staticmethod
     def F64(destination, source):
-        origin = inspect.stack() if peachpy.arm.function.active_function.collect_origin else None
+        origin = inspect.stack() if peachpy.arm.function.get_active_function().collect_origin else None
         instruction = VfpNeonMovInstruction('VMOV.F64', Operand(destination), Operand(source), origin=origin)
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(instruction)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(instruction)
         return instruction
@@ -0,0 +1,67 @@
+# This file is part of Peach-Py package and is licensed under the Simplified BSD license.
+#    See license.rst for the full text of the license.
+
+import threading
+
+
+class BuildContext(object):
+    """State of code generation: the active function, instruction stream, writer, and compilation cache, and the
+    options of code generation.
+
+    The state is local to a thread: each thread starts in its own default context, and entering a BuildContext in a
+    with statement makes it the active context of the current thread until the end of the statement. Functions,
+    instruction streams, writers, and caches activated inside a context are visible only in that context. Thus
+    several threads can construct, finalize, and encode functions concurrently, and a thread can construct a function
+    while another function is active in an enclosing context.
+
+    Options which are not set in the context take the process-wide default values from
+    :mod:`peachpy.x86_64.options`.
+
+    :ivar active_function: the function which receives new virtual registers and local variables, or None.
+    :ivar active_stream: the instruction stream which receives new instructions, or None.
+    :ivar active_writer: the writer which receives finalized functions, or None.
+    :ivar active_cache: the compilation cache of encoded functions, or None.
+    :ivar dict options: map from option name to the value which overrides the process-wide default in this context.
+    """
+
+    def __init__(self, **options):
+        """
+        :param options: values of options for this context, e.g. abi, target, debug_level, package, or profiler.
+        """
+        if options:
+            import peachpy.x86_64.options
+            for name in options:
+                if name.startswith("_") or not hasattr(peachpy.x86_64.options, name) or \
+                        callable(getattr(peachpy.x86_64.options, name)):
+                    raise TypeError("Unknown option %s" % name)
+        self.active_function = None
+        self.active_stream = None
+        self.active_writer = None
+        self.active_cache = None
+        self.options = options
+        self.previous_context = None
+
+    def __enter__(self):
+        if self.previous_context is not None or _thread_state.context is self:
+            raise ValueError("The build context is already active")
+        self.previous_context = _thread_state.context
+        _thread_state.context = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _thread_state.context = self.previous_context
+        self.previous_context = None
+
+
+class _ThreadState(threading.local):
+    def __init__(self):
+        # Each thread starts in its own default context
+        self.context = BuildContext()
+
+
+_thread_state = _ThreadState()
+
+
+def get_active_context():
+    """Returns the active build context of the current thread"""
+    return _thread_state.context
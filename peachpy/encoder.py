@@ -129,7 +129,8 @@ class Encoder:
     @staticmethod
     def fixed_string(string, size):
         """Converts string to fixed-length bytearray representation"""
-        assert isinstance(size, (int, long)) and size > 0, "size %u is not a positive integer" % size
+        from peachpy.util import is_int
+        assert is_int(size) and size > 0, "size %u is not a positive integer" % size
         if string is None:
             return bytearray(size)
         import codecs
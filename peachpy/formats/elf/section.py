@@ -133,6 +133,12 @@ class ProgramBitsSection(Section):
         self.header.content_size += len(bytes)
         self._content += bytes
 
+    def align(self, alignment):
+        self.header.address_alignment = max(self.header.address_alignment, alignment)
+        if self.header.content_size % alignment != 0:
+            padding_length = alignment - self.header.content_size % alignment
+            self.append(bytearray(padding_length))
+
 
 class TextSection(ProgramBitsSection):
     def __init__(self, abi):
@@ -33,7 +33,7 @@ class Image:
         import codecs
         name_bytestring = codecs.encode(name, "utf8")
         if len(name_bytestring) > 8:
-            symbol.name = self.string_table.add(name_bytestring)
+            symbol.name = self.string_table.add(name)
         else:
             symbol.name = name
         self.symbols.append(symbol)
@@ -127,6 +127,13 @@ class Section(object):
         self.header.content_size += len(data)
         self.content += data
 
+    def align(self, alignment):
+        if alignment > self.header.alignment:
+            self.header.set_alignment(alignment)
+        if self.header.content_size % alignment != 0:
+            padding_length = alignment - self.header.content_size % alignment
+            self.write(bytearray(padding_length))
+
 
 class TextSection(Section):
     def __init__(self):
@@ -121,9 +121,17 @@ class Loader:
 
     def copy_code(self, code_segment):
         import ctypes
-        ctypes.memmove(self.code_address,
-                       ctypes.c_char_p(bytes(code_segment)),
-                       len(code_segment))
+        code_size = len(code_segment)
+        try:
+            # Writable buffers (bytearray, and its memoryview on Python 3) are copied without an intermediate copy
+            code_buffer = (ctypes.c_char * code_size).from_buffer(code_segment)
+        except TypeError:
+            # On Python 2 bytes(memoryview) is the representation of the view rather than its content
+            if isinstance(code_segment, memoryview):
+                code_segment = code_segment.tobytes()
+            code_buffer = ctypes.c_char_p(bytes(code_segment))
+        ctypes.memmove(self.code_address, code_buffer, code_size)
+        del code_buffer
 
     def __del__(self):
         if self._release_memory is not None:
@@ -133,3 +141,331 @@ class Loader:
             if self.data_address is not None:
                 self._release_memory((self.data_address, self.data_size))
                 self.data_address = None
+
+
+class _VirtualMemory:
+    """Allocation and protection of pages of virtual memory in the host OS"""
+
+    def __init__(self):
+        import ctypes
+        import mmap
+        self.allocation_granularity = max(mmap.ALLOCATIONGRANULARITY, mmap.PAGESIZE)
+
+        osname = sys.platform.lower()
+        if osname == "darwin" or osname.startswith("linux"):
+            if osname == "darwin":
+                libc = ctypes.cdll.LoadLibrary("libc.dylib")
+            else:
+                libc = ctypes.cdll.LoadLibrary("libc.so.6")
+
+            # void* mmap(void* addr, size_t len, int prot, int flags, int fd, off_t offset)
+            self._mmap = libc.mmap
+            self._mmap.restype = ctypes.c_void_p
+            self._mmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t,
+                                   ctypes.c_int, ctypes.c_int,
+                                   ctypes.c_int, ctypes.c_ssize_t]
+            # int munmap(void* addr, size_t len)
+            self._munmap = libc.munmap
+            self._munmap.restype = ctypes.c_int
+            self._munmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+            # int mprotect(void* addr, size_t len, int prot)
+            self._mprotect = libc.mprotect
+            self._mprotect.restype = ctypes.c_int
+            self._mprotect.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int]
+            self._is_windows = False
+        elif osname == "win32":
+            # LPVOID WINAPI VirtualAlloc(LPVOID address, SIZE_T size, DWORD allocationType, DWORD protect)
+            self._VirtualAlloc = ctypes.windll.kernel32.VirtualAlloc
+            self._VirtualAlloc.restype = ctypes.c_void_p
+            self._VirtualAlloc.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_ulong, ctypes.c_ulong]
+            # BOOL WINAPI VirtualFree(LPVOID lpAddress, SIZE_T dwSize, DWORD  dwFreeType)
+            self._VirtualFree = ctypes.windll.kernel32.VirtualFree
+            self._VirtualFree.restype = ctypes.c_int
+            self._VirtualFree.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_ulong]
+            # BOOL WINAPI VirtualProtect(LPVOID lpAddress, SIZE_T dwSize, DWORD flNewProtect, PDWORD lpflOldProtect)
+            self._VirtualProtect = ctypes.windll.kernel32.VirtualProtect
+            self._VirtualProtect.restype = ctypes.c_int
+            self._VirtualProtect.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_ulong,
+                                             ctypes.POINTER(ctypes.c_ulong)]
+            self._is_windows = True
+        elif osname == "nacl":
+            raise NotImplementedError("Native Client")
+        else:
+            raise ValueError("Unknown host OS: " + osname)
+
+    def allocation_size(self, size):
+        import peachpy.util
+        return peachpy.util.roundup(size, self.allocation_granularity)
+
+    def allocate(self, size):
+        """Allocates readable and writable memory of the specified size and returns its address"""
+        if self._is_windows:
+            # From WinNT.h
+            PAGE_READWRITE = 0x04
+            MEM_COMMIT = 0x1000
+            MEM_RESERVE = 0x2000
+            address = self._VirtualAlloc(None, size, MEM_RESERVE | MEM_COMMIT, PAGE_READWRITE)
+        else:
+            import mmap
+            address = self._mmap(None, size,
+                                 mmap.PROT_READ | mmap.PROT_WRITE,
+                                 mmap.MAP_ANON | mmap.MAP_PRIVATE,
+                                 -1, 0)
+            # MAP_FAILED is (void*) -1
+            if address is not None and address + 1 == 1 << (8 * _pointer_size()):
+                address = None
+        if not address:
+            raise OSError("Failed to allocate %d bytes of memory for code arena" % size)
+        return address
+
+    def protect(self, address, size, executable):
+        """Makes the memory either readable and executable, or readable and writable"""
+        if self._is_windows:
+            import ctypes
+            # From WinNT.h
+            PAGE_READWRITE = 0x04
+            PAGE_EXECUTE_READ = 0x20
+            old_protection = ctypes.c_ulong(0)
+            protect_result = self._VirtualProtect(address, size,
+                                                  PAGE_EXECUTE_READ if executable else PAGE_READWRITE,
+                                                  ctypes.byref(old_protection))
+            success = protect_result != 0
+        else:
+            import mmap
+            protection = mmap.PROT_READ | (mmap.PROT_EXEC if executable else mmap.PROT_WRITE)
+            success = self._mprotect(address, size, protection) == 0
+        if not success:
+            raise OSError("Failed to change protection of code arena memory")
+
+    def release(self, address, size):
+        if self._is_windows:
+            MEM_RELEASE = 0x8000
+            release_result = self._VirtualFree(address, 0, MEM_RELEASE)
+            assert release_result != 0
+        else:
+            munmap_result = self._munmap(address, size)
+            assert munmap_result == 0
+
+
+def _pointer_size():
+    import ctypes
+    return ctypes.sizeof(ctypes.c_void_p)
+
+
+class _ArenaMapping:
+    """A memory mapping in the code arena with a list of free slots"""
+
+    def __init__(self, address, size):
+        self.address = address
+        self.size = size
+        # Sorted list of non-adjacent [offset, size] pairs
+        self.free_slots = [[0, size]]
+        self.executable = False
+
+    def allocate(self, size, alignment=1):
+        """Returns the offset of a slot of the specified size, or None if the mapping has no suitable free slot.
+
+        The address of the slot is a multiple of the alignment. The free memory before the aligned slot stays in the
+        free list.
+        """
+        import peachpy.util
+        for index, slot in enumerate(self.free_slots):
+            slot_offset, slot_size = slot
+            padding = peachpy.util.roundup(self.address + slot_offset, alignment) - (self.address + slot_offset)
+            if slot_size >= padding + size:
+                aligned_offset = slot_offset + padding
+                if slot_size == padding + size:
+                    del self.free_slots[index]
+                else:
+                    slot[0] = aligned_offset + size
+                    slot[1] = slot_size - padding - size
+                if padding != 0:
+                    self.free_slots.insert(index, [slot_offset, padding])
+                return aligned_offset
+        return None
+
+    def release(self, offset, size):
+        import bisect
+        index = bisect.bisect_left(self.free_slots, [offset, size])
+        self.free_slots.insert(index, [offset, size])
+        # Merge with the next free slot
+        if index + 1 < len(self.free_slots) and offset + size == self.free_slots[index + 1][0]:
+            self.free_slots[index][1] += self.free_slots[index + 1][1]
+            del self.free_slots[index + 1]
+        # Merge with the previous free slot
+        if index > 0 and sum(self.free_slots[index - 1]) == offset:
+            self.free_slots[index - 1][1] += self.free_slots[index][1]
+            del self.free_slots[index]
+
+    @property
+    def is_empty(self):
+        return self.free_slots == [[0, self.size]]
+
+
+class CodeArena:
+    """Executable memory which holds many functions in shared memory mappings.
+
+    Unlike :class:`Loader`, which maps separate pages for every function, the arena packs functions into aligned slots
+    in large mappings. The mappings are never writable and executable at the same time: functions are copied while the
+    mappings are writable, and then the mappings are switched to read and execute protection.
+
+    Released slots are added to the free list of their mapping and reused by subsequently loaded functions.
+
+    While :meth:`load` copies new functions, the mappings which receive them are not executable, so functions
+    previously loaded into these mappings can not be called. Loading into an arena must not run concurrently with
+    calls of the functions in the arena, e.g. in other threads.
+
+    :ivar int mapping_size: the minimum size of memory mappings allocated by the arena.
+    :ivar int alignment: the minimum alignment of functions in the arena. Functions which require a larger alignment of
+        their code, e.g. for aligned loops, are placed at addresses aligned on the code alignment of the function.
+    """
+
+    def __init__(self, mapping_size=1024 * 1024, alignment=16):
+        self._memory = None
+        self._mappings = []
+
+        from peachpy.util import is_int
+        if not is_int(mapping_size):
+            raise TypeError("mapping size %s is not an integer" % str(mapping_size))
+        if mapping_size <= 0:
+            raise ValueError("mapping size %d is not a positive integer" % mapping_size)
+        if not is_int(alignment):
+            raise TypeError("alignment %s is not an integer" % str(alignment))
+        if alignment <= 0 or (alignment & (alignment - 1)) != 0:
+            raise ValueError("alignment %d is not a positive power of 2" % alignment)
+
+        self._memory = _VirtualMemory()
+        self.mapping_size = self._memory.allocation_size(mapping_size)
+        self.alignment = alignment
+
+    @property
+    def mapping_count(self):
+        """The number of memory mappings allocated by the arena"""
+        return len(self._mappings)
+
+    @property
+    def mapped_size(self):
+        """The total size of memory mappings allocated by the arena"""
+        return sum(mapping.size for mapping in self._mappings)
+
+    def load(self, encoded_functions):
+        """Copies encoded functions into the arena and returns a list of callable objects for them.
+
+        All functions are placed in the arena first, then copied in one pass over the mappings, and each modified
+        mapping changes its protection only twice. Functions in the modified mappings can not be called until the
+        method returns.
+
+        :param encoded_functions: an iterable of :class:`peachpy.x86_64.function.EncodedFunction` objects. The
+            functions must use the ABI of the host process.
+        :returns: a list of :class:`ArenaFunction` objects in the same order as the encoded functions.
+        """
+        import ctypes
+        import peachpy.util
+        from peachpy.x86_64.function import EncodedFunction
+        import peachpy.x86_64.abi
+
+        encoded_functions = list(encoded_functions)
+        process_abi = peachpy.x86_64.abi.detect()
+        for function in encoded_functions:
+            if not isinstance(function, EncodedFunction):
+                raise TypeError("%s is not an EncodedFunction object" % str(function))
+            if function.abi != process_abi:
+                raise ValueError("Function ABI (%s) does not match process ABI (%s)" %
+                                 (str(function.abi), str(process_abi)))
+
+        placements = []
+        for function in encoded_functions:
+            alignment = max(self.alignment, function.code_alignment)
+            slot_size = peachpy.util.roundup(max(len(function._code), 1), self.alignment)
+            placements.append(self._allocate(slot_size, alignment) + (slot_size,))
+
+        modified_mappings = []
+        for mapping, _, _ in placements:
+            if not any(mapping is modified_mapping for modified_mapping in modified_mappings):
+                modified_mappings.append(mapping)
+        for mapping in modified_mappings:
+            if mapping.executable:
+                self._memory.protect(mapping.address, mapping.size, executable=False)
+                mapping.executable = False
+
+        for function, (mapping, offset, _) in zip(encoded_functions, placements):
+            # Python 2 ctypes can not wrap a memoryview, so the code is copied from its bytearray buffer
+            code = function._code
+            if len(code) != 0:
+                code_buffer = (ctypes.c_char * len(code)).from_buffer(code)
+                ctypes.memmove(mapping.address + offset, code_buffer, len(code))
+                del code_buffer
+
+        for mapping in modified_mappings:
+            self._memory.protect(mapping.address, mapping.size, executable=True)
+            mapping.executable = True
+
+        return [ArenaFunction(self, function, mapping.address + offset, slot_size)
+                for function, (mapping, offset, slot_size) in zip(encoded_functions, placements)]
+
+    def release(self, arena_function):
+        """Frees the slot of a function loaded into the arena. The function can not be called after this call.
+
+        :param ArenaFunction arena_function: a function returned by :meth:`load`.
+        """
+        if not isinstance(arena_function, ArenaFunction):
+            raise TypeError("%s is not an ArenaFunction object" % str(arena_function))
+        if arena_function.arena is not self:
+            raise ValueError("Function %s was not loaded into this arena" % arena_function.name)
+        if arena_function.address is None:
+            raise ValueError("Function %s was already released" % arena_function.name)
+
+        for mapping in self._mappings:
+            if mapping.address <= arena_function.address < mapping.address + mapping.size:
+                mapping.release(arena_function.address - mapping.address, arena_function.slot_size)
+                break
+        arena_function.address = None
+        arena_function.function_pointer = None
+
+    def _allocate(self, slot_size, alignment):
+        """Returns a (mapping, offset) tuple for a new aligned slot, and allocates a new mapping if needed"""
+        for mapping in self._mappings:
+            offset = mapping.allocate(slot_size, alignment)
+            if offset is not None:
+                return mapping, offset
+
+        # Mappings are aligned on the allocation granularity, so the padding is only needed for larger alignment
+        padding = max(alignment - self._memory.allocation_granularity, 0)
+        mapping_size = max(self.mapping_size, self._memory.allocation_size(slot_size + padding))
+        mapping = _ArenaMapping(self._memory.allocate(mapping_size), mapping_size)
+        self._mappings.append(mapping)
+        return mapping, mapping.allocate(slot_size, alignment)
+
+    def __del__(self):
+        if self._memory is not None:
+            for mapping in self._mappings:
+                self._memory.release(mapping.address, mapping.size)
+            self._mappings = []
+
+
+class ArenaFunction:
+    """A callable function in a :class:`CodeArena`.
+
+    :ivar CodeArena arena: the arena which holds the function code. The function keeps the arena alive.
+    :ivar str name: the name of the function.
+    :ivar int address: the address of the function code, or None if the function was released.
+    :ivar int slot_size: the size of the arena slot occupied by the function.
+    :ivar function_pointer: ctypes function pointer to the function code.
+    """
+
+    def __init__(self, arena, function, address, slot_size):
+        import ctypes
+        self.arena = arena
+        self.name = function.name
+        self.address = address
+        self.slot_size = slot_size
+
+        result_type = None if function.result_type is None else function.result_type.as_ctypes_type
+        argument_types = [arg.ctype.as_ctypes_type for arg in function.arguments]
+        self.function_type = ctypes.CFUNCTYPE(result_type, *argument_types)
+        self.function_pointer = self.function_type(address)
+
+    def __call__(self, *args):
+        if self.function_pointer is None:
+            raise ValueError("Function %s was released from the code arena" % self.name)
+        return self.function_pointer(*args)
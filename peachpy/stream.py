@@ -1,7 +1,12 @@
 # This file is part of Peach-Py package and is licensed under the Simplified BSD license.
 #    See license.rst for the full text of the license.
 
-active_stream = None
+from peachpy.context import get_active_context
+
+
+def get_active_stream():
+    """Returns the instruction stream active in the build context of the current thread, or None"""
+    return get_active_context().active_stream
 
 
 class InstructionStream(object):
@@ -10,14 +15,13 @@ class InstructionStream(object):
         self.previous_stream = None
 
     def __enter__(self):
-        global active_stream
-        self.previous_stream = active_stream
-        active_stream = self
+        context = get_active_context()
+        self.previous_stream = context.active_stream
+        context.active_stream = self
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        global active_stream
-        active_stream = self.previous_stream
+        get_active_context().active_stream = self.previous_stream
         self.previous_stream = None
 
     def __iter__(self):
@@ -39,7 +43,7 @@ class InstructionStream(object):
     def issue(self, count=1):
         for i in range(count):
             if self.instructions:
-                active_stream.add_instruction(self.instructions.pop(0))
+                get_active_stream().add_instruction(self.instructions.pop(0))
 
 
 class NullStream:
@@ -47,12 +51,11 @@ class NullStream:
         self.previous_stream = None
 
     def __enter__(self):
-        global active_stream
-        self.previous_stream = active_stream
-        active_stream = None
+        context = get_active_context()
+        self.previous_stream = context.active_stream
+        context.active_stream = None
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        global active_stream
-        active_stream = self.previous_stream
+        get_active_context().active_stream = self.previous_stream
         self.previous_stream = None
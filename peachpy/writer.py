@@ -1,7 +1,12 @@
 # This file is part of Peach-Py package and is licensed under the Simplified BSD license.
 #    See license.rst for the full text of the license.
 
-active_writer = None
+from peachpy.context import get_active_context
+
+
+def get_active_writer():
+    """Returns the writer active in the build context of the current thread, or None"""
+    return get_active_context().active_writer
 
 
 class AssemblyWriter:
@@ -31,17 +36,16 @@ class AssemblyWriter:
         self.previous_writer = None
 
     def __enter__(self):
-        global active_writer
-        self.previous_writer = active_writer
-        active_writer = self
+        context = get_active_context()
+        self.previous_writer = context.active_writer
+        context.active_writer = self
         self.output_file = open(self.output_path, "w")
         self.output_file.write(self.output_header)
         self.output_file.flush()
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        global active_writer
-        active_writer = self.previous_writer
+        get_active_context().active_writer = self.previous_writer
         self.previous_writer = None
         if exc_type is None:
             self.output_file.close()
@@ -53,12 +57,26 @@ class AssemblyWriter:
             raise
 
     def add_function(self, function):
+        self._add_prepared_function(self._prepare_function(function))
+
+    def _prepare_function(self, function):
         import peachpy.x86_64.function
         assert isinstance(function, peachpy.x86_64.function.ABIFunction), \
             "Function must be bindinded to an ABI before its assembly can be used"
 
         function_code = function.format(self.assembly_format)
-
+        import peachpy.x86_64.options
+        if peachpy.x86_64.options.get_option("analyze_loops"):
+            import os
+            from peachpy.x86_64.analyzer import analyze_loops
+            report = [line for analysis in analyze_loops(function)
+                      for line in analysis.format(self.assembly_format)]
+            if report:
+                function_code = os.linesep.join(self.comment_prefix + " " + line for line in report) + \
+                    os.linesep + function_code
+        return function_code
+
+    def _add_prepared_function(self, function_code):
         import os
         self.output_file.write(function_code + os.linesep)
         self.output_file.flush()
@@ -77,15 +95,14 @@ class ELFWriter:
         self.image.bind_section(self.text_section, ".text")
 
     def __enter__(self):
-        global active_writer
-        self.previous_writer = active_writer
-        active_writer = self
-        self.output_file = open(self.output_path, "w", buffering=0)
+        context = get_active_context()
+        self.previous_writer = context.active_writer
+        context.active_writer = self
+        self.output_file = open(self.output_path, "wb")
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        global active_writer
-        active_writer = self.previous_writer
+        get_active_context().active_writer = self.previous_writer
         self.previous_writer = None
         if exc_type is None:
             self.image.symtab.bind()
@@ -99,19 +116,26 @@ class ELFWriter:
             raise
 
     def add_function(self, function):
+        self._add_prepared_function(self._prepare_function(function))
+
+    def _prepare_function(self, function):
         import peachpy.x86_64.function
         assert isinstance(function, peachpy.x86_64.function.ABIFunction), \
             "Function must be bindinded to an ABI before its assembly can be used"
 
-        encoded_function = function.encode()
-        function_code = encoded_function.as_bytearray
+        return function.encode()
+
+    def _add_prepared_function(self, encoded_function):
+        function_code = encoded_function.code_view
 
+        if encoded_function.code_alignment > 1:
+            self.text_section.align(encoded_function.code_alignment)
         function_offset = len(self.text_section.content)
         self.text_section.append(function_code)
 
         from peachpy.formats.elf.symbol import Symbol, SymbolBinding, SymbolType
         function_symbol = Symbol(self.abi)
-        function_symbol.name_index = self.image.strtab.add(function.name)
+        function_symbol.name_index = self.image.strtab.add(encoded_function.name)
         function_symbol.value = function_offset
         function_symbol.content_size = len(function_code)
         function_symbol.section_index = self.text_section.index
@@ -130,15 +154,14 @@ class MachOWriter:
         self.image = Image(abi)
 
     def __enter__(self):
-        global active_writer
-        self.previous_writer = active_writer
-        active_writer = self
-        self.output_file = open(self.output_path, "w", buffering=0)
+        context = get_active_context()
+        self.previous_writer = context.active_writer
+        context.active_writer = self
+        self.output_file = open(self.output_path, "wb")
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        global active_writer
-        active_writer = self.previous_writer
+        get_active_context().active_writer = self.previous_writer
         self.previous_writer = None
         if exc_type is None:
             self.output_file.write(self.image.as_bytearray)
@@ -151,13 +174,20 @@ class MachOWriter:
             raise
 
     def add_function(self, function):
+        self._add_prepared_function(self._prepare_function(function))
+
+    def _prepare_function(self, function):
         import peachpy.x86_64.function
         assert isinstance(function, peachpy.x86_64.function.ABIFunction), \
             "Function must be bindinded to an ABI before its assembly can be used"
 
-        encoded_function = function.encode()
-        function_code = encoded_function.as_bytearray
+        return function.encode()
+
+    def _add_prepared_function(self, encoded_function):
+        function_code = encoded_function.code_view
 
+        if encoded_function.code_alignment > 1:
+            self.image.text_section.align(encoded_function.code_alignment)
         function_offset = len(self.image.text_section.content)
 
         self.image.text_section.append(function_code)
@@ -168,7 +198,7 @@ class MachOWriter:
         function_symbol.description = SymbolDescription.Defined
         function_symbol.type = SymbolType.SectionRelative
         function_symbol.visibility = SymbolVisibility.External
-        function_symbol.string_index = self.image.string_table.add("_" + function.name)
+        function_symbol.string_index = self.image.string_table.add("_" + encoded_function.name)
         function_symbol.section_index = self.image.text_section.index
         function_symbol.value = function_offset
         self.image.symbols.append(function_symbol)
@@ -187,15 +217,14 @@ class MSCOFFWriter:
         self.image.add_section(self.text_section, ".text")
 
     def __enter__(self):
-        global active_writer
-        self.previous_writer = active_writer
-        active_writer = self
-        self.output_file = open(self.output_path, "w", buffering=0)
+        context = get_active_context()
+        self.previous_writer = context.active_writer
+        context.active_writer = self
+        self.output_file = open(self.output_path, "wb")
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        global active_writer
-        active_writer = self.previous_writer
+        get_active_context().active_writer = self.previous_writer
         self.previous_writer = None
         if exc_type is None:
             self.output_file.write(self.image.as_bytearray)
@@ -208,13 +237,20 @@ class MSCOFFWriter:
             raise
 
     def add_function(self, function):
+        self._add_prepared_function(self._prepare_function(function))
+
+    def _prepare_function(self, function):
         import peachpy.x86_64.function
         assert isinstance(function, peachpy.x86_64.function.ABIFunction), \
             "Function must be bindinded to an ABI before its assembly can be used"
 
-        encoded_function = function.encode()
-        function_code = encoded_function.as_bytearray
+        return function.encode()
+
+    def _add_prepared_function(self, encoded_function):
+        function_code = encoded_function.code_view
 
+        if encoded_function.code_alignment > 1:
+            self.text_section.align(encoded_function.code_alignment)
         function_offset = len(self.text_section.content)
         self.text_section.write(function_code)
 
@@ -224,7 +260,7 @@ class MSCOFFWriter:
         function_symbol.section_index = self.text_section.index
         function_symbol.symbol_type = SymbolType.function
         function_symbol.storage_class = StorageClass.external
-        self.image.add_symbol(function_symbol, function.name)
+        self.image.add_symbol(function_symbol, encoded_function.name)
 
 
 class NullWriter:
@@ -232,12 +268,159 @@ class NullWriter:
         pass
 
     def __enter__(self):
-        global active_writer
-        self.previous_writer = active_writer
-        active_writer = None
+        context = get_active_context()
+        self.previous_writer = context.active_writer
+        context.active_writer = None
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        global active_writer
-        active_writer = self.previous_writer
+        get_active_context().active_writer = self.previous_writer
         self.previous_writer = None
+
+
+class ParallelWriter:
+    """Wrapper for a writer which finalizes and encodes functions in a pool of processes.
+
+    Functions are independent after the end of their definition, so instead of binding each function to an ABI when
+    its definition ends, the writer collects them and on exit runs ABI-specific finalization and encoding in worker
+    processes. The results are added to the wrapped writer in the order of function definitions, thus the output does
+    not depend on the number of processes.
+
+    Worker processes inherit the collected functions through fork. If fork is not supported on the host, the functions
+    are processed in the calling process.
+
+    :ivar writer: the wrapped writer (AssemblyWriter, ELFWriter, MachOWriter, or MSCOFFWriter).
+    :ivar int jobs: the number of worker processes.
+    """
+
+    def __init__(self, writer, jobs):
+        from peachpy.util import is_int
+        if not is_int(jobs):
+            raise TypeError("Number of jobs %s is not an integer" % str(jobs))
+        if jobs <= 0:
+            raise ValueError("Number of jobs %d is not a positive integer" % jobs)
+        self.writer = writer
+        self.jobs = jobs
+        self.previous_writer = None
+        self._functions = []
+
+    def __enter__(self):
+        self.writer.__enter__()
+        context = get_active_context()
+        self.previous_writer = context.active_writer
+        context.active_writer = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        get_active_context().active_writer = self.previous_writer
+        self.previous_writer = None
+        functions, self._functions = self._functions, []
+        if exc_type is None:
+            try:
+                for prepared_function in self._prepare_functions(functions):
+                    self.writer._add_prepared_function(prepared_function)
+            except Exception:
+                import sys
+                self.writer.__exit__(*sys.exc_info())
+                raise
+        return self.writer.__exit__(exc_type, exc_value, traceback)
+
+    def defer_function(self, function, abi):
+        """Adds a function to be finalized for the ABI and written when the writer exits
+
+        :param peachpy.x86_64.function.Function function: a function after the end of its definition.
+        :param peachpy.abi.ABI abi: the ABI to finalize the function for.
+        """
+        self._functions.append((function, abi, None))
+
+    def _add_prepared_function(self, prepared_function):
+        self._functions.append((None, None, prepared_function))
+
+    def _prepare_functions(self, functions):
+        global _parallel_functions
+        # Functions found in the compilation cache are already prepared and are not sent to the worker processes
+        prepared_functions = [prepared_function for (_, _, prepared_function) in functions]
+        uncached_functions = [(function, abi) for (function, abi, prepared_function) in functions
+                              if prepared_function is None]
+
+        context = _get_fork_context()
+        if self.jobs == 1 or len(uncached_functions) <= 1 or context is None:
+            uncached_prepared_functions = [self._prepare_function(function, abi)
+                                           for (function, abi) in uncached_functions]
+        else:
+            import peachpy.x86_64.options
+            # Worker processes find the functions through the module global inherited through fork
+            _parallel_functions = (self, uncached_functions)
+            pool = context.Pool(min(self.jobs, len(uncached_functions)))
+            try:
+                results = pool.map(_prepare_parallel_function, range(len(uncached_functions)))
+            finally:
+                pool.close()
+                pool.join()
+                _parallel_functions = None
+            uncached_prepared_functions = [prepared_function for (prepared_function, _) in results]
+            # Profiles of worker processes are merged into the profiler of the calling process
+            calling_profiler = peachpy.x86_64.options.get_option("profiler")
+            if calling_profiler is not None:
+                for (_, profiler) in results:
+                    calling_profiler.merge(profiler)
+
+        uncached_prepared_functions = iter(uncached_prepared_functions)
+        return [prepared_function if prepared_function is not None else next(uncached_prepared_functions)
+                for prepared_function in prepared_functions]
+
+    def _prepare_function(self, function, abi):
+        return self.writer._prepare_function(function.finalize(abi))
+
+
+_parallel_functions = None
+
+
+def prepare_cached_function(writer, function, abi):
+    """Returns the function from the active compilation cache prepared for the writer, or None if it is not cached
+
+    Only the writers of binary images accept cached encoded functions.
+
+    :param writer: the writer to add the function to.
+    :param peachpy.x86_64.function.Function function: the function after the end of its definition.
+    :param peachpy.abi.ABI abi: the ABI the function is bound to.
+    """
+    import peachpy.x86_64.cache
+    cache = peachpy.x86_64.cache.get_active_cache()
+    if isinstance(writer, ParallelWriter):
+        writer = writer.writer
+    if cache is None or not isinstance(writer, (ELFWriter, MachOWriter, MSCOFFWriter)):
+        return None
+    key = cache.get_key(function, abi)
+    if key is None:
+        return None
+    cached_function = cache.lookup(key, function, abi)
+    if cached_function is None:
+        # The function will be encoded and inserted into the cache without another lookup
+        function._missed_cache_key = key
+    return cached_function
+
+
+def _get_fork_context():
+    import multiprocessing
+    try:
+        return multiprocessing.get_context("fork")
+    except AttributeError:
+        # Python 2: multiprocessing always uses fork on POSIX systems
+        import os
+        return multiprocessing if os.name == "posix" else None
+    except ValueError:
+        # Fork start method is not supported on the host
+        return None
+
+
+def _prepare_parallel_function(index):
+    import peachpy.x86_64.options
+    from peachpy.x86_64.profiler import Profiler
+    writer, functions = _parallel_functions
+    function, abi = functions[index]
+    # The worker inherits the profiler of the calling process: collect only the statistics of this function
+    profiler = None
+    if peachpy.x86_64.options.get_option("profiler") is not None:
+        profiler = get_active_context().options["profiler"] = Profiler()
+    return writer._prepare_function(function, abi), profiler
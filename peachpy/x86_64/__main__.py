@@ -13,6 +13,8 @@ parser.add_argument("-g", dest="debug_level", type=int, default=0,
                     help="Debug information level")
 parser.add_argument("-S", dest="generate_assembly", action="store_true",
                     help="Generate assembly listing on output")
+parser.add_argument("-j", dest="jobs", type=int, default=1,
+                    help="Number of processes for parallel finalization and encoding of functions")
 
 abi_map = {
     "ms": (peachpy.x86_64.abi.microsoft_x64_abi, ["masm", "nasm"], ["ms-coff"]),
@@ -62,6 +64,25 @@ parser.add_argument("-massembly-format", dest="assembly_format",
 
 parser.add_argument("-fpackage", dest="package", default="",
                     help="Use specified Go package name in generated Plan 9 assembly listings")
+parser.add_argument("-fcache", dest="cache_directory",
+                    help="Reuse encoded functions from the compilation cache in specified directory")
+parser.add_argument("-fprofile", dest="profile_output",
+                    help="Write time and counters of compilation phases in JSON format to specified file")
+parser.add_argument("-fschedule-insns", dest="schedule_instructions", action="store_true",
+                    help="Reorder instructions to hide their latency on the microarchitecture specified by -mcpu")
+parser.add_argument("-fanalyze-loops", dest="analyze_loops", action="store_true",
+                    help="Annotate assembly listings with estimated performance of loops on the microarchitecture "
+                         "specified by -mcpu")
+parser.add_argument("-fpeephole", dest="peephole", action="store_true",
+                    help="Rewrite instructions into shorter or cheaper equivalents after register allocation")
+parser.add_argument("-fpeephole-patterns", dest="peephole_patterns",
+                    help="Comma-separated list of peephole patterns to apply with -fpeephole (default: all patterns)")
+parser.add_argument("-falign-loops", dest="align_loops", nargs="?", const=True, type=int, choices=(16, 32, 64),
+                    help="Align innermost loops to the number of bytes specified as -falign-loops=N, or without a "
+                         "value to the loop alignment of the microarchitecture specified by -mcpu. Without a value "
+                         "the option must not be followed by the input file")
+parser.add_argument("-mbranches-within-32B-boundaries", dest="align_branches", action="store_true",
+                    help="Pad code so that jumps and macro-fused jumps do not cross or end at 32-byte boundaries")
 avx_group = parser.add_mutually_exclusive_group()
 avx_group.add_argument("-mavx", dest="avx", action="store_true",
                        help="Enable AVX extension")
@@ -124,6 +145,13 @@ def main():
     peachpy.x86_64.options.target = cpu_map[options.cpu]
     peachpy.x86_64.options.package = options.package
     peachpy.x86_64.options.generate_assembly = options.generate_assembly
+    peachpy.x86_64.options.schedule_instructions = options.schedule_instructions
+    peachpy.x86_64.options.analyze_loops = options.analyze_loops
+    peachpy.x86_64.options.peephole = options.peephole
+    peachpy.x86_64.options.align_loops = options.align_loops
+    peachpy.x86_64.options.align_branches = options.align_branches
+    if options.peephole_patterns:
+        peachpy.x86_64.options.peephole_patterns = options.peephole_patterns.split(",")
 
     import peachpy.writer
     writer = peachpy.writer.NullWriter()
@@ -148,12 +176,28 @@ def main():
         else:
             raise ValueError("Image format %s is not supported" % image_format)
 
-    with writer:
-        import os
-        sys.path.append(os.path.dirname(options.input[0]))
-        with open(options.input[0]) as input_file:
-            code = compile(input_file.read(), options.input[0], 'exec')
-            exec(code, globals())
+    if options.jobs != 1:
+        writer = peachpy.writer.ParallelWriter(writer, options.jobs)
+
+    import peachpy.x86_64.cache
+    cache = peachpy.x86_64.cache.NullCache()
+    if options.cache_directory is not None:
+        cache = peachpy.x86_64.cache.CompilationCache(options.cache_directory)
+
+    if options.profile_output is not None:
+        import peachpy.x86_64.profiler
+        peachpy.x86_64.options.profiler = peachpy.x86_64.profiler.Profiler()
+
+    with cache:
+        with writer:
+            import os
+            sys.path.append(os.path.dirname(options.input[0]))
+            with open(options.input[0]) as input_file:
+                code = compile(input_file.read(), options.input[0], 'exec')
+                exec(code, globals())
+
+    if options.profile_output is not None:
+        peachpy.x86_64.options.profiler.save(options.profile_output)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,291 @@
+# This file is part of Peach-Py package and is licensed under the Simplified BSD license.
+#    See license.rst for the full text of the license.
+
+import collections
+
+
+# The number of loop iterations simulated to find the length of loop-carried dependency chains
+_simulated_iterations = 16
+
+
+class LoopAnalysis:
+    """Static estimate of the performance of a loop in the steady state.
+
+    The number of cycles per iteration is the maximum of the bounds imposed by the issue width, by the load of the
+    busiest execution port, by the reciprocal throughput of instructions on units which are not fully pipelined, and by
+    the longest chain of dependencies carried from one loop iteration to the next.
+
+    :ivar str name: the name of the loop label.
+    :ivar list instructions: the instructions of the loop body.
+    :ivar Microarchitecture target: the microarchitecture the estimate is for.
+    :ivar bool has_inner_loops: indicates if the loop contains other loops. The estimate assumes that instructions of
+        inner loops execute once per iteration of the outer loop.
+    :ivar int uops: the number of micro-operations per iteration.
+    :ivar float issue_cycles: the number of cycles to issue the micro-operations of an iteration.
+    :ivar collections.OrderedDict port_pressure: map from execution port name to the number of micro-operations it
+        executes per iteration.
+    :ivar float port_cycles: the number of micro-operations on the busiest port.
+    :ivar float throughput_cycles: the sum of reciprocal throughputs of instructions on units which are not fully
+        pipelined.
+    :ivar float dependency_cycles: the latency of the longest loop-carried dependency chain per iteration.
+    :ivar str dependency_value: the register, memory location, or flags which carry the longest dependency chain.
+    :ivar list dependency_chain: the instructions of the longest loop-carried dependency chain in program order.
+    :ivar float cycles: the estimated number of cycles per iteration.
+    :ivar str bottleneck: the bound which limits the performance: "issue", "port", "throughput", or "dependency".
+    """
+
+    def __init__(self, name, instructions, target, has_inner_loops=False):
+        from peachpy.x86_64.uarch import get_reciprocal_throughput
+        self.name = name
+        self.instructions = instructions
+        self.target = target
+        self.has_inner_loops = has_inner_loops
+        timings = [target.get_instruction_timing(instruction) for instruction in instructions]
+        model = target.scheduling_model
+
+        self.uops = sum(timing.uops for timing in timings)
+        self.issue_cycles = float(self.uops) / model.issue_width
+        self.port_pressure = _get_port_pressure([ports for timing in timings for ports in timing.ports])
+        self.port_cycles = max(list(self.port_pressure.values()) + [0.0])
+        self.throughput_cycles = 0.0
+        for timing in timings:
+            if timing.reciprocal_throughput > get_reciprocal_throughput(timing.ports, model.issue_width):
+                self.throughput_cycles += timing.reciprocal_throughput
+        self.dependency_cycles, self.dependency_value, self.dependency_chain = \
+            _find_loop_carried_chain(instructions, timings, model.load_latency)
+
+        bounds = [("dependency", self.dependency_cycles), ("throughput", self.throughput_cycles),
+                  ("port", self.port_cycles), ("issue", self.issue_cycles)]
+        self.bottleneck, self.cycles = max(bounds, key=lambda bound: bound[1])
+
+    @property
+    def bottleneck_description(self):
+        """Human-readable description of the resource which limits the performance of the loop"""
+        if self.bottleneck == "dependency":
+            return "loop-carried dependency through %s" % self.dependency_value
+        elif self.bottleneck == "throughput":
+            return "throughput of non-pipelined execution units"
+        elif self.bottleneck == "port":
+            busiest_ports = [port for (port, pressure) in self.port_pressure.items() if pressure == self.port_cycles]
+            return "execution port%s %s" % ("s" if len(busiest_ports) > 1 else "", ", ".join(busiest_ports))
+        else:
+            return "instruction issue width"
+
+    def format(self, assembly_format="peachpy", line_separator=None):
+        """Formats the report of the analysis
+
+        :param str assembly_format: the assembly format of instructions on the loop-carried chain.
+        :param str line_separator: the separator of lines in the report. If None, the method returns the list of lines.
+        """
+        lines = ["Loop %s: %d instructions, %d uops on %s%s" %
+                 (self.name, len(self.instructions), self.uops, self.target.name,
+                  " (includes inner loops)" if self.has_inner_loops else ""),
+                 "  Cycles per iteration: %.2f (bottleneck: %s)" % (self.cycles, self.bottleneck_description),
+                 "  Bounds: issue %.2f, ports %.2f, throughput %.2f, dependencies %.2f" %
+                 (self.issue_cycles, self.port_cycles, self.throughput_cycles, self.dependency_cycles),
+                 "  Port pressure: " + ", ".join("%s: %.2f" % (port, pressure)
+                                                 for (port, pressure) in self.port_pressure.items())]
+        if self.dependency_chain:
+            lines.append("  Loop-carried chain through %s (%.2f cycles):" %
+                         (self.dependency_value, self.dependency_cycles))
+            lines.extend("    " + instruction.format(assembly_format, indent=False)
+                         for instruction in self.dependency_chain)
+        if line_separator is None:
+            return lines
+        else:
+            return line_separator.join(lines)
+
+    def __str__(self):
+        return self.format(line_separator="\n")
+
+
+def _get_port_pressure(uop_ports):
+    """Distributes micro-operations over execution ports and returns the map from port name to its load.
+
+    Micro-operations with fewer port options are placed first, and each micro-operation goes to the least loaded of its
+    ports.
+    """
+    pressure = dict()
+    for ports in uop_ports:
+        for port in ports:
+            pressure.setdefault(port, 0.0)
+    for ports in sorted(uop_ports, key=len):
+        port = min(ports, key=lambda port: pressure[port])
+        pressure[port] += 1.0
+    return collections.OrderedDict(sorted(pressure.items()))
+
+
+def _get_value_keys(instruction, loop_output_keys):
+    """Returns the lists of keys of values which the instruction reads and writes, and the keys of values which the
+    instruction needs to load its memory operand, or None if the instruction does not load from memory.
+
+    Values are registers, identified as in :func:`peachpy.x86_64.scheduler.get_register_keys`, memory locations with
+    addresses which do not change in the loop, identified by the formatted address, and the arithmetic flags.
+    """
+    from peachpy.x86_64.operand import MemoryOperand
+    from peachpy.x86_64.scheduler import get_register_keys, get_flags_usage, is_schedulable
+    from peachpy.x86_64.uarch import address_only_names
+    input_keys = get_register_keys(instruction.input_registers_masks)
+    output_keys = get_register_keys(instruction.output_registers_masks)
+    load_keys = None
+    for (operand, is_output) in zip(instruction.operands, instruction.out_operands):
+        # The memory operand of LEA is only an address: the instruction does not access memory
+        if isinstance(operand, MemoryOperand) and instruction.name not in address_only_names:
+            address_keys = get_register_keys({register._internal_id: register.mask
+                                              for register in (operand.address.base, operand.address.index)
+                                              if register is not None})
+            # Integer instructions other than moves and SETcc read, modify, and write the memory operand
+            is_input = not is_output or instruction.__class__.__module__ == "peachpy.x86_64.generic" and \
+                instruction.name not in ("MOV", "MOVBE", "MOVNTI") and not instruction.name.startswith("SET")
+            if is_input:
+                load_keys = set(address_keys)
+            if loop_output_keys is None or not any(key in loop_output_keys for key in address_keys):
+                memory_key = str(operand)
+                if is_output:
+                    output_keys.append(memory_key)
+                if is_input:
+                    input_keys.append(memory_key)
+                    load_keys.add(memory_key)
+    if is_schedulable(instruction):
+        reads_flags, writes_flags = get_flags_usage(instruction)
+        if reads_flags:
+            input_keys.append("flags")
+        if writes_flags:
+            output_keys.append("flags")
+    return input_keys, output_keys, load_keys
+
+
+def _format_value_key(key, instructions):
+    """Returns the name of a register, memory location, or flags identified by a value key"""
+    from peachpy.x86_64.registers import Register
+    from peachpy.x86_64.scheduler import get_register_keys
+    if not isinstance(key, tuple):
+        return key
+    for instruction in instructions:
+        for operand in instruction.operands:
+            if isinstance(operand, Register) and key in get_register_keys({operand._internal_id: operand.mask}):
+                return str(operand)
+    return "register"
+
+
+def _find_loop_carried_chain(instructions, timings, load_latency):
+    """Finds the longest dependency chain carried between loop iterations.
+
+    The function simulates several iterations assuming unlimited execution resources, and measures the growth of the
+    time when each value becomes available. Values computed only from loop-invariant inputs become available at the
+    same time in every iteration, and values on a loop-carried chain are delayed by the latency of the chain in each
+    iteration. The latency of instructions with a memory operand includes the latency of the load, which delays only
+    the values needed to compute the address and the loaded memory location.
+
+    :returns: a tuple of the latency of the chain per iteration, the name of the value which carries the chain, and the
+        list of instructions on the chain.
+    """
+    loop_output_keys = set()
+    for instruction in instructions:
+        loop_output_keys.update(_get_value_keys(instruction, None)[1])
+    value_keys = [_get_value_keys(instruction, loop_output_keys) for instruction in instructions]
+
+    ready_time = dict()
+    # Map from value key to the (iteration, instruction position) of its last producer
+    producers = dict()
+    # Map from (iteration, instruction position) to the producer and the key of the input which delays the instruction
+    # the most
+    critical_inputs = dict()
+    half_ready_time = None
+    for iteration in range(_simulated_iterations):
+        if iteration == _simulated_iterations // 2:
+            half_ready_time = dict(ready_time)
+        for (i, (input_keys, output_keys, load_keys)) in enumerate(value_keys):
+            latency = timings[i].latency
+            if load_keys is not None:
+                latency = max(latency - load_latency, 0)
+            start_time, critical_input = 0, None
+            for key in input_keys:
+                input_time = ready_time.get(key, 0)
+                if load_keys is not None and key in load_keys:
+                    input_time += load_latency
+                if input_time > start_time:
+                    start_time = input_time
+                    critical_input = (producers[key], key) if key in producers else None
+            critical_inputs[(iteration, i)] = critical_input
+            for key in output_keys:
+                ready_time[key] = start_time + latency
+                producers[key] = (iteration, i)
+
+    measured_iterations = _simulated_iterations - _simulated_iterations // 2
+    chain_key, chain_cycles = None, 0.0
+    for (key, time) in ready_time.items():
+        cycles = float(time - half_ready_time.get(key, 0)) / measured_iterations
+        if cycles > chain_cycles:
+            chain_key, chain_cycles = key, cycles
+    if chain_key is None:
+        return 0.0, None, []
+
+    # Follow the critical inputs backward from the last producer of the value until the walk returns to an
+    # instruction in the chain: the instructions since its first visit form the recurrence, and the value passed from
+    # one iteration to the next on the recurrence carries the chain.
+    chain_positions, chain_keys = [], []
+    producer = producers[chain_key]
+    while producer is not None and producer[1] not in chain_positions:
+        chain_positions.append(producer[1])
+        critical_input = critical_inputs[producer]
+        if critical_input is None:
+            producer = None
+        else:
+            input_producer, key = critical_input
+            chain_keys.append((key, input_producer[0] < producer[0]))
+            producer = input_producer
+    if producer is not None:
+        recurrence_start = chain_positions.index(producer[1])
+        chain_positions = chain_positions[recurrence_start:]
+        chain_key = next((key for (key, is_carried) in chain_keys[recurrence_start:] if is_carried), chain_key)
+    chain = [instructions[i] for i in sorted(chain_positions)]
+    return chain_cycles, _format_value_key(chain_key, instructions), chain
+
+
+def find_loops(instructions):
+    """Finds loops in a list of instructions.
+
+    A loop is formed by a label and a later branch to the label. If several branches jump back to the same label, the
+    loop extends to the last of them.
+
+    :returns: the list of tuples (label name, position of the label, position of the backward branch) in the order of
+        labels.
+    """
+    from peachpy.x86_64.instructions import BranchInstruction
+    from peachpy.x86_64.pseudo import LABEL
+    label_positions = dict()
+    loop_ends = collections.OrderedDict()
+    for (i, instruction) in enumerate(instructions):
+        if isinstance(instruction, LABEL):
+            label_positions[instruction.identifier] = i
+        elif isinstance(instruction, BranchInstruction) and instruction.label_name in label_positions:
+            loop_ends[instruction.label_name] = i
+    loops = [(name, label_positions[name], end) for (name, end) in loop_ends.items()]
+    return sorted(loops, key=lambda loop: loop[1])
+
+
+def analyze_loops(function, target=None):
+    """Estimates the performance of each loop in a function.
+
+    :param function: the function to analyze: a :class:`peachpy.x86_64.function.ABIFunction` with physical
+        registers, or a :class:`peachpy.x86_64.function.Function` with virtual registers.
+    :param Microarchitecture target: the microarchitecture to estimate the performance on. If not specified, the target
+        of the function, or the target option, or the default microarchitecture is used.
+    :returns: a list of :class:`LoopAnalysis` objects in the order of loops in the function.
+    """
+    from peachpy.x86_64.scheduler import get_scheduling_target
+    from peachpy.x86_64.pseudo import LABEL
+    if target is None:
+        target = get_scheduling_target(function)
+    instructions = function._instructions
+    loops = find_loops(instructions)
+    analyses = []
+    for (name, start, end) in loops:
+        body = [instruction for instruction in instructions[start + 1:end + 1]
+                if instruction.__class__.__module__ != "peachpy.x86_64.pseudo"]
+        has_inner_loops = any(start < inner_start and inner_end <= end for (_, inner_start, inner_end) in loops)
+        if name.endswith(".begin"):
+            name = name[:-len(".begin")]
+        analyses.append(LoopAnalysis(name, body, target, has_inner_loops))
+    return analyses
@@ -0,0 +1,267 @@
+# This file is part of Peach-Py package and is licensed under the Simplified BSD license.
+#    See license.rst for the full text of the license.
+
+from peachpy.context import get_active_context
+
+
+def get_active_cache():
+    """Returns the compilation cache active in the build context of the current thread, or None"""
+    return get_active_context().active_cache
+
+
+class CompilationCache:
+    """Persistent content-addressed cache of encoded functions.
+
+    The cache maps a hash of the function instruction stream, ABI, target microarchitecture, and PeachPy version to
+    the code of the encoded function and its metadata. When the cache is active, the writers take cached
+    functions instead of binding them to an ABI, and ABIFunction.encode returns the cached code instead of encoding
+    instructions. Thus unchanged functions skip register allocation and encoding in incremental builds.
+
+    Each entry is stored in a separate file: a line with JSON metadata followed by the function code. When the total
+    size of the entries exceeds the limit, the least recently used entries are removed.
+
+    Functions restored from the cache contain the code, but not the instruction objects.
+
+    :ivar str directory: the directory with cache entries. It is created if it does not exist.
+    :ivar int max_size: the maximum total size of cache entries in bytes.
+    :ivar int hits: the number of lookups which found the function in the cache.
+    :ivar int misses: the number of lookups which did not find the function in the cache.
+    """
+
+    entry_extension = ".peachpy-cache"
+
+    def __init__(self, directory, max_size=256 * 1024 * 1024):
+        from peachpy.util import is_int
+        if not is_int(max_size):
+            raise TypeError("Cache size %s is not an integer" % str(max_size))
+        if max_size <= 0:
+            raise ValueError("Cache size %d is not a positive integer" % max_size)
+        import os
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.previous_cache = None
+
+    def __enter__(self):
+        context = get_active_context()
+        self.previous_cache = context.active_cache
+        context.active_cache = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        get_active_context().active_cache = self.previous_cache
+        self.previous_cache = None
+
+    @staticmethod
+    def get_key(function, abi):
+        """Returns the cache key for encoding of the function for the ABI, or None if the function can not be cached.
+
+        Only functions defined while a compilation cache is active can be cached, as the key is based on the
+        instruction stream before it is modified by analysis passes.
+
+        :param peachpy.x86_64.function.Function function: the function after the end of its definition.
+        :param peachpy.abi.ABI abi: the ABI the function is bound to.
+        """
+        import hashlib
+        import peachpy
+
+        if function._instruction_stream_digest is None:
+            return None
+        target = function.target
+        if target is None:
+            target_description = "None"
+        else:
+            target_description = target.name + ": " + ", ".join(sorted(map(str, target.extensions)))
+        key_lines = [
+            "PeachPy " + peachpy.__version__,
+            "ABI " + abi.name,
+            "Target " + target_description,
+            "Instructions " + function._instruction_stream_digest
+        ]
+        return hashlib.sha256("\n".join(key_lines).encode("utf-8")).hexdigest()
+
+    def lookup(self, key, function, abi):
+        """Returns the cached encoded function or None if the function is not in the cache
+
+        :param str key: the cache key returned by :meth:`get_key`.
+        :param function: the function after the end of its definition, or the ABIFunction created from it. The
+            function provides the name and the signature of the encoded function.
+        :param peachpy.abi.ABI abi: the ABI the function is bound to.
+        """
+        from peachpy.x86_64.profiler import count
+        entry = self._read_entry(key)
+        if entry is None:
+            self.misses += 1
+            count(function, "cache", "misses")
+            return None
+        self.hits += 1
+        count(function, "cache", "hits")
+
+        from peachpy.x86_64.function import EncodedFunction
+        metadata, code = entry
+        return EncodedFunction._from_code(function, abi, code, metadata["instruction_addresses"],
+                                          metadata.get("code_alignment", 1))
+
+    def insert(self, key, encoded_function):
+        """Adds the encoded function to the cache and removes the least recently used entries beyond the size limit
+
+        :param str key: the cache key returned by :meth:`get_key`.
+        :param peachpy.x86_64.function.EncodedFunction encoded_function: the encoded function.
+        """
+        import json
+        import os
+        import tempfile
+        import peachpy
+
+        code = bytes(encoded_function._code)
+        metadata = {
+            "version": peachpy.__version__,
+            "name": encoded_function.name,
+            "abi": encoded_function.abi.name,
+            "code_size": len(code),
+            "instruction_addresses": encoded_function._instruction_addresses,
+            "code_alignment": encoded_function.code_alignment
+        }
+
+        # Write into a temporary file and rename it so that concurrent builds never observe partial entries
+        entry_fd, entry_temp_path = tempfile.mkstemp(dir=self.directory)
+        try:
+            with os.fdopen(entry_fd, "wb") as entry_file:
+                entry_file.write(json.dumps(metadata, sort_keys=True).encode("utf-8") + b"\n")
+                entry_file.write(code)
+            _replace_file(entry_temp_path, self._get_entry_path(key))
+        except:
+            os.unlink(entry_temp_path)
+            raise
+        self._evict()
+
+    def clear(self):
+        """Removes all entries from the cache and resets the counters"""
+        import os
+        for entry_path, _, _ in self._list_entries():
+            os.unlink(entry_path)
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def size(self):
+        """The total size of cache entries in bytes"""
+        return sum(entry_size for (_, entry_size, _) in self._list_entries())
+
+    def _get_entry_path(self, key):
+        import os
+        return os.path.join(self.directory, key + CompilationCache.entry_extension)
+
+    def _read_entry(self, key):
+        import json
+        import os
+        import peachpy
+
+        entry_path = self._get_entry_path(key)
+        try:
+            with open(entry_path, "rb") as entry_file:
+                metadata = json.loads(entry_file.readline().decode("utf-8"))
+                code = bytearray(entry_file.read())
+        except (IOError, OSError, ValueError):
+            return None
+        if metadata.get("version") != peachpy.__version__ or metadata.get("code_size") != len(code):
+            return None
+        # Update modification time to keep recently used entries on eviction
+        try:
+            os.utime(entry_path, None)
+        except OSError:
+            pass
+        return metadata, code
+
+    def _list_entries(self):
+        """Returns the list of (path, size, modification time) tuples for cache entries"""
+        import os
+        entries = []
+        for entry_name in os.listdir(self.directory):
+            if entry_name.endswith(CompilationCache.entry_extension):
+                entry_path = os.path.join(self.directory, entry_name)
+                try:
+                    entry_stat = os.stat(entry_path)
+                except OSError:
+                    continue
+                entries.append((entry_path, entry_stat.st_size, entry_stat.st_mtime))
+        return entries
+
+    def _evict(self):
+        import os
+        import operator
+        entries = self._list_entries()
+        cache_size = sum(entry_size for (_, entry_size, _) in entries)
+        for entry_path, entry_size, _ in sorted(entries, key=operator.itemgetter(2)):
+            if cache_size <= self.max_size:
+                break
+            try:
+                os.unlink(entry_path)
+            except OSError:
+                pass
+            cache_size -= entry_size
+
+
+class NullCache:
+    """Disables the active compilation cache"""
+
+    def __init__(self):
+        self.previous_cache = None
+
+    def __enter__(self):
+        context = get_active_context()
+        self.previous_cache = context.active_cache
+        context.active_cache = None
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        get_active_context().active_cache = self.previous_cache
+        self.previous_cache = None
+
+
+def get_instruction_stream_digest(function):
+    """Returns a hash of the signature and the instructions of a function"""
+    import hashlib
+    stream_hash = hashlib.sha256()
+    stream_hash.update(function.c_signature.encode("utf-8"))
+    stream_hash.update(str(function.package).encode("utf-8"))
+    import peachpy.x86_64.options
+    if peachpy.x86_64.options.get_option("schedule_instructions"):
+        # Scheduled instructions depend on the target microarchitecture
+        from peachpy.x86_64.scheduler import get_scheduling_target
+        stream_hash.update(("\nscheduled for %s" % get_scheduling_target(function).id).encode("utf-8"))
+    if peachpy.x86_64.options.get_option("peephole"):
+        # Rewritten instructions depend on the selected patterns
+        from peachpy.x86_64.peephole import pattern_library
+        pattern_names = peachpy.x86_64.options.get_option("peephole_patterns")
+        if pattern_names is None:
+            pattern_names = list(pattern_library)
+        stream_hash.update(("\npeephole %s" % ",".join(pattern_names)).encode("utf-8"))
+    align_loops = peachpy.x86_64.options.get_option("align_loops")
+    if align_loops:
+        # Loop alignment depends on the target microarchitecture
+        if align_loops is True:
+            from peachpy.x86_64.scheduler import get_scheduling_target
+            align_loops = get_scheduling_target(function).loop_alignment
+        stream_hash.update(("\nloops aligned to %d" % align_loops).encode("utf-8"))
+    if peachpy.x86_64.options.get_option("align_branches"):
+        stream_hash.update(b"\nbranches within 32-byte boundaries")
+    for instruction in function._instructions:
+        line = "\n%s %s %s %s" % (instruction.__class__.__name__, instruction.avx_mode, instruction.mmx_mode,
+                                  instruction.format("peachpy", indent=False))
+        stream_hash.update(line.encode("utf-8"))
+    return stream_hash.hexdigest()
+
+
+def _replace_file(source_path, destination_path):
+    import os
+    try:
+        os.replace(source_path, destination_path)
+    except AttributeError:
+        # Python 2: rename does not replace existing files on Windows
+        if os.path.exists(destination_path):
+            os.unlink(destination_path)
+        os.rename(source_path, destination_path)
@@ -1,6 +1,8 @@
 # This file is part of Peach-Py package and is licensed under the Simplified BSD license.
 #    See license.rst for the full text of the license.
 
+import threading
+
 
 def optional_rex(r, rm, force_rex=False):
     assert r in {0, 1}, "REX.R must be 0 or 1"
@@ -230,4 +232,328 @@ class Options:
     Disp32 = 0x02
     SIB = 0x04
     REX = 0x08
-    VEX3 = 0x10
\ No newline at end of file
+    VEX3 = 0x10
+
+
+class TableComponent:
+    """Kinds of steps in static encoding tables generated by codegen/x86_64.py.
+
+    An encoding table is a tuple of steps, each step is a tuple with a component kind followed by its parameters.
+    Operand references are indices in the operands list, -1 indicates that the operand is not used.
+
+    - (Bytes, bytes): constant bytes.
+    - (OptionalREX, r, r_operand, b_operand, xb_operand, r8_operands): REX prefix which is omitted if all bits are
+      zero and REX is not forced by the rex option or 8-bit registers spl, bpl, sil, and dil. xb_operand refers to a
+      memory operand which provides REX.X and REX.B bits.
+    - (REXMemory, w, r, r_operand, xb_operand): REX prefix for an instruction with a memory operand.
+    - (REXRegister, rex, r_operand, b_operand): REX prefix for an instruction with register operands.
+    - (VEX2, lpp, r_operand, b_operand, xb_operand, vvvv_operand): 2-byte VEX prefix which is replaced with 3-byte
+      VEX prefix if REX.X or REX.B bits are set or the vex3 option is specified.
+    - (VEX3Memory, escape, mmmmm, w____lpp, r_operand, xb_operand, vvvv_operand): 3-byte VEX/XOP prefix for an
+      instruction with a memory operand.
+    - (VEX3Register, escape, byte1, r_operand, b_operand, byte2, vvvv_operand): 3-byte VEX/XOP prefix for an
+      instruction with register operands.
+    - (OpcodeAddend, opcode, operand): opcode byte with register encoded in the low 3 bits.
+    - (ModRMMemory, reg, reg_operand, rm_operand): ModR/M, SIB, and displacement for a memory operand.
+    - (ModRMRegister, modrm, reg_operand, rm_operand): ModR/M byte for register operands.
+    - (Immediate, size, operand): immediate value.
+    - (RegisterByte, register_operand, payload_operand): register encoded in the high 4 bits of an immediate byte.
+    - (CodeOffset, size, operand): relative code offset.
+    """
+
+    Bytes = 0
+    OptionalREX = 1
+    REXMemory = 2
+    REXRegister = 3
+    VEX2 = 4
+    VEX3Memory = 5
+    VEX3Register = 6
+    OpcodeAddend = 7
+    ModRMMemory = 8
+    ModRMRegister = 9
+    Immediate = 10
+    RegisterByte = 11
+    CodeOffset = 12
+
+
+def _address_xb(address):
+    x = 0 if address.index is None else (address.index.physical_id >> 3) & 1
+    b = 0 if address.base is None else (address.base.physical_id >> 3) & 1
+    return x, b
+
+
+def _encode_modrm_sib_disp(code, reg, address, force_sib, min_disp):
+    # Equivalent of modrm_sib_disp which appends the bytes to the code buffer
+    base, index, displacement = address.base, address.index, address.displacement
+    if not force_sib and index is None and base.physical_id & 0x7 != 0b100:
+        base = base.physical_id & 0x7
+        if displacement == 0 and base != 0b101 and min_disp <= 0:
+            code.append((reg << 3) | base)
+            return
+        elif -128 <= displacement <= 127 and min_disp <= 1:
+            code.append(0x40 | (reg << 3) | base)
+            code.append(displacement & 0xFF)
+            return
+        code.append(0x80 | (reg << 3) | base)
+    else:
+        assert index is None or index.physical_id != 0b100, \
+            "rsp is not encodable as an index register (interpreted as no index)"
+        index = 0x4 if index is None else index.physical_id & 0x7
+        scale = {None: 0, 1: 0, 2: 1, 4: 2, 8: 3}[address.scale]
+        sib = (scale << 6) | (index << 3)
+        if base is None:
+            code.append((reg << 3) | 0x4)
+            code.append(sib | 0x5)
+        else:
+            base = base.physical_id & 0x7
+            if displacement == 0 and base != 0b101 and min_disp <= 0:
+                code.append((reg << 3) | 0x4)
+                code.append(sib | base)
+                return
+            elif -128 <= displacement <= 127 and min_disp <= 1:
+                code.append((reg << 3) | 0x44)
+                code.append(sib | base)
+                code.append(displacement & 0xFF)
+                return
+            code.append((reg << 3) | 0x84)
+            code.append(sib | base)
+    code.append(displacement & 0xFF)
+    code.append((displacement >> 8) & 0xFF)
+    code.append((displacement >> 16) & 0xFF)
+    code.append((displacement >> 24) & 0xFF)
+
+
+def encode_table(code, table, op, rex=False, vex3=False, sib=False, min_disp=0):
+    """Encodes an instruction using a static encoding table and appends the bytes to the code buffer
+
+    :param bytearray code: the output buffer.
+    :param tuple table: the encoding table, a tuple of steps described in TableComponent.
+    :param list op: the instruction operands.
+    :param bool rex: force the use of REX prefix.
+    :param bool vex3: force the use of 3-byte VEX prefix.
+    :param bool sib: force the use of SIB byte in memory operand encoding.
+    :param int min_disp: the minimum size of displacement in memory operand encoding.
+    """
+    for step in table:
+        kind = step[0]
+        if kind == TableComponent.Bytes:
+            code += step[1]
+        elif kind == TableComponent.ModRMRegister:
+            modrm = step[1] | (op[step[3]].physical_id & 0x7)
+            if step[2] >= 0:
+                modrm |= (op[step[2]].physical_id & 0x7) << 3
+            code.append(modrm)
+        elif kind == TableComponent.ModRMMemory:
+            reg = step[1] if step[2] < 0 else op[step[2]].physical_id & 0x7
+            _encode_modrm_sib_disp(code, reg, op[step[3]].address, sib, min_disp)
+        elif kind == TableComponent.OptionalREX:
+            r = step[1] if step[2] < 0 else (op[step[2]].physical_id >> 3) & 1
+            if step[4] >= 0:
+                x, b = _address_xb(op[step[4]].address)
+            else:
+                x, b = 0, (op[step[3]].physical_id >> 3) & 1
+            force_rex = rex
+            for r8 in step[5]:
+                force_rex = force_rex or op[r8].physical_id >= 4
+            if r | x | b or force_rex:
+                code.append(0x40 | (r << 2) | (x << 1) | b)
+        elif kind == TableComponent.Immediate:
+            value = op[step[2]]
+            for _ in range(step[1]):
+                code.append(value & 0xFF)
+                value >>= 8
+        elif kind == TableComponent.VEX2:
+            r = 0 if step[2] < 0 else (op[step[2]].physical_id >> 3) & 1
+            if step[4] >= 0:
+                x, b = _address_xb(op[step[4]].address)
+            else:
+                x, b = 0, 0 if step[3] < 0 else (op[step[3]].physical_id >> 3) & 1
+            vvvv = 0 if step[5] < 0 else op[step[5]].physical_id & 0xF
+            if (x | b) == 0 and not vex3:
+                code.append(0xC5)
+                code.append(0xF8 ^ (r << 7) ^ (vvvv << 3) ^ step[1])
+            else:
+                code.append(0xC4)
+                code.append(0xE1 ^ (r << 7) ^ (x << 6) ^ (b << 5))
+                code.append(0x78 ^ (vvvv << 3) ^ step[1])
+        elif kind == TableComponent.VEX3Register:
+            byte1 = step[2]
+            if step[3] >= 0:
+                byte1 ^= ((op[step[3]].physical_id >> 3) & 1) << 7
+            if step[4] >= 0:
+                byte1 ^= ((op[step[4]].physical_id >> 3) & 1) << 5
+            byte2 = step[5]
+            if step[6] >= 0:
+                byte2 ^= (op[step[6]].physical_id & 0xF) << 3
+            code.append(step[1])
+            code.append(byte1)
+            code.append(byte2)
+        elif kind == TableComponent.VEX3Memory:
+            r = 0 if step[4] < 0 else (op[step[4]].physical_id >> 3) & 1
+            x, b = _address_xb(op[step[5]].address)
+            vvvv = 0 if step[6] < 0 else op[step[6]].physical_id & 0xF
+            code.append(step[1])
+            code.append(0xE0 ^ (r << 7) ^ (x << 6) ^ (b << 5) ^ step[2])
+            code.append(0x78 ^ (vvvv << 3) ^ step[3])
+        elif kind == TableComponent.REXMemory:
+            r = step[2] if step[3] < 0 else (op[step[3]].physical_id >> 3) & 1
+            x, b = _address_xb(op[step[4]].address)
+            code.append(0x40 | (step[1] << 3) | (r << 2) | (x << 1) | b)
+        elif kind == TableComponent.REXRegister:
+            rex_byte = step[1]
+            if step[2] >= 0:
+                rex_byte |= ((op[step[2]].physical_id >> 3) & 1) << 2
+            if step[3] >= 0:
+                rex_byte |= (op[step[3]].physical_id >> 3) & 1
+            code.append(rex_byte)
+        elif kind == TableComponent.OpcodeAddend:
+            code.append(step[1] | (op[step[2]].physical_id & 0x7))
+        elif kind == TableComponent.RegisterByte:
+            byte = (op[step[1]].physical_id & 0xF) << 4
+            if step[2] >= 0:
+                byte |= op[step[2]] & 0xF
+            code.append(byte)
+        else:
+            assert kind == TableComponent.CodeOffset, "Unknown encoding table component %d" % kind
+            offset = op[step[2]].offset
+            for _ in range(step[1]):
+                code.append(offset & 0xFF)
+                offset >>= 8
+
+
+class _OutputBuffer(threading.local):
+    # Encoded instructions are appended to the buffer until it exceeds the limit, and then it is reset
+    limit = 4096
+
+    def __init__(self):
+        # Each thread encodes into its own buffer
+        self.code = bytearray()
+
+
+_output_buffer = _OutputBuffer()
+
+
+class TableEncoder(object):
+    """Encoding function backed by a static encoding table.
+
+    Table encoders are used in the instruction encodings list in place of encoding lambdas and have the same calling
+    convention, but encode all instruction components into a per-thread output buffer, which keeps its allocation
+    between calls, and return a copy of the encoded bytes.
+
+    :ivar tuple table: the encoding table, a tuple of steps described in TableComponent.
+    """
+
+    __slots__ = ("table",)
+
+    def __init__(self, table):
+        self.table = table
+
+    def __call__(self, op, rex=False, vex3=False, sib=False, min_disp=0):
+        code = _output_buffer.code
+        start = len(code)
+        if start > _OutputBuffer.limit:
+            del code[:]
+            start = 0
+        encode_table(code, self.table, op, rex, vex3, sib, min_disp)
+        return code[start:]
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class EncodingCache:
+    """Process-wide least-recently-used cache of instruction encodings.
+
+    Generated kernels often repeat the same instruction with the same physical operands many times. The cache maps
+    a key of instruction class, operand signature, and encoding options to the encoded bytes, so that repeated
+    encodings skip the encoding functions. The cache is shared by all threads, and its operations are serialized by a
+    lock.
+
+    :ivar int capacity: the maximum number of entries in the cache. Zero disables caching.
+    :ivar int hits: the number of lookups which found an entry in the cache.
+    :ivar int misses: the number of lookups which did not find an entry in the cache.
+    """
+
+    def __init__(self, capacity=65536):
+        import collections
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, key):
+        """Returns the cached value for the key or None if the key is not in the cache"""
+        with self._lock:
+            value = self._entries.pop(key, None)
+            if value is None:
+                self.misses += 1
+                return None
+            # Re-insert the entry to mark it as the most recently used
+            self._entries[key] = value
+            self.hits += 1
+            return value
+
+    def insert(self, key, value):
+        """Adds an immutable value to the cache and evicts the least recently used entries beyond the capacity"""
+        if self.capacity <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Removes all entries from the cache and resets the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def get_key(instruction, options=None):
+        """Returns the cache key for encoding of the instruction, or None if the encoding can not be cached.
+
+        :param Instruction instruction: the instruction to encode. Only instructions with physical registers,
+            immediates, memory, and RIP-relative operands can be cached.
+        :param options: a hashable description of encoding options, e.g. the method used for encoding.
+        """
+        from peachpy.x86_64.registers import Register
+        from peachpy.x86_64.operand import MemoryOperand, RIPRelativeOffset
+        from peachpy.util import is_int
+
+        def get_register_signature(register):
+            if register is None:
+                return None
+            return register.__class__, register.physical_id, register.mask
+
+        signature = [instruction.__class__, instruction.name, options]
+        for operand in instruction.operands:
+            if isinstance(operand, Register):
+                if operand.physical_id is None:
+                    return None
+                signature.append(get_register_signature(operand))
+            elif isinstance(operand, MemoryOperand):
+                address = operand.address
+                if address.base is not None and address.base.physical_id is None or \
+                        address.index is not None and address.index.physical_id is None:
+                    return None
+                signature.append((MemoryOperand, operand.size,
+                                  get_register_signature(address.base), get_register_signature(address.index),
+                                  address.scale, address.displacement))
+            elif isinstance(operand, RIPRelativeOffset):
+                signature.append((RIPRelativeOffset, operand.offset))
+            elif is_int(operand):
+                signature.append(int(operand))
+            else:
+                return None
+        return tuple(signature)
+
+
+encoding_cache = EncodingCache()
@@ -12,10 +12,86 @@ import peachpy
 import peachpy.writer
 import peachpy.x86_64.instructions
 import peachpy.x86_64.registers
-import peachpy.x86_64.avx
 import peachpy.x86_64.options
+from peachpy.x86_64.registers import GeneralPurposeRegister, MMXRegister, XMMRegister, MaskRegister
+from peachpy.context import get_active_context
 
-active_function = None
+
+def get_active_function():
+    """Returns the function active in the build context of the current thread, or None"""
+    return get_active_context().active_function
+
+
+class RegisterIndex:
+    """Dense bitset representation of register sets used in data-flow analysis.
+
+    Each register internal id is assigned a compact index, and the register mask occupies a group of
+    :attr:`mask_bits` bits in a Python integer at the position given by the index. Unions, intersections, and
+    differences of register sets thus become single integer operations.
+
+    :ivar list register_ids: internal ids of registers in the order of their compact indices.
+    :ivar dict register_indices: map from register internal id to its compact index.
+    """
+
+    # The number of bits in a register mask (the widest mask is 0x700 for zmm registers)
+    mask_bits = 11
+    # The mask which covers all parts of a register
+    group_mask = (1 << mask_bits) - 1
+
+    def __init__(self):
+        self.register_ids = list()
+        self.register_indices = dict()
+        # Map from register mask to the mask replicated for all registers in the index
+        self._replicated_masks = dict()
+
+    def encode(self, register_masks):
+        """Converts a map from register internal id to register mask into a bitset"""
+        bits = 0
+        for (register_id, register_mask) in six.iteritems(register_masks):
+            register_index = self.register_indices.get(register_id)
+            if register_index is None:
+                register_index = len(self.register_ids)
+                self.register_indices[register_id] = register_index
+                self.register_ids.append(register_id)
+                self._replicated_masks = dict()
+            bits |= register_mask << (register_index * RegisterIndex.mask_bits)
+        return bits
+
+    def decode(self, bits):
+        """Converts a bitset into a map from register internal id to register mask"""
+        register_masks = dict()
+        while bits != 0:
+            register_index = ((bits & -bits).bit_length() - 1) // RegisterIndex.mask_bits
+            shift = register_index * RegisterIndex.mask_bits
+            register_masks[self.register_ids[register_index]] = (bits >> shift) & RegisterIndex.group_mask
+            bits &= ~(RegisterIndex.group_mask << shift)
+        return register_masks
+
+    def decode_ids(self, bits):
+        """Returns a list of internal ids of registers in a bitset"""
+        register_ids = list()
+        while bits != 0:
+            register_index = ((bits & -bits).bit_length() - 1) // RegisterIndex.mask_bits
+            register_ids.append(self.register_ids[register_index])
+            bits &= ~(RegisterIndex.group_mask << (register_index * RegisterIndex.mask_bits))
+        return register_ids
+
+    def get_mask(self, bits, register_id):
+        """Returns the mask of a register in a bitset"""
+        register_index = self.register_indices.get(register_id)
+        if register_index is None:
+            return 0
+        return (bits >> (register_index * RegisterIndex.mask_bits)) & RegisterIndex.group_mask
+
+    def replicate_mask(self, register_mask):
+        """Returns a bitset with the same mask for every register in the index"""
+        bits = self._replicated_masks.get(register_mask)
+        if bits is None:
+            bits = 0
+            for register_index in range(len(self.register_ids)):
+                bits |= register_mask << (register_index * RegisterIndex.mask_bits)
+            self._replicated_masks[register_mask] = bits
+        return bits
 
 
 class Function:
@@ -27,6 +103,14 @@ class Function:
     virtual registers, and instruction stream may contain pseudo-instructions, such as LOAD.ARGUMENT or RETURN.
     """
 
+    # Map from register kind to the number of physical registers available for allocation
+    _max_live_registers = {
+        GeneralPurposeRegister._kind: 15,
+        MMXRegister._kind: 8,
+        XMMRegister._kind: 16,
+        MaskRegister._kind: 8
+    }
+
     def __init__(self, name, arguments, result_type=None,
                  package=None,
                  target=None,
@@ -55,15 +139,15 @@ class Function:
         self.arguments = arguments
         self.result_type = result_type
         if package is None:
-            self.package = peachpy.x86_64.options.package
+            self.package = peachpy.x86_64.options.get_option("package")
         self.package = package
         if target is None:
-            self.target = peachpy.x86_64.options.target
+            self.target = peachpy.x86_64.options.get_option("target")
         self.target = target
 
         self.target = target
         if debug_level is None:
-            self.debug_level = peachpy.x86_64.options.debug_level
+            self.debug_level = peachpy.x86_64.options.get_option("debug_level")
         else:
             self.debug_level = int(debug_level)
 
@@ -81,6 +165,15 @@ class Function:
         self._virtual_mmx_registers_count = 0
         self._virtual_xmm_registers_count = 0
 
+        # Hash of the instruction stream for the compilation cache
+        self._instruction_stream_digest = None
+        # Cache key which was not found in the compilation cache at the end of the function definition
+        self._missed_cache_key = None
+        # Whether the function was served from the compilation cache and its analysis is postponed until finalize
+        self._analysis_deferred = False
+        # Struct-of-arrays representation of the instructions, rebuilt by each analysis of the function
+        self._instruction_arrays = None
+
         from peachpy.x86_64 import m256, m256d, m256i
         avx_types = [m256, m256d, m256i]
         self.avx_environment = any([arg.ctype in avx_types for arg in self.arguments]) or self.result_type in avx_types
@@ -177,18 +270,33 @@ class Function:
     def __exit__(self, exc_type, exc_value, traceback):
         self.detach()
         if exc_type is None:
-            self._add_default_labels()
-            self._check_undefined_labels()
-            self._remove_unused_labels()
-            self._analize()
-            self._check_live_registers()
-            self._preallocate_registers()
-            self._bind_registers()
-            if peachpy.x86_64.options.abi is not None:
-                abi_function = self.finalize(peachpy.x86_64.options.abi)
+            import peachpy.x86_64.cache
+            from peachpy.x86_64.profiler import phase
+            context = get_active_context()
+            abi = peachpy.x86_64.options.get_option("abi")
+            if context.active_cache is not None:
+                with phase(self, "cache"):
+                    # The cache key is based on the instruction stream before it is modified by analysis passes
+                    self._instruction_stream_digest = peachpy.x86_64.cache.get_instruction_stream_digest(self)
+                    # Functions found in the compilation cache skip analysis, register allocation and encoding
+                    cached_function = None
+                    if abi is not None:
+                        cached_function = peachpy.writer.prepare_cached_function(context.active_writer, self, abi)
+                if cached_function is not None:
+                    context.active_writer._add_prepared_function(cached_function)
+                    self._analysis_deferred = True
+                    return
+
+            self._process_definition()
+            if abi is not None:
+                if isinstance(context.active_writer, peachpy.writer.ParallelWriter):
+                    # The parallel writer finalizes the function in a worker process
+                    context.active_writer.defer_function(self, abi)
+                else:
+                    abi_function = self.finalize(abi)
 
-                if peachpy.writer.active_writer is not None:
-                    peachpy.writer.active_writer.add_function(abi_function)
+                    if context.active_writer is not None:
+                        context.active_writer.add_function(abi_function)
         else:
             raise
 
@@ -198,16 +306,18 @@ class Function:
         While the instruction stream is active, generated instructions are added to this function.
 
         While the function is active, generated instructions are checked for compatibility with the function target.
-        """
-        import peachpy.stream
-        global active_function
 
-        if active_function is not None:
-            raise ValueError("Can not attach the function: alternative function %s is active" % active_function.name)
-        if peachpy.stream.active_stream is not None:
+        The function becomes active in the build context of the current thread (see
+        :class:`peachpy.context.BuildContext`), and functions in other threads or build contexts are not affected.
+        """
+        context = get_active_context()
+        if context.active_function is not None:
+            raise ValueError("Can not attach the function: alternative function %s is active" %
+                             context.active_function.name)
+        if context.active_stream is not None:
             raise ValueError("Can not attach the function instruction stream: alternative instruction stream is active")
-        active_function = self
-        peachpy.stream.active_stream = self
+        context.active_function = self
+        context.active_stream = self
         return self
 
     def detach(self):
@@ -215,14 +325,13 @@ class Function:
 
         The function and its instruction stream must be active before calling the method.
         """
-        import peachpy.stream
-        global active_function
-        if active_function is None:
+        context = get_active_context()
+        if context.active_function is None:
             raise ValueError("Can not detach the function: no function is active")
-        if active_function is not self:
+        if context.active_function is not self:
             raise ValueError("Can not detach the function: a different function is active")
-        active_function = None
-        peachpy.stream.active_stream = None
+        context.active_function = None
+        context.active_stream = None
         return self
 
     @staticmethod
@@ -282,6 +391,26 @@ class Function:
         instruction._indent_level = self._indent_level
         self._instructions.append(instruction)
 
+    def _process_definition(self):
+        """Analyses the instructions after the end of the function definition and binds the registers"""
+        from peachpy.x86_64.profiler import phase
+        with phase(self, "analysis") as analysis_phase:
+            analysis_phase.count("instructions", len(self._instructions))
+            self._add_default_labels()
+            self._check_undefined_labels()
+            self._remove_unused_labels()
+            self._analize()
+        if peachpy.x86_64.options.get_option("schedule_instructions"):
+            with phase(self, "scheduling"):
+                self._schedule_instructions()
+        with phase(self, "spilling"):
+            self._spill_registers()
+        with phase(self, "preallocation"):
+            self._check_live_registers()
+            self._preallocate_registers()
+            self._bind_registers()
+        self._instruction_arrays.release_register_sets()
+
     def add_instructions(self, instructions):
         for instruction in instructions:
             self.add_instruction(instruction)
@@ -290,6 +419,10 @@ class Function:
         from peachpy.x86_64.abi import ABI
         if not isinstance(abi, ABI):
             raise TypeError("%s is not an ABI object" % str(abi))
+        if self._analysis_deferred:
+            # The function was served from the compilation cache at the end of its definition
+            self._analysis_deferred = False
+            self._process_definition()
         return ABIFunction(self, abi)
 
     def _add_default_labels(self):
@@ -333,36 +466,36 @@ class Function:
         self._label_names.difference_update(unreferenced_label_names)
 
     def _analize(self):
-        from peachpy.x86_64.instructions import BranchInstruction
         from peachpy.x86_64.pseudo import LABEL, RETURN
         from peachpy.x86_64.generic import RET
+        from peachpy.x86_64.ir import InstructionArrays, InstructionCategory
 
-        # Query input/output registers for each instruction
-        input_registers = []
-        output_registers = []
-        for instruction in self._instructions:
-            input_registers.append(instruction.input_registers_masks)
-            output_registers.append(instruction.output_registers_masks)
+        # Collect input/output registers (as bitsets) and operand registers of each instruction in parallel arrays
+        register_index = RegisterIndex()
+        arrays = InstructionArrays(self._instructions, register_index)
+        self._instruction_arrays = arrays
+        input_registers = arrays.input_registers
+        output_registers = arrays.output_registers
+        categories = arrays.categories
+        label_names = arrays.label_names
 
         # Map from label name to its quasi-instruction number in the stream
-        labels = {instruction.identifier: i for (i, instruction)
-                  in enumerate(self._instructions) if isinstance(instruction, LABEL)}
+        labels = {label_names[i]: i for i in range(len(arrays)) if categories[i] == InstructionCategory.Label}
         entry_position = 0
         if self.entry.name in self._label_names:
             entry_position = labels[self.entry.name]
-        branch_instructions = [(i, instruction) for (i, instruction) in enumerate(self._instructions) if
-                               isinstance(instruction, BranchInstruction) and instruction.label_name]
+        branch_positions = [i for i in range(len(arrays)) if label_names[i] and
+                            categories[i] in (InstructionCategory.Branch, InstructionCategory.ConditionalBranch)]
         # Basic blocks start at function entry position or on branch target
         basic_block_starts = {entry_position}
-        for (i, branch_instruction) in branch_instructions:
-            basic_block_starts.add(labels[branch_instruction.label_name])
-            if branch_instruction.is_conditional:
+        for i in branch_positions:
+            basic_block_starts.add(labels[label_names[i]])
+            if categories[i] == InstructionCategory.ConditionalBranch:
                 basic_block_starts.add(i+1)
         basic_block_starts = sorted(basic_block_starts)
         # Basic block ends on a referenced label instruction or right after return/branch instructions
-        basic_block_ends = [i + int(not isinstance(instruction, LABEL)) for (i, instruction)
-                            in enumerate(self._instructions) if
-                            isinstance(instruction, (BranchInstruction, RETURN, RET, LABEL))]
+        basic_block_ends = [i + int(categories[i] != InstructionCategory.Label) for i in range(len(arrays))
+                            if categories[i] != InstructionCategory.Other]
         # TODO: check that the last block with an uncoditional branch/return instruction
         basic_block_bounds = [(start, basic_block_ends[bisect.bisect_right(basic_block_ends, start)])
                               for start in basic_block_starts]
@@ -374,17 +507,16 @@ class Function:
                 self.input_registers_list = input_registers_list
                 self.output_registers_list = output_registers_list
 
-                self.consumed_register_masks = collections.defaultdict(int)
-                self.produced_register_masks = collections.defaultdict(int)
+                # Bitsets of registers consumed and produced by the basic block
+                self.consumed_registers = 0
+                self.produced_registers = 0
 
-                self.live_register_masks = collections.defaultdict(int)
-                self.available_register_masks = collections.defaultdict(int)
+                # Bitsets of registers live on exit from the basic block and available on entry to the basic block
+                self.live_registers = 0
+                self.available_registers = 0
 
                 self.is_reachable = False
 
-                self.liveness_analysis_passes = 0
-                self.availability_analysis_passes = 0
-
                 self.input_blocks = list()
                 self.output_blocks = list()
 
@@ -397,12 +529,8 @@ class Function:
                 # - If a register is produced by an instruction, it becomes available for the subsequent instructions
                 #   of the basic block and counts as produced by the basic block
                 for (input_registers, output_registers) in zip(input_registers_list, output_registers_list):
-                    for (input_register_id, input_register_mask) in six.iteritems(input_registers):
-                        consumed_mask = input_register_mask & ~self.produced_register_masks[input_register_id]
-                        if consumed_mask != 0:
-                            self.consumed_register_masks[input_register_id] |= consumed_mask
-                    for (output_register_id, output_register_mask) in six.iteritems(output_registers):
-                        self.produced_register_masks[output_register_id] |= output_register_mask
+                    self.consumed_registers |= input_registers & ~self.produced_registers
+                    self.produced_registers |= output_registers
 
             def reset_processed_blocks(self):
                 self.processed_input_blocks = set()
@@ -410,39 +538,25 @@ class Function:
 
             @property
             def available_registers_list(self):
-                from peachpy.x86_64.registers import Register
                 available_registers_list = []
-                available_registers_masks = self.available_register_masks.copy()
+                available_registers = self.available_registers
                 for output_registers in self.output_registers_list:
                     # Record available registers for current instruction
-                    available_registers_list.append(available_registers_masks.copy())
+                    available_registers_list.append(available_registers)
                     # Update with output registers for current instruction
-                    for (output_register_id, output_register_mask) in six.iteritems(output_registers):
-                        available_registers_masks[output_register_id] = \
-                            available_registers_masks.get(output_register_id, 0) | output_register_mask
+                    available_registers |= output_registers
                 return available_registers_list
 
             @property
             def live_registers_list(self):
-                from peachpy.x86_64.registers import Register
                 live_registers_list = []
-                live_registers_masks = self.live_register_masks.copy()
+                live_registers = self.live_registers
                 for (input_registers, output_registers) in \
                         reversed(list(zip(self.input_registers_list, self.output_registers_list))):
-                    # Mark register written by the instruction as non-live
-                    for (output_register_id, output_register_mask) in six.iteritems(output_registers):
-                        if output_register_id in live_registers_masks:
-                            new_live_register_mask = live_registers_masks[output_register_id] & ~output_register_mask
-                            if new_live_register_mask != 0:
-                                live_registers_masks[output_register_id] = new_live_register_mask
-                            else:
-                                del live_registers_masks[output_register_id]
-                    # Mark registers read by the instruction as live
-                    for (input_register_id, input_register_mask) in six.iteritems(input_registers):
-                        live_registers_masks[input_register_id] = \
-                            live_registers_masks.get(input_register_id, 0) | input_register_mask
-                    # Record available registers for current instruction
-                    live_registers_list.append(live_registers_masks.copy())
+                    # Mark register written by the instruction as non-live and registers read by the instruction as live
+                    live_registers = (live_registers & ~output_registers) | input_registers
+                    # Record live registers for current instruction
+                    live_registers_list.append(live_registers)
                 live_registers_list.reverse()
                 return live_registers_list
 
@@ -452,76 +566,6 @@ class Function:
             def __repr__(self):
                 return str(self)
 
-            def analyze_availability(self, extra_available_registers):
-                self.availability_analysis_passes += 1
-
-                if self.availability_analysis_passes == 1:
-                    # First pass: add registers produced by the block and propagate further
-                    self.available_register_masks.update(extra_available_registers)
-                    if self.output_blocks:
-                        # Add registers produced by this block
-                        for (produced_reg_id, produced_reg_mask) in six.iteritems(self.produced_register_masks):
-                            extra_available_registers[produced_reg_id] =\
-                                extra_available_registers.get(produced_reg_id, 0) | produced_reg_mask
-                else:
-                    # Subsequent passes: compute and propagate only the input registers that were not processed before
-                    for (reg_id, extra_reg_mask) in list(six.iteritems(extra_available_registers)):
-                        old_reg_mask = self.available_register_masks[reg_id]
-                        update_reg_mask = extra_reg_mask & ~old_reg_mask
-                        if update_reg_mask != 0:
-                            self.available_register_masks[reg_id] |= extra_reg_mask
-                        if self.output_blocks:
-                            if update_reg_mask != 0:
-                                extra_available_registers[reg_id] = update_reg_mask
-                            else:
-                                del extra_available_registers[reg_id]
-
-                if self.output_blocks and (extra_available_registers or self.availability_analysis_passes == 1):
-                    for output_block in self.output_blocks[1:]:
-                        # The dict needs to be copied because output blocks can change it
-                        output_block.analyze_availability(extra_available_registers.copy())
-                    # Optimization: do not create a copy of the dict
-                    self.output_blocks[0].analyze_availability(extra_available_registers)
-
-            def analyze_liveness(self, extra_live_registers):
-                # Update in liveness analysis consists of three steps:
-                # 1. Update live registers for this basic block.
-                # 2. Mark registers which are produced to by the basic block as non-live.
-                # 3. Mark registers which are consumed by the basic block as live (only on first pass).
-
-                self.liveness_analysis_passes += 1
-
-                # Steps 1 and 2
-                for (reg_id, extra_reg_mask) in list(six.iteritems(extra_live_registers)):
-                    old_reg_mask = self.live_register_masks[reg_id]
-                    update_reg_mask = extra_reg_mask & ~old_reg_mask
-                    if update_reg_mask != 0:
-                        self.live_register_masks[reg_id] |= extra_reg_mask
-                    if self.input_blocks:
-                        # On the first pass do not modify the extra live registers masks that are passed to input blocks
-                        # On subsequent passes only the novel live registers need to be passed further
-                        if self.liveness_analysis_passes == 1:
-                            update_reg_mask = extra_reg_mask
-                        update_reg_mask &= ~self.produced_register_masks.get(reg_id, 0)
-                        if update_reg_mask != 0:
-                            extra_live_registers[reg_id] = update_reg_mask
-                        else:
-                            del extra_live_registers[reg_id]
-
-                # Step 3
-                if self.input_blocks:
-                    if self.liveness_analysis_passes == 1:
-                        for (consumed_reg_id, consumed_reg_mask) in six.iteritems(self.consumed_register_masks):
-                            extra_live_registers[consumed_reg_id] =\
-                                extra_live_registers.get(consumed_reg_id, 0) | consumed_reg_mask
-
-                if self.input_blocks and (extra_live_registers or self.liveness_analysis_passes == 1):
-                    for input_block in self.input_blocks[1:]:
-                        # The dict needs to be copied because input blocks can change it
-                        input_block.analyze_liveness(extra_live_registers.copy())
-                    # Optimization: do not create a copy of the dict
-                    self.input_blocks[0].analyze_liveness(extra_live_registers)
-
             def analyze_reachability(self):
                 if not self.is_reachable:
                     self.is_reachable = True
@@ -553,7 +597,8 @@ class Function:
                             avx_state = None
                         elif instruction.avx_mode is None:
                             # Instruction without a mode
-                            if isinstance(instruction, (LOAD.ARGUMENT, STORE.RESULT, RETURN, RET, LABEL)):
+                            if isinstance(instruction, (LOAD.ARGUMENT, LOAD.LOCAL, STORE.RESULT, STORE.LOCAL,
+                                                        RETURN, RET, LABEL)):
                                 # Some pseudo-instructions need AVX/SSE mode for lowering
                                 instruction.avx_mode = avx_state
                         elif instruction.avx_mode:
@@ -577,7 +622,8 @@ class Function:
                         if instruction.avx_mode is not None:
                             avx_state = instruction.avx_mode
                         elif avx_state is not None and not avx_state:
-                            if isinstance(instruction, (LOAD.ARGUMENT, STORE.RESULT, RETURN, RET, LABEL)):
+                            if isinstance(instruction, (LOAD.ARGUMENT, LOAD.LOCAL, STORE.RESULT, STORE.LOCAL,
+                                                        RETURN, RET, LABEL)):
                                 instruction.avx_mode = avx_state
                     return avx_state
                 self.backward_pass(propogate_sse_backward, instructions, avx_state)
@@ -591,7 +637,8 @@ class Function:
                         if instruction.avx_mode is not None:
                             avx_state = instruction.avx_mode
                         elif avx_state:
-                            if isinstance(instruction, (LOAD.ARGUMENT, STORE.RESULT, RETURN, RET, LABEL)):
+                            if isinstance(instruction, (LOAD.ARGUMENT, LOAD.LOCAL, STORE.RESULT, STORE.LOCAL,
+                                                        RETURN, RET, LABEL)):
                                 instruction.avx_mode = avx_state
                 self.backward_pass(propogate_avx_backward, instructions, avx_state)
 
@@ -601,21 +648,22 @@ class Function:
                                       input_registers[start_end[0]:start_end[1]],
                                       output_registers[start_end[0]:start_end[1]]),
                            basic_block_bounds))
+        branch_positions_set = set(branch_positions)
         # Map from block start position to BasicBlock object
         basic_blocks_map = {basic_block_start: basic_block
                             for (basic_block_start, basic_block) in zip(basic_block_starts, basic_blocks)}
         # Set output basic blocks for each basic block object
         for (i, basic_block) in enumerate(basic_blocks):
             # Consider last instruction of the basic block
-            last_instruction = self._instructions[basic_block.end_position - 1]
-            if isinstance(last_instruction, (RET, RETURN)):
+            last_position = basic_block.end_position - 1
+            if categories[last_position] == InstructionCategory.Return:
                 # Basic block that ends with a return instruction has no output blocks
                 pass
-            elif isinstance(last_instruction, BranchInstruction) and last_instruction.label_name:
+            elif last_position in branch_positions_set:
                 # Basic block that ends with a branch instruction can jump to the block at branch label
-                target_position = labels[last_instruction.label_name]
+                target_position = labels[label_names[last_position]]
                 basic_block.output_blocks = [basic_blocks_map[target_position]]
-                if last_instruction.is_conditional:
+                if categories[last_position] == InstructionCategory.ConditionalBranch:
                     # Basic blocks that end with a conditional branch instruction can fall through to the next block
                     basic_block.output_blocks.append(basic_blocks[i+1])
             else:
@@ -623,16 +671,55 @@ class Function:
                 basic_block.output_blocks = [basic_blocks[i+1]]
         # Set input basic blocks for each basic block object
         for basic_block in basic_blocks:
-            basic_block.input_blocks = list(filter(lambda bb: basic_block in bb.output_blocks, basic_blocks))
+            for output_block in basic_block.output_blocks:
+                if not output_block.input_blocks or output_block.input_blocks[-1] is not basic_block:
+                    output_block.input_blocks.append(basic_block)
 
         # Analyze which blocks can be reached from the entry point
         basic_blocks_map[entry_position].analyze_reachability()
         exit_positions = [block.start_position for block in basic_blocks if not block.output_blocks]
 
-        # Analyze register lifetime
-        basic_blocks_map[entry_position].analyze_availability(dict())
-        for exit_position in exit_positions:
-            basic_blocks_map[exit_position].analyze_liveness(dict())
+        # Analyze register lifetime with worklist-driven iterative dataflow solvers:
+        # - Registers are available on entry to a block if they are available on entry to or produced by any of its
+        #   input blocks. The analysis starts from the entry block.
+        # - Registers are live on exit from a block if they are consumed, or live on exit and not produced, by any of
+        #   its output blocks. The analysis starts from the exit blocks.
+        fixpoint_iterations = 0
+        entry_block = basic_blocks_map[entry_position]
+        analyzed_blocks = {entry_block}
+        worklist = collections.deque([entry_block])
+        while worklist:
+            fixpoint_iterations += 1
+            basic_block = worklist.popleft()
+            available_registers = basic_block.available_registers | basic_block.produced_registers
+            for output_block in basic_block.output_blocks:
+                output_available_registers = output_block.available_registers | available_registers
+                if output_block not in analyzed_blocks or \
+                        output_available_registers != output_block.available_registers:
+                    output_block.available_registers = output_available_registers
+                    analyzed_blocks.add(output_block)
+                    if output_block not in worklist:
+                        worklist.append(output_block)
+
+        exit_blocks = [basic_blocks_map[exit_position] for exit_position in exit_positions]
+        analyzed_blocks = set(exit_blocks)
+        worklist = collections.deque(exit_blocks)
+        while worklist:
+            fixpoint_iterations += 1
+            basic_block = worklist.popleft()
+            live_registers = basic_block.consumed_registers | \
+                (basic_block.live_registers & ~basic_block.produced_registers)
+            for input_block in basic_block.input_blocks:
+                input_live_registers = input_block.live_registers | live_registers
+                if input_block not in analyzed_blocks or input_live_registers != input_block.live_registers:
+                    input_block.live_registers = input_live_registers
+                    analyzed_blocks.add(input_block)
+                    if input_block not in worklist:
+                        worklist.append(input_block)
+
+        from peachpy.x86_64.profiler import count
+        count(self, "analysis", "basic_blocks", len(basic_blocks))
+        count(self, "analysis", "fixpoint_iterations", fixpoint_iterations)
 
         # Analyze SSE/AVX mode
         basic_blocks_map[entry_position].propogate_sse_avx_state_forward(self._instructions, self.avx_environment)
@@ -646,48 +733,219 @@ class Function:
 
         # Reconstruct live and available registers for the whole instruction sequence
         for basic_block in basic_blocks:
+            block_slice = slice(basic_block.start_position, basic_block.end_position)
+            arrays.available_registers[block_slice] = basic_block.available_registers_list
+            arrays.live_registers[block_slice] = basic_block.live_registers_list
             for (instruction, available_registers, live_registers) in \
-                    zip(self._instructions[basic_block.start_position:basic_block.end_position],
-                        basic_block.available_registers_list, basic_block.live_registers_list):
-                instruction._live_registers = live_registers
-                instruction._available_registers = available_registers
+                    zip(self._instructions[block_slice],
+                        arrays.available_registers[block_slice], arrays.live_registers[block_slice]):
+                instruction._register_index = register_index
+                instruction._live_registers_bits = live_registers
+                instruction._available_registers_bits = available_registers
             # Remove referenced to input/output blocks to avoid memory leaks due to cycles in ref graph
             basic_block.input_blocks = None
             basic_block.output_blocks = None
 
-        # Analyze conflicting registers
-        for instruction in self._instructions:
-            virtual_registers = list(filter(operator.attrgetter("is_virtual"), instruction.registers))
-            for virtual_register in virtual_registers:
+        # Analyze conflicting registers: accumulate a bitset of conflicting registers for each virtual register
+        from peachpy.x86_64.regalloc import get_register_copy
+        from peachpy.x86_64.ir import RegisterRole
+        conflicting_registers = collections.OrderedDict()
+        register_ids, register_masks, register_kinds = arrays.register_ids, arrays.register_masks, arrays.register_kinds
+        for i in arrays.virtual_register_positions:
+            live_registers = arrays.live_registers[i] or 0
+            copy = get_register_copy(self._instructions[i])
+            for slot in arrays.get_register_slots(i):
+                register_id = register_ids[slot]
+                if register_id >= 0:
+                    continue
                 # TODO: generalize conflicts
-                conflicting_ids = [reg_id for (reg_id, reg_mask)
-                                   in six.iteritems(instruction._live_registers)
-                                   if reg_mask & virtual_register.mask != 0]
-                self._conflicting_registers[virtual_register.kind][-virtual_register.virtual_id]\
-                    .update(conflicting_ids)
-                # Make sure that conflicting registers are mutually conflicting
-                for conflicting_id in conflicting_ids:
-                    if conflicting_id < 0:
-                        self._conflicting_registers[virtual_register.kind][conflicting_id].\
-                            add(-virtual_register.virtual_id)
+                conflicts = live_registers & register_index.replicate_mask(register_masks[slot])
+                if copy is not None and arrays.register_operands[slot] == 0 and \
+                        arrays.register_roles[slot] == RegisterRole.Register:
+                    # The destination of a copy does not conflict with the source on the copy instruction, unless
+                    # the source is live in wider parts of the register than the copy instruction reads
+                    source = copy[1]
+                    if register_index.get_mask(live_registers, source._internal_id) & ~source.mask == 0:
+                        conflicts &= ~register_index.encode({source._internal_id: RegisterIndex.group_mask})
+                conflict_key = (register_kinds[slot], register_id)
+                conflicting_registers[conflict_key] = conflicting_registers.get(conflict_key, 0) | conflicts
+        for ((kind, virtual_register_id), conflicts) in six.iteritems(conflicting_registers):
+            conflicting_ids = register_index.decode_ids(conflicts)
+            self._conflicting_registers[kind][virtual_register_id].update(conflicting_ids)
+            # Make sure that conflicting registers are mutually conflicting
+            for conflicting_id in conflicting_ids:
+                if conflicting_id < 0:
+                    self._conflicting_registers[kind][conflicting_id].add(virtual_register_id)
+
+    def _find_excess_live_registers(self):
+        """Returns the position of the first instruction where the number of live registers exceeds the number of
+        physical registers, or None if there is no such instruction"""
+        from peachpy.x86_64.registers import GeneralPurposeRegister64, ZMMRegister
+        kind_masks = {
+            GeneralPurposeRegister._kind: GeneralPurposeRegister64._mask,
+            MMXRegister._kind: MMXRegister._mask,
+            XMMRegister._kind: ZMMRegister._mask,
+            MaskRegister._kind: MaskRegister._mask
+        }
+        arrays = self._instruction_arrays
+        register_index = arrays.register_index
+        for (i, live_registers) in enumerate(arrays.live_registers):
+            if not live_registers:
+                continue
+            for (kind, kind_mask) in six.iteritems(kind_masks):
+                kind_live_registers = live_registers & register_index.replicate_mask(kind_mask)
+                if len(register_index.decode_ids(kind_live_registers)) > self._max_live_registers[kind]:
+                    return i
+        return None
 
     def _check_live_registers(self):
         """Checks that the number of live registers does not exceed the number of physical registers for each insruction
         """
-        from peachpy.x86_64.registers import GeneralPurposeRegister, MMXRegister, XMMRegister, MaskRegister
-        max_live_registers = {
-            GeneralPurposeRegister._kind: 15,
-            MMXRegister._kind: 8,
-            XMMRegister._kind: 16,
-            MaskRegister._kind: 8
+        i = self._find_excess_live_registers()
+        if i is not None:
+            raise peachpy.RegisterAllocationError(
+                "The number of live virtual registers exceeds physical constaints %s" % str(self._instructions[i]))
+
+    def _reanalize(self):
+        """Repeats the analysis for a modified instruction sequence"""
+        for conflicting_registers in six.itervalues(self._conflicting_registers):
+            conflicting_registers.clear()
+        self._analize()
+
+    def _schedule_instructions(self):
+        """Reorders independent instructions in basic blocks to hide their latency on the target microarchitecture.
+
+        The scheduler uses the timing model of the target microarchitecture of the function, or of the target option if
+        the function does not specify it. If the scheduled instructions need more registers than available where the
+        original instructions did not, the original order is restored to avoid spilling.
+        """
+        from peachpy.x86_64.scheduler import schedule_instructions, get_scheduling_target
+        from peachpy.x86_64.profiler import count
+
+        scheduled_instructions, moved_count = \
+            schedule_instructions(self._instructions, self._instruction_arrays, get_scheduling_target(self))
+        count(self, "scheduling", "moved_instructions", moved_count)
+        if moved_count == 0:
+            return
+
+        fits_registers = self._find_excess_live_registers() is None
+        original_instructions = self._instructions
+        self._instructions = scheduled_instructions
+        self._reanalize()
+        if fits_registers and self._find_excess_live_registers() is not None:
+            count(self, "scheduling", "reverted")
+            self._instructions = original_instructions
+            self._reanalize()
+
+    def _spill_registers(self):
+        """Spills virtual registers to stack slots where the number of live registers exceeds physical constraints.
+
+        Each spilled virtual register is assigned a :class:`LocalVariable` slot. The register is reloaded from the slot
+        into a new virtual register before every instruction that reads it, and stored back after every instruction
+        that writes it, so that the new virtual registers are live only across a single instruction. Stack slots are
+        assigned addresses in the ABI-specific stack frame by :meth:`ABIFunction._update_stack_frame`.
+        """
+        from peachpy.x86_64.regalloc import select_spilled_registers
+
+        while True:
+            spilled_registers = select_spilled_registers(self._instructions, self._instruction_arrays,
+                                                         self._max_live_registers)
+            if not any(six.itervalues(spilled_registers)):
+                break
+            from peachpy.x86_64.profiler import count
+            count(self, "spilling", "rounds")
+            count(self, "spilling", "spilled_registers", sum(map(len, six.itervalues(spilled_registers))))
+            self._insert_spill_code(spilled_registers)
+
+            # Repeat the analysis for the new instruction sequence
+            self._reanalize()
+
+    def _insert_spill_code(self, spilled_registers):
+        """Rewrites instructions to keep the spilled virtual registers in stack slots.
+
+        :param dict spilled_registers: map from register kind to a set of internal ids of virtual registers to spill.
+        """
+        import copy
+        from peachpy.x86_64.pseudo import LOAD, STORE
+        from peachpy.x86_64.registers import Register, GeneralPurposeRegister, GeneralPurposeRegister64, \
+            MMXRegister, XMMRegister, YMMRegister, ZMMRegister
+        from peachpy.x86_64.operand import MemoryOperand
+        from peachpy.stream import NullStream
+
+        kind_masks = {
+            GeneralPurposeRegister._kind: GeneralPurposeRegister64._mask,
+            MMXRegister._kind: MMXRegister._mask,
+            XMMRegister._kind: ZMMRegister._mask
         }
+        allocate_register_id = {
+            GeneralPurposeRegister._kind: self._allocate_general_purpose_register_id,
+            MMXRegister._kind: self._allocate_mmx_register_id,
+            XMMRegister._kind: self._allocate_xmm_register_id
+        }
+
+        def is_spilled(register):
+            return register.is_virtual and register._internal_id in spilled_registers.get(register.kind, ())
+
+        # Stack slots hold the widest part of the spilled register used in the function
+        slot_registers = dict()
         for instruction in self._instructions:
-            live_registers = max_live_registers.copy()
-            for reg in instruction.live_registers:
-                live_registers[reg.kind] -= 1
-            if any(map(lambda c: c < 0, six.itervalues(live_registers))):
-                raise peachpy.RegisterAllocationError(
-                    "The number of live virtual registers exceeds physical constaints %s" % str(instruction))
+            for register in filter(is_spilled, instruction.registers):
+                spill_key = (register.kind, register._internal_id)
+                if register.kind == GeneralPurposeRegister._kind:
+                    slot_registers[spill_key] = GeneralPurposeRegister64
+                elif register.kind == MMXRegister._kind:
+                    slot_registers[spill_key] = MMXRegister
+                elif slot_registers.get(spill_key, XMMRegister).size < register.size:
+                    slot_registers[spill_key] = register.__class__
+                else:
+                    slot_registers.setdefault(spill_key, XMMRegister)
+        slots = {spill_key: LocalVariable(slot_register.size, function=self)
+                 for (spill_key, slot_register) in six.iteritems(slot_registers)}
+
+        def replace_registers(operand, temporary_ids):
+            if isinstance(operand, Register) and is_spilled(operand):
+                temporary_register = copy.copy(operand)
+                temporary_register.virtual_id = temporary_ids[(operand.kind, operand._internal_id)]
+                return temporary_register
+            elif isinstance(operand, MemoryOperand):
+                address = operand.address
+                if (address.base is not None and is_spilled(address.base)) or \
+                        (address.index is not None and is_spilled(address.index)):
+                    operand = copy.copy(operand)
+                    operand.address = copy.copy(address)
+                    if address.base is not None:
+                        operand.address.base = replace_registers(address.base, temporary_ids)
+                    if address.index is not None:
+                        operand.address.index = replace_registers(address.index, temporary_ids)
+            return operand
+
+        instructions = list()
+        with NullStream():
+            for instruction in self._instructions:
+                spill_keys = set((register.kind, register._internal_id)
+                                 for register in filter(is_spilled, instruction.registers))
+                if not spill_keys:
+                    instructions.append(instruction)
+                    continue
+
+                output_registers_masks = instruction.output_registers_masks
+                loads, stores = list(), list()
+                temporary_ids = dict()
+                for spill_key in sorted(spill_keys):
+                    kind, register_id = spill_key
+                    temporary_ids[spill_key] = allocate_register_id[kind]()
+                    temporary_register = slot_registers[spill_key](virtual_id=temporary_ids[spill_key])
+                    # Reload the register if the instruction reads any part of it
+                    if instruction._live_registers.get(register_id, 0) & kind_masks[kind] != 0:
+                        loads.append(LOAD.LOCAL(temporary_register, slots[spill_key], prototype=instruction))
+                    if output_registers_masks.get(register_id, 0) & kind_masks[kind] != 0:
+                        stores.append(STORE.LOCAL(slots[spill_key], temporary_register, prototype=instruction))
+                instruction.operands = tuple(replace_registers(operand, temporary_ids)
+                                             for operand in instruction.operands)
+                instructions.extend(loads)
+                instructions.append(instruction)
+                instructions.extend(stores)
+        self._instructions = instructions
 
     def _preallocate_registers(self):
         """Allocates registers that can be binded only to a single virtual register.
@@ -782,11 +1040,13 @@ class Function:
     def _bind_registers(self):
         """Iterates through the list of instructions and assigns physical IDs to allocated registers"""
 
-        for instruction in self._instructions:
-            for register in instruction.registers:
+        arrays = self._instruction_arrays
+        for i in arrays.virtual_register_positions:
+            for register in self._instructions[i].registers:
                 if register.is_virtual:
                     register.physical_id = \
                         self._register_allocations[register.kind].get(register._internal_id, register.physical_id)
+        arrays.bind_registers(self._register_allocations)
 
     def _allocate_local_variable(self):
         """Returns a new unique ID for a local variable"""
@@ -888,7 +1148,7 @@ class ABIFunction:
     def __init__(self, function, abi):
         from peachpy.x86_64.abi import ABI, microsoft_x64_abi, system_v_x86_64_abi, linux_x32_abi, \
             native_client_x86_64_abi, golang_amd64_abi, golang_amd64p32_abi
-        from copy import deepcopy
+        from peachpy.x86_64.profiler import phase
         assert isinstance(function, Function), "Function object expected"
         assert isinstance(abi, ABI), "ABI object expected"
         self.name = function.name
@@ -904,43 +1164,71 @@ class ABIFunction:
         self.avx_environment = function.avx_environment
         self._avx_prolog = function._avx_prolog
 
+        import peachpy.x86_64.cache
+        self._cache_key = None
+        if peachpy.x86_64.cache.get_active_cache() is not None:
+            self._cache_key = peachpy.x86_64.cache.CompilationCache.get_key(function, abi)
+        # The function was already looked up in the cache at the end of its definition
+        self._cache_missed = self._cache_key is not None and self._cache_key == function._missed_cache_key
+
         from peachpy.x86_64.registers import rsp
         self._stack_base = rsp
         self._stack_frame_size = 0
 
-        self._instructions = deepcopy(function._instructions)
-        self._conflicting_registers = function._conflicting_registers.copy()
-        self._register_allocations = function._register_allocations.copy()
-
-        if abi == microsoft_x64_abi:
-            self._setup_windows_arguments()
-        elif abi in {system_v_x86_64_abi, linux_x32_abi, native_client_x86_64_abi}:
-            self._setup_unix_arguments()
-        elif abi in {golang_amd64_abi, golang_amd64p32_abi}:
-            self._setup_golang_arguments()
-        else:
-            raise ValueError("Unsupported ABI: %s" % str(abi))
-
-        self._update_argument_loads(function.arguments)
-
-        self._allocate_registers()
-        self._bind_registers()
+        # Statistics of the peephole optimization pass, if it is enabled
+        self.peephole_report = None
+
+        with phase(self, "abi_setup"):
+            # Instructions are shared with the function and other ABI-specific versions of it: the passes below copy
+            # an instruction before they modify it or its operands
+            self._instructions = list(function._instructions)
+            # The arrays describe the instructions until registers are bound
+            self._instruction_arrays = function._instruction_arrays
+            self._conflicting_registers = function._conflicting_registers.copy()
+            # Allocations are ABI-specific: only copy pre-allocated registers and do not modify the function's tables
+            self._register_allocations = {kind: allocations.copy()
+                                          for (kind, allocations) in six.iteritems(function._register_allocations)}
+
+            if abi == microsoft_x64_abi:
+                self._setup_windows_arguments()
+            elif abi in {system_v_x86_64_abi, linux_x32_abi, native_client_x86_64_abi}:
+                self._setup_unix_arguments()
+            elif abi in {golang_amd64_abi, golang_amd64p32_abi}:
+                self._setup_golang_arguments()
+            else:
+                raise ValueError("Unsupported ABI: %s" % str(abi))
 
-        self._clobbered_registers = self._analyze_clobbered_registers()
-        self._update_stack_frame()
-        self._update_argument_addresses()
+            self._update_argument_loads(function.arguments)
 
-        self._lower_argument_loads()
-        self._lower_pseudoinstructions()
-        # self._lower_complex_instructions
-        self._filter_instruction_encodings()
+        with phase(self, "register_allocation"):
+            self._allocate_registers()
+            self._bind_registers()
+            self._instruction_arrays = None
+
+        with phase(self, "stack_frame"):
+            self._clobbered_registers = self._analyze_clobbered_registers()
+            self._update_stack_frame()
+            self._update_argument_addresses()
+
+        with phase(self, "lowering") as lowering_phase:
+            self._lower_argument_loads()
+            self._lower_local_variable_accesses()
+            self._lower_pseudoinstructions()
+            if peachpy.x86_64.options.get_option("peephole"):
+                self._optimize_instructions()
+            # self._lower_complex_instructions
+            self._filter_instruction_encodings()
+            lowering_phase.count("instructions", len(self._instructions))
 
         # self.stack_frame = StackFrame(self.abi)
 
     def _update_argument_loads(self, arguments):
         from peachpy.x86_64.pseudo import LOAD
-        for instruction in self._instructions:
+        from copy import copy
+        for (i, instruction) in enumerate(self._instructions):
             if isinstance(instruction, LOAD.ARGUMENT):
+                instruction = copy(instruction)
+                self._instructions[i] = instruction
                 instruction.operands = \
                     (instruction.operands[0], self.arguments[arguments.index(instruction.operands[1])])
                 if instruction.operands[1].register in instruction.available_registers:
@@ -1045,57 +1333,12 @@ class ABIFunction:
             self.result_offset = roundup(stack_offset, self.result_type.size)
 
     def _allocate_registers(self):
-        from peachpy.x86_64.registers import Register, GeneralPurposeRegister, MMXRegister, XMMRegister
-        from peachpy.util import unique, append_unique
+        """Binds virtual registers to physical registers of the ABI with a graph-coloring register allocator"""
+        from peachpy.x86_64.regalloc import RegisterAllocator
 
-        allocation_options = {
-            # Map from virtual register id to a list of possible allocations in priority order
-            GeneralPurposeRegister._kind: dict(),
-            MMXRegister._kind: dict(),
-            XMMRegister._kind: dict()
-        }
-        from peachpy.x86_64.pseudo import LOAD
-        for vreg_kind, vreg_ids in six.iteritems(self._conflicting_registers):
-            for vreg_id in vreg_ids:
-                allocation_options[vreg_kind][vreg_id] = []
-
-        for instruction in self._instructions:
-            if isinstance(instruction, LOAD.ARGUMENT):
-                dst_reg = instruction.operands[0]
-                src_arg = instruction.operands[1]
-                assert isinstance(dst_reg, Register)
-                assert isinstance(src_arg, Argument)
-                if dst_reg.is_virtual and src_arg.register is not None:
-                    allocation_options[dst_reg.kind][dst_reg._internal_id] = [src_arg.register.physical_id]
-
-        # A list of physical register IDs ordered by allocation priority:
-        # - Volatile and argument registers go first
-        # - Then allocation may use non-volatile registers
-        physical_register_ids = list(map(operator.attrgetter("physical_id"), self.abi.volatile_registers +
-                                         list(reversed(self.abi.argument_registers)) + self.abi.callee_save_registers))
-        for vreg_kind, vreg_ids in six.iteritems(allocation_options):
-            for vreg_id in vreg_ids:
-                allocation_options[vreg_kind][vreg_id] = \
-                    unique(allocation_options[vreg_kind][vreg_id] + physical_register_ids)
-                for conflicting_reg_id in self._conflicting_registers[vreg_kind][vreg_id]:
-                    if conflicting_reg_id >= 0 and conflicting_reg_id in allocation_options[vreg_kind][vreg_id]:
-                        allocation_options[vreg_kind][vreg_id].remove(conflicting_reg_id)
-
-        # Allocate registers
-        for vreg_kind, vreg_ids in six.iteritems(allocation_options):
-            # Choose the register to allocate
-            for vreg_id in vreg_ids:
-                if not vreg_ids[vreg_id]:
-                    raise Exception("Not physical registers for vreg_id = " + str(vreg_id))
-                physical_id = vreg_ids[vreg_id].pop(0)
-                for vconflict_id in self._conflicting_registers[vreg_kind][vreg_id]:
-                    if vconflict_id in vreg_ids:
-                        valloc_ids = vreg_ids[vconflict_id]
-                        try:
-                            valloc_ids.remove(physical_id)
-                        except ValueError:
-                            pass
-                self._register_allocations[vreg_kind][vreg_id] = physical_id
+        allocator = RegisterAllocator(self.abi, self._instructions, self._instruction_arrays,
+                                      self._conflicting_registers, self._register_allocations)
+        allocator.allocate()
 
     def _lower_argument_loads(self):
         from peachpy.x86_64.pseudo import LOAD
@@ -1130,6 +1373,23 @@ class ABIFunction:
                 lowered_instructions.append(instruction)
         self._instructions = lowered_instructions
 
+    def _lower_local_variable_accesses(self):
+        from peachpy.x86_64.pseudo import LOAD, STORE
+        from peachpy.x86_64.lower import load_local_variable, store_local_variable
+        lowered_instructions = []
+        for instruction in self._instructions:
+            if isinstance(instruction, LOAD.LOCAL):
+                lowered_instructions.append(load_local_variable(instruction.operands[0],
+                                                                instruction.operands[1],
+                                                                prototype=instruction))
+            elif isinstance(instruction, STORE.LOCAL):
+                lowered_instructions.append(store_local_variable(instruction.operands[0],
+                                                                 instruction.operands[1],
+                                                                 prototype=instruction))
+            else:
+                lowered_instructions.append(instruction)
+        self._instructions = lowered_instructions
+
     def _lower_pseudoinstructions(self):
         from peachpy.x86_64.pseudo import RETURN, STORE
         from peachpy.x86_64.mmxsse import MOVAPS
@@ -1141,6 +1401,7 @@ class ABIFunction:
         from peachpy.x86_64.registers import GeneralPurposeRegister64, XMMRegister, rsp
         from peachpy.util import is_uint32, is_sint32, is_int
         from peachpy.stream import InstructionStream
+        from copy import copy
         # The new list with lowered instructions
         instructions = list()
         # Generate prologue
@@ -1158,10 +1419,10 @@ class ABIFunction:
                     PUSH(reg)
                 else:
                     cloberred_xmm_registers.append(reg)
-            if cloberred_xmm_registers:
-                # Total size of the stack frame less what is already adjusted with PUSH instructions
-                stack_adjustment = \
-                    self._stack_frame_size - len(cloberred_general_purpose_registers) * GeneralPurposeRegister64.size
+            # Total size of the stack frame less what is already adjusted with PUSH instructions
+            stack_adjustment = \
+                self._stack_frame_size - len(cloberred_general_purpose_registers) * GeneralPurposeRegister64.size
+            if stack_adjustment != 0:
                 SUB(rsp, stack_adjustment)
             for i, xmm_reg in enumerate(cloberred_xmm_registers):
                 movaps = VMOVAPS if self._avx_prolog else MOVAPS
@@ -1255,15 +1516,12 @@ class ABIFunction:
                         VZEROUPPER()
                     # Generate epilog
                     # 1. Restore clobbered XMM registers on stack with (V)MOVAPS instruction
-                    # 2. If there are clobbered XMM registers, release their space on stack (increment stack pointer)
+                    # 2. Release the space for XMM registers and local variables on stack (increment stack pointer)
                     # 3. Restore clobbered general-purpose registers with PUSH instruction
                     for i, xmm_reg in enumerate(cloberred_xmm_registers):
                         movaps = VMOVAPS if self.avx_environment else MOVAPS
-                        movaps([rsp + i * XMMRegister.size], xmm_reg)
-                    if cloberred_xmm_registers:
-                        # Total size of the stack frame less what will be adjusted with POP instructions
-                        stack_adjustment = self._stack_frame_size - \
-                            len(cloberred_general_purpose_registers) * GeneralPurposeRegister64.size
+                        movaps(xmm_reg, [rsp + i * XMMRegister.size])
+                    if stack_adjustment != 0:
                         ADD(rsp, stack_adjustment)
                     # Important: registers must be POPed in reverse order
                     for reg in reversed(cloberred_general_purpose_registers):
@@ -1276,6 +1534,7 @@ class ABIFunction:
                         RET(prototype=instruction)
                 instructions.extend(epilog_stream.instructions)
             elif isinstance(instruction, STORE.RESULT):
+                instruction = copy(instruction)
                 instruction.destination_offset = self.result_offset
                 instructions.append(instruction)
             else:
@@ -1294,15 +1553,38 @@ class ABIFunction:
                             with InstructionStream():
                                 from peachpy.x86_64.generic import MOV
                                 instructions.append(MOV(memory_address.base.as_dword, memory_address.base.as_dword))
-                            memory_address.index = memory_address.base
-                            memory_address.scale = 1
-                            memory_address.base = r15
+                            memory_operand = copy(memory_operands[0])
+                            memory_operand.address = copy(memory_address)
+                            memory_operand.address.index = memory_address.base
+                            memory_operand.address.scale = 1
+                            memory_operand.address.base = r15
+                            instruction = copy(instruction)
+                            instruction.operands = tuple(memory_operand if operand is memory_operands[0] else operand
+                                                         for operand in instruction.operands)
                 instructions.append(instruction)
         self._instructions = instructions
 
+    def _optimize_instructions(self):
+        """Rewrites instructions into shorter or cheaper equivalents with the patterns of the peephole_patterns option.
+
+        The statistics of the rewrites are stored in the peephole_report attribute and in the counters of the profiler.
+        """
+        import peachpy.x86_64.options
+        from peachpy.x86_64.peephole import optimize_instructions
+        from peachpy.x86_64.profiler import count
+        self._instructions, self.peephole_report = \
+            optimize_instructions(self._instructions, peachpy.x86_64.options.get_option("peephole_patterns"))
+        count(self, "peephole", "removed_instructions", self.peephole_report.removed_instructions)
+        count(self, "peephole", "saved_bytes", self.peephole_report.saved_bytes)
+
     def _filter_instruction_encodings(self):
-        for instruction in self._instructions:
-            instruction.encodings = instruction._filter_encodings()
+        from copy import copy
+        for (i, instruction) in enumerate(self._instructions):
+            encodings = instruction._filter_encodings()
+            if len(encodings) != len(instruction.encodings):
+                instruction = copy(instruction)
+                instruction.encodings = encodings
+                self._instructions[i] = instruction
 
     def _update_argument_addresses(self):
         from peachpy.x86_64.registers import rsp
@@ -1328,7 +1610,9 @@ class ABIFunction:
         return list(sorted(filter(lambda reg: reg in self.abi.callee_save_registers, output_registers)))
 
     def _update_stack_frame(self):
-        from peachpy.x86_64.registers import GeneralPurposeRegister64, XMMRegister
+        from peachpy.x86_64.registers import GeneralPurposeRegister64, XMMRegister, rsp
+        from peachpy.x86_64.abi import golang_amd64_abi, golang_amd64p32_abi
+        from copy import copy
         clobbered_general_purpose_registers = 0
         clobbered_xmm_registers = 0
         for reg in self._clobbered_registers:
@@ -1338,26 +1622,91 @@ class ABIFunction:
                 clobbered_general_purpose_registers += 1
             else:
                 clobbered_xmm_registers += 1
+        # Local variables are placed on stack after the saved XMM registers
+        local_variables_size = 0
+        local_variables = dict()
+        # Addresses of local variables are ABI-specific: instructions refer to copies of the function's variables
+        local_variable_copies = dict()
+        for (i, instruction) in enumerate(self._instructions):
+            if any(isinstance(operand, LocalVariable) for operand in instruction.operands):
+                instruction = copy(instruction)
+                instruction.operands = tuple(_copy_local_variable(operand, local_variable_copies)
+                                             if isinstance(operand, LocalVariable) else operand
+                                             for operand in instruction.operands)
+                self._instructions[i] = instruction
+                for operand in instruction.operands:
+                    if isinstance(operand, LocalVariable):
+                        local_variables.setdefault(operand.root._id, list()).append(operand.root)
+        if local_variables and self.abi in {golang_amd64_abi, golang_amd64p32_abi}:
+            raise ValueError("Local variables are not supported with %s" % str(self.abi))
+        # Place variables with the largest alignment first to minimize padding
+        local_variables_offsets = dict()
+        for variable_id in sorted(local_variables,
+                                  key=lambda variable_id: (-local_variables[variable_id][0].alignment, variable_id)):
+            # Stack frame is aligned on 16 bytes, and stronger alignment is not guaranteed
+            alignment = min(local_variables[variable_id][0].alignment, 16)
+            local_variables_size += (alignment - local_variables_size % alignment) % alignment
+            local_variables_offsets[variable_id] = local_variables_size
+            local_variables_size += local_variables[variable_id][0].size
+        for (variable_id, variables) in six.iteritems(local_variables):
+            for variable in variables:
+                variable._address = \
+                    rsp + (clobbered_xmm_registers * XMMRegister.size + local_variables_offsets[variable_id])
+
         self._stack_frame_size = \
             clobbered_general_purpose_registers * GeneralPurposeRegister64.size + \
-            clobbered_xmm_registers * XMMRegister.size
+            clobbered_xmm_registers * XMMRegister.size + local_variables_size
         # 1. On function entry stack is misaligned by 8
         # 2. Each clobbered general-purpose register is pushed as 8 bytes
         # 3. If the number of clobbered general-purpose registers is odd, the stack will be misaligned by 8 after they
         #    are pushed on stack
-        # 4. If additionally there are clobbered XMM registers, we need to subtract 8 from stack to make it aligned
-        #    by 16 after the general-purpose registers are pushed
-        if clobbered_xmm_registers != 0 and clobbered_general_purpose_registers % 2 == 0:
-            self._stack_frame_size += 8
+        # 4. If additionally there are clobbered XMM registers or local variables, we need to subtract enough from
+        #    stack to make it aligned by 16 after the whole stack frame is allocated
+        if clobbered_xmm_registers != 0 or local_variables:
+            return_address_size = 8
+            self._stack_frame_size += -(self._stack_frame_size + return_address_size) % 16
 
     def _bind_registers(self):
-        """Iterates through the list of instructions and assigns physical IDs to allocated registers"""
+        """Iterates through the list of instructions and assigns physical IDs to allocated registers.
 
-        for instruction in self._instructions:
-            for register in instruction.registers:
-                if register.is_virtual:
-                    register.physical_id = \
-                        self._register_allocations[register.kind].get(register._internal_id, register.physical_id)
+        Registers are shared with the function, thus instructions with virtual registers are replaced with copies
+        which refer to the bound copies of the registers.
+        """
+        from copy import copy
+        from peachpy.x86_64.registers import Register
+        from peachpy.x86_64.operand import MemoryOperand
+
+        # Map from id of a virtual register object to its bound copy
+        bound_registers = dict()
+
+        def bind_register(register):
+            if register is None or not register.is_virtual:
+                return register
+            bound_register = bound_registers.get(id(register))
+            if bound_register is None:
+                bound_register = copy(register)
+                bound_register.physical_id = \
+                    self._register_allocations[register.kind].get(register._internal_id, register.physical_id)
+                bound_registers[id(register)] = bound_register
+            return bound_register
+
+        def bind_operand(operand):
+            if isinstance(operand, Register):
+                return bind_register(operand)
+            elif isinstance(operand, MemoryOperand):
+                address = operand.address
+                if (address.base is not None and address.base.is_virtual) or \
+                        (address.index is not None and address.index.is_virtual):
+                    operand = copy(operand)
+                    operand.address = copy(address)
+                    operand.address.base = bind_register(address.base)
+                    operand.address.index = bind_register(address.index)
+            return operand
+
+        for i in self._instruction_arrays.virtual_register_positions:
+            instruction = copy(self._instructions[i])
+            instruction.operands = tuple(map(bind_operand, instruction.operands))
+            self._instructions[i] = instruction
 
     def format_code(self, assembly_format="peachpy", line_separator=os.linesep, indent=True):
         """Returns code of assembly instructions comprising the function"""
@@ -1417,7 +1766,19 @@ class ABIFunction:
             return str(line_separator).join(code)
 
     def encode(self):
-        return EncodedFunction(self)
+        import peachpy.x86_64.cache
+        cache = peachpy.x86_64.cache.get_active_cache()
+        if cache is None or self._cache_key is None:
+            return EncodedFunction(self)
+
+        encoded_function = None
+        if not self._cache_missed:
+            encoded_function = cache.lookup(self._cache_key, self, self.abi)
+        if encoded_function is None:
+            encoded_function = EncodedFunction(self)
+            cache.insert(self._cache_key, encoded_function)
+            self._cache_missed = False
+        return encoded_function
 
 
 class InstructionBundle:
@@ -1468,25 +1829,47 @@ class InstructionBundle:
         else:
             raise BufferError()
 
-    def realign(self):
-        from peachpy.x86_64.instructions import BranchInstruction, Instruction
+    def realign(self, padding=None):
+        """Chooses longer encodings of instructions in the bundle to grow it without NOP instructions.
+
+        Branches keep their encodings, and instructions before a short branch are lengthened only while the branch still
+        reaches its label. Among the choices of encodings with the largest total growth, the method prefers the choice
+        which lengthens the fewest instructions. Returns the number of bytes of the padding which longer encodings could
+        not fill.
+
+        :param int padding: the number of bytes to grow the bundle by. If None, the bundle is grown to its capacity.
+        """
+        from peachpy.x86_64.instructions import BranchInstruction
         from peachpy.x86_64.pseudo import LABEL
-        from peachpy.util import diff
-        encoding_options = []
-        for i, instruction in enumerate(self._instructions):
-            assert isinstance(instruction, Instruction)
+        if padding is None:
+            padding = self.capacity - self.size
+        # Map from the total growth of instructions up to the current one to the list of tuples (instruction position,
+        # longer bytecode) with the fewest lengthened instructions which achieves the growth
+        growth_choices = {0: []}
+        position = 0
+        for (i, instruction) in enumerate(self._instructions):
             if isinstance(instruction, BranchInstruction):
-                (label_address, long_encoding, branch_pos_max) = self.branch_info_map[i]
-                length_encoding_map = dict()
-                _, bytecode = instruction._encode_label_branch(self.end_address, label_address, long_encoding)
-                encoding_options.append(list())
-            else:
-                length_options = instruction.encode_length_options().keys()
-                min_length = min(length_options)
-                encoding_options.append(
-                    diff(sorted([length - min_length for length in length_options])))
-        gap = self.capacity - self.size
-
+                _, _, branch_pos_max = self.branch_info_map[i]
+                growth_choices = {growth: choices for (growth, choices) in six.iteritems(growth_choices)
+                                  if growth == 0 or position + growth <= branch_pos_max}
+            elif not isinstance(instruction, LABEL) and instruction.encodings:
+                length = len(instruction.bytecode)
+                instruction_choices = dict(growth_choices)
+                for (encoding_length, bytecode) in six.iteritems(instruction.encode_length_options()):
+                    if encoding_length <= length:
+                        continue
+                    for (growth, choices) in six.iteritems(growth_choices):
+                        new_growth = growth + encoding_length - length
+                        if new_growth <= padding and (new_growth not in instruction_choices or
+                                                      len(instruction_choices[new_growth]) > len(choices) + 1):
+                            instruction_choices[new_growth] = choices + [(i, bytecode)]
+                growth_choices = instruction_choices
+            position += len(instruction.bytecode or ())
+        growth = max(growth_choices)
+        for (i, bytecode) in growth_choices[growth]:
+            self._instructions[i].bytecode = bytecode
+        self.size += growth
+        return padding - growth
 
     @property
     def label_address_map(self):
@@ -1508,14 +1891,14 @@ class InstructionBundle:
         return self.size
 
 
-class EncodedFunction:
+class EncodedFunction(object):
     """ABI-specific x86-64 assembly function.
 
     A function consists of C signature, ABI, and a list of instructions without virtual registers.
     """
 
     def __init__(self, function):
-        from copy import copy, deepcopy
+        from copy import copy
         assert isinstance(function, ABIFunction), "ABIFunction object expected"
         self.name = function.name
         self.arguments = list(map(copy, function.arguments))
@@ -1523,50 +1906,303 @@ class EncodedFunction:
         self.target = function.target
         self.abi = function.abi
 
-        self._instructions = deepcopy(function._instructions)
-        self._register_allocations = function._register_allocations.copy()
+        from peachpy.x86_64.profiler import phase
+        from peachpy.x86_64.encoding import encoding_cache
+        with phase(self, "encoding") as encoding_phase:
+            cache_hits, cache_misses = encoding_cache.hits, encoding_cache.misses
+            # Instructions are shared with the ABI function: _encode copies the instructions it assigns bytecode to
+            self._instructions = list(function._instructions)
+            self._register_allocations = function._register_allocations.copy()
+
+            import peachpy.x86_64.options
+            if peachpy.x86_64.options.get_option("align_loops") or \
+                    peachpy.x86_64.options.get_option("align_branches"):
+                self._insert_alignments()
+            self._encode()
+            encoding_phase.count("instructions", len(self._instructions))
+            encoding_phase.count("bytes", len(self._code))
+            encoding_phase.count("encoding_cache_hits", encoding_cache.hits - cache_hits)
+            encoding_phase.count("encoding_cache_misses", encoding_cache.misses - cache_misses)
 
-        self._encode()
+    @staticmethod
+    def _from_code(function, abi, code, instruction_addresses, code_alignment=1):
+        """Creates an encoded function with previously encoded code, e.g. restored from the compilation cache.
 
-    def _encode(self):
-        from peachpy.x86_64.pseudo import LABEL
+        The encoded function does not contain instruction objects.
+
+        :param function: the Function or ABIFunction object which provides the name and the signature.
+        :param peachpy.abi.ABI abi: the ABI the function is bound to.
+        :param bytearray code: the encoded code of the function.
+        :param list instruction_addresses: the addresses of instructions in the code followed by the end address.
+        :param int code_alignment: the alignment of the start of the function code.
+        """
+        from copy import copy
+        encoded_function = EncodedFunction.__new__(EncodedFunction)
+        encoded_function.name = function.name
+        encoded_function.arguments = list(map(copy, function.arguments))
+        encoded_function.result_type = function.result_type
+        encoded_function.target = function.target
+        encoded_function.abi = abi
+        encoded_function._instructions = []
+        encoded_function._register_allocations = dict()
+        encoded_function._code = code
+        encoded_function._instruction_addresses = list(instruction_addresses)
+        encoded_function.code_alignment = code_alignment
+        return encoded_function
+
+    def _insert_alignments(self):
+        """Inserts ALIGN pseudo-instructions before loops and jumps for the align_loops and align_branches options.
+
+        With align_loops, the labels of innermost loops are aligned to the loop alignment of the target
+        microarchitecture, or to the alignment specified in the option. With align_branches, jumps, and conditional
+        jumps together with the preceding instructions they macro-fuse with, are padded not to cross or end at a
+        32-byte boundary, as the decoded instruction cache of Skylake-derived microarchitectures does not hold such
+        jumps after the microcode update for the Jcc erratum.
+        """
+        import peachpy.x86_64.options
+        from peachpy.x86_64.analyzer import find_loops
+        from peachpy.x86_64.scheduler import get_scheduling_target
         from peachpy.x86_64.instructions import BranchInstruction
-        label_address_map = dict()
-        long_branches = set()
-
-        has_updated_branches = True
-        has_unresolved_labels = True
-        while has_updated_branches or has_unresolved_labels:
-            code_address = 0
-            has_updated_branches = False
-            has_unresolved_labels = False
+        from peachpy.x86_64.operand import MemoryOperand
+        from peachpy.x86_64.pseudo import ALIGN
+        from peachpy.stream import NullStream
+        from peachpy.util import is_int
+
+        loop_alignment = peachpy.x86_64.options.get_option("align_loops")
+        if loop_alignment is True:
+            loop_alignment = get_scheduling_target(self).loop_alignment
+        loop_positions = set()
+        if loop_alignment:
+            loops = find_loops(self._instructions)
+            # Only innermost loops, which contain no other loops, are aligned
+            loop_positions = {start for (_, start, end) in loops
+                              if not any(start < inner_start and inner_end <= end
+                                         for (_, inner_start, inner_end) in loops)}
+
+        # Map from position of the first instruction of a jump group to the number of instructions in the group
+        jump_groups = dict()
+        if peachpy.x86_64.options.get_option("align_branches"):
+            fused_names = {"CMP", "TEST", "ADD", "SUB", "AND", "INC", "DEC"}
+            for (i, instruction) in enumerate(self._instructions):
+                is_generic = instruction.__class__.__module__ == "peachpy.x86_64.generic"
+                if isinstance(instruction, BranchInstruction) or \
+                        is_generic and instruction.name in {"JMP", "CALL", "RET"}:
+                    previous = self._instructions[i - 1] if i > 0 else None
+                    if isinstance(instruction, BranchInstruction) and instruction.is_conditional and \
+                            previous is not None and previous.name in fused_names and \
+                            previous.__class__.__module__ == "peachpy.x86_64.generic" and \
+                            not (any(isinstance(operand, MemoryOperand) for operand in previous.operands) and
+                                 any(is_int(operand) for operand in previous.operands)):
+                        # Macro-fusion of instructions with memory and immediate operands is not supported
+                        jump_groups[i - 1] = 2
+                    else:
+                        jump_groups[i] = 1
+
+        instructions = []
+        with NullStream():
             for (i, instruction) in enumerate(self._instructions):
-                if isinstance(instruction, LABEL):
-                    label_address_map[instruction.identifier] = code_address
-                elif isinstance(instruction, BranchInstruction) and instruction.label_name:
-                    label_address = label_address_map.get(instruction.label_name)
-                    if label_address is None:
-                        has_unresolved_labels = True
-                    was_long = i in long_branches
-                    is_long, instruction.bytecode = instruction._encode_label_branch(code_address, label_address,
-                                                                                     long_encoding=was_long)
-                    if is_long and not was_long:
-                        long_branches.add(i)
-                        has_updated_branches = True
+                previous = instructions[-1] if instructions else None
+                if i in loop_positions and not isinstance(previous, ALIGN):
+                    instructions.append(ALIGN(loop_alignment))
+                if i in jump_groups:
+                    instructions.append(ALIGN(32, group_size=jump_groups[i]))
+                instructions.append(instruction)
+        self._instructions = instructions
+
+    def _encode(self):
+        """Encodes instructions and chooses the encodings of branches to labels.
+
+        Instructions other than branches to labels are encoded only once. Branches start with the short (rel8) encoding
+        and are relaxed to the long (rel32) encoding when their offset does not fit. After the first pass, each
+        relaxation pass updates the prefix sums of instruction lengths only from the first instruction which changed
+        its length, and re-checks only the short branches whose span covers an instruction which changed its length.
+        The branches are encoded after their lengths are final. ALIGN pseudo-instructions pad the code to their
+        alignment: the padding is filled with longer encodings of the preceding instructions where possible, and with
+        NOPs otherwise.
+        """
+        from peachpy.x86_64.pseudo import LABEL, ALIGN
+        from peachpy.x86_64.instructions import BranchInstruction
+        from peachpy.util import is_sint8
+        from copy import copy
+        import bisect
+
+        # Lengths of instructions in bytes
+        lengths = list()
+        # Map from label name to its position in the instruction list
+        label_positions = dict()
+        # Map from position of a branch instruction which can be relaxed to the lengths of its short and long encodings
+        short_branches = dict()
+        # Map from position of an ALIGN pseudo-instruction to its alignment and the size of the aligned group
+        alignments = dict()
+        for (i, instruction) in enumerate(self._instructions):
+            if isinstance(instruction, LABEL):
+                label_positions[instruction.identifier] = i
+                lengths.append(0)
+            elif isinstance(instruction, ALIGN):
+                alignments[i] = (instruction.alignment, instruction.group_size)
+                lengths.append(0)
+            elif isinstance(instruction, BranchInstruction) and instruction.label_name:
+                short_length, long_length = instruction._label_branch_lengths
+                if short_length is not None and long_length is not None:
+                    short_branches[i] = (short_length, long_length)
+                lengths.append(short_length if short_length is not None else long_length)
+            else:
+                instruction = copy(instruction)
+                instruction.bytecode = instruction.encode()
+                self._instructions[i] = instruction
+                lengths.append(len(instruction.bytecode))
+
+        # Relax branches until all short branches reach their labels.
+        # Branches only grow, thus the process converges in at most as many passes as there are branches.
+        addresses = self._get_instruction_addresses(lengths, alignments)
+        # Spans of short branches: the offset of a branch depends on lengths of instructions in [span_start, span_end)
+        branch_spans = dict()
+        for i in six.iterkeys(short_branches):
+            label_position = label_positions[self._instructions[i].label_name]
+            branch_spans[i] = (min(i + 1, label_position), max(i + 1, label_position))
+        unchecked_branches = list(short_branches)
+        relaxation_passes = 0
+        while True:
+            relaxation_passes += 1
+            long_branches = [i for i in unchecked_branches if not is_sint8(
+                addresses[label_positions[self._instructions[i].label_name]] - addresses[i + 1])]
+            if not long_branches:
+                break
+            for i in long_branches:
+                lengths[i] = short_branches.pop(i)[1]
+            changed_positions = self._update_instruction_addresses(addresses, lengths, alignments, min(long_branches))
+            changed_positions = sorted(changed_positions + long_branches)
+            unchecked_branches = []
+            for i in six.iterkeys(short_branches):
+                span_start, span_end = branch_spans[i]
+                k = bisect.bisect_left(changed_positions, span_start)
+                if k < len(changed_positions) and changed_positions[k] < span_end:
+                    unchecked_branches.append(i)
+
+        if alignments:
+            self._realign(lengths, alignments, addresses)
+            addresses = self._get_instruction_addresses(lengths, alignments)
+
+        code = bytearray()
+        for (i, instruction) in enumerate(self._instructions):
+            if isinstance(instruction, ALIGN):
+                instruction = copy(instruction)
+                self._instructions[i] = instruction
+                instruction.bytecode = self._encode_nops(lengths[i]) if lengths[i] != 0 else bytearray()
+            elif isinstance(instruction, BranchInstruction) and instruction.label_name:
+                label_address = addresses[label_positions[instruction.label_name]]
+                instruction = copy(instruction)
+                self._instructions[i] = instruction
+                _, instruction.bytecode = instruction._encode_label_branch(addresses[i], label_address,
+                                                                           long_encoding=i not in short_branches)
+                assert len(instruction.bytecode) == lengths[i], \
+                    "Internal error: branch %s encoding does not match relaxed length" % str(instruction)
+            if instruction.bytecode:
+                code += instruction.bytecode
+        self._code = code
+        self._instruction_addresses = addresses
+        self.code_alignment = max([alignment for (alignment, _) in six.itervalues(alignments)] + [1])
+
+        from peachpy.x86_64.profiler import count
+        count(self, "encoding", "relaxation_passes", relaxation_passes)
+
+    def _realign(self, lengths, alignments, addresses):
+        """Fills the padding of ALIGN pseudo-instructions with longer encodings of the instructions before them.
+
+        Only the instructions after the last label, branch, or ALIGN pseudo-instruction before the padding are
+        lengthened. As they grow by at most the padding, the addresses of labels and branches do not change.
+
+        :param list lengths: the lengths of instructions, updated with the new lengths of instructions and padding.
+        :param dict alignments: the map from positions of ALIGN pseudo-instructions to tuples of their alignment and
+            the size of the aligned group.
+        :param list addresses: the addresses of instructions with the padding of ALIGN pseudo-instructions.
+        """
+        from peachpy.x86_64.pseudo import LABEL, ALIGN
+        from peachpy.x86_64.instructions import BranchInstruction
+        from peachpy.x86_64.operand import MemoryOperand, MemoryAddress
+        from peachpy.x86_64.profiler import count
+        bundle_capacity = 64
+        for i in sorted(alignments):
+            padding = lengths[i]
+            if padding == 0:
+                continue
+            # The bundle of instructions before the padding: RIP-relative operands would change with the address
+            start = i
+            while start > 0 and lengths[start - 1] + addresses[i] - addresses[start - 1] + padding < bundle_capacity:
+                instruction = self._instructions[start - 1]
+                if isinstance(instruction, (LABEL, ALIGN, BranchInstruction)) or \
+                        any(isinstance(operand, MemoryOperand) and not isinstance(operand.address, MemoryAddress)
+                            for operand in instruction.operands):
+                    break
+                start -= 1
+            if start == i:
+                continue
+            bundle = InstructionBundle(bundle_capacity, addresses[start])
+            for instruction in self._instructions[start:i]:
+                bundle.add(instruction)
+            lengths[i] = bundle.realign(padding)
+            for position in range(start, i):
+                lengths[position] = len(self._instructions[position].bytecode)
+            count(self, "encoding", "realigned_bytes", padding - lengths[i])
+
+    @staticmethod
+    def _get_instruction_addresses(lengths, alignments=None):
+        """Returns the list of instruction addresses (prefix sums of instruction lengths) with the end address.
+
+        :param list lengths: the lengths of instructions. The lengths of ALIGN pseudo-instructions are updated to the
+            padding they need at their addresses.
+        :param dict alignments: the map from positions of ALIGN pseudo-instructions to tuples of their alignment and
+            the size of the aligned group.
+        """
+        addresses = [0] * (len(lengths) + 1)
+        EncodedFunction._update_instruction_addresses(addresses, lengths, alignments, 0)
+        return addresses
+
+    @staticmethod
+    def _update_instruction_addresses(addresses, lengths, alignments, start):
+        """Updates the addresses of instructions after the instruction at the start position changed its length.
+
+        Returns the list of positions of ALIGN pseudo-instructions which changed their padding.
+
+        :param list addresses: the addresses of instructions with the end address, updated in place.
+        :param list lengths: the lengths of instructions. The lengths of ALIGN pseudo-instructions are updated to the
+            padding they need at their addresses.
+        :param dict alignments: the map from positions of ALIGN pseudo-instructions to tuples of their alignment and
+            the size of the aligned group.
+        :param int start: the position of the first instruction which changed its length.
+        """
+        if alignments:
+            # The padding of ALIGN pseudo-instructions depends on the lengths of instructions in their group
+            for (i, (_, group_size)) in six.iteritems(alignments):
+                if i < start and group_size is not None and i + group_size >= start:
+                    start = i
+        changed_alignments = []
+        address = addresses[start]
+        for i in range(start, len(lengths)):
+            length = lengths[i]
+            if alignments and i in alignments:
+                alignment, group_size = alignments[i]
+                if group_size is not None and address % alignment + sum(lengths[i + 1:i + 1 + group_size]) < alignment:
+                    # The group neither crosses nor ends at the alignment boundary
+                    length = 0
                 else:
-                    instruction.bytecode = instruction.encode()
-                if instruction.bytecode:
-                    code_address += len(instruction.bytecode)
+                    length = -address % alignment
+                if length != lengths[i]:
+                    lengths[i] = length
+                    changed_alignments.append(i)
+            address += length
+            addresses[i + 1] = address
+        return changed_alignments
 
     def _encode_nops(self, length):
-        assert 1 <= length <= 31
+        assert length >= 1
         from peachpy.x86_64.encoding import nop
         if length <= 15:
             return nop(length)
         elif length <= 30:
             return nop(length // 2) + nop(length - length // 2)
         else:
-            return nop(8) + nop(8) + nop(15)
+            return nop(15) + self._encode_nops(length - 15)
 
     def _encode_abort(self, length):
         from peachpy.x86_64.abi import native_client_x86_64_abi, golang_amd64_abi, golang_amd64p32_abi
@@ -1615,15 +2251,43 @@ class EncodedFunction:
         else:
             return str(line_separator).join(code)
 
-    def load(self):
-        return ExecutableFuntion(self)
+    def load(self, arena=None):
+        """Loads the function into memory of the current process and returns a callable object for it
+
+        :param peachpy.loader.CodeArena arena: an optional code arena to place the function in. If not specified,
+            the function is loaded into its own memory mapping.
+        """
+        if arena is None:
+            return ExecutableFuntion(self)
+        else:
+            return arena.load([self])[0]
 
     @property
     def as_bytearray(self):
-        if six.PY3:
-            return b"".join(filter(bool, map(operator.attrgetter("bytecode"), self._instructions)))
-        else:
-            return sum(filter(bool, map(operator.attrgetter("bytecode"), self._instructions)), bytearray())
+        """Returns a copy of the function code"""
+        return bytearray(self._code)
+
+    @property
+    def code_view(self):
+        """Returns a view of the function code without copying it.
+
+        The code of all instructions is stored in a single contiguous buffer, and the view can be passed directly to
+        object writers and the loader.
+        """
+        return memoryview(self._code)
+
+    @property
+    def instruction_slices(self):
+        """Returns the list of (offset, length) tuples for code of each instruction in the function code buffer"""
+        addresses = self._instruction_addresses
+        return [(addresses[i], addresses[i + 1] - addresses[i]) for i in range(len(addresses) - 1)]
+
+    def __getstate__(self):
+        # Instructions keep references to encoding functions which can not be pickled.
+        # Pickled encoded functions preserve the code, but not the instruction objects.
+        state = self.__dict__.copy()
+        state["_instructions"] = []
+        return state
 
 
 class ExecutableFuntion:
@@ -1635,7 +2299,8 @@ class ExecutableFuntion:
             raise ValueError("Function ABI (%s) does not match process ABI (%s)" %
                              (str(function.abi), str(process_abi)))
 
-        self.code_segment = function.as_bytearray
+        # The loader copies directly from the bytearray buffer of the code
+        self.code_segment = function._code
 
         import peachpy.loader
         self.loader = peachpy.loader.Loader(len(self.code_segment))
@@ -1657,7 +2322,7 @@ class ExecutableFuntion:
 
 
 class LocalVariable:
-    def __init__(self, size_option, alignment=None):
+    def __init__(self, size_option, alignment=None, function=None):
         from peachpy.util import is_int
         if alignment is not None and not is_int(alignment):
             raise TypeError("alignment %s is not an integer" % str(alignment))
@@ -1674,7 +2339,9 @@ class LocalVariable:
             raise TypeError('Unsupported size specification %s: register or integer expected' % size_option)
         if self.alignment is None:
             self.alignment = self.size
-        self._id = active_function.allocate_local_variable()
+        if function is None:
+            function = get_active_function()
+        self._id = function._allocate_local_variable()
         self._address = None
         self.offset = 0
         self.parent = None
@@ -1689,7 +2356,7 @@ class LocalVariable:
         return hash(self._id)
 
     def __str__(self):
-        if self.address is not None:
+        if self.root._address is not None:
             return "[{0}]".format(self.address)
         else:
             return "local-variable<{0}>".format(self._id)
@@ -1732,3 +2399,20 @@ class LocalVariable:
         child.parent = self
         child.offset = self.size // 2
         return child
+
+
+def _copy_local_variable(variable, variable_copies):
+    """Returns a copy of the local variable with copies of its parent variables.
+
+    :param LocalVariable variable: the local variable to copy.
+    :param dict variable_copies: map from id of a local variable object to its copy. Variables copied with the same map
+        share the copies of common parent variables.
+    """
+    from copy import copy
+    variable_copy = variable_copies.get(id(variable))
+    if variable_copy is None:
+        variable_copy = copy(variable)
+        if variable.parent is not None:
+            variable_copy.parent = _copy_local_variable(variable.parent, variable_copies)
+        variable_copies[id(variable)] = variable_copy
+    return variable_copy
@@ -1,30 +1,100 @@
 # This file is part of Peach-Py package and is licensed under the Simplified BSD license.
 #    See license.rst for the full text of the license.
 
-
+import sys
+import six
 from six.moves import reduce
 
 
+class SourceOrigin(object):
+    """Location of Python code which created an instruction.
+
+    Only the code object and the line number are recorded when the instruction is created. The file name and the
+    source line are resolved when they are requested, e.g. to produce a listing or an error message.
+
+    :ivar int line_number: the line number in the source file.
+    """
+
+    __slots__ = ("code", "line_number", "_source_file")
+
+    def __init__(self, code, line_number, source_file=None):
+        self.code = code
+        self.line_number = line_number
+        self._source_file = source_file
+
+    @staticmethod
+    def capture(depth=1):
+        """Returns the origin of the code which called the current function.
+
+        :param int depth: the number of stack frames between the current function and the caller of interest.
+        """
+        try:
+            frame = sys._getframe(depth + 1)
+        except AttributeError:
+            # Python implementations without sys._getframe
+            import inspect
+            frame = inspect.stack()[depth + 1][0]
+        # Instructions constructed through a LazyInstruction placeholder originate in the caller of the placeholder
+        if frame.f_code is _lazy_instruction_call_code:
+            frame = frame.f_back
+        return SourceOrigin(frame.f_code, frame.f_lineno)
+
+    @staticmethod
+    def from_stack(stack):
+        """Returns the origin of the caller recorded in a stack returned by inspect.stack() in the callee"""
+        frame = stack[1][0]
+        return SourceOrigin(frame.f_code, stack[1][2])
+
+    @property
+    def source_file(self):
+        """The name of the source file"""
+        if self.code is None:
+            return self._source_file
+        return self.code.co_filename
+
+    @property
+    def source_code(self):
+        """The line of source code without leading and trailing whitespace, or None if it is not available"""
+        import linecache
+        source_line = linecache.getline(self.source_file, self.line_number)
+        return source_line.strip() if source_line else None
+
+    def __reduce__(self):
+        # Code objects can not be pickled: keep only the file name and the line number
+        return SourceOrigin, (None, self.line_number, self.source_file)
+
+    def __str__(self):
+        return "%s:%d" % (self.source_file, self.line_number)
+
+
+# Shared map for instructions without implicit input or output registers. The maps of implicit registers are shared
+# between instructions of the same form and must not be modified.
+_no_implicit_registers = dict()
+
+
 class Instruction(object):
+    # Instructions are the most numerous objects in PeachPy: slots avoid a per-instance dictionary. The metadata of
+    # instruction forms (encodings, ISA extensions, input and output operands) is shared between instances.
+    __slots__ = ("name", "origin", "operands",
+                 "_implicit_in_regs", "_implicit_out_regs", "in_regs", "out_regs", "out_operands",
+                 "encodings", "bytecode", "_gas_name", "go_name", "isa_extensions", "mmx_mode", "avx_mode",
+                 "_cancelling_inputs", "_register_index", "_live_registers_bits", "_available_registers_bits",
+                 "_live_registers_masks", "_available_registers_masks", "_indent_level")
+
     def __init__(self, name, origin=None, prototype=None):
         super(Instruction, self).__init__()
         self.name = name
 
-        self.line_number = None
-        self.source_file = None
-        self.source_code = None
-        if origin is not None:
-            self.line_number = origin[1][2]
-            self.source_file = origin[1][1]
-            self.source_code = origin[1][4][0].strip()
-        elif prototype is not None:
-            self.line_number = prototype.line_number
-            self.source_file = prototype.source_file
-            self.source_code = prototype.source_code
+        if origin is not None and not isinstance(origin, SourceOrigin):
+            # Stack returned by inspect.stack()
+            origin = SourceOrigin.from_stack(origin)
+        elif origin is None and prototype is not None:
+            origin = prototype.origin
+        self.origin = origin
 
         self.operands = ()
-        self._implicit_in_regs = dict()
-        self._implicit_out_regs = dict()
+        self._implicit_in_regs = _no_implicit_registers
+        self._implicit_out_regs = _no_implicit_registers
         self.in_regs = ()
         self.out_regs = ()
         self.out_operands = ()
@@ -38,9 +108,14 @@ class Instruction(object):
         self.mmx_mode = None
         self.avx_mode = None
         self._cancelling_inputs = False
+        # Live and available registers are stored as bitsets after register lifetime analysis and are decoded on query
+        self._register_index = None
+        self._live_registers_bits = None
+        self._available_registers_bits = None
         if prototype is None:
-            self._available_registers = dict()
-            self._live_registers = dict()
+            # Empty maps of live and available registers are created on query
+            self._available_registers_masks = None
+            self._live_registers_masks = None
             self._indent_level = 0
         else:
             self._available_registers = prototype._available_registers.copy()
@@ -53,6 +128,21 @@ class Instruction(object):
         else:
             return str(self.name)
 
+    @property
+    def line_number(self):
+        """The number of the line of Python code which created the instruction, or None if it is not recorded"""
+        return self.origin.line_number if self.origin is not None else None
+
+    @property
+    def source_file(self):
+        """The Python source file which created the instruction, or None if it is not recorded"""
+        return self.origin.source_file if self.origin is not None else None
+
+    @property
+    def source_code(self):
+        """The line of Python code which created the instruction, or None if it is not recorded"""
+        return self.origin.source_code if self.origin is not None else None
+
     @property
     def gas_name(self):
         if self._gas_name is None:
@@ -92,6 +182,32 @@ class Instruction(object):
         from operator import or_
         return reduce(or_, map(get_operand_registers, self.operands), set())
 
+    @property
+    def _live_registers(self):
+        if self._live_registers_bits is not None:
+            return self._register_index.decode(self._live_registers_bits)
+        if self._live_registers_masks is None:
+            return dict()
+        return self._live_registers_masks
+
+    @_live_registers.setter
+    def _live_registers(self, live_registers):
+        self._live_registers_bits = None
+        self._live_registers_masks = live_registers
+
+    @property
+    def _available_registers(self):
+        if self._available_registers_bits is not None:
+            return self._register_index.decode(self._available_registers_bits)
+        if self._available_registers_masks is None:
+            return dict()
+        return self._available_registers_masks
+
+    @_available_registers.setter
+    def _available_registers(self, available_registers):
+        self._available_registers_bits = None
+        self._available_registers_masks = available_registers
+
     @property
     def available_registers(self):
         from peachpy.x86_64.registers import Register
@@ -174,12 +290,23 @@ class Instruction(object):
         return registers_masks
 
     def encode(self):
+        if not self.encodings:
+            return bytearray()
+        from peachpy.x86_64.encoding import encoding_cache
+        cache_key = encoding_cache.get_key(self, "encode")
+        if cache_key is not None:
+            bytecode = encoding_cache.lookup(cache_key)
+            if bytecode is not None:
+                return bytearray(bytecode)
         encodings = self._filter_encodings()
         if encodings:
             bytecodes = [encoding(self.operands) for (_, encoding) in encodings]
-            return min(bytecodes, key=len)
+            bytecode = min(bytecodes, key=len)
         else:
-            return bytearray()
+            bytecode = bytearray()
+        if cache_key is not None:
+            encoding_cache.insert(cache_key, bytes(bytecode))
+        return bytecode
 
     def encode_options(self):
         if self.encodings:
@@ -190,6 +317,19 @@ class Instruction(object):
             return bytearray()
 
     def encode_length_options(self):
+        from peachpy.x86_64.encoding import encoding_cache
+        cache_key = encoding_cache.get_key(self, "encode_length_options")
+        if cache_key is not None:
+            length_encodings = encoding_cache.lookup(cache_key)
+            if length_encodings is not None:
+                return {length: bytearray(bytecode) for (length, bytecode) in length_encodings}
+        length_encoding_map = self._encode_length_options()
+        if cache_key is not None:
+            encoding_cache.insert(cache_key, tuple((length, bytes(bytecode))
+                                                   for (length, bytecode) in six.iteritems(length_encoding_map)))
+        return length_encoding_map
+
+    def _encode_length_options(self):
         from peachpy.x86_64.encoding import Flags, Options
         length_encoding_map = {}
         encode_options = []
@@ -297,10 +437,27 @@ class Instruction(object):
 
 
 class BranchInstruction(Instruction):
+    __slots__ = ("is_conditional",)
+
     def __init__(self, name, origin=None, prototype=None):
         super(BranchInstruction, self).__init__(name, origin=origin, prototype=prototype)
         self.is_conditional = name != "JMP"
 
+    @property
+    def _label_branch_lengths(self):
+        """Returns a tuple (length of rel8 encoding, length of rel32 encoding) for a branch to a label.
+
+        The length is None if the branch instruction does not have the corresponding encoding.
+        """
+        from peachpy.x86_64.encoding import Flags
+        short_length, long_length = None, None
+        for (flags, encode) in self.encodings:
+            if flags & Flags.Rel8Label != 0:
+                short_length = len(encode(0))
+            elif flags & Flags.Rel32Label != 0:
+                long_length = len(encode(0))
+        return short_length, long_length
+
     def _encode_label_branch(self, address, label_address=None, long_encoding=False):
         if label_address is None:
             encodings = [encode(0) for (_, encode) in self.encodings]
@@ -329,3 +486,66 @@ class BranchInstruction(Instruction):
         from peachpy.x86_64.pseudo import Label
         if isinstance(self.operands[0], Label):
             return self.operands[0].name
+
+
+class LazyInstruction(object):
+    """Placeholder for an instruction class which is defined in a generated module and imported on the first use.
+
+    Calling the placeholder constructs an instruction of the placeholder's class, and isinstance and issubclass checks
+    against the placeholder are checks against the class. Importing the placeholders instead of the instruction
+    classes lets scripts pay the import time only for the instruction set extensions which they use.
+
+    :ivar str __name__: the name of the instruction class.
+    :ivar str module_name: the full name of the module which defines the instruction class.
+    """
+
+    __slots__ = ("__name__", "module_name", "_instruction_class")
+
+    def __new__(cls, name, module_name, namespace=None):
+        if namespace is not None:
+            # Before Python 3.7 a class statement which derives from the placeholder calls the type of the placeholder
+            # with the name, the bases, and the namespace of the new class
+            bases = tuple(base._instruction_class or base.load() if isinstance(base, LazyInstruction) else base
+                          for base in module_name)
+            return type(name, bases, namespace)
+        return super(LazyInstruction, cls).__new__(cls)
+
+    def __init__(self, name, module_name):
+        self.__name__ = name
+        self.module_name = module_name
+        self._instruction_class = None
+
+    def load(self):
+        """Imports the module of the instruction and returns the instruction class"""
+        instruction_class = self._instruction_class
+        if instruction_class is None:
+            import importlib
+            module = importlib.import_module(self.module_name)
+            instruction_class = getattr(module, self.__name__)
+            self._instruction_class = instruction_class
+        return instruction_class
+
+    def __call__(self, *args, **kwargs):
+        # SourceOrigin.capture skips this frame, so the instruction records the caller of the placeholder as its origin
+        return (self._instruction_class or self.load())(*args, **kwargs)
+
+    def __instancecheck__(self, instance):
+        return isinstance(instance, self._instruction_class or self.load())
+
+    def __subclasscheck__(self, subclass):
+        return issubclass(subclass, self._instruction_class or self.load())
+
+    def __mro_entries__(self, bases):
+        # Classes which derive from the placeholder derive from the instruction class (Python 3.7+)
+        return (self._instruction_class or self.load(),)
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._instruction_class or self.load(), name)
+
+    def __repr__(self):
+        return "<lazy instruction %s.%s>" % (self.module_name, self.__name__)
+
+
+_lazy_instruction_call_code = LazyInstruction.__call__.__code__
@@ -0,0 +1,189 @@
+# This file is part of Peach-Py package and is licensed under the Simplified BSD license.
+#    See license.rst for the full text of the license.
+
+from array import array
+import threading
+
+
+class InstructionCategory:
+    """Categories of instructions which delimit basic blocks"""
+    Other = 0
+    Label = 1
+    Branch = 2
+    ConditionalBranch = 3
+    Return = 4
+
+
+class RegisterRole:
+    """Positions of a register in an instruction operand"""
+    Register = 0
+    MemoryBase = 1
+    MemoryIndex = 2
+
+
+# Map from instruction class to its opcode id, and the list of instruction classes in the order of opcode ids.
+# Opcode ids are shared by all functions in the process, and new ids are assigned under the lock.
+_opcode_ids = dict()
+_opcode_ids_lock = threading.Lock()
+opcode_classes = list()
+
+
+def get_opcode_id(instruction_class):
+    """Returns the opcode id of an instruction class, and assigns a new id to the class if needed"""
+    opcode_id = _opcode_ids.get(instruction_class)
+    if opcode_id is None:
+        with _opcode_ids_lock:
+            opcode_id = _opcode_ids.get(instruction_class)
+            if opcode_id is None:
+                opcode_id = len(opcode_classes)
+                opcode_classes.append(instruction_class)
+                _opcode_ids[instruction_class] = opcode_id
+    return opcode_id
+
+
+class InstructionArrays:
+    """Struct-of-arrays representation of an instruction stream for analysis and register allocation passes.
+
+    The properties of :class:`peachpy.x86_64.instructions.Instruction` objects which describe registers rebuild sets
+    and dicts on every query, and the analysis passes query them several times per instruction. InstructionArrays
+    collects the information once in parallel arrays indexed by instruction position:
+
+        - opcodes: the opcode id of each instruction (see :func:`get_opcode_id`).
+        - categories: the :class:`InstructionCategory` of each instruction.
+        - label_names: the name of the label defined by a LABEL or referenced by a branch instruction, or None.
+        - indent_levels: the loop nesting level of each instruction (the function body has level 1).
+        - input_registers, output_registers: bitsets of registers read and written by each instruction in the
+          :class:`peachpy.x86_64.function.RegisterIndex`.
+        - live_registers, available_registers: bitsets of registers live on entry to and available before each
+          instruction. They are filled by the liveness analysis, and are None for unreachable instructions.
+
+    The bitsets are released by :meth:`release_register_sets` when the analysis of the function is complete.
+
+    Registers in instruction operands are stored in flat arrays indexed by register slot. The slots of the instruction
+    at position i are register_starts[i] to register_starts[i + 1]:
+
+        - register_ids: internal id of the register (negative for virtual registers).
+        - register_masks: the mask of the register.
+        - register_kinds: the kind of the register.
+        - register_operands: the number of the operand which contains the register.
+        - register_roles: the :class:`RegisterRole` of the register in the operand.
+
+    Instruction objects remain the primary representation of the function: lowering, encoding, and formatting use
+    them. The arrays describe the instructions at the time of analysis, and passes which replace instructions or
+    operands must rebuild them.
+
+    :ivar RegisterIndex register_index: the index which defines the layout of register bitsets.
+    """
+
+    def __init__(self, instructions, register_index):
+        """
+        :param list instructions: the list of :class:`peachpy.x86_64.instructions.Instruction` objects.
+        :param RegisterIndex register_index: the index for bitsets of input and output registers.
+        """
+        from peachpy.x86_64.instructions import BranchInstruction
+        from peachpy.x86_64.registers import Register
+        from peachpy.x86_64.operand import MemoryOperand
+        from peachpy.x86_64.pseudo import LABEL, RETURN
+        from peachpy.x86_64.generic import RET
+
+        self.register_index = register_index
+
+        self.opcodes = array("H")
+        self.categories = array("B")
+        self.label_names = list()
+        self.indent_levels = array("H")
+        self.input_registers = list()
+        self.output_registers = list()
+        self.live_registers = [None] * len(instructions)
+        self.available_registers = [None] * len(instructions)
+
+        self.register_starts = array("l", [0])
+        self.register_ids = array("l")
+        self.register_masks = array("H")
+        self.register_kinds = array("B")
+        self.register_operands = array("B")
+        self.register_roles = array("B")
+
+        def add_register(register, operand_number, role):
+            self.register_ids.append(register._internal_id)
+            self.register_masks.append(register.mask)
+            self.register_kinds.append(register._kind)
+            self.register_operands.append(operand_number)
+            self.register_roles.append(role)
+
+        for instruction in instructions:
+            self.opcodes.append(get_opcode_id(instruction.__class__))
+            label_name = None
+            if isinstance(instruction, LABEL):
+                category = InstructionCategory.Label
+                label_name = instruction.identifier
+            elif isinstance(instruction, BranchInstruction):
+                category = InstructionCategory.ConditionalBranch if instruction.is_conditional \
+                    else InstructionCategory.Branch
+                label_name = instruction.label_name
+            elif isinstance(instruction, (RET, RETURN)):
+                category = InstructionCategory.Return
+            else:
+                category = InstructionCategory.Other
+            self.categories.append(category)
+            self.label_names.append(label_name)
+            self.indent_levels.append(instruction._indent_level)
+
+            self.input_registers.append(register_index.encode(instruction.input_registers_masks))
+            self.output_registers.append(register_index.encode(instruction.output_registers_masks))
+
+            for (operand_number, operand) in enumerate(instruction.operands):
+                if isinstance(operand, Register):
+                    add_register(operand, operand_number, RegisterRole.Register)
+                elif isinstance(operand, MemoryOperand):
+                    if operand.address.base is not None:
+                        add_register(operand.address.base, operand_number, RegisterRole.MemoryBase)
+                    if operand.address.index is not None:
+                        add_register(operand.address.index, operand_number, RegisterRole.MemoryIndex)
+            self.register_starts.append(len(self.register_ids))
+
+    def __len__(self):
+        return len(self.opcodes)
+
+    def get_register_slots(self, position):
+        """Returns the range of register slots of the instruction at the position"""
+        return range(self.register_starts[position], self.register_starts[position + 1])
+
+    @property
+    def virtual_register_positions(self):
+        """The list of positions of instructions which have virtual registers in operands"""
+        register_starts, register_ids = self.register_starts, self.register_ids
+        return [position for position in range(len(self.opcodes))
+                if any(register_ids[slot] < 0
+                       for slot in range(register_starts[position], register_starts[position + 1]))]
+
+    @property
+    def loop_weights(self):
+        """The list of relative execution frequencies of instructions estimated from their loop nesting depth"""
+        # Function body has indentation level 1, and each Loop statement adds one level
+        return [10 ** max(indent_level - 1, 0) for indent_level in self.indent_levels]
+
+    def release_register_sets(self):
+        """Releases the bitsets of input, output, live, and available registers after the analysis passes.
+
+        The bitsets are the largest part of the arrays, and the passes which run after the analysis of the function
+        (register allocation and binding) only need the operand registers.
+        """
+        self.input_registers = None
+        self.output_registers = None
+        self.live_registers = None
+        self.available_registers = None
+
+    def bind_registers(self, register_allocations):
+        """Replaces internal ids of allocated virtual registers with physical register ids.
+
+        :param dict register_allocations: map from register kind to a map from virtual register internal id to
+            physical register id.
+        """
+        register_ids, register_kinds = self.register_ids, self.register_kinds
+        for slot in range(len(register_ids)):
+            register_id = register_ids[slot]
+            if register_id < 0:
+                kind_allocations = register_allocations.get(register_kinds[slot])
+                if kind_allocations:
+                    register_ids[slot] = kind_allocations.get(register_id, register_id)
@@ -1,7 +1,7 @@
 from peachpy.x86_64.registers import GeneralPurposeRegister, MMXRegister, XMMRegister, YMMRegister
 from peachpy.x86_64.generic import MOV, MOVZX, MOVSX, MOVSXD
 from peachpy.x86_64.mmxsse import MOVQ, MOVAPS, MOVAPD, MOVSS, MOVSD, MOVDQA
-from peachpy.x86_64.avx import VMOVAPS, VMOVAPD, VMOVSS, VMOVSD, VMOVDQA
+from peachpy.x86_64.avx import VMOVAPS, VMOVAPD, VMOVSS, VMOVSD, VMOVDQA, VMOVUPS
 from peachpy.x86_64.operand import dword, word, byte
 from peachpy.stream import NullStream
 from peachpy.x86_64 import m128, m128d, m128i, m256, m256d, m256i
@@ -123,3 +123,32 @@ def load_memory(dst_reg, src_address, src_type, prototype):
                         return VMOVDQA(dst_reg, [src_address], prototype=prototype)
                     else:
                         return MOVDQA(dst_reg, [src_address], prototype=prototype)
+
+
+def _get_local_variable_mov(register, prototype):
+    if isinstance(register, GeneralPurposeRegister):
+        return MOV
+    elif isinstance(register, MMXRegister):
+        return MOVQ
+    elif isinstance(register, XMMRegister):
+        # Stack frame with local variables is aligned on 16 bytes
+        return VMOVAPS if prototype.avx_mode else MOVAPS
+    elif isinstance(register, YMMRegister):
+        # Stack frame alignment is not sufficient for aligned 32-byte loads and stores
+        return VMOVUPS
+    else:
+        assert False, "Unexpected type of local variable register: " + register.__class__.__name__
+
+
+def load_local_variable(dst_reg, src_variable, prototype):
+    assert dst_reg.size == src_variable.size
+    with NullStream():
+        mov = _get_local_variable_mov(dst_reg, prototype)
+        return mov(dst_reg, [src_variable.address], prototype=prototype)
+
+
+def store_local_variable(dst_variable, src_reg, prototype):
+    assert dst_variable.size == src_reg.size
+    with NullStream():
+        mov = _get_local_variable_mov(src_reg, prototype)
+        return mov([dst_variable.address], src_reg, prototype=prototype)
@@ -1,11 +1,8 @@
 # This file is part of Peach-Py package and is licensed under the Simplified BSD license.
 #    See license.rst for the full text of the license.
 
-
-import inspect
-
 import peachpy.stream
-from peachpy.x86_64.instructions import Instruction
+from peachpy.x86_64.instructions import Instruction, SourceOrigin
 from peachpy.x86_64.operand import check_operand, format_operand_type, is_r32
 
 
@@ -87,7 +84,7 @@ class NACLJMP(Instruction):
 
         origin = kwargs.get("origin")
         if origin is None and peachpy.x86_64.options.get_debug_level() > 0:
-            origin = inspect.stack()
+            origin = SourceOrigin.capture()
         super(NACLJMP, self).__init__("NACLJMP", origin=origin)
         self.operands = tuple(map(check_operand, args))
         self.encodings = []
@@ -104,8 +101,9 @@ class NACLJMP(Instruction):
         else:
             raise SyntaxError("Invalid operand types: NACLJMP " + ", ".join(map(format_operand_type, self.operands)))
         self._instructions = self._lower()
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(self)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(self)
 
     def _lower(self):
         from peachpy.stream import InstructionStream
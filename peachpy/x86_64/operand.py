@@ -5,12 +5,16 @@
 def check_operand(operand):
     """Validates operand object as an instruction operand and converts it to a standard form"""
 
+    if operand.__class__ in _operand_classes:
+        return operand
+
     from peachpy.x86_64.registers import Register
     from peachpy.x86_64.pseudo import Label
     from peachpy.x86_64.function import LocalVariable
     from peachpy import Constant, Argument
     from peachpy.util import is_int, is_int64
     if isinstance(operand, (Register, Constant, MemoryOperand, LocalVariable, Argument, RIPRelativeOffset, Label)):
+        _operand_classes.add(operand.__class__)
         return operand
     elif is_int(operand):
         if not is_int64(operand):
@@ -111,8 +115,9 @@ def format_operand_type(operand):
         return operand.__class__.__name__
 
 
-class MemoryAddress:
+class MemoryAddress(object):
     """An address expression involving a register, e.g. rax - 10, r8d * 4."""
+    __slots__ = ("base", "index", "scale", "displacement")
 
     def __init__(self, base=None, index=None, scale=None, displacement=0):
         from peachpy.x86_64.registers import GeneralPurposeRegister64, GeneralPurposeRegister32
@@ -195,7 +200,9 @@ class MemoryAddress:
         return str(self)
 
 
-class MemoryOperand:
+class MemoryOperand(object):
+    __slots__ = ("address", "size")
+
     def __init__(self, address, size=None):
         from peachpy.x86_64.registers import GeneralPurposeRegister64, GeneralPurposeRegister32
         assert isinstance(address, (GeneralPurposeRegister64, GeneralPurposeRegister32, MemoryAddress)),\
@@ -473,6 +480,74 @@ def is_label(operand):
     return isinstance(operand, peachpy.x86_64.pseudo.Label)
 
 
+def get_operand_kind(operand):
+    """Returns the kind of an instruction operand, or None if the operand does not match any operand type.
+
+    The kind is the name of the most specific operand type of the operand which does not depend on the values of
+    registers and immediates, e.g. "r32", "xmm", "m", "m128", "vm32x", "imm", "rel8", or "label". Generated instruction
+    constructors select the instruction form by the tuple of kinds of the operands instead of checking the operand
+    types of each form in turn.
+    """
+    operand_class = operand.__class__
+    if operand_class in _operand_class_kinds:
+        return _operand_class_kinds[operand_class]
+    elif isinstance(operand, MemoryOperand):
+        if is_m(operand):
+            return _memory_kinds.get(operand.size)
+        elif is_vmx(operand):
+            return _vmx_kinds.get(operand.size)
+        elif is_vmy(operand):
+            return _vmy_kinds.get(operand.size)
+        else:
+            return None
+    elif isinstance(operand, RIPRelativeOffset):
+        if is_rel8(operand):
+            return "rel8"
+        elif is_rel32(operand):
+            return "rel32"
+        else:
+            return None
+    else:
+        # The kind of other operands depends only on their class
+        from peachpy.x86_64.registers import GeneralPurposeRegister8, GeneralPurposeRegister16, \
+            GeneralPurposeRegister32, GeneralPurposeRegister64, MMXRegister, XMMRegister, YMMRegister, ZMMRegister, \
+            MaskRegister
+        from peachpy.x86_64.pseudo import Label
+        import six
+        class_kinds = [
+            (GeneralPurposeRegister8, "r8"),
+            (GeneralPurposeRegister16, "r16"),
+            (GeneralPurposeRegister32, "r32"),
+            (GeneralPurposeRegister64, "r64"),
+            (MMXRegister, "mm"),
+            (XMMRegister, "xmm"),
+            (YMMRegister, "ymm"),
+            (ZMMRegister, "zmm"),
+            (MaskRegister, "k"),
+            (six.integer_types, "imm"),
+            (Label, "label")
+        ]
+        operand_kind = None
+        for kind_class, kind in class_kinds:
+            if isinstance(operand, kind_class):
+                operand_kind = kind
+                break
+        _operand_class_kinds[operand_class] = operand_kind
+        return operand_kind
+
+
+# Classes of operands which check_operand accepts without conversion
+_operand_classes = set()
+
+# Map from operand class to operand kind for classes of operands which kind does not depend on the operand value
+_operand_class_kinds = dict()
+
+# Map from memory operand size to operand kind
+_memory_kinds = {None: "m", 1: "m8", 2: "m16", 4: "m32", 8: "m64", 10: "m80", 16: "m128", 32: "m256"}
+_vmx_kinds = {None: "vmx", 4: "vm32x", 8: "vm64x"}
+_vmy_kinds = {None: "vmy", 4: "vm32y", 8: "vm64y"}
+
+
 byte = SizeSpecification(1)
 word = SizeSpecification(2)
 dword = SizeSpecification(4)
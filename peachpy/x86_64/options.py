@@ -8,10 +8,32 @@ debug_level = 0
 package = None
 assembly_format = "go"
 generate_assembly = None
+profiler = None
+schedule_instructions = False
+analyze_loops = False
+peephole = False
+peephole_patterns = None
+align_loops = None
+align_branches = False
+
+
+def get_option(name):
+    """Returns the value of the option in the build context of the current thread.
+
+    Options set in the active :class:`peachpy.context.BuildContext` override the process-wide values in this module.
+    """
+    from peachpy.context import get_active_context
+    context_options = get_active_context().options
+    if name in context_options:
+        return context_options[name]
+    else:
+        return globals()[name]
+
 
 def get_debug_level():
-    import peachpy.x86_64.function as function
-    if function.active_function is None:
-        return debug_level
+    from peachpy.x86_64.function import get_active_function
+    active_function = get_active_function()
+    if active_function is None:
+        return get_option("debug_level")
     else:
-        return function.active_function.debug_level
+        return active_function.debug_level
@@ -0,0 +1,236 @@
+# This file is part of Peach-Py package and is licensed under the Simplified BSD license.
+#    See license.rst for the full text of the license.
+
+import collections
+
+
+# The number of instructions a pattern examines before or after the rewritten instruction
+_max_distance = 32
+
+# Instructions which copy their source operand into the destination register. Repeating such an instruction is
+# redundant while its source and destination operands are not modified.
+_copy_names = frozenset(["MOV", "MOVZX", "MOVSX", "MOVSXD", "LEA",
+                         "MOVD", "MOVQ", "MOVSS", "MOVSD", "MOVAPS", "MOVUPS", "MOVAPD", "MOVUPD", "MOVDQA", "MOVDQU",
+                         "VMOVD", "VMOVQ", "VMOVSS", "VMOVSD", "VMOVAPS", "VMOVUPS", "VMOVAPD", "VMOVUPD",
+                         "VMOVDQA", "VMOVDQU"])
+
+# SSE instructions which move a whole XMM register and do not modify other registers
+_full_vector_move_names = frozenset(["MOVAPS", "MOVUPS", "MOVAPD", "MOVUPD", "MOVDQA", "MOVDQU"])
+
+
+class PeepholeReport:
+    """Statistics of rewrites in the peephole optimization pass
+
+    :ivar collections.OrderedDict rewrites: the number of rewrites by each pattern, in the order of the patterns.
+    :ivar int removed_instructions: the number of instructions removed by the rewrites.
+    :ivar int saved_bytes: the reduction of the total size of encoded instructions.
+    """
+
+    def __init__(self, pattern_names):
+        self.rewrites = collections.OrderedDict((name, 0) for name in pattern_names)
+        self.removed_instructions = 0
+        self.saved_bytes = 0
+
+    def add(self, pattern_name, instruction, replacement):
+        self.rewrites[pattern_name] += 1
+        self.removed_instructions += 1 - len(replacement)
+        self.saved_bytes += len(instruction.encode()) - sum(len(new_instruction.encode())
+                                                            for new_instruction in replacement)
+
+    def __str__(self):
+        rewrites = ", ".join("%s: %d" % (name, count) for (name, count) in self.rewrites.items() if count != 0)
+        return "%d instructions and %d bytes saved (%s)" % \
+            (self.removed_instructions, self.saved_bytes, rewrites or "no rewrites")
+
+
+def _is_generic(instruction, *names):
+    return instruction.__class__.__module__ == "peachpy.x86_64.generic" and instruction.name in names
+
+
+def _is_general_purpose_register(operand, sizes):
+    from peachpy.x86_64.registers import GeneralPurposeRegister
+    return isinstance(operand, GeneralPurposeRegister) and operand.size in sizes
+
+
+def flags_are_dead(instructions, index):
+    """Checks that no instruction reads the arithmetic flags after the instruction at the index before the flags are
+    overwritten or the function returns.
+
+    The check follows the instructions in program order: after jumps the flags are conservatively considered live.
+    """
+    from peachpy.x86_64.pseudo import LABEL, STORE
+    from peachpy.x86_64.scheduler import is_schedulable, get_flags_usage
+    for instruction in instructions[index + 1:index + 1 + _max_distance]:
+        if isinstance(instruction, (LABEL, STORE.RESULT)):
+            continue
+        if _is_generic(instruction, "RET"):
+            # Arithmetic flags are not preserved across function calls
+            return True
+        if not is_schedulable(instruction):
+            return False
+        reads_flags, writes_flags = get_flags_usage(instruction)
+        if reads_flags:
+            return False
+        elif writes_flags:
+            return True
+    return False
+
+
+def remove_self_move(instructions, index):
+    """Removes moves of a register to itself.
+
+    Moves of 32-bit general-purpose registers clear the high 32 bits of the register, and VEX-encoded moves clear the
+    high bits of the vector register, so they are kept.
+    """
+    instruction = instructions[index]
+    if len(instruction.operands) != 2 or instruction.operands[0] != instruction.operands[1]:
+        return None
+    if _is_generic(instruction, "MOV") and _is_general_purpose_register(instruction.operands[0], (1, 2, 8)):
+        return []
+    if instruction.__class__.__module__ == "peachpy.x86_64.mmxsse" and \
+            instruction.name in _full_vector_move_names | {"MOVSS", "MOVSD"}:
+        return []
+
+
+def zero_register(instructions, index):
+    """Replaces MOV r32/r64, 0 with the XOR r32, r32 zero idiom if the flags modified by XOR are not used"""
+    from peachpy.x86_64.generic import XOR
+    from peachpy.util import is_int
+    from peachpy.stream import NullStream
+    instruction = instructions[index]
+    if _is_generic(instruction, "MOV"):
+        destination, source = instruction.operands
+        if _is_general_purpose_register(destination, (4, 8)) and is_int(source) and source == 0 and \
+                flags_are_dead(instructions, index):
+            register = destination.as_dword
+            with NullStream():
+                return [XOR(register, register, prototype=instruction)]
+
+
+def narrow_immediate_move(instructions, index):
+    """Replaces MOV r64, imm with MOV r32, imm if the immediate is a non-negative 32-bit constant: the write to the
+    32-bit register clears the high 32 bits"""
+    from peachpy.x86_64.generic import MOV
+    from peachpy.util import is_uint32
+    from peachpy.stream import NullStream
+    instruction = instructions[index]
+    if _is_generic(instruction, "MOV"):
+        destination, source = instruction.operands
+        if _is_general_purpose_register(destination, (8,)) and is_uint32(source):
+            with NullStream():
+                return [MOV(destination.as_dword, source, prototype=instruction)]
+
+
+def simplify_increment(instructions, index):
+    """Removes ADD/SUB of 0 to a register, and replaces ADD/SUB of 1 or -1 with INC or DEC if the flags which these
+    instructions modify differently are not used.
+
+    ADD/SUB of 0 to a 32-bit register clears the high 32 bits of the register, so it is kept.
+    """
+    from peachpy.x86_64.generic import INC, DEC
+    from peachpy.util import is_int
+    from peachpy.stream import NullStream
+    instruction = instructions[index]
+    if _is_generic(instruction, "ADD", "SUB"):
+        destination, source = instruction.operands
+        if not is_int(source) or source not in (0, 1, -1) or not flags_are_dead(instructions, index):
+            return None
+        if source == 0:
+            if _is_general_purpose_register(destination, (1, 2, 8)):
+                return []
+        else:
+            increment = source if instruction.name == "ADD" else -source
+            with NullStream():
+                return [(INC if increment == 1 else DEC)(destination, prototype=instruction)]
+
+
+def remove_redundant_move(instructions, index):
+    """Removes a move to a register which repeats a previous move in the same basic block, or which loads the value a
+    previous instruction stored from the same register to the same memory location.
+
+    The move is redundant only if no instruction between them modifies the source or destination of the move, and, for
+    loads, if no instruction between them writes memory.
+    """
+    from peachpy.x86_64.registers import Register
+    from peachpy.x86_64.operand import MemoryOperand
+    from peachpy.x86_64.scheduler import is_schedulable, get_register_keys
+    instruction = instructions[index]
+    if instruction.name not in _copy_names or len(instruction.operands) != 2 or not is_schedulable(instruction):
+        return None
+    destination, source = instruction.operands
+    if not isinstance(destination, Register):
+        return None
+    input_keys = set(get_register_keys(instruction.input_registers_masks))
+    output_keys = set(get_register_keys(instruction.output_registers_masks))
+    if input_keys & output_keys:
+        # The move modifies its source, e.g. MOV rax, [rax]
+        return None
+    loads_memory = isinstance(source, MemoryOperand) and instruction.name != "LEA"
+    text = instruction.format("peachpy", indent=False)
+    for previous in reversed(instructions[max(index - _max_distance, 0):index]):
+        if not is_schedulable(previous):
+            return None
+        if previous.format("peachpy", indent=False) == text:
+            return []
+        if loads_memory and len(previous.operands) == 2 and \
+                previous.operands[1] == destination and isinstance(previous.operands[0], MemoryOperand) and \
+                str(previous.operands[0]) == str(source):
+            # Load of the value stored by the previous instruction. Loads of 32-bit general-purpose registers clear
+            # the high 32 bits of the register which the store does not guarantee.
+            if _is_generic(previous, "MOV") and _is_generic(instruction, "MOV") and \
+                    _is_general_purpose_register(destination, (1, 2, 8)):
+                return []
+            if previous.name in _full_vector_move_names and instruction.name in _full_vector_move_names and \
+                    previous.__class__.__module__ == instruction.__class__.__module__ == "peachpy.x86_64.mmxsse":
+                return []
+        if set(get_register_keys(previous.output_registers_masks)) & (input_keys | output_keys):
+            return None
+        if loads_memory and any(is_output and isinstance(operand, MemoryOperand)
+                                for (operand, is_output) in zip(previous.operands, previous.out_operands)):
+            return None
+    return None
+
+
+# Patterns of the peephole optimization pass by name. A pattern is a function which receives the list of instructions
+# and the index of the instruction to rewrite, and returns the list of replacement instructions, or None if it does not
+# apply. New patterns can be registered in this map and selected with the peephole_patterns option.
+pattern_library = collections.OrderedDict([
+    ("self-moves", remove_self_move),
+    ("redundant-moves", remove_redundant_move),
+    ("zero-idioms", zero_register),
+    ("narrow-immediates", narrow_immediate_move),
+    ("increments", simplify_increment)
+])
+
+
+def optimize_instructions(instructions, pattern_names=None):
+    """Rewrites instructions with physical registers into shorter or cheaper equivalent instructions.
+
+    Returns a tuple of the list of rewritten instructions and the :class:`PeepholeReport` of the rewrites. The input
+    list and its instructions are not modified.
+
+    :param list instructions: the list of instructions after register allocation and lowering of pseudo-instructions.
+    :param list pattern_names: the names of patterns in :data:`pattern_library` to apply, in the order of priority. If
+        None, all patterns in the library are applied.
+    """
+    if pattern_names is None:
+        pattern_names = list(pattern_library)
+    for name in pattern_names:
+        if name not in pattern_library:
+            raise ValueError("Unknown peephole pattern %s" % name)
+    patterns = [(name, pattern_library[name]) for name in pattern_names]
+
+    instructions = list(instructions)
+    report = PeepholeReport(pattern_names)
+    index = 0
+    while index < len(instructions):
+        instruction = instructions[index]
+        for (name, rewrite) in patterns:
+            replacement = rewrite(instructions, index)
+            if replacement is not None:
+                report.add(name, instruction, replacement)
+                instructions[index:index + 1] = replacement
+                break
+        else:
+            index += 1
+    return instructions, report
@@ -0,0 +1,163 @@
+# This file is part of Peach-Py package and is licensed under the Simplified BSD license.
+#    See license.rst for the full text of the license.
+
+import collections
+import time
+
+# Monotonic high-resolution clock where available (Python 3.3+)
+_clock = getattr(time, "perf_counter", time.time)
+
+
+class PhaseStatistics:
+    """Wall time and counters of a compilation phase for a function.
+
+    :ivar float time: the total wall time spent in the phase, in seconds.
+    :ivar int calls: the number of times the phase was run.
+    :ivar collections.OrderedDict counters: map from counter name to its accumulated value.
+    """
+
+    def __init__(self):
+        self.time = 0.0
+        self.calls = 0
+        self.counters = collections.OrderedDict()
+
+    def count(self, counter, value=1):
+        self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def merge(self, other):
+        self.time += other.time
+        self.calls += other.calls
+        for counter, value in other.counters.items():
+            self.count(counter, value)
+
+    def as_dict(self):
+        return collections.OrderedDict([
+            ("time", self.time),
+            ("calls", self.calls),
+            ("counters", collections.OrderedDict(self.counters))
+        ])
+
+
+class Profiler:
+    """Collects wall time and counters of compilation phases for each function.
+
+    The profiler is enabled by setting :data:`peachpy.x86_64.options.profiler`. The compilation pipeline records
+    the following phases:
+
+        - cache: lookup of the function in the compilation cache.
+        - analysis: label checks and liveness analysis of the function.
+        - scheduling: reordering of instructions for the target microarchitecture, if enabled.
+        - spilling: selection of spilled registers, spill code insertion and re-analysis.
+        - preallocation: checks of live registers and binding of registers with fixed allocation.
+        - abi_setup: copying of instructions and placement of arguments for the ABI.
+        - register_allocation: allocation and binding of physical registers.
+        - stack_frame: analysis of clobbered registers and layout of the stack frame.
+        - lowering: lowering of argument loads, local variables and pseudo-instructions.
+        - peephole: counters of the peephole optimization pass, if enabled. Its time is included in lowering.
+        - encoding: encoding of instructions and relaxation of branches.
+
+    :ivar collections.OrderedDict functions: map from function name to an ordered map from phase name to
+        :class:`PhaseStatistics`.
+    """
+
+    def __init__(self):
+        self.functions = collections.OrderedDict()
+
+    def get_phase(self, function_name, phase_name):
+        """Returns the statistics of the phase for the function, and creates them if needed"""
+        phases = self.functions.setdefault(function_name, collections.OrderedDict())
+        statistics = phases.get(phase_name)
+        if statistics is None:
+            statistics = PhaseStatistics()
+            phases[phase_name] = statistics
+        return statistics
+
+    def merge(self, other):
+        """Adds the statistics collected by another profiler, e.g. in a worker process"""
+        for function_name, phases in other.functions.items():
+            for phase_name, statistics in phases.items():
+                self.get_phase(function_name, phase_name).merge(statistics)
+
+    @property
+    def totals(self):
+        """Ordered map from phase name to :class:`PhaseStatistics` accumulated over all functions"""
+        totals = collections.OrderedDict()
+        for phases in self.functions.values():
+            for phase_name, statistics in phases.items():
+                totals.setdefault(phase_name, PhaseStatistics()).merge(statistics)
+        return totals
+
+    def as_dict(self):
+        import peachpy
+        return collections.OrderedDict([
+            ("version", peachpy.__version__),
+            ("functions", [
+                collections.OrderedDict([
+                    ("name", function_name),
+                    ("phases", collections.OrderedDict((phase_name, statistics.as_dict())
+                                                       for (phase_name, statistics) in phases.items()))
+                ]) for (function_name, phases) in self.functions.items()]),
+            ("totals", collections.OrderedDict((phase_name, statistics.as_dict())
+                                               for (phase_name, statistics) in self.totals.items()))
+        ])
+
+    def to_json(self, indent=2):
+        import json
+        return json.dumps(self.as_dict(), indent=indent, separators=(",", ": "))
+
+    def save(self, path):
+        """Writes the collected statistics in JSON format to the file"""
+        with open(path, "w") as profile_file:
+            profile_file.write(self.to_json())
+            profile_file.write("\n")
+
+
+class _PhaseTimer:
+    def __init__(self, statistics):
+        self.statistics = statistics
+        self.start_time = None
+
+    def __enter__(self):
+        self.start_time = _clock()
+        return self.statistics
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.statistics.time += _clock() - self.start_time
+        self.statistics.calls += 1
+
+
+class _NullPhase:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+    def count(self, counter, value=1):
+        pass
+
+
+_null_phase = _NullPhase()
+
+
+def phase(function, phase_name):
+    """Returns a context manager which measures the phase for the function if the profiler is enabled.
+
+    The context manager returns an object with a count(counter, value=1) method to record phase counters.
+
+    :param function: the Function, ABIFunction or EncodedFunction object which is processed in the phase.
+    :param str phase_name: the name of the phase.
+    """
+    import peachpy.x86_64.options
+    profiler = peachpy.x86_64.options.get_option("profiler")
+    if profiler is None:
+        return _null_phase
+    return _PhaseTimer(profiler.get_phase(function.name, phase_name))
+
+
+def count(function, phase_name, counter, value=1):
+    """Adds to a counter of the phase for the function if the profiler is enabled"""
+    import peachpy.x86_64.options
+    profiler = peachpy.x86_64.options.get_option("profiler")
+    if profiler is not None:
+        profiler.get_phase(function.name, phase_name).count(counter, value)
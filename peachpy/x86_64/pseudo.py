@@ -1,12 +1,10 @@
 # This file is part of Peach-Py package and is licensed under the Simplified BSD license.
 #    See license.rst for the full text of the license.
 
-import inspect
-
 import peachpy.stream
 import peachpy.x86_64.options
 import peachpy.x86_64.isa
-from peachpy.x86_64.instructions import Instruction
+from peachpy.x86_64.instructions import Instruction, SourceOrigin
 from peachpy.x86_64.operand import check_operand, format_operand_type
 
 
@@ -15,7 +13,7 @@ class Label:
         if name is None:
             import re
 
-            source_line = inspect.stack()[1][4][0].strip()
+            source_line = SourceOrigin.capture().source_code or ""
             match = re.match("(?:\\w+\\.)*(\\w+)\\s*=\\s*(?:\\w+\\.)*Label\\(.*\\)", source_line)
             if match:
                 name = match.group(1)
@@ -69,8 +67,9 @@ class LABEL(Instruction):
             raise SyntaxError("Invalid operand for LABEL statement: Label object expected")
         self.identifier = label.name
         self.input_branches = set()
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(self)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(self)
 
     def __str__(self):
         return self.identifier + ':'
@@ -102,7 +101,7 @@ class Loop:
         if name is None:
             import re
 
-            source_line = inspect.stack()[1][4][0].strip()
+            source_line = SourceOrigin.capture().source_code or ""
             match = re.match("(?:\\w+\\.)*(\\w+)\\s*=\\s*(?:\\w+\\.)*Loop\\(.*\\)", source_line)
             if match:
                 name = match.group(1)
@@ -119,13 +118,15 @@ class Loop:
     def __enter__(self):
         LABEL(self.begin)
 
-        from peachpy.x86_64.function import active_function
+        from peachpy.x86_64.function import get_active_function
+        active_function = get_active_function()
         if active_function is not None:
             active_function._indent_level += 1
         return self
 
     def __exit__(self, exc_type, exc_value, exc_traceback):
-        from peachpy.x86_64.function import active_function
+        from peachpy.x86_64.function import get_active_function
+        active_function = get_active_function()
         if active_function is not None:
             active_function._indent_level -= 1
 
@@ -136,32 +137,45 @@ class Loop:
 
 
 class ALIGN(Instruction):
-    supported_alignments = (2, 4, 8, 16, 32)
+    supported_alignments = (2, 4, 8, 16, 32, 64)
+
+    def __init__(self, alignment, group_size=None, origin=None):
+        """Pads code to the alignment
 
-    def __init__(self, alignment, origin=None):
+        :param int alignment: the alignment of the address of the next instruction.
+        :param int group_size: the number of following instructions which must not cross or end at an alignment
+            boundary. If specified, the code is padded only if the instructions would otherwise cross the boundary.
+        """
         super(ALIGN, self).__init__('ALIGN', origin=origin)
         if not isinstance(alignment, int):
             raise TypeError("The alignment value must be an integer")
         if alignment not in ALIGN.supported_alignments:
             raise ValueError("The alignment value {0} is not in the list of supported alignments ({1})"
-                             .format(alignment, ", ".join(ALIGN.supported_alignments)))
+                             .format(alignment, ", ".join(map(str, ALIGN.supported_alignments))))
         self.alignment = alignment
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(self)
+        self.group_size = group_size
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(self)
 
     def __str__(self):
-        return "align {0}".format(self.alignment)
+        if self.group_size is None:
+            return "align {0}".format(self.alignment)
+        else:
+            return "align {0} ; only if the next {1} instructions cross or end at the boundary" \
+                .format(self.alignment, self.group_size)
 
 
 class RETURN(Instruction):
     def __init__(self, *args, **kwargs):
-        from peachpy.x86_64.function import active_function
+        from peachpy.x86_64.function import get_active_function
+        active_function = get_active_function()
         from peachpy.x86_64.registers import GeneralPurposeRegister, MMXRegister, XMMRegister, YMMRegister
 
         origin = kwargs.get("origin")
         prototype = kwargs.get("prototype")
         if origin is None and prototype is None and peachpy.x86_64.options.get_debug_level() > 0:
-            origin = inspect.stack()
+            origin = SourceOrigin.capture()
         super(RETURN, self).__init__("RETURN", origin=origin)
         self.operands = tuple(map(check_operand, args))
         if len(self.operands) == 0:
@@ -213,8 +227,9 @@ class RETURN(Instruction):
                 raise SyntaxError("Invalid operand type: RETURN " + ", ".join(map(format_operand_type, self.operands)))
         else:
             raise SyntaxError("Pseudo-instruction \"RETURN\" requires 0 or 1 operands")
-        if peachpy.stream.active_stream is not None:
-            peachpy.stream.active_stream.add_instruction(self)
+        active_stream = peachpy.stream.get_active_stream()
+        if active_stream is not None:
+            active_stream.add_instruction(self)
 
     def __str__(self):
         if len(self.operands) == 0:
@@ -233,14 +248,15 @@ class RETURN(Instruction):
 class LOAD:
     class ARGUMENT(Instruction):
         def __init__(self, *args, **kwargs):
-            from peachpy.x86_64.function import active_function
+            from peachpy.x86_64.function import get_active_function
+            active_function = get_active_function()
             from peachpy.x86_64.registers import GeneralPurposeRegister, XMMRegister, YMMRegister
             from peachpy.x86_64 import m64
 
             origin = kwargs.get("origin")
             prototype = kwargs.get("prototype")
             if origin is None and prototype is None and peachpy.x86_64.options.get_debug_level() > 0:
-                origin = inspect.stack()
+                origin = SourceOrigin.capture()
             super(LOAD.ARGUMENT, self).__init__("LOAD.ARGUMENT", origin=origin)
             self.operands = tuple(map(check_operand, args))
             self.out_regs = (True, False)
@@ -268,8 +284,9 @@ class LOAD:
             else:
                 raise ValueError("Unsupported combination of instruction operands")
 
-            if peachpy.stream.active_stream is not None:
-                peachpy.stream.active_stream.add_instruction(self)
+            active_stream = peachpy.stream.get_active_stream()
+            if active_stream is not None:
+                active_stream.add_instruction(self)
 
         def format(self, assembly_format, indent):
             assert assembly_format in {"peachpy", "go"}, \
@@ -335,11 +352,47 @@ class LOAD:
             else:
                 return text + str(self)
 
+    class LOCAL(Instruction):
+        def __init__(self, *args, **kwargs):
+            from peachpy.x86_64.function import LocalVariable
+            from peachpy.x86_64.registers import GeneralPurposeRegister, MMXRegister, XMMRegister, YMMRegister
+
+            origin = kwargs.get("origin")
+            prototype = kwargs.get("prototype")
+            if origin is None and prototype is None and peachpy.x86_64.options.get_debug_level() > 0:
+                origin = SourceOrigin.capture()
+            super(LOAD.LOCAL, self).__init__("LOAD.LOCAL", origin=origin, prototype=prototype)
+            self.operands = tuple(map(check_operand, args))
+            self.out_regs = (True, False)
+            self.in_regs = (False, False)
+            self.out_operands = (True, False)
+            if len(self.operands) != 2:
+                raise SyntaxError("Instruction \"LOAD.LOCAL\" requires 2 operands")
+
+            # Check source (second) operand
+            if not isinstance(self.operands[1], LocalVariable):
+                raise TypeError("The source operand to LOAD.LOCAL must be of LocalVariable type")
+
+            # Check destination (first) operand
+            if not isinstance(self.operands[0], (GeneralPurposeRegister, MMXRegister, XMMRegister, YMMRegister)):
+                raise TypeError("The destination operand to LOAD.LOCAL must be a general-purpose, mmx, xmm, or ymm "
+                                "register")
+            if self.operands[0].size != self.operands[1].size:
+                raise ValueError("Register %s and local variable %s have different sizes"
+                                 % (str(self.operands[0]), str(self.operands[1])))
+            if prototype is not None:
+                self.avx_mode = prototype.avx_mode
+
+            active_stream = peachpy.stream.get_active_stream()
+            if active_stream is not None:
+                active_stream.add_instruction(self)
+
 
 class STORE:
     class RESULT(Instruction):
         def __init__(self, *args, **kwargs):
-            from peachpy.x86_64.function import active_function
+            from peachpy.x86_64.function import get_active_function
+            active_function = get_active_function()
             from peachpy.x86_64.registers import GeneralPurposeRegister, MMXRegister, XMMRegister, YMMRegister
             from peachpy.util import is_int16, is_int32
             from peachpy.x86_64.abi import golang_amd64_abi, golang_amd64p32_abi
@@ -347,7 +400,7 @@ class STORE:
             origin = kwargs.get("origin")
             prototype = kwargs.get("prototype")
             if origin is None and prototype is None and peachpy.x86_64.options.get_debug_level() > 0:
-                origin = inspect.stack()
+                origin = SourceOrigin.capture()
             super(STORE.RESULT, self).__init__("STORE.RESULT", origin=origin)
             self.operands = tuple(map(check_operand, args))
             self.out_regs = (False,)
@@ -393,8 +446,9 @@ class STORE:
                     raise ValueError("Can not store integer result %d: size mismatch with result type %s"
                                      % (self.operands[0], str(self.destination_type)))
 
-            if peachpy.stream.active_stream is not None:
-                peachpy.stream.active_stream.add_instruction(self)
+            active_stream = peachpy.stream.get_active_stream()
+            if active_stream is not None:
+                active_stream.add_instruction(self)
 
         def format(self, assembly_format, indent):
             assert assembly_format in {"peachpy", "go"}, \
@@ -434,6 +488,41 @@ class STORE:
             else:
                 return text + str(self)
 
+    class LOCAL(Instruction):
+        def __init__(self, *args, **kwargs):
+            from peachpy.x86_64.function import LocalVariable
+            from peachpy.x86_64.registers import GeneralPurposeRegister, MMXRegister, XMMRegister, YMMRegister
+
+            origin = kwargs.get("origin")
+            prototype = kwargs.get("prototype")
+            if origin is None and prototype is None and peachpy.x86_64.options.get_debug_level() > 0:
+                origin = SourceOrigin.capture()
+            super(STORE.LOCAL, self).__init__("STORE.LOCAL", origin=origin, prototype=prototype)
+            self.operands = tuple(map(check_operand, args))
+            self.out_regs = (False, False)
+            self.in_regs = (False, True)
+            self.out_operands = (True, False)
+            if len(self.operands) != 2:
+                raise SyntaxError("Instruction \"STORE.LOCAL\" requires 2 operands")
+
+            # Check destination (first) operand
+            if not isinstance(self.operands[0], LocalVariable):
+                raise TypeError("The destination operand to STORE.LOCAL must be of LocalVariable type")
+
+            # Check source (second) operand
+            if not isinstance(self.operands[1], (GeneralPurposeRegister, MMXRegister, XMMRegister, YMMRegister)):
+                raise TypeError("The source operand to STORE.LOCAL must be a general-purpose, mmx, xmm, or ymm "
+                                "register")
+            if self.operands[0].size != self.operands[1].size:
+                raise ValueError("Register %s and local variable %s have different sizes"
+                                 % (str(self.operands[1]), str(self.operands[0])))
+            if prototype is not None:
+                self.avx_mode = prototype.avx_mode
+
+            active_stream = peachpy.stream.get_active_stream()
+            if active_stream is not None:
+                active_stream.add_instruction(self)
+
 
 class SWAP:
     @staticmethod
@@ -0,0 +1,383 @@
+# This file is part of Peach-Py package and is licensed under the Simplified BSD license.
+#    See license.rst for the full text of the license.
+
+import collections
+import operator
+
+import six
+
+
+# Instructions that copy a register into another register of the same kind and size without modifying the value
+_copy_instruction_names = {
+    "MOV", "MOVQ",
+    "MOVAPS", "MOVAPD", "MOVDQA", "MOVUPS", "MOVUPD", "MOVDQU",
+    "VMOVAPS", "VMOVAPD", "VMOVDQA", "VMOVUPS", "VMOVUPD", "VMOVDQU"
+}
+
+
+def get_register_copy(instruction):
+    """Checks if the instruction is a register-to-register copy.
+
+    Only copies that can be eliminated by assigning the same physical register to both operands are recognized:
+    the operands must be registers of the same kind and size, and general-purpose registers must be 32- or 64-bit
+    (8- and 16-bit moves do not overwrite the whole register).
+
+    :param Instruction instruction: the instruction to check.
+    :returns: a tuple (destination register, source register) for copy instructions, None otherwise.
+    """
+    from peachpy.x86_64.registers import Register, GeneralPurposeRegister
+    if instruction.name not in _copy_instruction_names or len(instruction.operands) != 2:
+        return None
+    destination, source = instruction.operands
+    if not isinstance(destination, Register) or not isinstance(source, Register):
+        return None
+    if destination.kind != source.kind or destination.size != source.size:
+        return None
+    if isinstance(destination, GeneralPurposeRegister) and destination.size not in {4, 8}:
+        return None
+    return destination, source
+
+
+def get_loop_weight(instruction):
+    """Returns the relative execution frequency of an instruction estimated from its loop nesting depth"""
+    # Function body has indentation level 1, and each Loop statement adds one level
+    return 10 ** max(instruction._indent_level - 1, 0)
+
+
+def get_register_weights(instruction_arrays):
+    """Counts uses of virtual registers weighted by the loop nesting depth of instructions.
+
+    Each distinct register operand (register and its mask) is counted once per instruction.
+
+    :param InstructionArrays instruction_arrays: the arrays of instructions.
+    :returns: a map from register kind to a map from virtual register internal id to its weighted use count.
+    """
+    weights = collections.defaultdict(lambda: collections.defaultdict(int))
+    register_ids, register_masks, register_kinds = \
+        instruction_arrays.register_ids, instruction_arrays.register_masks, instruction_arrays.register_kinds
+    loop_weights = instruction_arrays.loop_weights
+    for i in instruction_arrays.virtual_register_positions:
+        registers = set((register_kinds[slot], register_ids[slot], register_masks[slot])
+                        for slot in instruction_arrays.get_register_slots(i) if register_ids[slot] < 0)
+        for (kind, register_id, _) in registers:
+            weights[kind][register_id] += loop_weights[i]
+    return weights
+
+
+def get_occupied_register_ids(instruction_arrays, position):
+    """Returns internal ids of registers which must reside in physical registers during the instruction.
+
+    These are the registers live on entry to the instruction and the registers written by the instruction, which
+    matches the conflicts recorded by :meth:`Function._analize`.
+
+    :param InstructionArrays instruction_arrays: the arrays of instructions with live registers information.
+    :param int position: the position of the instruction.
+    :returns: a map from register kind to a list of register internal ids.
+    """
+    from peachpy.x86_64.registers import GeneralPurposeRegister, GeneralPurposeRegister64, \
+        MMXRegister, XMMRegister, ZMMRegister
+    kind_masks = [
+        (GeneralPurposeRegister._kind, GeneralPurposeRegister64._mask),
+        (MMXRegister._kind, MMXRegister._mask),
+        (XMMRegister._kind, ZMMRegister._mask)
+    ]
+    register_index = instruction_arrays.register_index
+    occupied_registers = (instruction_arrays.live_registers[position] or 0) | \
+        instruction_arrays.output_registers[position]
+    register_ids = dict()
+    for (kind, kind_mask) in kind_masks:
+        kind_registers = occupied_registers & register_index.replicate_mask(kind_mask)
+        if kind_registers:
+            register_ids[kind] = register_index.decode_ids(kind_registers)
+    return register_ids
+
+
+def select_spilled_registers(instructions, instruction_arrays, max_live_registers):
+    """Chooses virtual registers to spill so that registers at each instruction fit into physical registers.
+
+    A spilled register occupies a physical register only on the instructions which use it. Where the pressure on
+    physical registers is too high, the allocator spills the live virtual registers with the lowest use density: the
+    number of uses (weighted by loop nesting depth) per instruction of the live range. Thus registers which are used
+    rarely, or outside of the innermost loops, are spilled first.
+
+    :param list instructions: the list of instructions.
+    :param InstructionArrays instruction_arrays: the arrays of the instructions with live registers information.
+    :param dict max_live_registers: map from register kind to the number of allocatable physical registers.
+    :returns: a map from register kind to a set of internal ids of virtual registers to spill.
+    """
+    from peachpy import RegisterAllocationError
+    from peachpy.x86_64.registers import YMMRegister, ZMMRegister
+
+    occupied_register_ids = [get_occupied_register_ids(instruction_arrays, i)
+                             for i in range(len(instruction_arrays))]
+
+    # ZMM registers are never spilled: there are no instructions to store them to and load them from stack slots
+    zmm_only_mask = ZMMRegister._mask & ~YMMRegister._mask
+    unspillable_ids = set(register_id for (register_id, register_mask)
+                          in zip(instruction_arrays.register_ids, instruction_arrays.register_masks)
+                          if register_id < 0 and register_mask & zmm_only_mask)
+
+    # Map from register kind to a map from virtual register id to its weighted use count
+    weights = get_register_weights(instruction_arrays)
+    # Map from register kind to a map from virtual register id to the number of instructions in its live range
+    lengths = collections.defaultdict(lambda: collections.defaultdict(int))
+    for register_ids in occupied_register_ids:
+        for (kind, kind_register_ids) in six.iteritems(register_ids):
+            for register_id in kind_register_ids:
+                if register_id < 0:
+                    lengths[kind][register_id] += 1
+
+    def spill_cost(kind, register_id):
+        return float(weights[kind][register_id]) / lengths[kind][register_id], -register_id
+
+    spilled_register_ids = collections.defaultdict(set)
+    for (i, register_ids) in enumerate(occupied_register_ids):
+        # Spilled registers are reloaded into a new virtual register for each instruction which uses them
+        operand_ids = collections.defaultdict(set)
+        for slot in instruction_arrays.get_register_slots(i):
+            operand_ids[instruction_arrays.register_kinds[slot]].add(instruction_arrays.register_ids[slot])
+        for (kind, kind_register_ids) in six.iteritems(register_ids):
+            occupied_ids = [register_id for register_id in kind_register_ids
+                            if register_id not in spilled_register_ids[kind] or register_id in operand_ids[kind]]
+            excess = len(occupied_ids) - max_live_registers[kind]
+            if excess <= 0:
+                continue
+            candidate_ids = sorted([register_id for register_id in occupied_ids
+                                    if register_id < 0 and register_id not in operand_ids[kind] and
+                                    register_id not in unspillable_ids],
+                                   key=lambda register_id: spill_cost(kind, register_id))
+            if len(candidate_ids) < excess:
+                raise RegisterAllocationError(
+                    "The number of live registers exceeds physical constaints %s" % str(instructions[i]))
+            spilled_register_ids[kind].update(candidate_ids[:excess])
+    return spilled_register_ids
+
+
+class RegisterAllocator:
+    """Graph-coloring allocator of virtual registers to physical registers of an ABI-specific function.
+
+    The allocator follows the Chaitin-Briggs scheme. The interference graph for each register kind is built from the
+    conflicting registers computed by :meth:`Function._analize`. Non-interfering virtual registers connected by copy
+    instructions are merged (conservative Briggs coalescing), and the graph is then colored with physical registers
+    in the order of simplification, optimistically pushing potential spills on the stack. Virtual registers with high
+    use counts inside loops are simplified last and thus get the first choice of physical registers.
+
+    :ivar abi: the ABI which defines the set of allocatable physical registers and their priority.
+    :ivar list instructions: the list of instructions with live registers information.
+    :ivar InstructionArrays instruction_arrays: the arrays of the instructions.
+    :ivar dict conflicting_registers: map from register kind to a map from virtual register internal id to the set
+        of internal ids of conflicting (virtual and physical) registers.
+    :ivar dict register_allocations: map from register kind to a map from virtual register internal id to physical
+        register id. Pre-allocated virtual registers are treated as pre-colored nodes of the interference graph.
+    """
+
+    def __init__(self, abi, instructions, instruction_arrays, conflicting_registers, register_allocations):
+        from peachpy.x86_64.registers import rsp, r15
+        from peachpy.x86_64.abi import native_client_x86_64_abi
+        self.abi = abi
+        self.instructions = instructions
+        self.instruction_arrays = instruction_arrays
+        self.conflicting_registers = conflicting_registers
+        self.register_allocations = register_allocations
+
+        # Stack pointer is never allocatable, and Native Client reserves r15 as the sandbox base
+        reserved_registers = [rsp]
+        if abi == native_client_x86_64_abi:
+            reserved_registers.append(r15)
+
+        # Map from register kind to a list of physical register ids in allocation priority order:
+        # - Volatile and argument registers go first
+        # - Then allocation may use non-volatile registers
+        self.physical_register_ids = collections.defaultdict(list)
+        self.callee_save_register_ids = collections.defaultdict(set)
+        for register in abi.volatile_registers + list(reversed(abi.argument_registers)) + abi.callee_save_registers:
+            if register in reserved_registers:
+                continue
+            if register.physical_id not in self.physical_register_ids[register.kind]:
+                self.physical_register_ids[register.kind].append(register.physical_id)
+        for register in abi.callee_save_registers:
+            self.callee_save_register_ids[register.kind].add(register.physical_id)
+
+    def allocate(self):
+        """Assigns physical registers to all virtual registers and records the result in register_allocations"""
+        weights, copies, hints = self._analyze_instructions()
+        for kind, conflicting_registers in six.iteritems(self.conflicting_registers):
+            self._allocate_kind(kind, conflicting_registers,
+                                weights[kind], copies[kind], hints[kind])
+
+    def _analyze_instructions(self):
+        """Collects use weights, copies between virtual registers, and physical register preferences"""
+        from peachpy.x86_64.pseudo import LOAD, RETURN
+        from peachpy.x86_64.registers import Register, rax, mm0, xmm0
+        from peachpy.x86_64.abi import golang_amd64_abi, golang_amd64p32_abi
+
+        # Registers which hold the function result. Golang ABI returns the result on stack.
+        result_registers = dict()
+        if self.abi not in {golang_amd64_abi, golang_amd64p32_abi}:
+            result_registers = {register.kind: register for register in (rax, mm0, xmm0)}
+
+        # Map from register kind to a map from virtual register id to its weighted use count
+        weights = get_register_weights(self.instruction_arrays)
+        # Map from register kind to a list of (destination id, source id, weight) for copies between virtual registers
+        copies = collections.defaultdict(list)
+        # Map from register kind to a map from virtual register id to a list of preferred physical register ids
+        hints = collections.defaultdict(lambda: collections.defaultdict(list))
+        for i in self.instruction_arrays.virtual_register_positions:
+            instruction = self.instructions[i]
+            if isinstance(instruction, LOAD.ARGUMENT):
+                destination, argument = instruction.operands
+                if destination.is_virtual and argument.register is not None and \
+                        argument.register.kind == destination.kind:
+                    hints[destination.kind][destination._internal_id].append(argument.register.physical_id)
+                continue
+            if isinstance(instruction, RETURN):
+                # The epilog copies the returned register to the result register
+                if instruction.operands and isinstance(instruction.operands[0], Register):
+                    result = instruction.operands[0]
+                    if result.is_virtual and result.kind in result_registers:
+                        hints[result.kind][result._internal_id].append(result_registers[result.kind].physical_id)
+                continue
+
+            copy = get_register_copy(instruction)
+            if copy is not None:
+                destination, source = copy
+                if destination.is_virtual and source.is_virtual:
+                    copies[destination.kind].append((destination._internal_id, source._internal_id,
+                                                     get_loop_weight(instruction)))
+                elif destination.is_virtual:
+                    hints[destination.kind][destination._internal_id].append(source.physical_id)
+                elif source.is_virtual:
+                    hints[source.kind][source._internal_id].append(destination.physical_id)
+        return weights, copies, hints
+
+    def _allocate_kind(self, kind, conflicting_registers, weights, copies, hints):
+        from peachpy import RegisterAllocationError
+
+        physical_ids = self.physical_register_ids[kind]
+        callee_save_ids = self.callee_save_register_ids[kind]
+        allocations = self.register_allocations.setdefault(kind, dict())
+
+        # Pre-allocated registers are pre-colored: they are excluded from the graph and their physical registers
+        # become forbidden for the conflicting virtual registers
+        precolored = {vreg_id: allocations[vreg_id] for vreg_id in conflicting_registers if vreg_id in allocations}
+        nodes = sorted([vreg_id for vreg_id in conflicting_registers if vreg_id not in precolored],
+                       key=operator.neg)
+
+        adjacent = {vreg_id: set() for vreg_id in nodes}
+        forbidden = {vreg_id: set() for vreg_id in nodes}
+        for vreg_id in nodes:
+            for conflicting_id in conflicting_registers[vreg_id]:
+                if conflicting_id >= 0:
+                    forbidden[vreg_id].add(conflicting_id)
+                elif conflicting_id in precolored:
+                    forbidden[vreg_id].add(precolored[conflicting_id])
+                elif conflicting_id in adjacent and conflicting_id != vreg_id:
+                    adjacent[vreg_id].add(conflicting_id)
+                    adjacent[conflicting_id].add(vreg_id)
+
+        weights = {vreg_id: weights.get(vreg_id, 0) for vreg_id in nodes}
+        hints = {vreg_id: list(hints.get(vreg_id, [])) for vreg_id in nodes}
+        partners = {vreg_id: set() for vreg_id in nodes}
+
+        def colors_count(vreg_id):
+            return sum(1 for physical_id in physical_ids if physical_id not in forbidden[vreg_id])
+
+        # Coalesce copies between virtual registers, most frequently executed first
+        alias = dict()
+
+        def find(vreg_id):
+            while vreg_id in alias:
+                vreg_id = alias[vreg_id]
+            return vreg_id
+
+        for (destination_id, source_id, _) in sorted(copies, key=operator.itemgetter(2), reverse=True):
+            if destination_id in precolored or source_id in precolored:
+                # Bias the other register towards the physical register of the pre-colored one
+                if destination_id in precolored and source_id not in precolored:
+                    hints[find(source_id)].append(precolored[destination_id])
+                elif source_id in precolored and destination_id not in precolored:
+                    hints[find(destination_id)].append(precolored[source_id])
+                continue
+            x, y = find(destination_id), find(source_id)
+            if x == y:
+                continue
+            if y in adjacent[x]:
+                partners[x].add(y)
+                partners[y].add(x)
+                continue
+            # Briggs test: the merged node must have fewer than K neighbors of significant degree
+            k = sum(1 for physical_id in physical_ids
+                    if physical_id not in forbidden[x] and physical_id not in forbidden[y])
+            neighbors = adjacent[x] | adjacent[y]
+            significant_neighbors = sum(1 for neighbor in neighbors
+                                        if len(adjacent[neighbor]) >= colors_count(neighbor))
+            if significant_neighbors >= k:
+                partners[x].add(y)
+                partners[y].add(x)
+                continue
+            # Merge y into x
+            alias[y] = x
+            for neighbor in adjacent[y]:
+                adjacent[neighbor].discard(y)
+                adjacent[neighbor].add(x)
+            adjacent[x] |= adjacent[y]
+            forbidden[x] |= forbidden[y]
+            weights[x] += weights[y]
+            hints[x].extend(hints[y])
+            for partner in partners[y]:
+                partners[partner].discard(y)
+                if partner != x:
+                    partners[partner].add(x)
+                    partners[x].add(partner)
+            for table in (adjacent, forbidden, weights, hints, partners):
+                del table[y]
+        nodes = [vreg_id for vreg_id in nodes if vreg_id not in alias]
+
+        # Simplify: remove nodes of insignificant degree, and optimistically push potential spills on the stack
+        degrees = {vreg_id: len(adjacent[vreg_id]) for vreg_id in nodes}
+        remaining = set(nodes)
+        low_degree_nodes = collections.deque(
+            [vreg_id for vreg_id in nodes if degrees[vreg_id] < colors_count(vreg_id)])
+        stack = []
+        while remaining:
+            while low_degree_nodes and low_degree_nodes[0] not in remaining:
+                low_degree_nodes.popleft()
+            if low_degree_nodes:
+                vreg_id = low_degree_nodes.popleft()
+            else:
+                # Potential spill: the node with the lowest weight per interference, and the newest node on ties
+                vreg_id = min(remaining, key=lambda node: (float(weights[node]) / (degrees[node] + 1), -node))
+            remaining.remove(vreg_id)
+            stack.append(vreg_id)
+            for neighbor in adjacent[vreg_id]:
+                if neighbor in remaining:
+                    degrees[neighbor] -= 1
+                    if degrees[neighbor] == colors_count(neighbor) - 1:
+                        low_degree_nodes.append(neighbor)
+
+        # Select: assign physical registers in reverse order of simplification
+        colors = dict()
+        used_callee_save_ids = set(physical_id for physical_id in six.itervalues(precolored)
+                                   if physical_id in callee_save_ids)
+        while stack:
+            vreg_id = stack.pop()
+            neighbor_colors = set(colors[neighbor] for neighbor in adjacent[vreg_id] if neighbor in colors)
+            options = [physical_id for physical_id in physical_ids
+                       if physical_id not in forbidden[vreg_id] and physical_id not in neighbor_colors]
+            if not options:
+                raise RegisterAllocationError("No physical registers available for virtual register %d" % -vreg_id)
+            preferences = hints[vreg_id] + [colors[partner] for partner in sorted(partners[vreg_id], key=operator.neg)
+                                            if partner in colors]
+            physical_id = next((preference for preference in preferences if preference in options), None)
+            if physical_id is None:
+                physical_id = options[0]
+                if physical_id in callee_save_ids:
+                    # Reuse callee-save registers which are already saved in the prologue
+                    physical_id = next((option for option in options if option in used_callee_save_ids), physical_id)
+            if physical_id in callee_save_ids:
+                used_callee_save_ids.add(physical_id)
+            colors[vreg_id] = physical_id
+
+        for vreg_id in conflicting_registers:
+            if vreg_id not in precolored:
+                allocations[vreg_id] = colors[find(vreg_id)]
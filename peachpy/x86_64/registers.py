@@ -7,6 +7,7 @@ import six
 
 class Register(object):
     """A base class for all encodable registers (rip is not encodable)"""
+    __slots__ = ("mask", "virtual_id", "physical_id")
     _mask_size_map = {
         0x1: 1,
         0x2: 1,
@@ -181,6 +182,7 @@ class Register(object):
 
 class GeneralPurposeRegister(Register):
     """A base class for general-purpose registers"""
+    __slots__ = ()
     _go_physical_id_map = {0x0: 'AX',  0x1: 'CX',  0x2: 'DX',  0x3: 'BX',
                            0x4: 'SP',  0x5: 'BP',  0x6: 'SI',  0x7: 'DI',
                            0x8: 'R8',  0x9: 'R9',  0xA: 'R10', 0xB: 'R11',
@@ -222,6 +224,7 @@ class GeneralPurposeRegister(Register):
 
 class GeneralPurposeRegister64(GeneralPurposeRegister):
     """64-bit general-purpose register"""
+    __slots__ = ()
     size = 8
 
     _physical_id_map = {0x0: 'rax', 0x1: 'rcx', 0x2: 'rdx', 0x3: 'rbx',
@@ -232,7 +235,8 @@ class GeneralPurposeRegister64(GeneralPurposeRegister):
 
     def __init__(self, virtual_id=None, physical_id=None):
         if virtual_id is None and physical_id is None:
-            from peachpy.x86_64.function import active_function
+            from peachpy.x86_64.function import get_active_function
+            active_function = get_active_function()
             super(GeneralPurposeRegister64, self).__init__(GeneralPurposeRegister64._mask,
                                                            active_function._allocate_general_purpose_register_id())
         else:
@@ -281,6 +285,7 @@ r15 = GeneralPurposeRegister64(physical_id=0xF)
 
 class GeneralPurposeRegister32(GeneralPurposeRegister):
     """32-bit general-purpose register"""
+    __slots__ = ()
     size = 4
 
     _physical_id_map = {0x0: 'eax',  0x1: 'ecx',  0x2: 'edx',  0x3: 'ebx',
@@ -291,7 +296,8 @@ class GeneralPurposeRegister32(GeneralPurposeRegister):
 
     def __init__(self, virtual_id=None, physical_id=None):
         if virtual_id is None and physical_id is None:
-            from peachpy.x86_64.function import active_function
+            from peachpy.x86_64.function import get_active_function
+            active_function = get_active_function()
             super(GeneralPurposeRegister32, self).__init__(GeneralPurposeRegister32._mask,
                                                            active_function._allocate_general_purpose_register_id())
         else:
@@ -341,6 +347,7 @@ r15d = GeneralPurposeRegister32(physical_id=0xF)
 
 class GeneralPurposeRegister16(GeneralPurposeRegister):
     """16-bit general-purpose register"""
+    __slots__ = ()
     size = 2
 
     _physical_id_map = {0x0: 'ax',   0x1: 'cx',   0x2: 'dx',   0x3: 'bx',
@@ -351,7 +358,8 @@ class GeneralPurposeRegister16(GeneralPurposeRegister):
 
     def __init__(self, virtual_id=None, physical_id=None):
         if virtual_id is None and physical_id is None:
-            from peachpy.x86_64.function import active_function
+            from peachpy.x86_64.function import get_active_function
+            active_function = get_active_function()
             super(GeneralPurposeRegister16, self).__init__(GeneralPurposeRegister16._mask,
                                                            active_function._allocate_general_purpose_register_id())
         else:
@@ -384,6 +392,7 @@ r15w = GeneralPurposeRegister16(physical_id=0xF)
 
 class GeneralPurposeRegister8(GeneralPurposeRegister):
     """8-bit general-purpose register"""
+    __slots__ = ()
     size = 1
 
     _physical_id_map = {(0x0, 0x1): 'al',   (0x1, 0x1): 'cl',   (0x2, 0x1): 'dl',   (0x3, 0x1): 'bl',
@@ -402,7 +411,8 @@ class GeneralPurposeRegister8(GeneralPurposeRegister):
     def __init__(self, virtual_id=None, physical_id=None, is_high=False):
         mask = GeneralPurposeRegister8._high_mask if is_high else GeneralPurposeRegister8._mask
         if virtual_id is None and physical_id is None:
-            from peachpy.x86_64.function import active_function
+            from peachpy.x86_64.function import get_active_function
+            active_function = get_active_function()
             super(GeneralPurposeRegister8, self).__init__(mask, active_function._allocate_general_purpose_register_id())
         else:
             super(GeneralPurposeRegister8, self).__init__(mask, virtual_id, physical_id)
@@ -449,6 +459,7 @@ r15b = GeneralPurposeRegister8(physical_id=0xF)
 
 class MMXRegister(Register):
     """64-bit MMX technology register"""
+    __slots__ = ()
     size = 8
 
     _physical_id_map = {n: "mm" + str(n) for n in range(8)}
@@ -458,7 +469,8 @@ class MMXRegister(Register):
 
     def __init__(self, virtual_id=None, physical_id=None):
         if virtual_id is None and physical_id is None:
-            from peachpy.x86_64.function import active_function
+            from peachpy.x86_64.function import get_active_function
+            active_function = get_active_function()
             super(MMXRegister, self).__init__(MMXRegister._mask,
                                               active_function._allocate_mmx_register_id())
         else:
@@ -496,6 +508,7 @@ mm7 = MMXRegister(physical_id=7)
 
 class XMMRegister(Register):
     """128-bit xmm (SSE) register"""
+    __slots__ = ()
     size = 16
 
     _physical_id_map = {n: "xmm" + str(n) for n in range(32)}
@@ -505,7 +518,8 @@ class XMMRegister(Register):
 
     def __init__(self, virtual_id=None, physical_id=None):
         if virtual_id is None and physical_id is None:
-            from peachpy.x86_64.function import active_function
+            from peachpy.x86_64.function import get_active_function
+            active_function = get_active_function()
             super(XMMRegister, self).__init__(XMMRegister._mask,
                                               active_function._allocate_xmm_register_id())
         else:
@@ -579,6 +593,7 @@ xmm31 = XMMRegister(physical_id=31)
 
 class YMMRegister(Register):
     """256-bit ymm (AVX) register"""
+    __slots__ = ()
     size = 32
 
     _physical_id_map = {n: "ymm" + str(n) for n in range(32)}
@@ -587,7 +602,8 @@ class YMMRegister(Register):
 
     def __init__(self, virtual_id=None, physical_id=None):
         if virtual_id is None and physical_id is None:
-            from peachpy.x86_64.function import active_function
+            from peachpy.x86_64.function import get_active_function
+            active_function = get_active_function()
             super(YMMRegister, self).__init__(YMMRegister._mask,
                                               active_function._allocate_xmm_register_id())
         else:
@@ -648,6 +664,7 @@ ymm31 = YMMRegister(physical_id=31)
 
 class ZMMRegister(Register):
     """512-bit zmm (AVX-512) register"""
+    __slots__ = ()
     size = 64
 
     _physical_id_map = {n: "zmm" + str(n) for n in range(32)}
@@ -656,7 +673,8 @@ class ZMMRegister(Register):
 
     def __init__(self, virtual_id=None, physical_id=None):
         if virtual_id is None and physical_id is None:
-            from peachpy.x86_64.function import active_function
+            from peachpy.x86_64.function import get_active_function
+            active_function = get_active_function()
             super(ZMMRegister, self).__init__(ZMMRegister._mask,
                                               active_function._allocate_xmm_register_id())
         else:
@@ -717,6 +735,7 @@ zmm31 = ZMMRegister(physical_id=31)
 
 class MaskRegister(Register):
     """AVX-512 mask register"""
+    __slots__ = ()
     size = 8
 
     _physical_id_map = {n: "k" + str(n) for n in range(8)}
@@ -725,7 +744,8 @@ class MaskRegister(Register):
 
     def __init__(self, virtual_id=None, physical_id=None):
         if virtual_id is None and physical_id is None:
-            from peachpy.x86_64.function import active_function
+            from peachpy.x86_64.function import get_active_function
+            active_function = get_active_function()
             super(MaskRegister, self).__init__(MaskRegister._mask,
                                                active_function._allocate_mask_register_id())
         else:
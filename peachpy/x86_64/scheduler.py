@@ -0,0 +1,361 @@
+# This file is part of Peach-Py package and is licensed under the Simplified BSD license.
+#    See license.rst for the full text of the license.
+
+import heapq
+
+
+# Modules of generated instruction classes. Other instructions (pseudo-instructions and NaCl instructions) are never
+# moved by the scheduler.
+_instruction_modules = frozenset(["peachpy.x86_64.generic", "peachpy.x86_64.mmxsse", "peachpy.x86_64.avx",
+                                  "peachpy.x86_64.fma", "peachpy.x86_64.crypto", "peachpy.x86_64.amd",
+                                  "peachpy.x86_64.mask"])
+
+# Instructions with effects which are not described by their operands: implicit memory accesses, control and status
+# registers, serialization, or the state of the whole register file. They are never moved by the scheduler.
+_barrier_names = frozenset([
+    "PUSH", "POP", "CALL", "RET", "INT", "UD2", "PAUSE", "NOP",
+    "CPUID", "RDTSC", "RDTSCP", "XGETBV", "RDRAND", "RDSEED",
+    "SFENCE", "MFENCE", "LFENCE", "PREFETCHNTA", "PREFETCHT0", "PREFETCHT1", "PREFETCHT2",
+    "XCHG", "XADD", "CMPXCHG", "CMPXCHG8B", "CMPXCHG16B",
+    "STD", "CLD", "LDMXCSR", "STMXCSR", "VLDMXCSR", "VSTMXCSR",
+    "EMMS", "FEMMS", "VZEROUPPER", "VZEROALL",
+    "MASKMOVQ", "MASKMOVDQU", "VMASKMOVDQU"
+])
+
+# Instructions which read the arithmetic flags, in addition to conditional moves and SETcc
+_flags_reading_names = frozenset(["ADC", "SBB", "ADCX", "ADOX", "RCL", "RCR", "CMC",
+                                  # Partial writes preserve the other flags
+                                  "INC", "DEC", "ROL", "ROR", "BT", "BTS", "BTR", "BTC",
+                                  # Shifts by zero leave flags unmodified
+                                  "SHL", "SHR", "SAL", "SAR", "SHLD", "SHRD"])
+
+# General-purpose instructions which do not modify the arithmetic flags
+_flags_preserving_names = frozenset(["MOV", "MOVZX", "MOVSX", "MOVSXD", "MOVBE", "MOVNTI", "LEA", "NOT", "BSWAP",
+                                     "SHLX", "SHRX", "SARX", "RORX", "MULX", "PDEP", "PEXT", "CRC32",
+                                     "CBW", "CWD", "CDQ", "CQO", "CWDE", "CDQE"])
+
+# SIMD instructions which write the arithmetic flags
+_flags_writing_simd_names = frozenset(["COMISS", "COMISD", "UCOMISS", "UCOMISD",
+                                       "VCOMISS", "VCOMISD", "VUCOMISS", "VUCOMISD",
+                                       "PTEST", "VPTEST", "VTESTPS", "VTESTPD",
+                                       "PCMPESTRI", "PCMPESTRM", "PCMPISTRI", "PCMPISTRM",
+                                       "VPCMPESTRI", "VPCMPESTRM", "VPCMPISTRI", "VPCMPISTRM",
+                                       "KORTESTB", "KORTESTW", "KORTESTD", "KORTESTQ",
+                                       "KTESTB", "KTESTW", "KTESTD", "KTESTQ"])
+
+# The number of memory accesses after which a memory access orders all previous accesses, to bound the cost of alias
+# checks in long basic blocks
+_max_memory_accesses = 64
+
+# Masks of register kinds: general-purpose, MMX, mask, and vector (XMM, YMM, ZMM) registers. Virtual registers of
+# different kinds may have the same internal id, and are distinguished by the mask.
+_general_purpose_mask = 0xF
+_register_kind_masks = (_general_purpose_mask, 0x10, 0x40, 0x700)
+
+
+def get_scheduling_target(function):
+    """Returns the microarchitecture for scheduling of a function: the target of the function, or the target option,
+    or the default microarchitecture"""
+    import peachpy.x86_64.options
+    import peachpy.x86_64.uarch
+    return function.target or peachpy.x86_64.options.get_option("target") or peachpy.x86_64.uarch.default
+
+
+def is_schedulable(instruction):
+    """Checks if the scheduler may move the instruction relative to other instructions"""
+    from peachpy.x86_64.instructions import BranchInstruction
+    return instruction.__class__.__module__ in _instruction_modules and \
+        not isinstance(instruction, BranchInstruction) and instruction.name not in _barrier_names
+
+
+def get_flags_usage(instruction):
+    """Returns a tuple (reads flags, writes flags) for a schedulable instruction"""
+    name = instruction.name
+    if instruction.__class__.__module__ == "peachpy.x86_64.generic":
+        reads_flags = name in _flags_reading_names or name.startswith("CMOV") or name.startswith("SET")
+        writes_flags = not (name in _flags_preserving_names or name.startswith("CMOV") or name.startswith("SET"))
+        return reads_flags, writes_flags
+    else:
+        return False, name in _flags_writing_simd_names
+
+
+def get_register_keys(register_masks):
+    """Returns a list of (internal id, kind mask) keys which identify registers in a map from register internal id to
+    register mask"""
+    registers = []
+    for (register_id, register_mask) in register_masks.items():
+        for kind_mask in _register_kind_masks:
+            if register_mask & kind_mask != 0:
+                registers.append((register_id, kind_mask))
+    return registers
+
+
+def _get_memory_accesses(instruction, register_versions):
+    """Returns a list of tuples (address key, displacement, size, is write) for memory operands of the instruction.
+
+    The address key identifies the base and index registers, the versions of their values, and the scale. Accesses
+    with the same address key and non-overlapping displacement ranges never alias.
+    """
+    from peachpy.x86_64.operand import MemoryOperand
+    from peachpy.x86_64.uarch import address_only_names
+    accesses = []
+    if instruction.name in address_only_names:
+        return accesses
+    for (operand, is_output) in zip(instruction.operands, instruction.out_operands):
+        if isinstance(operand, MemoryOperand):
+            address = operand.address
+            base, index = address.base, address.index
+            base_key = (base._internal_id, _general_purpose_mask) if base is not None else None
+            index_key = (index._internal_id, _general_purpose_mask) if index is not None else None
+            address_key = (base_key, register_versions.get(base_key), index_key, register_versions.get(index_key),
+                           address.scale)
+            # Memory operands without size specification (e.g. vector loads) are at most 64 bytes wide
+            accesses.append((address_key, address.displacement, operand.size or 64, bool(is_output)))
+    return accesses
+
+
+def _may_alias(access_a, access_b):
+    address_key_a, displacement_a, size_a, _ = access_a
+    address_key_b, displacement_b, size_b, _ = access_b
+    if address_key_a != address_key_b:
+        return True
+    return displacement_a < displacement_b + size_b and displacement_b < displacement_a + size_a
+
+
+class DependencyGraph:
+    """Dependencies between instructions of a scheduling region.
+
+    :ivar list successors: for each instruction, the list of tuples (successor, delay), where delay is the minimum
+        number of cycles between the issue of the instruction and the issue of the successor.
+    :ivar list predecessors_count: the number of predecessors of each instruction.
+    :ivar list latencies: the latency of each instruction.
+    :ivar list ports: the execution ports of micro-operations of each instruction.
+    """
+
+    def __init__(self, instructions, input_registers, output_registers, register_index, target,
+                 live_out_flags=True):
+        """
+        :param list instructions: the instructions of the region in their original order.
+        :param list input_registers: the bitsets of registers read by each instruction.
+        :param list output_registers: the bitsets of registers written by each instruction.
+        :param RegisterIndex register_index: the index of register bitsets.
+        :param Microarchitecture target: the microarchitecture which provides instruction timings.
+        :param bool live_out_flags: whether flags written in the region may be read after the region.
+        """
+        count = len(instructions)
+        self.successors = [list() for _ in range(count)]
+        self.predecessors_count = [0] * count
+        timings = [target.get_instruction_timing(instruction) for instruction in instructions]
+        self.latencies = [timing.latency for timing in timings]
+        self.ports = [timing.ports for timing in timings]
+        # Map from (source, destination) to the index of the edge in successors of the source
+        self._edges = dict()
+
+        # Register dependencies: true dependencies delay the consumer by the latency of the producer, and output and
+        # anti-dependencies only order the instructions
+        last_writers = dict()
+        readers_since_write = dict()
+        register_versions = dict()
+        memory_accesses = list()
+        memory_fence = None
+        flags_usage = [get_flags_usage(instruction) for instruction in instructions]
+        flags_consumed = self._analyze_flags_consumers(flags_usage, live_out_flags)
+        flags_writer, flags_readers, dead_flags_writers = None, list(), list()
+        for i, instruction in enumerate(instructions):
+            for register_key in get_register_keys(register_index.decode(input_registers[i])):
+                writer = last_writers.get(register_key)
+                if writer is not None:
+                    self._add_edge(writer, i, self.latencies[writer])
+                readers_since_write.setdefault(register_key, []).append(i)
+
+            # Memory addresses are computed from the register values before the outputs of the instruction
+            accesses = _get_memory_accesses(instruction, register_versions)
+            if accesses:
+                if memory_fence is not None:
+                    self._add_edge(memory_fence, i, 0)
+                for (j, previous_accesses) in memory_accesses:
+                    if any((access[3] or previous_access[3]) and _may_alias(access, previous_access)
+                           for access in accesses for previous_access in previous_accesses):
+                        self._add_edge(j, i, self.latencies[j] if any(a[3] for a in previous_accesses) else 0)
+                memory_accesses.append((i, accesses))
+                if len(memory_accesses) > _max_memory_accesses:
+                    for (j, _) in memory_accesses[:-1]:
+                        self._add_edge(j, i, 0)
+                    memory_fence = i
+                    memory_accesses = list()
+
+            for register_key in get_register_keys(register_index.decode(output_registers[i])):
+                writer = last_writers.get(register_key)
+                if writer is not None:
+                    self._add_edge(writer, i, 0)
+                for reader in readers_since_write.get(register_key, ()):
+                    self._add_edge(reader, i, 0)
+                last_writers[register_key] = i
+                readers_since_write[register_key] = []
+                register_versions[register_key] = register_versions.get(register_key, 0) + 1
+
+            # Flags: a writer whose flags are consumed opens an interval which ends at its last reader, and no other
+            # flag writer may be placed inside the interval
+            reads_flags, writes_flags = flags_usage[i]
+            if reads_flags:
+                if flags_writer is not None:
+                    self._add_edge(flags_writer, i, self.latencies[flags_writer])
+                flags_readers.append(i)
+            if writes_flags:
+                for reader in flags_readers:
+                    self._add_edge(reader, i, 0)
+                if flags_consumed[i]:
+                    for writer in dead_flags_writers:
+                        self._add_edge(writer, i, 0)
+                    flags_writer, flags_readers, dead_flags_writers = i, list(), list()
+                else:
+                    dead_flags_writers.append(i)
+        self._edges = None
+
+    @staticmethod
+    def _analyze_flags_consumers(flags_usage, live_out_flags):
+        """Returns for each instruction whether the flags it writes may be read by a later instruction"""
+        consumed = [False] * len(flags_usage)
+        next_reads_flags = live_out_flags
+        for i in reversed(range(len(flags_usage))):
+            reads_flags, writes_flags = flags_usage[i]
+            if writes_flags:
+                consumed[i] = next_reads_flags
+                next_reads_flags = False
+            if reads_flags:
+                next_reads_flags = True
+        return consumed
+
+    def _add_edge(self, source, destination, delay):
+        if source == destination:
+            return
+        edge = (source, destination)
+        edge_index = self._edges.get(edge)
+        if edge_index is None:
+            self._edges[edge] = len(self.successors[source])
+            self.successors[source].append((destination, delay))
+            self.predecessors_count[destination] += 1
+        elif self.successors[source][edge_index][1] < delay:
+            self.successors[source][edge_index] = (destination, delay)
+
+    def get_heights(self):
+        """Returns the length of the longest latency-weighted path from each instruction to the end of the region"""
+        heights = list(self.latencies)
+        for i in reversed(range(len(heights))):
+            for (successor, delay) in self.successors[i]:
+                heights[i] = max(heights[i], delay + heights[successor])
+        return heights
+
+
+def schedule_region(graph, issue_width):
+    """Orders the instructions of a region with a cycle-driven list scheduler.
+
+    In each cycle, the scheduler issues up to issue_width instructions whose operands are ready and whose
+    micro-operations find free execution ports, preferring instructions on the longest path to the end of the region.
+    Instructions of equal priority keep their original order.
+
+    :param DependencyGraph graph: the dependencies of instructions in the region.
+    :param int issue_width: the maximum number of instructions issued per cycle.
+    :returns: the list of positions of instructions in the region in the scheduled order.
+    """
+    count = len(graph.latencies)
+    heights = graph.get_heights()
+    predecessors_count = list(graph.predecessors_count)
+    earliest_cycle = [0] * count
+    # Instructions with all predecessors issued, ordered by the cycle when their operands are ready
+    waiting = [(0, i) for i in range(count) if predecessors_count[i] == 0]
+    heapq.heapify(waiting)
+    ready = []
+    order = []
+    cycle = 0
+    while len(order) < count:
+        while waiting and waiting[0][0] <= cycle:
+            _, i = heapq.heappop(waiting)
+            heapq.heappush(ready, (-heights[i], i))
+        if not ready:
+            cycle = waiting[0][0]
+            continue
+
+        busy_ports = set()
+        deferred = []
+        issued_count = 0
+        while ready and issued_count < issue_width:
+            _, i = heapq.heappop(ready)
+            ports = []
+            for uop_ports in graph.ports[i]:
+                port = next((port for port in uop_ports if port not in busy_ports and port not in ports), None)
+                if port is None:
+                    break
+                ports.append(port)
+            if len(ports) != len(graph.ports[i]) and issued_count != 0:
+                # Execution ports are busy: retry in the next cycle. Instructions with more micro-operations than
+                # available ports issue alone.
+                deferred.append((-heights[i], i))
+                continue
+            busy_ports.update(ports)
+            issued_count += 1
+            order.append(i)
+            for (successor, delay) in graph.successors[i]:
+                earliest_cycle[successor] = max(earliest_cycle[successor], cycle + delay)
+                predecessors_count[successor] -= 1
+                if predecessors_count[successor] == 0:
+                    if earliest_cycle[successor] <= cycle:
+                        heapq.heappush(ready, (-heights[successor], successor))
+                    else:
+                        heapq.heappush(waiting, (earliest_cycle[successor], successor))
+        for entry in deferred:
+            heapq.heappush(ready, entry)
+        cycle += 1
+    return order
+
+
+def schedule_instructions(instructions, instruction_arrays, target):
+    """Reorders independent instructions in basic blocks to hide instruction latencies on the target microarchitecture.
+
+    Scheduling regions are the maximal sequences of schedulable instructions (see :func:`is_schedulable`) between
+    labels, branches, returns, pseudo-instructions, and barriers. Instructions in a region are reordered subject to
+    register, flags, and memory dependencies. Flags written in a region are assumed to be read after the region, and
+    an instruction which writes the flags for a conditional branch at the end of the region stays right before the
+    branch to keep macro-fusion.
+
+    :param list instructions: the list of instructions of the function.
+    :param InstructionArrays instruction_arrays: the arrays of the instructions computed by the analysis pass.
+    :param Microarchitecture target: the target microarchitecture.
+    :returns: a tuple of the reordered list of instructions and the number of instructions which changed position.
+    """
+    from peachpy.x86_64.instructions import BranchInstruction
+    regions = []
+    region_start = None
+    for i, instruction in enumerate(instructions):
+        if is_schedulable(instruction):
+            if region_start is None:
+                region_start = i
+        elif region_start is not None:
+            regions.append((region_start, i))
+            region_start = None
+    if region_start is not None:
+        regions.append((region_start, len(instructions)))
+
+    scheduled_instructions = list(instructions)
+    moved_count = 0
+    for (start, end) in regions:
+        if end - start < 2:
+            continue
+        region_end = end
+        next_instruction = instructions[end] if end < len(instructions) else None
+        if isinstance(next_instruction, BranchInstruction) and next_instruction.is_conditional and \
+                get_flags_usage(instructions[end - 1])[1]:
+            # Keep the compare-and-branch pair together
+            region_end = end - 1
+            if region_end - start < 2:
+                continue
+        graph = DependencyGraph(instructions[start:region_end],
+                                instruction_arrays.input_registers[start:region_end],
+                                instruction_arrays.output_registers[start:region_end],
+                                instruction_arrays.register_index, target)
+        order = schedule_region(graph, target.scheduling_model.issue_width)
+        for (position, i) in enumerate(order):
+            if position != i:
+                moved_count += 1
+            scheduled_instructions[start + position] = instructions[start + i]
+    return scheduled_instructions, moved_count
@@ -1,11 +1,231 @@
 # This file is part of Peach-Py package and is licensed under the Simplified BSD license.
 #    See license.rst for the full text of the license.
 
+import collections
+import os
+import re
+import struct
+import zlib
+
 from peachpy.x86_64 import isa
 
 
+class InstructionTiming(collections.namedtuple("InstructionTiming",
+                                                ["latency", "reciprocal_throughput", "uops", "ports"])):
+    """Timing of an instruction form on a microarchitecture.
+
+    :ivar int latency: the number of cycles until the outputs of the instruction are available to dependent
+        instructions.
+    :ivar float reciprocal_throughput: the average number of cycles per instruction in a long sequence of independent
+        instructions of this form.
+    :ivar int uops: the number of micro-operations of the instruction.
+    :ivar tuple ports: the execution ports of each micro-operation of the instruction. Each element is a string of port
+        names, and the micro-operation executes on any one of these ports.
+    """
+
+    __slots__ = ()
+
+
+class SchedulingModel:
+    """Simplified model of the execution core of a microarchitecture for instruction scheduling.
+
+    Instructions are classified into groups with similar latency and execution ports (see
+    :func:`get_instruction_group`), and the model specifies the latency and the ports of each group. Port names are
+    single characters, and their meaning is specific to the model.
+
+    :ivar int issue_width: the maximum number of instructions issued per cycle.
+    :ivar int load_latency: the latency of loads from L1 cache.
+    :ivar str load_ports: the ports which execute load micro-operations.
+    :ivar tuple store_ports: the ports of each micro-operation of a store.
+    :ivar dict groups: map from instruction group to a tuple (latency, ports) for operations on registers. Groups
+        executed on units which are not fully pipelined specify the reciprocal throughput as the third element.
+    """
+
+    def __init__(self, issue_width, load_latency, load_ports, store_ports, groups):
+        self.issue_width = issue_width
+        self.load_latency = load_latency
+        self.load_ports = load_ports
+        self.store_ports = store_ports
+        self.groups = groups
+
+
+# Instructions whose memory operand only specifies an address: they neither load from nor store to memory
+address_only_names = frozenset(["LEA"])
+
+# Groups of instructions which operate on general-purpose registers
+_integer_groups = frozenset(["move", "alu", "shift", "multiply", "divide", "bit_count"])
+
+_integer_group_names = {
+    "IMUL": "multiply", "MUL": "multiply", "MULX": "multiply",
+    "DIV": "divide", "IDIV": "divide",
+    "POPCNT": "bit_count", "LZCNT": "bit_count", "TZCNT": "bit_count", "BSF": "bit_count", "BSR": "bit_count",
+    "PDEP": "bit_count", "PEXT": "bit_count", "CRC32": "bit_count",
+    "MOV": "move", "MOVZX": "move", "MOVSX": "move", "MOVSXD": "move", "MOVBE": "move", "MOVNTI": "move",
+}
+_integer_shift_names = frozenset(["SHL", "SHR", "SAL", "SAR", "ROL", "ROR", "RCL", "RCR", "SHLD", "SHRD",
+                                  "SHLX", "SHRX", "SARX", "RORX"])
+
+# Patterns of SIMD instruction names (without the V prefix of AVX forms) and their groups, in the order of matching
+_vector_group_patterns = [
+    (re.compile(r"^F(N)?M(ADD|SUB)"), "fma"),
+    (re.compile(r"^(AES|SHA|PCLMUL)"), "crypto"),
+    (re.compile(r"^(DIV|SQRT)[PS][SD]$"), "fp_divide"),
+    (re.compile(r"^(MUL[PS][SD]|RCP[PS]S|RSQRT[PS]S|DP[PS][SD])$"), "fp_multiply"),
+    (re.compile(r"^(ADD|SUB|ADDSUB|HADD|HSUB|MIN|MAX|CMP|ROUND|COMI|UCOMI)[PS]?[SD]$"), "fp_add"),
+    (re.compile(r"^CVT"), "convert"),
+    (re.compile(r"^(P(MUL|MADD|SADBW)|MPSADBW|PHMINPOSUW|PCMP[EI]STR)"), "vector_multiply"),
+    (re.compile(r"^PS(LL|RL)DQ$"), "shuffle"),
+    (re.compile(r"^PS(LL|RL|RA)"), "vector_shift"),
+    (re.compile(r"^(P?SHUF|P?UNPCK|PERM|PALIGNR|INSERT|EXTRACT|PEXTR|PINSR|P?BROADCAST|PACK|MOV(HL|LH|DDUP|SLDUP|"
+                r"SHDUP|MSK)|PMOV|PMOVMSKB|BLENDV|PBLENDVB|P?GATHER)"), "shuffle"),
+    (re.compile(r"^(MOV|LDDQU)"), "vector_move"),
+]
+
+
+def get_instruction_group(name, is_generic):
+    """Classifies an instruction into a group of instructions with similar latency and execution ports.
+
+    :param str name: the name of the instruction.
+    :param bool is_generic: indicates if the instruction is a general-purpose instruction (defined in the
+        :mod:`peachpy.x86_64.generic` module).
+    :returns: one of "move", "alu", "shift", "multiply", "divide", "bit_count" for instructions on general-purpose
+        registers, and "vector_move", "vector_alu", "vector_shift", "vector_multiply", "shuffle", "fp_add",
+        "fp_multiply", "fp_divide", "fma", "convert", "crypto" for SIMD instructions.
+    """
+    group = _instruction_groups.get(name)
+    if group is None:
+        if is_generic:
+            group = _integer_group_names.get(name)
+            if group is None:
+                group = "shift" if name in _integer_shift_names else "alu"
+        else:
+            simd_name = name[1:] if name.startswith("V") else name
+            group = next((group for (pattern, group) in _vector_group_patterns if pattern.match(simd_name)),
+                         "vector_alu")
+        _instruction_groups[name] = group
+    return group
+
+
+# Map from instruction name to its group
+_instruction_groups = dict()
+
+
+def get_operand_descriptions(instruction):
+    """Returns a list of tuples (operand type, size, is output) which describe the operands of an instruction for
+    :meth:`Microarchitecture.estimate_timing`. Operand type is "register", "memory", or None for other operands."""
+    from peachpy.x86_64.operand import MemoryOperand
+    from peachpy.x86_64.registers import Register
+    descriptions = []
+    for (operand, is_output) in zip(instruction.operands, instruction.out_operands):
+        if isinstance(operand, Register):
+            descriptions.append(("register", operand.size, bool(is_output)))
+        elif isinstance(operand, MemoryOperand):
+            descriptions.append(("memory", operand.size, bool(is_output)))
+        else:
+            descriptions.append((None, None, bool(is_output)))
+    return descriptions
+
+
+def get_reciprocal_throughput(ports, issue_width):
+    """Estimates the reciprocal throughput of an instruction from the execution ports of its micro-operations.
+
+    Each micro-operation occupies one of its ports for a cycle, and the throughput is limited by the issue width and
+    by the set of ports with the highest load.
+    """
+    throughput = float(len(ports)) / issue_width
+    for port_set in set(ports):
+        port_users = sum(1 for uop_ports in ports if set(uop_ports) <= set(port_set))
+        throughput = max(throughput, float(port_users) / len(port_set))
+    return throughput
+
+
+def unpack_timing_database(data):
+    """Decodes the packed instruction timing database.
+
+    The database starts with the magic bytes "PTDB" and the format version byte, followed by zlib-compressed
+    little-endian records:
+
+    - The number of strings (uint16) and the strings, each as the length (uint8) and ASCII characters. Instruction
+      names, operand kinds, port sets, and microarchitecture ids refer to strings by their index.
+    - The number of instruction forms (uint32) and the forms, each as the instruction name (uint16), the number of
+      operands (uint8), and the operand kinds (uint16 each, see :func:`peachpy.x86_64.operand.get_operand_kind`).
+    - The number of timings (uint16) and the timings, each as the latency (uint16), the reciprocal throughput in
+      hundredths of a cycle (uint16), the number of micro-operations (uint8), the number of port sets (uint8), and the
+      port sets of micro-operations (uint16 each).
+    - The number of columns (uint8) and the columns, each as the timing index (uint16) for every instruction form.
+    - The number of microarchitectures (uint8) and the microarchitectures, each as the id (uint16) and the column
+      (uint8).
+
+    :param bytes data: the content of the timing database file.
+    :returns: a tuple of the list of (instruction name, operand kinds) keys of instruction forms, the list of
+        columns of timings of instruction forms, and the map from microarchitecture id to its column.
+    """
+    if data[:4] != b"PTDB" or bytearray(data[4:5])[0] != 1:
+        raise ValueError("Invalid instruction timing database")
+    data = zlib.decompress(data[5:])
+    offset = [0]
+
+    def read(format):
+        values = struct.unpack_from("<" + format, data, offset[0])
+        offset[0] += struct.calcsize("<" + format)
+        return values
+
+    strings = []
+    for _ in range(read("H")[0]):
+        length = read("B")[0]
+        strings.append(data[offset[0]:offset[0] + length].decode("ascii"))
+        offset[0] += length
+    forms = []
+    for _ in range(read("I")[0]):
+        name_index, operand_count = read("HB")
+        forms.append((strings[name_index], tuple(strings[kind] for kind in read("H" * operand_count))))
+    timings = []
+    for _ in range(read("H")[0]):
+        latency, throughput, uops, port_set_count = read("HHBB")
+        ports = tuple(strings[port_set] for port_set in read("H" * port_set_count))
+        timings.append(InstructionTiming(latency, throughput / 100.0, uops, ports))
+    columns = []
+    for _ in range(read("B")[0]):
+        columns.append([timings[timing] for timing in read("H" * len(forms))])
+    microarchitecture_columns = dict()
+    for _ in range(read("B")[0]):
+        id_index, column = read("HB")
+        microarchitecture_columns[strings[id_index]] = column
+    return forms, columns, microarchitecture_columns
+
+
+def get_timing_table(microarchitecture):
+    """Returns the map from (instruction name, operand kinds) to :class:`InstructionTiming` for a microarchitecture.
+
+    The table is loaded on first use from the timing database file generated by codegen/x86_64_timing.py. If the
+    file is missing, or does not describe the microarchitecture, the table is empty.
+    """
+    table = _timing_tables.get(microarchitecture.id)
+    if table is None:
+        global _timing_database
+        if _timing_database is None:
+            path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "timing.bin")
+            if os.path.isfile(path):
+                with open(path, "rb") as database_file:
+                    _timing_database = unpack_timing_database(database_file.read())
+            else:
+                _timing_database = (list(), list(), dict())
+        forms, columns, microarchitecture_columns = _timing_database
+        column = microarchitecture_columns.get(microarchitecture.id)
+        table = dict(zip(forms, columns[column])) if column is not None else dict()
+        _timing_tables[microarchitecture.id] = table
+    return table
+
+
+# The content of the timing database: None if not loaded yet
+_timing_database = None
+# Map from microarchitecture id to the map from instruction form key to its timing
+_timing_tables = dict()
+
+
 class Microarchitecture:
-    def __init__(self, name, extensions, alu_width, fpu_width, load_with, store_width):
+    def __init__(self, name, extensions, alu_width, fpu_width, load_with, store_width, scheduling_model=None,
+                 loop_alignment=16):
         self.name = name
         self.extensions = isa.Extensions(*[prerequisite for extension in extensions
                                            for prerequisite in extension.prerequisites])
@@ -13,6 +233,9 @@ class Microarchitecture:
         self.fpu_width = fpu_width
         self.load_width = load_with
         self.store_width = store_width
+        self.scheduling_model = scheduling_model if scheduling_model is not None else nehalem_model
+        # Alignment of loop heads to the instruction fetch and decoded instruction cache windows
+        self.loop_alignment = loop_alignment
 
     def is_supported(self, extension):
         return extension in self.extensions
@@ -61,13 +284,95 @@ class Microarchitecture:
     def has_avx512f(self):
         return isa.avx512f in self.extensions
 
+    def get_instruction_timing(self, instruction):
+        """Returns the latency, the reciprocal throughput, and the execution ports of an instruction on this
+        microarchitecture.
+
+        Timings of instruction forms are looked up in the timing database (see :func:`get_timing_table`) by the name
+        and the operand kinds of the instruction, and forms missing from the database are estimated with
+        :meth:`estimate_timing`.
+
+        :param Instruction instruction: the instruction to query.
+        :returns: an :class:`InstructionTiming` tuple.
+        """
+        from peachpy.x86_64.operand import get_operand_kind
+        timing = get_timing_table(self).get((instruction.name, tuple(map(get_operand_kind, instruction.operands))))
+        if timing is None:
+            timing = self.estimate_timing(instruction.name,
+                                          instruction.__class__.__module__ == "peachpy.x86_64.generic",
+                                          get_operand_descriptions(instruction))
+        return timing
+
+    def estimate_timing(self, name, is_generic, operands, execution_timing=None):
+        """Estimates the timing of an instruction form from the scheduling model of this microarchitecture.
+
+        Instructions with memory operands include the micro-operations of the load and the store, unless the memory
+        operand only specifies an address (e.g. in LEA), and operations on registers or memory wider than the
+        execution units are split into several micro-operations.
+
+        :param str name: the name of the instruction.
+        :param bool is_generic: indicates if the instruction is a general-purpose instruction.
+        :param list operands: tuples (operand type, size, is output) which describe the operands of the instruction
+            (see :func:`get_operand_descriptions`).
+        :param tuple execution_timing: an optional tuple (latency, reciprocal throughput, ports) of the operation on
+            registers which replaces the estimate of the scheduling model.
+        :returns: an :class:`InstructionTiming` tuple.
+        """
+        model = self.scheduling_model
+        group = get_instruction_group(name, is_generic)
+        is_move = group in ("move", "vector_move")
+        if execution_timing is not None:
+            latency, execution_throughput, execution_ports = execution_timing
+            execution_ports = tuple(execution_ports)
+        else:
+            group_timing = model.groups.get(group) or model.groups["vector_alu"]
+            latency, ports = group_timing[:2]
+            execution_throughput = group_timing[2] if len(group_timing) > 2 else None
+            execution_ports = (ports,)
+
+        # Operations wider than the execution units take several micro-operations
+        splits = 1
+        register_sizes = [size for (operand_type, size, _) in operands if operand_type == "register"]
+        if group not in _integer_groups:
+            vector_bits = max([size * 8 for size in register_sizes if size >= 32] + [0])
+            if vector_bits != 0:
+                splits = max(vector_bits // self.fpu_width, 1)
+        uops = list(execution_ports) * splits
+
+        has_load, has_store = False, False
+        for (operand_type, size, is_output) in operands:
+            if operand_type != "memory" or name in address_only_names:
+                continue
+            # Memory operands without size specification have the size of register operands
+            bits = (size or max(register_sizes + [8])) * 8
+            # Integer instructions other than moves and SETcc read, modify, and write the memory operand
+            if not is_output or not is_move and group in _integer_groups and not name.startswith("SET"):
+                has_load = True
+                uops += [model.load_ports] * max(bits // self.load_width, 1)
+            if is_output:
+                has_store = True
+                uops += list(model.store_ports) * max(bits // self.store_width, 1)
+        if is_move and (has_load or has_store):
+            # Loads and stores do not use an execution unit
+            uops = uops[len(execution_ports) * splits:]
+            latency = 0
+        if has_load:
+            latency += model.load_latency
+
+        reciprocal_throughput = get_reciprocal_throughput(uops, model.issue_width)
+        if execution_throughput is not None:
+            reciprocal_throughput = max(reciprocal_throughput, execution_throughput * splits)
+        return InstructionTiming(latency or 1, reciprocal_throughput, len(uops), tuple(uops))
+
     def __add__(self, extension):
         return Microarchitecture(self.name, self.extensions + extension,
-                                 self.alu_width, self.fpu_width, self.load_width, self.store_width)
+                                 self.alu_width, self.fpu_width, self.load_width, self.store_width,
+                                 self.scheduling_model)
 
     def __sub__(self, extension):
         return Microarchitecture(self.name, self.extensions - extension,
-                                 self.alu_width, self.fpu_width, self.load_width, self.store_width)
+                                 self.alu_width, self.fpu_width, self.load_width, self.store_width,
+                                 self.scheduling_model)
 
     def __hash__(self):
         return hash(self.name)
@@ -84,51 +389,146 @@ class Microarchitecture:
     def __repr__(self):
         return str(self)
 
+# Scheduling models of microarchitecture families. Ports of Intel models are numbered as in Intel manuals. Ports of
+# AMD and Atom models name integer pipes with digits, address generation units and load/store pipes with letters
+# A-C, and floating-point pipes with letters F-I.
+prescott_model = SchedulingModel(issue_width=3, load_latency=4, load_ports="2", store_ports=("3",), groups={
+    "move": (1, "01"), "alu": (1, "01"), "shift": (1, "1"), "multiply": (10, "1"), "divide": (70, "1", 70),
+    "bit_count": (8, "1"), "vector_move": (6, "0"), "vector_alu": (2, "1"), "vector_shift": (2, "1"),
+    "vector_multiply": (8, "1"), "shuffle": (4, "1"), "fp_add": (5, "1"), "fp_multiply": (7, "1"),
+    "fp_divide": (40, "1", 40), "convert": (6, "1"),
+})
+conroe_model = SchedulingModel(issue_width=4, load_latency=3, load_ports="2", store_ports=("3", "4"), groups={
+    "move": (1, "015"), "alu": (1, "015"), "shift": (1, "05"), "multiply": (3, "1"), "divide": (40, "0", 30),
+    "bit_count": (3, "1"), "vector_move": (1, "015"), "vector_alu": (1, "015"), "vector_shift": (2, "1"),
+    "vector_multiply": (3, "0"), "shuffle": (1, "5"), "fp_add": (3, "1"), "fp_multiply": (4, "0"),
+    "fp_divide": (18, "0", 17), "convert": (4, "1"),
+})
+nehalem_model = SchedulingModel(issue_width=4, load_latency=4, load_ports="2", store_ports=("3", "4"), groups={
+    "move": (1, "015"), "alu": (1, "015"), "shift": (1, "05"), "multiply": (3, "1"), "divide": (26, "0", 12),
+    "bit_count": (3, "1"), "vector_move": (1, "015"), "vector_alu": (1, "015"), "vector_shift": (1, "0"),
+    "vector_multiply": (3, "0"), "shuffle": (1, "5"), "fp_add": (3, "1"), "fp_multiply": (4, "0"),
+    "fp_divide": (14, "0", 7), "convert": (4, "1"), "crypto": (6, "0"),
+})
+sandy_bridge_model = SchedulingModel(issue_width=4, load_latency=5, load_ports="23", store_ports=("4", "23"), groups={
+    "move": (1, "015"), "alu": (1, "015"), "shift": (1, "05"), "multiply": (3, "1"), "divide": (26, "0", 11),
+    "bit_count": (3, "1"), "vector_move": (1, "015"), "vector_alu": (1, "015"), "vector_shift": (1, "0"),
+    "vector_multiply": (5, "0"), "shuffle": (1, "5"), "fp_add": (3, "1"), "fp_multiply": (5, "0"),
+    "fp_divide": (14, "0", 7), "convert": (4, "1"), "crypto": (8, "1"),
+})
+haswell_model = SchedulingModel(issue_width=4, load_latency=5, load_ports="23", store_ports=("4", "237"), groups={
+    "move": (1, "0156"), "alu": (1, "0156"), "shift": (1, "06"), "multiply": (3, "1"), "divide": (26, "0", 9),
+    "bit_count": (3, "1"), "vector_move": (1, "015"), "vector_alu": (1, "015"), "vector_shift": (1, "0"),
+    "vector_multiply": (5, "0"), "shuffle": (1, "5"), "fp_add": (3, "1"), "fp_multiply": (5, "01"),
+    "fp_divide": (13, "0", 7), "convert": (4, "1"), "fma": (5, "01"), "crypto": (7, "5"),
+})
+broadwell_model = SchedulingModel(issue_width=4, load_latency=5, load_ports="23", store_ports=("4", "237"), groups={
+    "move": (1, "0156"), "alu": (1, "0156"), "shift": (1, "06"), "multiply": (3, "1"), "divide": (22, "0", 8),
+    "bit_count": (3, "1"), "vector_move": (1, "015"), "vector_alu": (1, "015"), "vector_shift": (1, "0"),
+    "vector_multiply": (5, "0"), "shuffle": (1, "5"), "fp_add": (3, "1"), "fp_multiply": (3, "01"),
+    "fp_divide": (11, "0", 5), "convert": (4, "1"), "fma": (5, "01"), "crypto": (7, "0"),
+})
+k8_model = SchedulingModel(issue_width=3, load_latency=3, load_ports="AB", store_ports=("AB",), groups={
+    "move": (1, "012"), "alu": (1, "012"), "shift": (1, "012"), "multiply": (3, "0"), "divide": (40, "0", 40),
+    "bit_count": (3, "012"), "vector_move": (2, "FG"), "vector_alu": (2, "FG"), "vector_shift": (2, "FG"),
+    "vector_multiply": (3, "G"), "shuffle": (2, "FG"), "fp_add": (4, "F"), "fp_multiply": (4, "G"),
+    "fp_divide": (20, "G", 17), "convert": (4, "H"),
+})
+k10_model = SchedulingModel(issue_width=3, load_latency=3, load_ports="AB", store_ports=("AB",), groups={
+    "move": (1, "012"), "alu": (1, "012"), "shift": (1, "012"), "multiply": (3, "0"), "divide": (40, "0", 40),
+    "bit_count": (2, "012"), "vector_move": (2, "FG"), "vector_alu": (2, "FG"), "vector_shift": (3, "FG"),
+    "vector_multiply": (3, "G"), "shuffle": (3, "FG"), "fp_add": (4, "F"), "fp_multiply": (4, "G"),
+    "fp_divide": (16, "G", 15), "convert": (4, "H"),
+})
+bulldozer_model = SchedulingModel(issue_width=4, load_latency=4, load_ports="AB", store_ports=("AB",), groups={
+    "move": (1, "01"), "alu": (1, "01"), "shift": (1, "01"), "multiply": (4, "1"), "divide": (40, "0", 25),
+    "bit_count": (4, "01"), "vector_move": (2, "HI"), "vector_alu": (2, "HI"), "vector_shift": (3, "G"),
+    "vector_multiply": (4, "F"), "shuffle": (2, "G"), "fp_add": (5, "FG"), "fp_multiply": (5, "FG"),
+    "fp_divide": (20, "F", 10), "convert": (4, "G"), "fma": (5, "FG"), "crypto": (5, "F"),
+})
+bonnell_model = SchedulingModel(issue_width=2, load_latency=3, load_ports="0", store_ports=("0",), groups={
+    "move": (1, "01"), "alu": (1, "01"), "shift": (1, "0"), "multiply": (5, "0"), "divide": (50, "0", 50),
+    "bit_count": (5, "0"), "vector_move": (1, "01"), "vector_alu": (1, "01"), "vector_shift": (1, "0"),
+    "vector_multiply": (5, "0"), "shuffle": (1, "0"), "fp_add": (5, "1"), "fp_multiply": (5, "0"),
+    "fp_divide": (70, "0", 70), "convert": (7, "01"),
+})
+silvermont_model = SchedulingModel(issue_width=2, load_latency=3, load_ports="A", store_ports=("A",), groups={
+    "move": (1, "01"), "alu": (1, "01"), "shift": (1, "01"), "multiply": (3, "0"), "divide": (30, "0", 30),
+    "bit_count": (3, "0"), "vector_move": (1, "FG"), "vector_alu": (1, "FG"), "vector_shift": (1, "F"),
+    "vector_multiply": (5, "F"), "shuffle": (1, "F"), "fp_add": (3, "G"), "fp_multiply": (5, "F"),
+    "fp_divide": (20, "F", 20), "convert": (4, "G"), "crypto": (8, "F"),
+})
+jaguar_model = SchedulingModel(issue_width=2, load_latency=3, load_ports="A", store_ports=("B",), groups={
+    "move": (1, "01"), "alu": (1, "01"), "shift": (1, "01"), "multiply": (3, "0"), "divide": (25, "0", 25),
+    "bit_count": (3, "01"), "vector_move": (1, "FG"), "vector_alu": (1, "FG"), "vector_shift": (1, "F"),
+    "vector_multiply": (4, "G"), "shuffle": (1, "FG"), "fp_add": (3, "F"), "fp_multiply": (2, "G"),
+    "fp_divide": (19, "G", 19), "convert": (3, "F"), "crypto": (4, "G"),
+})
+
 default = Microarchitecture('Default', isa.default,
-                            alu_width=128, fpu_width=128, load_with=128, store_width=128)
+                            alu_width=128, fpu_width=128, load_with=128, store_width=128,
+                            scheduling_model=nehalem_model)
 prescott = Microarchitecture('Prescott', (isa.cmov, isa.sse3),
-                             alu_width=64, fpu_width=64, load_with=64, store_width=64)
+                             alu_width=64, fpu_width=64, load_with=64, store_width=64,
+                             scheduling_model=prescott_model)
 conroe = Microarchitecture('Conroe', (isa.cmov, isa.mmx_plus, isa.ssse3),
-                           alu_width=128, fpu_width=128, load_with=128, store_width=128)
+                           alu_width=128, fpu_width=128, load_with=128, store_width=128,
+                           scheduling_model=conroe_model)
 penryn = Microarchitecture('Penryn', (isa.cmov, isa.mmx_plus, isa.sse4_1),
-                           alu_width=128, fpu_width=128, load_with=128, store_width=128)
+                           alu_width=128, fpu_width=128, load_with=128, store_width=128,
+                           scheduling_model=conroe_model)
 nehalem = Microarchitecture('Nehalem', (isa.cmov, isa.mmx_plus, isa.sse4_2, isa.popcnt),
-                            alu_width=128, fpu_width=128, load_with=128, store_width=128)
+                            alu_width=128, fpu_width=128, load_with=128, store_width=128,
+                            scheduling_model=nehalem_model)
 sandy_bridge = Microarchitecture('Sandy Bridge', (isa.cmov, isa.mmx_plus, isa.sse4_2, isa.popcnt, isa.avx),
-                                 alu_width=128, fpu_width=256, load_with=256, store_width=128)
+                                 alu_width=128, fpu_width=256, load_with=256, store_width=128,
+                                 scheduling_model=sandy_bridge_model, loop_alignment=32)
 ivy_bridge = Microarchitecture('Ivy Bridge', (isa.cmov, isa.mmx_plus, isa.sse4_2, isa.popcnt, isa.avx, isa.f16c),
-                               alu_width=128, fpu_width=256, load_with=256, store_width=128)
+                               alu_width=128, fpu_width=256, load_with=256, store_width=128,
+                               scheduling_model=sandy_bridge_model, loop_alignment=32)
 haswell = Microarchitecture('Haswell', (isa.cmov, isa.mmx_plus, isa.sse4_2, isa.popcnt, isa.avx, isa.f16c, isa.fma3,
                                         isa.avx2, isa.lzcnt, isa.three_d_now_prefetch, isa.movbe, isa.bmi2),
-                            alu_width=256, fpu_width=256, load_with=256, store_width=256)
+                            alu_width=256, fpu_width=256, load_with=256, store_width=256,
+                            scheduling_model=haswell_model, loop_alignment=32)
 broadwell = Microarchitecture('Broadwell', (isa.cmov, isa.mmx_plus, isa.sse4_2, isa.popcnt, isa.f16c, isa.fma3, isa.avx2,
                                             isa.lzcnt, isa.three_d_now_prefetch, isa.movbe, isa.bmi2, isa.adx),
-                              alu_width=256, fpu_width=256, load_with=256, store_width=256)
+                              alu_width=256, fpu_width=256, load_with=256, store_width=256,
+                              scheduling_model=broadwell_model, loop_alignment=32)
 k8 = Microarchitecture('K8', (isa.cmov, isa.mmx_plus, isa.three_d_now_plus, isa.three_d_now_prefetch, isa.sse2),
-                       alu_width=64, fpu_width=64, load_with=64, store_width=64)
+                       alu_width=64, fpu_width=64, load_with=64, store_width=64,
+                       scheduling_model=k8_model)
 k10 = Microarchitecture('K10', (isa.cmov, isa.mmx_plus, isa.three_d_now_plus, isa.three_d_now_prefetch, isa.sse4a,
                                 isa.popcnt, isa.lzcnt),
-                        alu_width=128, fpu_width=128, load_with=128, store_width=64)
+                        alu_width=128, fpu_width=128, load_with=128, store_width=64,
+                        scheduling_model=k10_model)
 bulldozer = Microarchitecture('Bulldozer', (isa.cmov, isa.mmx_plus, isa.sse4a, isa.avx, isa.xop, isa.fma4,
                                             isa.three_d_now_prefetch, isa.aes, isa.pclmulqdq, isa.lzcnt, isa.popcnt),
-                              alu_width=128, fpu_width=128, load_with=128, store_width=128)
+                              alu_width=128, fpu_width=128, load_with=128, store_width=128,
+                              scheduling_model=bulldozer_model, loop_alignment=32)
 piledriver = Microarchitecture('Piledriver', (isa.cmov, isa.mmx_plus, isa.sse4a, isa.sse4_2, isa.avx, isa.xop, isa.fma4,
                                               isa.fma3, isa.f16c, isa.three_d_now_prefetch, isa.aes, isa.pclmulqdq,
                                               isa.lzcnt, isa.popcnt, isa.bmi, isa.tbm),
-                               alu_width=128, fpu_width=128, load_with=128, store_width=128)
+                               alu_width=128, fpu_width=128, load_with=128, store_width=128,
+                               scheduling_model=bulldozer_model, loop_alignment=32)
 steamroller = Microarchitecture('Steamroller', (isa.cmov, isa.mmx_plus, isa.sse4a, isa.avx, isa.xop, isa.fma4, isa.fma3,
                                                 isa.f16c, isa.three_d_now_prefetch, isa.aes, isa.pclmulqdq, isa.lzcnt,
                                                 isa.popcnt, isa.bmi, isa.tbm),
-                                alu_width=128, fpu_width=256, load_with=256, store_width=128)
+                                alu_width=128, fpu_width=256, load_with=256, store_width=128,
+                                scheduling_model=bulldozer_model, loop_alignment=32)
 bonnell = Microarchitecture('Bonnell', (isa.cmov, isa.movbe, isa.mmx_plus, isa.ssse3),
-                            alu_width=128, fpu_width=64, load_with=128, store_width=128)
+                            alu_width=128, fpu_width=64, load_with=128, store_width=128,
+                            scheduling_model=bonnell_model)
 saltwell = Microarchitecture('Saltwell', (isa.cmov, isa.movbe, isa.mmx_plus, isa.ssse3),
-                             alu_width=128, fpu_width=64, load_with=128, store_width=128)
+                             alu_width=128, fpu_width=64, load_with=128, store_width=128,
+                             scheduling_model=bonnell_model)
 silvermont = Microarchitecture('Silvermont', (isa.cmov, isa.movbe, isa.popcnt, isa.mmx_plus, isa.sse4_2, isa.aes,
                                               isa.pclmulqdq),
-                               alu_width=128, fpu_width=64, load_with=128, store_width=128)
+                               alu_width=128, fpu_width=64, load_with=128, store_width=128,
+                               scheduling_model=silvermont_model)
 bobcat = Microarchitecture('Bobcat', (isa.cmov, isa.mmx_plus, isa.three_d_now_prefetch, isa.ssse3, isa.sse4a),
-                           alu_width=64, fpu_width=64, load_with=64, store_width=64)
+                           alu_width=64, fpu_width=64, load_with=64, store_width=64,
+                           scheduling_model=jaguar_model)
 jaguar = Microarchitecture('Jaguar', (isa.cmov, isa.movbe, isa.lzcnt, isa.bmi, isa.popcnt, isa.three_d_now_prefetch,
                                       isa.mmx_plus, isa.sse4_2, isa.sse4a, isa.avx, isa.f16c, isa.aes, isa.pclmulqdq),
-                           alu_width=128, fpu_width=128, load_with=128, store_width=128)
+                           alu_width=128, fpu_width=128, load_with=128, store_width=128,
+                           scheduling_model=jaguar_model)
@@ -35,6 +35,9 @@ class GenerateInstructions(Command):
                       level=distutils.log.INFO)
         import codegen.x86_64
         codegen.x86_64.main(src_dir)
+        self.announce("Generating x86-64 instruction timing database", level=distutils.log.INFO)
+        import codegen.x86_64_timing
+        codegen.x86_64_timing.main(src_dir)
 
 
 setup(
@@ -433,3 +433,62 @@ RETURN
     Avail regs: gp64-vreg<10>, gp64-vreg<11>, gp64-vreg<12>, gp64-vreg<13>, gp64-vreg<14>, gp64-vreg<15>, gp64-vreg<1>, gp64-vreg<2>, gp64-vreg<3>, gp64-vreg<4>, gp64-vreg<5>, gp64-vreg<6>, gp64-vreg<7>, gp64-vreg<8>, gp64-vreg<9>, rax
 """
         assert equal_codes(listing, ref_listing), "Unexpected Peach-Py code:\n" + listing
+
+
+class TestInstructionArrays(unittest.TestCase):
+    def runTest(self):
+        from peachpy.x86_64.function import RegisterIndex
+        from peachpy.x86_64.ir import InstructionArrays, InstructionCategory, RegisterRole
+
+        x = Argument(ptr(const_uint32_t))
+        n = Argument(size_t)
+
+        with Function("sum_elements", (x, n), uint32_t) as function:
+            reg_x, reg_n = GeneralPurposeRegister64(), GeneralPurposeRegister64()
+            LOAD.ARGUMENT(reg_x, x)
+            LOAD.ARGUMENT(reg_n, n)
+            reg_sum = GeneralPurposeRegister32()
+            XOR(reg_sum, reg_sum)
+            with Loop() as loop:
+                ADD(reg_sum, [reg_x + reg_n * 4 - 4])
+                SUB(reg_n, 1)
+                JNZ(loop.begin)
+            RETURN(reg_sum)
+
+        # Bitsets of registers are released after the analysis of the function
+        assert function._instruction_arrays.live_registers is None
+
+        register_index = RegisterIndex()
+        arrays = InstructionArrays(function._instructions, register_index)
+        assert len(arrays) == len(function._instructions)
+        for (i, instruction) in enumerate(function._instructions):
+            assert arrays.input_registers[i] == register_index.encode(instruction.input_registers_masks)
+            assert arrays.output_registers[i] == register_index.encode(instruction.output_registers_masks)
+            assert set(arrays.register_ids[slot] for slot in arrays.get_register_slots(i)) == \
+                set(register._internal_id for register in instruction.registers)
+
+        categories = [arrays.categories[i] for i in range(len(arrays))]
+        assert categories.count(InstructionCategory.Label) == 1
+        assert categories.count(InstructionCategory.ConditionalBranch) == 1
+        assert categories[-1] == InstructionCategory.Return
+        jnz_position = categories.index(InstructionCategory.ConditionalBranch)
+        assert arrays.label_names[jnz_position] == loop.begin.name
+
+        add_position = next(i for (i, instruction) in enumerate(function._instructions) if instruction.name == "ADD")
+        add_slots = arrays.get_register_slots(add_position)
+        assert [arrays.register_roles[slot] for slot in add_slots] == \
+            [RegisterRole.Register, RegisterRole.MemoryBase, RegisterRole.MemoryIndex]
+        assert [arrays.register_operands[slot] for slot in add_slots] == [0, 1, 1]
+        assert [arrays.register_ids[slot] for slot in add_slots] == \
+            [reg_sum._internal_id, reg_x._internal_id, reg_n._internal_id]
+        assert add_position in arrays.virtual_register_positions
+        assert arrays.loop_weights[add_position] == 10
+
+        arrays.bind_registers({reg_sum.kind: {reg_sum._internal_id: 0, reg_x._internal_id: 1, reg_n._internal_id: 2}})
+        assert [arrays.register_ids[slot] for slot in add_slots] == [0, 1, 2]
+        assert not arrays.virtual_register_positions
+
+        py_sum_elements = function.finalize(abi.detect()).encode().load()
+        import ctypes
+        data = (ctypes.c_uint32 * 4)(1, 2, 3, 4)
+        assert py_sum_elements(data, 4) == 10
@@ -0,0 +1,86 @@
+import unittest
+from peachpy import *
+from peachpy.x86_64 import *
+from peachpy.x86_64.analyzer import analyze_loops
+import peachpy.x86_64.uarch
+
+
+class AccumulationLoop(unittest.TestCase):
+    def runTest(self):
+        x = Argument(ptr(const_float_), name="x")
+        n = Argument(size_t, name="n")
+
+        with Function("sum", (x, n), float_, target=peachpy.x86_64.uarch.haswell) as function:
+            reg_x, reg_n = GeneralPurposeRegister64(), GeneralPurposeRegister64()
+            LOAD.ARGUMENT(reg_x, x)
+            LOAD.ARGUMENT(reg_n, n)
+            xmm_acc = XMMRegister()
+            XORPS(xmm_acc, xmm_acc)
+            with Loop() as loop:
+                ADDSS(xmm_acc, dword[reg_x])
+                ADD(reg_x, 4)
+                SUB(reg_n, 1)
+                JNZ(loop.begin)
+            RETURN(xmm_acc)
+
+        (analysis,) = analyze_loops(function.finalize(abi.detect()))
+        assert analysis.bottleneck == "dependency", str(analysis)
+        assert abs(analysis.cycles - 3.0) < 0.01, str(analysis)
+        assert [instruction.name for instruction in analysis.dependency_chain] == ["ADDSS"], str(analysis)
+        assert not analysis.has_inner_loops
+
+
+class DivisionLoop(unittest.TestCase):
+    def runTest(self):
+        x = Argument(ptr(uint64_t), name="x")
+        n = Argument(size_t, name="n")
+
+        with Function("divide", (x, n), target=peachpy.x86_64.uarch.haswell) as function:
+            reg_x, reg_n = GeneralPurposeRegister64(), GeneralPurposeRegister64()
+            LOAD.ARGUMENT(reg_x, x)
+            LOAD.ARGUMENT(reg_n, n)
+            MOV(rcx, 10)
+            with Loop() as loop:
+                MOV(rax, [reg_x])
+                XOR(edx, edx)
+                DIV(rcx)
+                MOV([reg_x], rax)
+                ADD(reg_x, 8)
+                SUB(reg_n, 1)
+                JNZ(loop.begin)
+            RETURN()
+
+        (analysis,) = analyze_loops(function.finalize(abi.detect()))
+        # Iterations are independent, and the unpipelined divider bounds the loop
+        assert analysis.bottleneck == "throughput", str(analysis)
+        assert analysis.cycles >= 70, str(analysis)
+
+
+class AddressComputationLoop(unittest.TestCase):
+    def runTest(self):
+        x = Argument(uint64_t, name="x")
+        n = Argument(size_t, name="n")
+
+        loop_analyses = []
+        for use_lea in (False, True):
+            with Function("sum", (x, n), uint64_t, target=peachpy.x86_64.uarch.haswell) as function:
+                reg_x, reg_n = GeneralPurposeRegister64(), GeneralPurposeRegister64()
+                LOAD.ARGUMENT(reg_x, x)
+                LOAD.ARGUMENT(reg_n, n)
+                reg_sum = GeneralPurposeRegister64()
+                XOR(reg_sum.as_dword, reg_sum.as_dword)
+                with Loop() as loop:
+                    if use_lea:
+                        LEA(reg_sum, [reg_sum + reg_x * 1])
+                    else:
+                        ADD(reg_sum, reg_x)
+                    SUB(reg_n, 1)
+                    JNZ(loop.begin)
+                RETURN(reg_sum)
+            (analysis,) = analyze_loops(function.finalize(abi.detect()))
+            loop_analyses.append(analysis)
+
+        # LEA does not load from memory, and the loop-carried dependency is as short as with ADD
+        add_analysis, lea_analysis = loop_analyses
+        assert abs(lea_analysis.cycles - add_analysis.cycles) < 0.01, str(lea_analysis)
+        assert abs(lea_analysis.cycles - 1.0) < 0.01, str(lea_analysis)
@@ -0,0 +1,120 @@
+import shutil
+import tempfile
+import unittest
+from peachpy import *
+from peachpy.x86_64 import *
+from peachpy.x86_64.cache import CompilationCache
+
+
+def define_function(name, addend):
+    x = Argument(uint32_t)
+
+    with Function(name, (x,), uint32_t) as function:
+        reg_x = GeneralPurposeRegister32()
+        LOAD.ARGUMENT(reg_x, x)
+        ADD(reg_x, addend)
+        RETURN(reg_x)
+
+    return function
+
+
+class CacheEncodedFunction(unittest.TestCase):
+    def runTest(self):
+        cache_directory = tempfile.mkdtemp()
+        try:
+            with CompilationCache(cache_directory) as cache:
+                encoded_function = define_function("add_5", 5).finalize(abi.detect()).encode()
+                assert cache.hits == 0 and cache.misses == 1
+
+                cached_function = define_function("add_5", 5).finalize(abi.detect()).encode()
+                assert cache.hits == 1
+                assert cached_function.code_view.tobytes() == encoded_function.code_view.tobytes()
+                assert cached_function.instruction_slices == encoded_function.instruction_slices
+
+                py_add_5 = cached_function.load()
+                assert py_add_5(10) == 15
+
+                define_function("add_7", 7).finalize(abi.detect()).encode()
+                assert cache.misses == 2
+        finally:
+            shutil.rmtree(cache_directory)
+
+
+class CacheUndefinedFunction(unittest.TestCase):
+    def runTest(self):
+        # Functions defined without an active cache have no cache key
+        function = define_function("add_3", 3)
+        cache_directory = tempfile.mkdtemp()
+        try:
+            with CompilationCache(cache_directory) as cache:
+                function.finalize(abi.system_v_x86_64_abi).encode()
+                assert cache.hits == 0 and cache.misses == 0
+                assert cache.size == 0
+        finally:
+            shutil.rmtree(cache_directory)
+
+
+class CacheEviction(unittest.TestCase):
+    def runTest(self):
+        cache_directory = tempfile.mkdtemp()
+        try:
+            with CompilationCache(cache_directory) as cache:
+                define_function("add_1", 1).finalize(abi.system_v_x86_64_abi).encode()
+                entry_size = cache.size
+                cache.max_size = entry_size * 2
+                for addend in range(2, 6):
+                    define_function("add_%d" % addend, addend).finalize(abi.system_v_x86_64_abi).encode()
+                    assert cache.size <= cache.max_size
+
+                # The most recently added function is still in the cache, but the first one is evicted
+                define_function("add_5", 5).finalize(abi.system_v_x86_64_abi).encode()
+                assert cache.hits == 1
+                define_function("add_1", 1).finalize(abi.system_v_x86_64_abi).encode()
+                assert cache.hits == 1
+        finally:
+            shutil.rmtree(cache_directory)
+
+
+class CacheWriterFunction(unittest.TestCase):
+    def runTest(self):
+        import os
+        import peachpy.writer
+        from peachpy.context import BuildContext
+        output_directory = tempfile.mkdtemp()
+        try:
+            cache_directory = os.path.join(output_directory, "cache")
+            object_path = os.path.join(output_directory, "add.o")
+            with BuildContext(abi=abi.system_v_x86_64_abi), CompilationCache(cache_directory) as cache:
+                # A function missed at the end of its definition is not looked up again when it is encoded
+                with peachpy.writer.ELFWriter(object_path, abi.system_v_x86_64_abi):
+                    define_function("add_9", 9)
+                assert cache.hits == 0 and cache.misses == 1
+                assert cache.size != 0
+
+                with peachpy.writer.ELFWriter(object_path, abi.system_v_x86_64_abi):
+                    define_function("add_9", 9)
+                assert cache.hits == 1 and cache.misses == 1
+        finally:
+            shutil.rmtree(output_directory)
+
+
+class CacheFinalizeServedFunction(unittest.TestCase):
+    def runTest(self):
+        import os
+        import peachpy.writer
+        from peachpy.context import BuildContext
+        output_directory = tempfile.mkdtemp()
+        try:
+            cache_directory = os.path.join(output_directory, "cache")
+            object_path = os.path.join(output_directory, "add.o")
+            with BuildContext(abi=abi.system_v_x86_64_abi), CompilationCache(cache_directory):
+                with peachpy.writer.ELFWriter(object_path, abi.system_v_x86_64_abi):
+                    define_function("add_4", 4)
+                with peachpy.writer.ELFWriter(object_path, abi.system_v_x86_64_abi):
+                    function = define_function("add_4", 4)
+
+                # The function served from the cache is analysed when it is finalized for another ABI
+                encoded_function = function.finalize(abi.microsoft_x64_abi).encode()
+                assert "ADD" in encoded_function.format()
+        finally:
+            shutil.rmtree(output_directory)
@@ -0,0 +1,99 @@
+import unittest
+from peachpy import *
+from peachpy.x86_64 import *
+from peachpy.context import get_active_context
+
+
+def define_polynomial(name, a, b):
+    x = Argument(uint32_t)
+    n = Argument(uint32_t)
+
+    with Function(name, (x, n), uint32_t) as function:
+        reg_x = GeneralPurposeRegister32()
+        reg_n = GeneralPurposeRegister32()
+        reg_result = GeneralPurposeRegister32()
+        LOAD.ARGUMENT(reg_x, x)
+        LOAD.ARGUMENT(reg_n, n)
+
+        # Computes (a * x + b) * n by repeated addition
+        IMUL(reg_x, reg_x, a)
+        ADD(reg_x, b)
+        XOR(reg_result, reg_result)
+        TEST(reg_n, reg_n)
+        skip_loop = Label("skip_loop")
+        JZ(skip_loop)
+        with Loop() as loop:
+            ADD(reg_result, reg_x)
+            SUB(reg_n, 1)
+            JNZ(loop.begin)
+        LABEL(skip_loop)
+        RETURN(reg_result)
+
+    return function
+
+
+class NestedBuildContext(unittest.TestCase):
+    def runTest(self):
+        with Function("outer", tuple(), uint32_t) as outer_function:
+            MOV(eax, 1)
+            # A nested build context defines another function while the outer function is active
+            with BuildContext():
+                inner_function = define_polynomial("inner", 3, 1)
+            MOV(eax, 2)
+            RETURN(eax)
+
+        assert len(inner_function._instructions) > len(outer_function._instructions)
+        assert all(instruction.name != "IMUL" for instruction in outer_function._instructions)
+        assert inner_function.finalize(abi.detect()).encode().load()(5, 2) == 32
+        assert outer_function.finalize(abi.detect()).encode().load()() == 2
+
+
+class BuildContextOptions(unittest.TestCase):
+    def runTest(self):
+        with BuildContext(debug_level=1):
+            with Function("debug", tuple()) as debug_function:
+                RETURN()
+        assert debug_function.debug_level == 1
+        assert debug_function._instructions[0].origin is not None
+
+        with Function("release", tuple()) as release_function:
+            RETURN()
+        assert release_function.debug_level == 0
+
+        with self.assertRaises(TypeError):
+            BuildContext(optimization_level=2)
+
+        build_context = BuildContext()
+        with build_context:
+            assert get_active_context() is build_context
+            with self.assertRaises(ValueError):
+                build_context.__enter__()
+        assert get_active_context() is not build_context
+
+
+class ConcurrentFunctionConstruction(unittest.TestCase):
+    def runTest(self):
+        try:
+            from concurrent.futures import ThreadPoolExecutor
+        except ImportError:
+            # Python 2 without the futures backport
+            return
+
+        def build_function(index):
+            # Each thread builds its functions in a separate build context
+            with BuildContext():
+                function = define_polynomial("polynomial_%d" % index, index % 100, index)
+                return function.finalize(abi.detect()).encode()
+
+        executor = ThreadPoolExecutor(max_workers=8)
+        try:
+            encoded_functions = list(executor.map(build_function, range(256)))
+        finally:
+            executor.shutdown()
+
+        assert get_active_context().active_function is None
+        assert get_active_context().active_stream is None
+        for index, encoded_function in enumerate(encoded_functions):
+            assert encoded_function.name == "polynomial_%d" % index
+            py_polynomial = encoded_function.load()
+            assert py_polynomial(3, 2) == 2 * (index % 100 * 3 + index)
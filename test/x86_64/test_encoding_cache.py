@@ -0,0 +1,49 @@
+import unittest
+from peachpy import *
+from peachpy.x86_64 import *
+from peachpy.x86_64.encoding import EncodingCache, encoding_cache
+
+
+class TestEncodingCacheHits(unittest.TestCase):
+    def runTest(self):
+        encoding_cache.clear()
+        code = ADD(rax, [rsi + rdi * 4 + 16]).encode()
+        assert encoding_cache.misses == 1 and encoding_cache.hits == 0
+        cached_code = ADD(rax, [rsi + rdi * 4 + 16]).encode()
+        assert encoding_cache.hits == 1
+        assert cached_code == code
+
+        other_code = ADD(rax, [rsi + rdi * 4 + 32]).encode()
+        assert encoding_cache.misses == 2
+        assert other_code != code
+
+        # Modification of the returned bytecode must not affect the cache
+        cached_code[0] = 0
+        assert ADD(rax, [rsi + rdi * 4 + 16]).encode() == code
+
+
+class TestEncodingCacheLengthOptions(unittest.TestCase):
+    def runTest(self):
+        encoding_cache.clear()
+        length_options = VADDPS(ymm0, ymm1, [rsi + 64]).encode_length_options()
+        assert VADDPS(ymm0, ymm1, [rsi + 64]).encode_length_options() == length_options
+        assert encoding_cache.hits == 1
+
+
+class TestEncodingCacheVirtualRegisters(unittest.TestCase):
+    def runTest(self):
+        instruction = MOV(GeneralPurposeRegister64(virtual_id=1), rax)
+        assert EncodingCache.get_key(instruction) is None
+
+
+class TestEncodingCacheEviction(unittest.TestCase):
+    def runTest(self):
+        cache = EncodingCache(capacity=2)
+        cache.insert("a", b"\x01")
+        cache.insert("b", b"\x02")
+        assert cache.lookup("a") == b"\x01"
+        cache.insert("c", b"\x03")
+        assert len(cache) == 2
+        assert cache.lookup("b") is None
+        assert cache.lookup("a") == b"\x01" and cache.lookup("c") == b"\x03"
+        assert cache.hits == 3 and cache.misses == 1
@@ -172,6 +172,52 @@ loop.begin:
 """
         assert equal_codes(code, ref_code), "Unexpected Peach-Py code:\n" + code
 
+class MultipleABIs(unittest.TestCase):
+    def runTest(self):
+        x = Argument(ptr(const_uint32_t))
+        n = Argument(size_t)
+
+        with Function("sum_elements", (x, n), uint32_t) as function:
+            r_x = GeneralPurposeRegister64()
+            r_n = GeneralPurposeRegister64()
+            LOAD.ARGUMENT(r_x, x)
+            LOAD.ARGUMENT(r_n, n)
+
+            r_sum = GeneralPurposeRegister32()
+            XOR(r_sum, r_sum)
+            sum_variable = LocalVariable(r_sum)
+            STORE.LOCAL(sum_variable, r_sum)
+            with Loop() as loop:
+                LOAD.LOCAL(r_sum, sum_variable)
+                ADD(r_sum, [r_x])
+                STORE.LOCAL(sum_variable, r_sum)
+                ADD(r_x, 4)
+                SUB(r_n, 1)
+                JNZ(loop.begin)
+
+            RETURN(r_sum)
+
+        code = function.format()
+        abi_functions = [function.finalize(function_abi) for function_abi in
+                         (abi.system_v_x86_64_abi, abi.microsoft_x64_abi, abi.native_client_x86_64_abi, abi.detect())]
+        encoded_functions = [abi_function.encode() for abi_function in abi_functions
+                             if abi_function.abi != abi.native_client_x86_64_abi]
+
+        # ABI-specific passes must not modify the instructions of the function
+        assert function.format() == code, "Function is modified by ABI-specific passes:\n" + function.format()
+        assert all(instruction.bytecode is None for instruction in function._instructions)
+        # Instructions which are not rewritten for the ABI are shared with the function
+        function_instruction_ids = set(map(id, function._instructions))
+        assert any(id(instruction) in function_instruction_ids for instruction in abi_functions[0]._instructions)
+        assert "rdi" in abi_functions[0].format_code() and "rcx" in abi_functions[1].format_code()
+        assert "r15" in abi_functions[2].format_code()
+
+        import ctypes
+        py_sum_elements = encoded_functions[-1].load()
+        data = (ctypes.c_uint32 * 5)(1, 2, 3, 4, 5)
+        assert py_sum_elements(data, 5) == 15
+
+
 # class SSEArgument(unittest.TestCase):
 #     def runTest(self):
 #
@@ -190,3 +236,37 @@ loop.begin:
 #             RETURN()
 #
 #         print add_function.assembly
+
+
+class DebugOrigin(unittest.TestCase):
+    def runTest(self):
+        import pickle
+
+        x = Argument(uint32_t)
+
+        with Function("debug_origin", (x,), uint32_t, debug_level=1) as function:
+            reg_x = GeneralPurposeRegister32()
+            LOAD.ARGUMENT(reg_x, x)
+            ADD(reg_x, 1)
+            RETURN(reg_x)
+
+        load, add = function._instructions[0], function._instructions[1]
+        assert load.source_file == __file__.replace(".pyc", ".py")
+        assert load.source_code == "LOAD.ARGUMENT(reg_x, x)"
+        assert add.line_number == load.line_number + 1
+        assert add.source_code == "ADD(reg_x, 1)"
+
+        abi_function = function.finalize(abi.system_v_x86_64_abi)
+        abi_add = next(instruction for instruction in abi_function._instructions if instruction.name == "ADD")
+        assert abi_add.line_number == add.line_number
+
+        pickled_origin = pickle.loads(pickle.dumps(add.origin))
+        assert pickled_origin.source_code == add.source_code
+
+        with Function("release_origin", (x,), uint32_t, debug_level=0) as function:
+            reg_x = GeneralPurposeRegister32()
+            LOAD.ARGUMENT(reg_x, x)
+            RETURN(reg_x)
+
+        assert all(instruction.origin is None and instruction.source_code is None
+                   for instruction in function._instructions)
@@ -0,0 +1,97 @@
+import copy
+import unittest
+from peachpy import *
+from peachpy.x86_64 import *
+from peachpy.x86_64.operand import MemoryOperand
+
+
+class SharedInstructionFormMetadata(unittest.TestCase):
+    def runTest(self):
+        add_eax_ecx, add_edx_ebx = ADD(eax, ecx), ADD(edx, ebx)
+        assert not hasattr(add_eax_ecx, "__dict__")
+        assert all(x is y for (x, y) in zip(add_eax_ecx.encodings, add_edx_ebx.encodings))
+
+        vfmadd = VFMADD231PS(ymm0, ymm1, ymm2)
+        assert vfmadd.isa_extensions is VFMADD231PS(ymm3, ymm4, ymm5).isa_extensions
+        assert vfmadd.isa_extensions == frozenset([isa.fma3])
+
+        add_copy = copy.deepcopy(add_eax_ecx)
+        assert add_copy.operands == add_eax_ecx.operands
+        assert add_copy.encode() == add_eax_ecx.encode()
+
+
+class SlottedOperands(unittest.TestCase):
+    def runTest(self):
+        address = rsi + rdi * 4 + 16
+        operand = MemoryOperand(address, 4)
+        for obj in (rax, xmm1, address, operand):
+            assert not hasattr(obj, "__dict__"), "%s has per-instance dictionary" % str(obj)
+        operand_copy = copy.copy(operand)
+        assert operand_copy.address is address and operand_copy.size == 4
+
+
+class OperandFormDispatch(unittest.TestCase):
+    def runTest(self):
+        from peachpy.x86_64.operand import get_operand_kind
+        assert [get_operand_kind(operand) for operand in (al, r9d, xmm9, ymm1, 5, Label("skip"))] == \
+            ["r8", "r32", "xmm", "ymm", "imm", "label"]
+        assert [get_operand_kind(operand) for operand in (MemoryOperand(rax), dword[rax], oword[rsi + rdi * 4])] == \
+            ["m", "m32", "m128"]
+        assert get_operand_kind(1.0) is None
+
+        # Forms which match only specific registers or immediates
+        assert SHL(eax, 1).encode() == bytearray([0xD1, 0xE0])
+        assert SHL(eax, 2).encode() == bytearray([0xC1, 0xE0, 0x02])
+        assert SHL(eax, cl).encode() == bytearray([0xD3, 0xE0])
+        with self.assertRaises(SyntaxError):
+            SHL(eax, dl)
+
+        # Memory operands without size match memory operand types of any size
+        assert ADD(eax, [rax]).encode() == ADD(eax, dword[rax]).encode()
+        with self.assertRaises(SyntaxError):
+            ADD(eax, byte[rax])
+        with self.assertRaises(SyntaxError):
+            ADD(eax, ecx, edx)
+
+        # Instructions with forms of different operand counts
+        assert RET().encode() == bytearray([0xC3])
+        assert RET(8).encode() == bytearray([0xC2, 0x08, 0x00])
+        with self.assertRaises(SyntaxError):
+            RET(eax)
+        with self.assertRaises(SyntaxError):
+            RET(8, 8)
+
+
+class LazyInstructionLoading(unittest.TestCase):
+    def runTest(self):
+        import os
+        import sys
+        import subprocess
+        import peachpy
+        script = "\n".join([
+            "import sys",
+            "from peachpy.x86_64 import *",
+            "assert not any(name in sys.modules for name in ('peachpy.x86_64.generic', 'peachpy.x86_64.avx'))",
+            "assert ADD(eax, 1).encode() == bytearray([0x83, 0xC0, 0x01])",
+            "assert 'peachpy.x86_64.generic' in sys.modules and 'peachpy.x86_64.avx' not in sys.modules",
+        ])
+        environment = dict(os.environ)
+        environment["PYTHONPATH"] = os.path.dirname(os.path.dirname(os.path.abspath(peachpy.__file__)))
+        subprocess.check_call([sys.executable, "-c", script], env=environment)
+
+        import peachpy.x86_64.generic
+        assert ADD.load() is peachpy.x86_64.generic.ADD
+        assert isinstance(ADD(eax, ecx), ADD) and not isinstance(ADD(eax, ecx), SUB)
+        assert issubclass(peachpy.x86_64.generic.ADD, ADD)
+
+        # Classes derived from the placeholder derive from the instruction class on all Python versions
+        class ADD_EAX(ADD):
+            def __init__(self, source):
+                super(ADD_EAX, self).__init__(eax, source)
+        assert ADD_EAX.__bases__ == (peachpy.x86_64.generic.ADD,)
+        assert isinstance(ADD_EAX(ecx), ADD) and ADD_EAX(1).encode() == bytearray([0x83, 0xC0, 0x01])
+
+        with Function("lazy_origin", tuple(), debug_level=1) as function:
+            ADD(eax, ecx)
+            RETURN()
+        assert function._instructions[0].origin.code is self.runTest.__func__.__code__
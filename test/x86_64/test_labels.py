@@ -67,3 +67,135 @@ used:
     RETURN
 """
         assert equal_codes(code, ref_code), "Unexpected Peach-Py code:\n" + code
+
+
+class TestBranchRelaxation(unittest.TestCase):
+    """Test that branches use the short encoding unless the label is out of rel8 range"""
+    def runTest(self):
+        with Function("branch_relaxation", tuple()) as function:
+            far_label = Label("far")
+            near_label = Label("near")
+            LABEL(near_label)
+            # 2 * 61 = 122 bytes: JNZ is in rel8 range until JZ is relaxed to rel32
+            for _ in range(61):
+                XOR(eax, eax)
+            JZ(far_label)
+            JNZ(near_label)
+            # 5 * 30 = 150 bytes: out of rel8 range
+            for _ in range(30):
+                ADD(eax, 0x12345678)
+            LABEL(far_label)
+            RETURN()
+
+        encoded_function = function.finalize(abi.system_v_x86_64_abi).encode()
+        jz, jnz = [instruction for instruction in encoded_function._instructions if instruction.name in {"JZ", "JNZ"}]
+        assert jz.bytecode == bytearray([0x0F, 0x84]) + bytearray([6 + 150, 0, 0, 0]), \
+            "Unexpected encoding of JZ: " + " ".join("%02X" % byte for byte in jz.bytecode)
+        assert jnz.bytecode == bytearray([0x0F, 0x85]) + bytearray([0x100 - 134, 0xFF, 0xFF, 0xFF]), \
+            "Unexpected encoding of JNZ: " + " ".join("%02X" % byte for byte in jnz.bytecode)
+
+
+class TestAlignment(unittest.TestCase):
+    """Test that ALIGN pads code with longer encodings of preceding instructions before NOPs"""
+    def runTest(self):
+        from peachpy import Argument, ptr, const_uint32_t, size_t, uint32_t
+        x = Argument(ptr(const_uint32_t), name="x")
+        n = Argument(size_t, name="n")
+        with Function("sum", (x, n), uint32_t) as function:
+            reg_x, reg_n = GeneralPurposeRegister64(), GeneralPurposeRegister64()
+            LOAD.ARGUMENT(reg_x, x)
+            LOAD.ARGUMENT(reg_n, n)
+            reg_sum = GeneralPurposeRegister32()
+            MOV(reg_sum, [reg_x])
+            ADD(reg_x, 4)
+            SUB(reg_n, 1)
+            JZ(Label("done"))
+            MOV(ecx, 1)
+            ALIGN(32)
+            with Loop() as loop:
+                ADD(reg_sum, [reg_x])
+                ADD(reg_x, 4)
+                SUB(reg_n, 1)
+                JNZ(loop.begin)
+            LABEL(Label("done"))
+            RETURN(reg_sum)
+
+        encoded_function = function.finalize(abi.detect()).encode()
+        instructions = encoded_function._instructions
+        loop_position = [i for (i, instruction) in enumerate(instructions)
+                         if isinstance(instruction, LABEL) and instruction.identifier == loop.begin.name][0]
+        assert encoded_function._instruction_addresses[loop_position] % 32 == 0
+        # MOV ecx, 1 after JZ is lengthened, and JZ keeps the short encoding
+        mov, = [instruction for instruction in instructions
+                if instruction.name == "MOV" and ecx in instruction.operands]
+        assert len(mov.bytecode) > 5
+        jz, = [instruction for instruction in instructions if instruction.name == "JZ"]
+        assert len(jz.bytecode) == 2
+        assert len(encoded_function._code) == encoded_function._instruction_addresses[-1]
+
+        import ctypes
+        data = (ctypes.c_uint32 * 5)(1, 2, 3, 4, 5)
+        assert encoded_function.load()(data, 5) == 15
+
+
+class TestBundleRealignment(unittest.TestCase):
+    """Test that instruction bundles grow to their capacity with longer encodings"""
+    def runTest(self):
+        from peachpy.x86_64.function import InstructionBundle
+        from peachpy.stream import NullStream
+        with NullStream():
+            instructions = [MOV(eax, [rdi + 4]), ADD(rax, [rsi + rcx * 4]), XOR(eax, eax)]
+        bundle = InstructionBundle(16, 0)
+        for instruction in instructions:
+            bundle.add(instruction)
+        assert bundle.size == 3 + 4 + 2
+        assert bundle.realign() == 0
+        assert len(bundle) == 16
+        assert sum(len(instruction.bytecode) for instruction in instructions) == 16
+
+
+class TestLoopAlignment(unittest.TestCase):
+    """Test that innermost loops are aligned to the loop alignment of the target and jumps avoid 32-byte boundaries"""
+    def runTest(self):
+        from peachpy import Argument, ptr, const_uint32_t, size_t, uint32_t
+        from peachpy.context import BuildContext
+        from peachpy.x86_64.instructions import BranchInstruction
+        import peachpy.x86_64.uarch
+        x = Argument(ptr(const_uint32_t), name="x")
+        n = Argument(size_t, name="n")
+        with BuildContext(align_loops=True, align_branches=True, target=peachpy.x86_64.uarch.haswell):
+            with Function("sum", (x, n), uint32_t) as function:
+                reg_x, reg_n = GeneralPurposeRegister64(), GeneralPurposeRegister64()
+                LOAD.ARGUMENT(reg_x, x)
+                LOAD.ARGUMENT(reg_n, n)
+                reg_sum = GeneralPurposeRegister32()
+                XOR(reg_sum, reg_sum)
+                with Loop() as outer_loop:
+                    MOV(ecx, 3)
+                    with Loop() as inner_loop:
+                        for _ in range(5):
+                            ADD(reg_sum, [reg_x])
+                        SUB(ecx, 1)
+                        JNZ(inner_loop.begin)
+                    ADD(reg_x, 4)
+                    SUB(reg_n, 1)
+                    JNZ(outer_loop.begin)
+                RETURN(reg_sum)
+
+            encoded_function = function.finalize(abi.detect()).encode()
+
+        instructions, addresses = encoded_function._instructions, encoded_function._instruction_addresses
+        label_addresses = {instruction.identifier: address for (instruction, address) in zip(instructions, addresses)
+                           if isinstance(instruction, LABEL)}
+        assert label_addresses[inner_loop.begin.name] % peachpy.x86_64.uarch.haswell.loop_alignment == 0
+        assert encoded_function.code_alignment >= peachpy.x86_64.uarch.haswell.loop_alignment
+        for (i, instruction) in enumerate(instructions):
+            if isinstance(instruction, BranchInstruction):
+                # Macro-fused SUB + Jcc pairs do not cross or end at a 32-byte boundary
+                assert instructions[i - 1].name == "SUB"
+                start, end = addresses[i - 1], addresses[i + 1]
+                assert start // 32 == (end - 1) // 32 and end % 32 != 0
+
+        import ctypes
+        data = (ctypes.c_uint32 * 4)(1, 2, 3, 4)
+        assert encoded_function.load()(data, 4) == 5 * 3 * 10
@@ -29,3 +29,88 @@ class LoadAsm(unittest.TestCase):
         assert py_multiply(2, 2.0) == 4.0
         assert py_multiply(2, 3.0) == 6.0
 
+
+class LoadCodeView(unittest.TestCase):
+    def runTest(self):
+        x = Argument(uint32_t)
+
+        with Function("Square", (x,), uint32_t) as asm_square:
+            reg_x = GeneralPurposeRegister32()
+            LOAD.ARGUMENT(reg_x, x)
+            IMUL(reg_x, reg_x)
+            RETURN(reg_x)
+
+        encoded_square = asm_square.finalize(abi.detect()).encode()
+        code_view = encoded_square.code_view
+        assert isinstance(code_view, memoryview)
+        assert code_view.tobytes() == bytes(encoded_square.as_bytearray)
+        for instruction, (offset, length) in zip(encoded_square._instructions, encoded_square.instruction_slices):
+            assert code_view[offset:offset + length].tobytes() == bytes(instruction.bytecode or bytearray())
+
+        py_square = encoded_square.load()
+        assert py_square(7) == 49
+
+
+class LoadArena(unittest.TestCase):
+    def runTest(self):
+        from peachpy.loader import CodeArena
+
+        x = Argument(uint32_t)
+        encoded_functions = []
+        for addend in range(200):
+            with Function("add_%d" % addend, (x,), uint32_t) as asm_add:
+                reg_x = GeneralPurposeRegister32()
+                LOAD.ARGUMENT(reg_x, x)
+                ADD(reg_x, addend)
+                RETURN(reg_x)
+            encoded_functions.append(asm_add.finalize(abi.detect()).encode())
+
+        arena = CodeArena(alignment=32)
+        py_adds = arena.load(encoded_functions)
+        assert arena.mapping_count == 1
+        for addend, py_add in enumerate(py_adds):
+            assert py_add.address % 32 == 0
+            assert py_add(1000) == 1000 + addend
+
+        # Released slots are reused by subsequently loaded functions
+        released_addresses = set(py_add.address for py_add in py_adds[10:20])
+        for py_add in py_adds[10:20]:
+            arena.release(py_add)
+        self.assertRaises(ValueError, py_adds[10], 1)
+        py_add_5 = encoded_functions[5].load(arena=arena)
+        assert py_add_5.address in released_addresses
+        assert py_add_5(1) == 6
+        assert py_adds[30](1) == 31
+        assert arena.mapping_count == 1
+
+
+class LoadArenaAlignedLoops(unittest.TestCase):
+    def runTest(self):
+        from peachpy.loader import CodeArena
+        from peachpy.context import BuildContext
+
+        x = Argument(uint32_t)
+        encoded_functions = []
+        for multiplier in range(1, 4):
+            with BuildContext(align_loops=64):
+                with Function("multiply_%d" % multiplier, (x,), uint32_t) as asm_multiply:
+                    reg_x = GeneralPurposeRegister32()
+                    LOAD.ARGUMENT(reg_x, x)
+                    reg_product = GeneralPurposeRegister32()
+                    XOR(reg_product, reg_product)
+                    MOV(ecx, multiplier)
+                    with Loop() as loop:
+                        ADD(reg_product, reg_x)
+                        SUB(ecx, 1)
+                        JNZ(loop.begin)
+                    RETURN(reg_product)
+                encoded_functions.append(asm_multiply.finalize(abi.detect()).encode())
+        assert all(encoded_function.code_alignment == 64 for encoded_function in encoded_functions)
+
+        arena = CodeArena(alignment=16)
+        # Occupy the first slot so that the next free slot is not aligned on 64 bytes
+        encoded_functions[0].load(arena=arena)
+        py_multiplies = arena.load(encoded_functions)
+        for multiplier, py_multiply in enumerate(py_multiplies, start=1):
+            assert py_multiply.address % 64 == 0
+            assert py_multiply(7) == 7 * multiplier
@@ -0,0 +1,74 @@
+import unittest
+from peachpy import *
+from peachpy.x86_64 import *
+from peachpy.context import BuildContext
+
+
+class RewritePatterns(unittest.TestCase):
+    def runTest(self):
+        x = Argument(ptr(uint64_t), name="x")
+        n = Argument(uint64_t, name="n")
+
+        with BuildContext(peephole=True):
+            with Function("count", (x, n), uint64_t) as function:
+                reg_x, reg_n = GeneralPurposeRegister64(), GeneralPurposeRegister64()
+                LOAD.ARGUMENT(reg_x, x)
+                LOAD.ARGUMENT(reg_n, n)
+                reg_count, reg_tmp = GeneralPurposeRegister64(), GeneralPurposeRegister64()
+                MOV(reg_count, 0)
+                MOV(reg_tmp, [reg_x])
+                MOV([reg_x + 8], reg_tmp)
+                MOV(reg_tmp, [reg_x + 8])
+                ADD(reg_count, reg_tmp)
+                ADD(reg_x, 1)
+                CMP(reg_x, reg_n)
+                MOV(reg_tmp, 0)
+                SETE(reg_tmp.as_low_byte)
+                ADD(reg_count, 0)
+                ADD(reg_count, reg_tmp)
+                RETURN(reg_count)
+
+            abi_function = function.finalize(abi.system_v_x86_64_abi)
+
+        code = [instruction.format("peachpy", indent=False) for instruction in abi_function._instructions]
+        assert code == [
+            "XOR r10d, r10d",
+            "MOV rax, [rdi]",
+            "MOV [rdi + 8], rax",
+            "ADD r10, rax",
+            "INC rdi",
+            "CMP rdi, rsi",
+            # XOR would clobber the flags which SETE reads
+            "MOV eax, 0",
+            "SETE al",
+            "ADD r10, rax",
+            "MOV rax, r10",
+            "RET"
+        ], "\n".join(code)
+
+        report = abi_function.peephole_report
+        assert report.removed_instructions == 2
+        assert report.rewrites["redundant-moves"] == 1 and report.rewrites["zero-idioms"] == 1
+        assert report.saved_bytes > 0
+
+
+class SelectPatterns(unittest.TestCase):
+    def runTest(self):
+        x = Argument(ptr(uint64_t), name="x")
+
+        with BuildContext(peephole=True, peephole_patterns=["narrow-immediates"]):
+            with Function("load", (x,), uint64_t) as function:
+                reg_x = GeneralPurposeRegister64()
+                LOAD.ARGUMENT(reg_x, x)
+                reg_y = GeneralPurposeRegister64()
+                MOV(reg_y, 0)
+                ADD(reg_y, [reg_x])
+                SUB(reg_y, 1)
+                RETURN(reg_y)
+
+            abi_function = function.finalize(abi.system_v_x86_64_abi)
+
+        names = [instruction.name for instruction in abi_function._instructions]
+        assert names == ["MOV", "ADD", "SUB", "RET"], names
+        assert abi_function._instructions[0].format("peachpy", indent=False) == "MOV eax, 0"
+        assert abi_function.peephole_report.saved_bytes == 2
@@ -0,0 +1,55 @@
+import json
+import unittest
+from peachpy import *
+from peachpy.x86_64 import *
+import peachpy.x86_64.options
+from peachpy.x86_64.profiler import Profiler
+
+
+class ProfilePhases(unittest.TestCase):
+    def runTest(self):
+        profiler = Profiler()
+        peachpy.x86_64.options.profiler = profiler
+        try:
+            x = Argument(uint32_t)
+
+            with Function("count_bits", (x,), uint32_t) as function:
+                reg_x = GeneralPurposeRegister32()
+                LOAD.ARGUMENT(reg_x, x)
+                reg_count = GeneralPurposeRegister32()
+                XOR(reg_count, reg_count)
+                with Loop() as loop:
+                    BLSR(reg_x, reg_x)
+                    INC(reg_count)
+                    TEST(reg_x, reg_x)
+                    JNZ(loop.begin)
+                RETURN(reg_count)
+
+            function.finalize(abi.system_v_x86_64_abi).encode()
+        finally:
+            peachpy.x86_64.options.profiler = None
+
+        phases = profiler.functions["count_bits"]
+        for phase_name in ["analysis", "spilling", "preallocation", "abi_setup", "register_allocation",
+                           "stack_frame", "lowering", "encoding"]:
+            assert phases[phase_name].calls == 1, "Phase %s is not profiled" % phase_name
+            assert phases[phase_name].time >= 0.0
+        assert phases["analysis"].counters["basic_blocks"] >= 2
+        assert phases["analysis"].counters["fixpoint_iterations"] >= phases["analysis"].counters["basic_blocks"]
+        assert phases["encoding"].counters["relaxation_passes"] == 1
+        assert phases["encoding"].counters["bytes"] > 0
+
+        profile = json.loads(profiler.to_json())
+        assert profile["functions"][0]["name"] == "count_bits"
+        assert profile["totals"]["encoding"]["counters"]["bytes"] == phases["encoding"].counters["bytes"]
+
+
+class ProfileMerge(unittest.TestCase):
+    def runTest(self):
+        profiler, worker_profiler = Profiler(), Profiler()
+        profiler.get_phase("f", "encoding").count("bytes", 10)
+        worker_profiler.get_phase("f", "encoding").count("bytes", 5)
+        worker_profiler.get_phase("g", "lowering").count("instructions", 3)
+        profiler.merge(worker_profiler)
+        assert profiler.functions["f"]["encoding"].counters["bytes"] == 15
+        assert profiler.totals["lowering"].counters["instructions"] == 3
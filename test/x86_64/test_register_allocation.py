@@ -0,0 +1,127 @@
+import unittest
+from peachpy import *
+from peachpy.x86_64 import *
+
+
+class NoCalleeSaveRegisters(unittest.TestCase):
+    def runTest(self):
+        x = Argument(uint64_t)
+
+        with Function("sum_copies", (x,), uint64_t) as function:
+            reg_x = GeneralPurposeRegister64()
+            LOAD.ARGUMENT(reg_x, x)
+            copies = [GeneralPurposeRegister64() for _ in range(9)]
+            for reg in copies:
+                MOV(reg, reg_x)
+            for reg in copies[1:]:
+                ADD(copies[0], reg)
+            RETURN(copies[0])
+
+        code = function.finalize(abi.system_v_x86_64_abi).format_code(line_separator=None, indent=False)
+        assert not any(line.startswith("PUSH") for line in code), \
+            "Unexpected callee-save registers in Peach-Py code:\n" + "\n".join(code)
+        assert not any("rsp" in line for line in code), \
+            "Unexpected stack pointer allocation in Peach-Py code:\n" + "\n".join(code)
+
+
+class CoalesceCopy(unittest.TestCase):
+    def runTest(self):
+        x = Argument(uint32_t)
+
+        with Function("increment", (x,), uint32_t) as function:
+            reg_x = GeneralPurposeRegister32()
+            LOAD.ARGUMENT(reg_x, x)
+            reg_y = GeneralPurposeRegister32()
+            MOV(reg_y, reg_x)
+            ADD(reg_y, 1)
+            RETURN(reg_y)
+
+        abi_function = function.finalize(abi.system_v_x86_64_abi)
+        # The argument is loaded from edi, and all other moves are coalesced with the result register
+        moves = [instruction for instruction in abi_function._instructions
+                 if instruction.name == "MOV" and instruction.operands[1] != edi]
+        assert moves and all(move.operands == (eax, eax) for move in moves), \
+            "Copy is not coalesced:\n" + abi_function.format_code()
+
+
+class ConflictingCopy(unittest.TestCase):
+    def runTest(self):
+        x = Argument(uint32_t)
+
+        with Function("double", (x,), uint32_t) as function:
+            reg_x = GeneralPurposeRegister32()
+            LOAD.ARGUMENT(reg_x, x)
+            reg_y = GeneralPurposeRegister32()
+            MOV(reg_y, reg_x)
+            ADD(reg_y, reg_x)
+            RETURN(reg_y)
+
+        abi_function = function.finalize(abi.system_v_x86_64_abi)
+        add = next(instruction for instruction in abi_function._instructions if instruction.name == "ADD")
+        assert add.operands[0] != add.operands[1], \
+            "Conflicting registers are allocated to the same physical register:\n" + abi_function.format_code()
+
+
+class CoalesceResult(unittest.TestCase):
+    def runTest(self):
+        x = Argument(ptr(const_float_))
+        n = Argument(size_t)
+
+        with Function("sum", (x, n), float_) as function:
+            reg_x, reg_n = GeneralPurposeRegister64(), GeneralPurposeRegister64()
+            LOAD.ARGUMENT(reg_x, x)
+            LOAD.ARGUMENT(reg_n, n)
+            xmm_sum = XMMRegister()
+            XORPS(xmm_sum, xmm_sum)
+            with Loop() as loop:
+                ADDSS(xmm_sum, [reg_x])
+                ADD(reg_x, 4)
+                SUB(reg_n, 1)
+                JNZ(loop.begin)
+            RETURN(xmm_sum)
+
+        abi_function = function.finalize(abi.system_v_x86_64_abi)
+        names = [instruction.name for instruction in abi_function._instructions]
+        assert names[-2:] == ["JNZ", "RET"], \
+            "Result is not allocated to the result register:\n" + abi_function.format_code()
+
+
+class SpillGeneralPurposeRegisters(unittest.TestCase):
+    def runTest(self):
+        x = Argument(uint64_t)
+
+        with Function("sum_offsets", (x,), uint64_t) as function:
+            reg_x = GeneralPurposeRegister64()
+            LOAD.ARGUMENT(reg_x, x)
+            offsets = [GeneralPurposeRegister64() for _ in range(24)]
+            for i, reg in enumerate(offsets):
+                LEA(reg, [reg_x + i])
+            for reg in offsets[1:]:
+                ADD(offsets[0], reg)
+            RETURN(offsets[0])
+
+        py_sum_offsets = function.finalize(abi.detect()).encode().load()
+        assert py_sum_offsets(1) == 24 + sum(range(24))
+
+
+class SpillXMMRegisters(unittest.TestCase):
+    def runTest(self):
+        x = Argument(double_)
+
+        with Function("sum_products", (x,), double_) as function:
+            xmm_x = XMMRegister()
+            LOAD.ARGUMENT(xmm_x, x)
+            products = [XMMRegister() for _ in range(20)]
+            for reg in products:
+                MOVAPD(reg, xmm_x)
+                MULSD(reg, xmm_x)
+            for reg in products[1:]:
+                ADDSD(products[0], reg)
+            RETURN(products[0])
+
+        abi_function = function.finalize(abi.system_v_x86_64_abi)
+        code = abi_function.format_code(line_separator=None, indent=False)
+        assert any(line.startswith("MOVAPS [rsp") for line in code), \
+            "Expected spill stores in Peach-Py code:\n" + "\n".join(code)
+        assert abi_function._stack_frame_size % 16 == 8, \
+            "Stack frame is not aligned on 16 bytes:\n" + "\n".join(code)
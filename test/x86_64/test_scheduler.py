@@ -0,0 +1,69 @@
+import unittest
+import ctypes
+from peachpy import *
+from peachpy.x86_64 import *
+from peachpy.context import BuildContext
+import peachpy.x86_64.uarch
+
+
+class HideLoadLatency(unittest.TestCase):
+    def runTest(self):
+        x = Argument(ptr(const_float_))
+        y = Argument(ptr(float_))
+
+        with BuildContext(schedule_instructions=True):
+            with Function("sum_squares", (x, y), target=peachpy.x86_64.uarch.haswell) as function:
+                reg_x, reg_y = GeneralPurposeRegister64(), GeneralPurposeRegister64()
+                LOAD.ARGUMENT(reg_x, x)
+                LOAD.ARGUMENT(reg_y, y)
+                ymm_acc = YMMRegister()
+                VXORPS(ymm_acc, ymm_acc, ymm_acc)
+                for i in range(4):
+                    ymm_x = YMMRegister()
+                    VMOVUPS(ymm_x, [reg_x + i * YMMRegister.size])
+                    VFMADD231PS(ymm_acc, ymm_x, ymm_x)
+                VMOVUPS([reg_y], ymm_acc)
+                RETURN()
+
+        names = [instruction.name for instruction in function._instructions]
+        last_load = max(i for i, instruction in enumerate(function._instructions)
+                        if instruction.name == "VMOVUPS" and instruction.operands[0].__class__ is YMMRegister)
+        assert last_load < names.index("VFMADD231PS"), \
+            "Loads are not scheduled ahead of dependent instructions:\n" + function.format_instructions()
+        assert names.index("VMOVUPS", last_load + 1) > max(i for i, name in enumerate(names) if name == "VFMADD231PS")
+
+
+class PreserveDependencies(unittest.TestCase):
+    def runTest(self):
+        x = Argument(ptr(uint64_t))
+        n = Argument(uint64_t)
+
+        with BuildContext(schedule_instructions=True):
+            with Function("shuffle", (x, n), uint64_t, target=peachpy.x86_64.uarch.haswell) as function:
+                reg_x, reg_n = GeneralPurposeRegister64(), GeneralPurposeRegister64()
+                LOAD.ARGUMENT(reg_x, x)
+                LOAD.ARGUMENT(reg_n, n)
+                # Store followed by a load of the same address
+                reg_a, reg_b = GeneralPurposeRegister64(), GeneralPurposeRegister64()
+                MOV([reg_x], reg_n)
+                IMUL(reg_n, reg_n, 3)
+                MOV(reg_a, [reg_x])
+                # Accesses through a modified base register
+                ADD(reg_x, 8)
+                MOV([reg_x], reg_n)
+                MOV(reg_b, [reg_x - 8])
+                # Flags producer, flags consumer, and an unrelated flags writer
+                reg_c = GeneralPurposeRegister64()
+                MOV(reg_c, 100)
+                CMP(reg_a, reg_b)
+                CMOVA(reg_c, reg_n)
+                ADD(reg_n, reg_a)
+                ADD(reg_c, reg_n)
+                RETURN(reg_c)
+
+        py_shuffle = function.finalize(abi.detect()).encode().load()
+        array = (ctypes.c_uint64 * 2)()
+        assert py_shuffle(array, 5) == 100 + 4 * 5
+        assert list(array) == [5, 15]
+        array = (ctypes.c_uint64 * 2)()
+        assert py_shuffle(array, 0) == 100
@@ -0,0 +1,50 @@
+import unittest
+from peachpy.x86_64 import *
+import peachpy.x86_64.uarch
+
+
+class TimingDatabase(unittest.TestCase):
+    def runTest(self):
+        haswell = peachpy.x86_64.uarch.haswell
+        table = peachpy.x86_64.uarch.get_timing_table(haswell)
+        assert table, "Instruction timing database is not available"
+
+        div32, div64 = haswell.get_instruction_timing(DIV(ecx)), haswell.get_instruction_timing(DIV(rcx))
+        assert div64.latency > div32.latency and div64.uops > 1
+        div64_load = haswell.get_instruction_timing(DIV(qword[rax]))
+        assert div64_load.latency == div64.latency + haswell.scheduling_model.load_latency
+        assert div64_load.uops == div64.uops + 1
+        # LEA computes the address of its memory operand without loading from memory
+        lea = haswell.get_instruction_timing(LEA(rax, [rax + 8]))
+        assert lea == haswell.get_instruction_timing(ADD(rax, 8))
+        assert haswell.scheduling_model.load_ports not in lea.ports
+
+        # Timings of forms without overrides match the scheduling model
+        for instruction in [ADD(rax, rbx), ADD([rbx], eax), VFMADD231PS(ymm0, ymm1, [rax]), VMOVUPS([rax], ymm1)]:
+            timing = haswell.get_instruction_timing(instruction)
+            is_generic = instruction.__class__.__module__ == "peachpy.x86_64.generic"
+            estimate = haswell.estimate_timing(instruction.name, is_generic,
+                                               peachpy.x86_64.uarch.get_operand_descriptions(instruction))
+            assert (timing.latency, timing.uops, timing.ports) == (estimate.latency, estimate.uops, estimate.ports)
+            assert abs(timing.reciprocal_throughput - estimate.reciprocal_throughput) < 0.01
+
+
+class TimingEstimate(unittest.TestCase):
+    def runTest(self):
+        # Microarchitectures without a column in the timing database use the scheduling model
+        sandy_bridge = peachpy.x86_64.uarch.sandy_bridge
+        target = peachpy.x86_64.uarch.Microarchitecture("Test", (), alu_width=128, fpu_width=128,
+                                                        load_with=128, store_width=128,
+                                                        scheduling_model=sandy_bridge.scheduling_model)
+        assert not peachpy.x86_64.uarch.get_timing_table(target)
+
+        divps = target.get_instruction_timing(VDIVPS(xmm0, xmm1, xmm2))
+        assert divps.ports == ("0",) and divps.reciprocal_throughput == 7
+        # 256-bit operations are split in two 128-bit micro-operations
+        divps256 = target.get_instruction_timing(VDIVPS(ymm0, ymm1, ymm2))
+        assert divps256.ports == ("0", "0") and divps256.reciprocal_throughput == 14
+        # Loads and stores of moves do not use execution ports
+        load = target.get_instruction_timing(MOV(rax, [rbx]))
+        assert load.latency == sandy_bridge.scheduling_model.load_latency and load.ports == ("23",)
+        # Throughput is limited by the number of ports which execute the micro-operations
+        assert abs(target.get_instruction_timing(ADD(rax, rbx)).reciprocal_throughput - 1.0 / 3) < 0.01
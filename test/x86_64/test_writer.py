@@ -0,0 +1,46 @@
+import os
+import shutil
+import tempfile
+import unittest
+from peachpy import *
+from peachpy.x86_64 import *
+import peachpy.writer
+import peachpy.x86_64.options
+
+
+def generate_functions():
+    for n in range(4):
+        x = Argument(uint32_t)
+
+        with Function("add_%d" % n, (x,), uint32_t):
+            reg_x = GeneralPurposeRegister32()
+            LOAD.ARGUMENT(reg_x, x)
+            skip = Label("skip")
+            CMP(reg_x, n)
+            JB(skip)
+            ADD(reg_x, n)
+            LABEL(skip)
+            RETURN(reg_x)
+
+
+class ParallelELFWriter(unittest.TestCase):
+    def runTest(self):
+        output_directory = tempfile.mkdtemp()
+        previous_abi = peachpy.x86_64.options.abi
+        peachpy.x86_64.options.abi = abi.system_v_x86_64_abi
+        try:
+            serial_path = os.path.join(output_directory, "serial.o")
+            with peachpy.writer.ELFWriter(serial_path, abi.system_v_x86_64_abi):
+                generate_functions()
+
+            parallel_path = os.path.join(output_directory, "parallel.o")
+            elf_writer = peachpy.writer.ELFWriter(parallel_path, abi.system_v_x86_64_abi)
+            with peachpy.writer.ParallelWriter(elf_writer, 2):
+                generate_functions()
+
+            with open(serial_path, "rb") as serial_file, open(parallel_path, "rb") as parallel_file:
+                assert serial_file.read() == parallel_file.read(), \
+                    "Parallel writer output differs from the serial writer output"
+        finally:
+            peachpy.x86_64.options.abi = previous_abi
+            shutil.rmtree(output_directory)